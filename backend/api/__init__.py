@@ -37,6 +37,10 @@ def create_app(config_name='development'):
     # Apply configuration
     app.config.from_object(config_obj)
 
+    # Serialise responses with the fast (orjson/NumPy-aware) JSON provider
+    from utils.json_encoding import install_json_provider
+    install_json_provider(app)
+
     # Initialize extensions
     CORS(app)
     socketio.init_app(app, async_mode='threading')
@@ -82,7 +86,18 @@ def create_app(config_name='development'):
     @app.before_request
     def before_request():
         """Pre-request processing"""
-        pass
+        # Alpaca calls made while serving the dashboard yield to bot traffic
+        from flask import g
+        from core.resilience import RequestPriority, set_api_priority
+        g.api_priority_token = set_api_priority(RequestPriority.DASHBOARD)
+
+    @app.teardown_request
+    def teardown_request(exc):
+        from flask import g
+        from core.resilience import reset_api_priority
+        token = g.pop('api_priority_token', None)
+        if token is not None:
+            reset_api_priority(token)
 
     @app.after_request
     def after_request(response):
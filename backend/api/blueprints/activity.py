@@ -6,6 +6,7 @@ Provides endpoints for bot activity feed and scanner status
 from flask import Blueprint, jsonify, request
 
 from backend.api.services.activity_service import get_activity_service
+from ..utils.responses import conditional_json_response
 
 activity_bp = Blueprint('activity', __name__)
 
@@ -20,7 +21,7 @@ def get_activity_feed():
 
         activity = service.get_recent_activity(limit=limit)
 
-        return jsonify({
+        return conditional_json_response({
             'activity': activity,
             'count': len(activity)
         })
@@ -49,7 +50,7 @@ def get_signal_cache():
         # Sort by timestamp descending
         formatted.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
 
-        return jsonify({
+        return conditional_json_response({
             'signals': formatted,
             'count': len(formatted)
         })
@@ -84,7 +85,7 @@ def get_activity_summary():
     try:
         service = get_activity_service()
 
-        return jsonify({
+        return conditional_json_response({
             'activity': service.get_recent_activity(limit=30),
             'signals': list(service.get_signal_cache().values()),
             'scanner': service.get_scanner_stats()
@@ -6,6 +6,7 @@ Core API endpoints for account, positions, and signals
 
 from flask import Blueprint, jsonify, current_app, request
 from ..utils.decorators import handle_errors, require_auth
+from ..utils.responses import conditional_json_response
 
 api_bp = Blueprint('api', __name__)
 
@@ -70,7 +71,7 @@ def api_positions():
         return _service_unavailable_response()
 
     positions = service.get_positions()
-    return jsonify(positions)
+    return conditional_json_response(positions)
 
 @api_bp.route('/signals')
 @handle_errors
@@ -92,7 +93,7 @@ def api_signals():
         symbols = None
 
     signals = service.calculate_signals(symbols)
-    return jsonify(signals)
+    return conditional_json_response(signals)
 
 @api_bp.route('/signals/analysis')
 @handle_errors
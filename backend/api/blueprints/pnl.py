@@ -5,12 +5,12 @@ Profit and Loss tracking, history, and analytics
 Consolidated from realtime_pnl_dashboard.py and other P&L features
 """
 
-from flask import Blueprint, jsonify, request, send_file, current_app
+from flask import Blueprint, jsonify, request, current_app
 from datetime import datetime
-import pandas as pd
-import io
 
 from ..utils.decorators import handle_api_errors, require_service
+from ..utils.responses import conditional_json_response
+from ..utils.streaming import check_export_format, streaming_download
 
 pnl_bp = Blueprint('pnl', __name__)
 
@@ -61,7 +61,7 @@ def pnl_chart_data(service):
     days = int(request.args.get('days', 7))
     chart_data = service.get_chart_data(days=days)
 
-    return jsonify({
+    return conditional_json_response({
         'labels': chart_data.get('labels', []),
         'datasets': [
             {
@@ -109,36 +109,26 @@ def pnl_statistics(service):
 @handle_api_errors()
 @require_service('pnl_service', 'P&L service not initialized')
 def export_pnl(service):
-    """Export P&L data to CSV"""
+    """Stream P&L data as CSV, NDJSON, JSON or Parquet"""
     # Get export parameters
-    export_format = request.args.get('format', 'csv')
+    export_format = request.args.get('format', 'csv').lower()
     days = int(request.args.get('days', 30))
     include_trades = request.args.get('include_trades', 'true').lower() == 'true'
-
-    # Get data
-    data = service.get_export_data(days=days, include_trades=include_trades)
-
-    if export_format == 'csv':
-        # Create DataFrame and convert to CSV
-        df = pd.DataFrame(data)
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-
-        # Create response
-        response = send_file(
-            io.BytesIO(output.getvalue().encode()),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'pnl_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        )
-        return response
-
-    elif export_format == 'json':
-        return jsonify(data)
-
-    else:
-        return jsonify({'error': 'Unsupported format'}), 400
+    start = request.args.get('start')
+    end = request.args.get('end')
+    symbols = [s.strip().upper() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    check_export_format(export_format)
+
+    # The queries run here, so database errors still get an error status;
+    # rows are then pulled from the cursors while the response is sent
+    rows = service.iter_export_rows(
+        days=days,
+        include_trades=include_trades,
+        start=datetime.fromisoformat(start) if start else None,
+        end=datetime.fromisoformat(end) if end else None,
+        symbols=symbols,
+    )
+    return streaming_download(rows, export_format, service.EXPORT_COLUMNS, 'pnl_export')
 
 @pnl_bp.route('/trades')
 @handle_api_errors()
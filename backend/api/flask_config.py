@@ -22,6 +22,7 @@ class Config:
 
     # API settings
     JSON_SORT_KEYS = False
+    JSON_BACKEND = os.environ.get('API_JSON_BACKEND', 'auto')  # auto, orjson, stdlib
 
     # CORS settings
     CORS_HEADERS = 'Content-Type'
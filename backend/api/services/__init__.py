@@ -12,6 +12,7 @@ from core.alpaca_data_service import AlpacaDataService
 from core.scanner_service import ScannerService
 from core.resilient_client import ResilientAlpacaClient, create_resilient_client
 from core.position_reconciler import PositionReconciler
+from core.account_state import create_account_state_refresher
 from core.resilience import get_resilience_status
 
 logger = logging.getLogger(__name__)
@@ -246,6 +247,16 @@ def init_services(app) -> None:
     app.alpaca_client = alpaca_client
     app.resilient_client = resilient_client
 
+    # Single refresher for account/positions/orders shared by every reader
+    account_state = None
+    if alpaca_client and alpaca_client.api:
+        try:
+            account_state = create_account_state_refresher(resilient_client or alpaca_client.api)
+            logger.info("AccountStateRefresher registered as account_state")
+        except Exception as exc:
+            logger.warning("Failed to start AccountStateRefresher: %s", exc)
+    app.account_state = account_state
+
     # Initialise data manager for market data
     data_manager = None
     if alpaca_client:
@@ -295,12 +306,16 @@ def init_services(app) -> None:
                 reconciler = PositionReconciler(
                     alpaca_client=resilient_client,
                     local_position_manager=local_manager,
-                    reconcile_interval=60,  # Sync every 60 seconds
+                    reconcile_interval=60,  # Verify dirty symbols every 60 seconds
                     auto_resolve=True,
+                    full_sweep_interval=900,  # Full sweep every 15 minutes
                 )
+                order_book = getattr(getattr(trading_service, 'trading_bot', None), 'order_book', None)
+                if order_book is not None:
+                    reconciler.watch_order_book(order_book)
                 reconciler.start()
                 registry.register("position_reconciler", reconciler)
-                logger.info("PositionReconciler started with 60s interval")
+                logger.info("PositionReconciler started with 60s interval, 900s full sweep")
             else:
                 logger.info("No position manager found, skipping reconciler")
         except Exception as exc:
@@ -9,16 +9,17 @@ import logging
 import os
 import threading
 from collections import deque
-from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from utils.records import record
+
 logger = logging.getLogger(__name__)
 
 # Shared file path for activity data
 ACTIVITY_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'activity_feed.json')
 
-@dataclass
+@record(frozen=True)
 class ActivityEntry:
     """Single activity log entry"""
     timestamp: str
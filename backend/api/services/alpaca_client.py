@@ -9,6 +9,7 @@ from typing import Dict, Optional, Union
 
 import alpaca_trade_api as tradeapi
 
+from core.http_transport import use_shared_session
 from utils.alpaca import AlpacaCredentials
 
 logger = logging.getLogger(__name__)
@@ -40,12 +41,12 @@ class AlpacaClient:
     def _connect(self):
         """Establish connection to Alpaca API"""
         try:
-            self.api = tradeapi.REST(
+            self.api = use_shared_session(tradeapi.REST(
                 self.credentials.key_id,
                 self.credentials.secret_key,
                 self.credentials.base_url,
                 api_version='v2'
-            )
+            ))
 
             # Test connection
             account = self.api.get_account()
@@ -8,10 +8,12 @@ Consolidated from multiple P&L dashboard implementations
 import logging
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import pandas as pd
 import numpy as np
 
+from core.account_state import get_account_state
+
 logger = logging.getLogger(__name__)
 
 class PnLService:
@@ -19,6 +21,10 @@ class PnLService:
     Service for P&L tracking, history, and analytics
     """
 
+    # Column order of P&L exports (P&L rows first, then trade rows)
+    EXPORT_COLUMNS = ['type', 'date', 'daily_pnl', 'total_pnl',
+                      'symbol', 'side', 'qty', 'price', 'pnl']
+
     def __init__(self, alpaca_client, db_path: str = 'database/crypto_trading.db'):
         """
         Initialize P&L service
@@ -72,6 +78,16 @@ class PnLService:
                 )
             ''')
 
+            # Range/symbol filters for exports and history queries
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trade_history_timestamp
+                ON trade_history (timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trade_history_symbol_timestamp
+                ON trade_history (symbol, timestamp)
+            ''')
+
             # Create performance metrics table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS performance_metrics (
@@ -97,8 +113,9 @@ class PnLService:
     def get_current_pnl(self) -> Dict:
         """Get current P&L data"""
         try:
-            account = self.api.get_account()
-            positions = self.api.list_positions()
+            reader = get_account_state() or self.api
+            account = reader.get_account()
+            positions = reader.list_positions()
 
             # Calculate P&L
             daily_pnl = self._calculate_daily_pnl()
@@ -328,34 +345,105 @@ class PnLService:
             return {}
 
     def get_export_data(self, days: int = 30, include_trades: bool = True) -> List[Dict]:
-        """Get data for export"""
-        data = []
+        """Get data for export (materialized; prefer ``iter_export_rows`` for large ranges)"""
+        return list(self.iter_export_rows(days=days, include_trades=include_trades))
 
-        # Get P&L history
-        history = self.get_pnl_history(days=days, interval='daily')
-        for entry in history:
-            data.append({
-                'type': 'pnl',
-                'date': entry['timestamp'],
-                'daily_pnl': entry['daily_pnl'],
-                'total_pnl': entry['total_pnl']
-            })
-
-        # Get trades if requested
-        if include_trades:
-            trades = self._get_recent_trades(days=days)
-            for trade in trades:
-                data.append({
-                    'type': 'trade',
-                    'date': trade['timestamp'],
-                    'symbol': trade['symbol'],
-                    'side': trade['side'],
-                    'qty': trade['qty'],
-                    'price': trade['price'],
-                    'pnl': trade['pnl']
-                })
+    def iter_export_rows(self, days: int = 30, include_trades: bool = True,
+                         start: Optional[datetime] = None, end: Optional[datetime] = None,
+                         symbols: Optional[Iterable[str]] = None,
+                         chunk_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream export rows straight from SQLite in chunks of ``chunk_size``.
+
+        Daily P&L rows come first, then trades (newest first). Memory use is
+        bounded by the chunk size regardless of how many trades the range holds.
+        Both queries run before this returns, so database errors are raised
+        here rather than part-way through a streamed response.
+
+        Args:
+            days: Look-back window used when ``start`` is not given
+            include_trades: Include individual trade rows
+            start: Inclusive range start (overrides ``days``)
+            end: Exclusive range end
+            symbols: Only export trades for these symbols
+            chunk_size: Rows fetched from the cursor per round trip
+
+        Raises:
+            sqlite3.Error: If either query fails
+        """
+        if start is None:
+            start = datetime.now() - timedelta(days=days)
+
+        range_sql = 'timestamp >= ?'
+        params: List = [start]
+        if end is not None:
+            range_sql += ' AND timestamp < ?'
+            params.append(end)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            pnl_cursor = conn.cursor()
+            pnl_cursor.execute(f'''
+                SELECT DATE(timestamp) as date,
+                       AVG(unrealized_pnl) as avg_unrealized_pnl,
+                       MAX(account_value) - MIN(account_value) as daily_change
+                FROM pnl_history
+                WHERE {range_sql}
+                GROUP BY DATE(timestamp)
+                ORDER BY date
+            ''', params)
+
+            trade_cursor = None
+            if include_trades:
+                trade_sql = range_sql
+                trade_params = list(params)
+                symbol_list = list(symbols or [])
+                if symbol_list:
+                    trade_sql += f" AND symbol IN ({', '.join('?' * len(symbol_list))})"
+                    trade_params.extend(symbol_list)
+
+                trade_cursor = conn.cursor()
+                trade_cursor.execute(f'''
+                    SELECT timestamp, symbol, side, qty, price, pnl
+                    FROM trade_history
+                    WHERE {trade_sql}
+                    ORDER BY timestamp DESC
+                ''', trade_params)
+        except Exception:
+            conn.close()
+            raise
 
-        return data
+        return self._export_rows(conn, pnl_cursor, trade_cursor, chunk_size)
+
+    @staticmethod
+    def _export_rows(conn: sqlite3.Connection, pnl_cursor: sqlite3.Cursor,
+                     trade_cursor: Optional[sqlite3.Cursor], chunk_size: int) -> Iterator[Dict]:
+        """Read the executed export queries, closing ``conn`` when done."""
+        try:
+            for rows in iter(lambda: pnl_cursor.fetchmany(chunk_size), []):
+                for row in rows:
+                    yield {
+                        'type': 'pnl',
+                        'date': row[0],
+                        'daily_pnl': round(row[2] or 0, 2),
+                        'total_pnl': round(row[1] or 0, 2)
+                    }
+
+            if trade_cursor is None:
+                return
+            for rows in iter(lambda: trade_cursor.fetchmany(chunk_size), []):
+                for row in rows:
+                    yield {
+                        'type': 'trade',
+                        'date': row[0],
+                        'symbol': row[1],
+                        'side': row[2],
+                        'qty': row[3],
+                        'price': row[4],
+                        'pnl': row[5]
+                    }
+        finally:
+            conn.close()
 
     def get_recent_trades(self, limit: int = 50) -> List[Dict]:
         """Get recent trades with P&L"""
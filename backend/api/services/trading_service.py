@@ -15,6 +15,7 @@ from trading_executor import TradingExecutor
 from signal_processor import SignalProcessor
 from strategies import get_strategy
 from core.service_registry import get_service_registry
+from core.account_state import get_account_state
 from indicator import Indicator
 
 logger = logging.getLogger(__name__)
@@ -75,10 +76,15 @@ class TradingService:
         self._positions_cache = None
         self._positions_cache_time = datetime.min
 
+    @property
+    def account_reader(self):
+        """Shared account-state cache when running, otherwise the REST client."""
+        return get_account_state() or self.api
+
     def get_system_status(self) -> Dict:
         """Get system status information"""
         try:
-            account = self.api.get_account()
+            account = self.account_reader.get_account()
             market_status = "OPEN" if account.trading_blocked == False else "CLOSED"
 
             status = {
@@ -120,7 +126,7 @@ class TradingService:
             return self._account_cache
 
         try:
-            account = self.api.get_account()
+            account = self.account_reader.get_account()
             self._account_cache = {
                 "status": account.status,
                 "buying_power": float(account.buying_power),
@@ -158,7 +164,7 @@ class TradingService:
             return self._positions_cache
 
         try:
-            positions = self.api.list_positions()
+            positions = self.account_reader.list_positions()
             position_data = []
 
             for pos in positions:
@@ -335,6 +341,11 @@ class TradingService:
                 "price": order.limit_price or "market",
             }
 
+            # Refresh cached account state so readers see the new order
+            account_state = get_account_state()
+            if account_state:
+                account_state.notify_fill(order_data)
+
             # Broadcast trade update via WebSocket
             if WEBSOCKET_AVAILABLE:
                 emit_trade_update(order_data)
@@ -348,7 +359,7 @@ class TradingService:
     def get_orders(self, status: str = "all", limit: int = 50) -> List[Dict]:
         """Get orders"""
         try:
-            orders = self.api.list_orders(status=status, limit=limit)
+            orders = self.account_reader.list_orders(status=status, limit=limit)
             return [
                 {
                     "id": order.id,
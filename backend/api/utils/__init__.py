@@ -18,7 +18,11 @@ from .responses import (
     validation_error,
     not_found,
     paginated_response,
+    snapshot_response,
+    columnar_response,
+    conditional_json_response,
 )
+from .streaming import EXPORT_FORMATS, streaming_download
 from .validators import validate_order, validate_symbol
 from .error_handlers import register_error_handlers
 
@@ -37,6 +41,12 @@ __all__ = [
     'validation_error',
     'not_found',
     'paginated_response',
+    'snapshot_response',
+    'columnar_response',
+    'conditional_json_response',
+    # Streaming downloads
+    'EXPORT_FORMATS',
+    'streaming_download',
     # Validators
     'validate_order',
     'validate_symbol',
@@ -7,6 +7,8 @@ Provides consistent response formatting across all API endpoints.
 from typing import Any, Dict, Optional
 from flask import jsonify
 
+from utils.json_encoding import conditional_json_response, to_columnar
+
 
 def success_response(
     data: Any,
@@ -34,6 +36,38 @@ def success_response(
     return jsonify(response), 200
 
 
+def snapshot_response(data: Any, **extra_fields) -> Any:
+    """
+    Create a success response for polled snapshots with ETag/304 support.
+
+    Args:
+        data: The response data
+        extra_fields: Additional fields to include in response
+
+    Returns:
+        Response (``304 Not Modified`` when the client copy is current)
+    """
+    response = {'data': data, 'success': True}
+    response.update(extra_fields)
+
+    return conditional_json_response(response)
+
+
+def columnar_response(data: Any, columns: Optional[list] = None, **extra_fields) -> tuple:
+    """
+    Create a success response with series data in columnar form.
+
+    Args:
+        data: DataFrame or list of row dicts
+        columns: Optional subset/order of columns to include
+        extra_fields: Additional fields to include in response
+
+    Returns:
+        Tuple of (response, status_code)
+    """
+    return success_response(to_columnar(data, columns), shape='columnar', **extra_fields)
+
+
 def error_response(
     message: str,
     status_code: int = 500,
@@ -0,0 +1,175 @@
+"""
+Streaming download helpers.
+
+Encode row iterators as CSV, NDJSON, JSON or Parquet chunk by chunk so large
+exports are sent with constant memory instead of being built in full first.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from flask import Response, stream_with_context
+
+from utils.json_encoding import dumps_bytes
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'json': ('application/json', 'json'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _chunked(rows: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(rows: Iterable[Dict[str, Any]], columns: Sequence[str],
+               chunk_size: int = 1000) -> Iterator[bytes]:
+    """Yield a CSV document (header first) in chunks of ``chunk_size`` rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction='ignore')
+    writer.writeheader()
+    for chunk in _chunked(rows, chunk_size):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining.encode('utf-8')
+
+
+def stream_ndjson(rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> Iterator[bytes]:
+    """Yield newline-delimited JSON, one object per row."""
+    for chunk in _chunked(rows, chunk_size):
+        yield b''.join(dumps_bytes(row) + b'\n' for row in chunk)
+
+
+def stream_json_array(rows: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> Iterator[bytes]:
+    """Yield a single JSON array without holding every row in memory."""
+    yield b'['
+    first = True
+    for chunk in _chunked(rows, chunk_size):
+        body = b','.join(dumps_bytes(row) for row in chunk)
+        yield body if first else b',' + body
+        first = False
+    yield b']'
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def stream_parquet(rows: Iterable[Dict[str, Any]], columns: Sequence[str],
+                   chunk_size: int = 10000) -> Iterator[bytes]:
+    """Yield a Parquet file, one row group per ``chunk_size`` rows (requires pyarrow)."""
+    if pq is None:
+        raise ValueError('Parquet export requires pyarrow')
+
+    sink = _ChunkSink()
+    writer = None
+    try:
+        for chunk in _chunked(rows, chunk_size):
+            table = pa.Table.from_pydict(
+                {name: [row.get(name) for row in chunk] for name in columns}
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            yield sink.drain()
+        if writer is None:
+            empty = pa.Table.from_pydict({name: pa.array([], pa.null()) for name in columns})
+            writer = pq.ParquetWriter(sink, empty.schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+
+def check_export_format(export_format: str) -> None:
+    """
+    Raise ``ValueError`` unless ``export_format`` can be streamed here.
+
+    Call before running export queries so a bad request does not open a cursor.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported format '{export_format}'; expected one of {sorted(EXPORT_FORMATS)}"
+        )
+    if export_format == 'parquet' and pq is None:
+        raise ValueError('Parquet export requires pyarrow')
+
+
+def streaming_download(rows: Iterable[Dict[str, Any]], export_format: str,
+                       columns: Sequence[str], filename_stem: str,
+                       chunk_size: Optional[int] = None) -> Response:
+    """
+    Build a streamed attachment response for ``rows``.
+
+    Args:
+        rows: Row dictionaries (typically a database cursor generator)
+        export_format: ``csv``, ``ndjson``, ``json`` or ``parquet``
+        columns: Column order for tabular formats
+        filename_stem: Download name without timestamp/extension
+        chunk_size: Rows encoded per yielded chunk
+
+    Raises:
+        ValueError: Unsupported format or missing optional dependency
+    """
+    check_export_format(export_format)
+
+    if export_format == 'csv':
+        body = stream_csv(rows, columns, chunk_size or 1000)
+    elif export_format == 'ndjson':
+        body = stream_ndjson(rows, chunk_size or 1000)
+    elif export_format == 'json':
+        body = stream_json_array(rows, chunk_size or 1000)
+    else:
+        body = stream_parquet(rows, columns, chunk_size or 10000)
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f'{filename_stem}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+    )
@@ -0,0 +1,454 @@
+"""
+Account State Refresher
+Single background poller for Alpaca account, positions and orders.
+
+Every dashboard endpoint and service used to call ``get_account`` /
+``list_positions`` / ``list_orders`` on its own, so REST usage grew with
+dashboard traffic. The refresher polls those three reads on a fixed cadence
+(and immediately after fills), fills the ``TradingState`` caches and serves
+all readers from memory. It exposes the same ``get_account`` /
+``list_positions`` / ``get_position`` / ``list_orders`` signatures and
+errors as the Alpaca REST client so existing readers can swap it in
+unchanged; order queries the cache cannot answer are passed through to REST.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from alpaca_trade_api.rest import APIError
+
+logger = logging.getLogger(__name__)
+
+# Alpaca order statuses that count as "closed" for ``status='closed'`` queries
+CLOSED_ORDER_STATUSES = frozenset({
+    "filled",
+    "canceled",
+    "cancelled",
+    "expired",
+    "replaced",
+    "rejected",
+    "done_for_day",
+    "stopped",
+    "suspended",
+})
+
+
+def _order_status(order: Any) -> str:
+    status = getattr(order, "status", "")
+    return str(getattr(status, "value", status)).lower()
+
+
+def _position_not_found(symbol: str) -> APIError:
+    """The 404 ``APIError`` REST raises for a symbol without a position."""
+    response = requests.Response()
+    response.status_code = 404
+    return APIError(
+        {"code": 40410000, "message": f"position does not exist: {symbol}"},
+        requests.HTTPError(response=response),
+    )
+
+
+def _raw_fields(entity: Any) -> Dict[str, Any]:
+    """Return the raw field mapping of an Alpaca entity for dict-based caches."""
+    raw = getattr(entity, "_raw", None)
+    if isinstance(raw, dict):
+        return dict(raw)
+    if hasattr(entity, "model_dump"):
+        return entity.model_dump()
+    if hasattr(entity, "__dict__"):
+        return {k: v for k, v in vars(entity).items() if not k.startswith("_")}
+    return {}
+
+
+class AccountStateRefresher:
+    """
+    Background refresher for account, positions and orders.
+
+    Features:
+    - One REST call per resource per interval, independent of reader count
+    - Immediate refresh on fill events (``notify_fill``)
+    - Serves stale data on API errors instead of failing readers
+    - Optional mirroring into ``TradingState`` caches
+    """
+
+    def __init__(
+        self,
+        alpaca_client: Any,
+        state: Any = None,
+        refresh_interval: float = 5.0,
+        orders_limit: int = 100,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            alpaca_client: Alpaca REST client (legacy SDK surface)
+            state: Optional ``TradingState`` whose caches are populated
+            refresh_interval: Seconds between scheduled refreshes
+            orders_limit: Number of recent orders (and of open orders) kept in the cache
+        """
+        self.alpaca_client = alpaca_client
+        self.state = state
+        self.refresh_interval = refresh_interval
+        self.orders_limit = orders_limit
+
+        self._account: Any = None
+        self._positions: List[Any] = []
+        self._orders: List[Any] = []
+        self._open_orders: List[Any] = []
+        self._last_refresh: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._attempted = False
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.refresh_count = 0
+        self.api_calls = 0
+
+    def start(self) -> None:
+        """Start the refresh loop in a background thread."""
+        with self._lock:
+            if self._running:
+                logger.warning("AccountStateRefresher already running")
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._refresh_loop,
+                name="AccountStateRefresher",
+                daemon=True,
+            )
+            self._thread.start()
+        self._register_fill_callback()
+        logger.info(f"Account state refresher started (interval={self.refresh_interval}s)")
+
+    def stop(self) -> None:
+        """Stop the refresh loop."""
+        self._running = False
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._unregister_fill_callback()
+        logger.info("Account state refresher stopped")
+
+    def _refresh_loop(self) -> None:
+        while self._running:
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(self.refresh_interval)
+
+    def refresh(self) -> bool:
+        """
+        Fetch account, positions, recent orders and open orders once.
+
+        Concurrent callers coalesce onto the refresh already in progress.
+
+        Returns:
+            True if all reads succeeded
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            # Another thread is refreshing - wait for it and reuse its result
+            with self._refresh_lock:
+                return self._last_error is None
+
+        try:
+            self._attempted = True
+            ok = True
+            account = positions = orders = open_orders = None
+            try:
+                self.api_calls += 1
+                account = self.alpaca_client.get_account()
+                self.api_calls += 1
+                positions = list(self.alpaca_client.list_positions())
+                self.api_calls += 1
+                orders = list(
+                    self.alpaca_client.list_orders(status="all", limit=self.orders_limit)
+                )
+                # Open orders are listed separately so older ones still working
+                # are not lost behind newer closed orders
+                self.api_calls += 1
+                open_orders = list(
+                    self.alpaca_client.list_orders(status="open", limit=self.orders_limit)
+                )
+            except Exception as e:
+                ok = False
+                self._last_error = str(e)
+                logger.warning(f"Account state refresh failed, serving cached data: {e}")
+
+            with self._lock:
+                now = datetime.now()
+                if account is not None:
+                    self._account = account
+                if positions is not None:
+                    self._positions = positions
+                if orders is not None:
+                    self._orders = orders
+                if open_orders is not None:
+                    self._open_orders = open_orders
+                if ok:
+                    self._last_error = None
+                    self._last_refresh = now
+                    self.refresh_count += 1
+                self._publish_to_state(now)
+            return ok
+        finally:
+            self._refresh_lock.release()
+
+    def attach_state(self, state: Any) -> None:
+        """Mirror the cache into ``state`` from now on, starting with what is cached."""
+        with self._lock:
+            self.state = state
+            if self._last_refresh is not None:
+                self._publish_to_state(self._last_refresh)
+
+    def _publish_to_state(self, now: datetime) -> None:
+        state = self.state
+        if state is None:
+            return
+        if self._account is not None:
+            state.account_cache = _raw_fields(self._account)
+            state.last_update["account"] = now
+        state.positions_cache = list(self._positions)
+        state.orders_cache = list(self._orders)
+        state.last_update["positions"] = now
+        state.last_update["orders"] = now
+
+    def _ensure_loaded(self) -> None:
+        """Populate the cache synchronously before the first scheduled refresh."""
+        if not self._attempted:
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    # Fill events
+    # ------------------------------------------------------------------
+    def notify_fill(self, *_args: Any, **_kwargs: Any) -> None:
+        """Request an immediate refresh after an order fill or submission."""
+        if self._running:
+            self._wake.set()
+        else:
+            self.refresh()
+
+    def _register_fill_callback(self) -> None:
+        try:
+            from utils.trade_store import register_trade_callback
+            register_trade_callback(self.notify_fill)
+        except Exception as e:  # pragma: no cover - defensive
+            logger.debug(f"Trade callback registration skipped: {e}")
+
+    def _unregister_fill_callback(self) -> None:
+        try:
+            from utils.trade_store import unregister_trade_callback
+            unregister_trade_callback(self.notify_fill)
+        except Exception as e:  # pragma: no cover - defensive
+            logger.debug(f"Trade callback removal skipped: {e}")
+
+    # ------------------------------------------------------------------
+    # Read API (drop-in for the Alpaca REST client)
+    # ------------------------------------------------------------------
+    def get_account(self) -> Any:
+        """Return the cached account object."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._account is None:
+                raise RuntimeError(f"Account data unavailable: {self._last_error}")
+            return self._account
+
+    def list_positions(self) -> List[Any]:
+        """Return the cached open positions."""
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._positions)
+
+    def get_position(self, symbol: str) -> Any:
+        """
+        Return the cached position for ``symbol`` (``BTC/USD`` or ``BTCUSD``).
+
+        Raises:
+            APIError: With status 404, as REST does, if there is no position
+        """
+        wanted = symbol.replace("/", "")
+        for position in self.list_positions():
+            if str(position.symbol).replace("/", "") == wanted:
+                return position
+        raise _position_not_found(symbol)
+
+    def list_orders(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        until: Optional[str] = None,
+        direction: Optional[str] = None,
+        symbols: Optional[Iterable[str]] = None,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """
+        Return orders like ``REST.list_orders``.
+
+        Open, closed and all-status queries for the most recent orders are
+        served from the cache. Queries by symbol, time range or ascending
+        direction, and those reaching further back than the cache holds,
+        are passed through to REST.
+        """
+        status = (status or "open").lower()
+        limit = 50 if limit is None else limit
+        if (
+            symbols or after or until or kwargs
+            or (direction or "desc").lower() != "desc"
+            or limit > self.orders_limit
+        ):
+            return self._list_orders_remote(status, limit, after, until, direction, symbols, kwargs)
+
+        self._ensure_loaded()
+        with self._lock:
+            orders = list(self._open_orders if status == "open" else self._orders)
+            recent_complete = len(self._orders) < self.orders_limit
+
+        if status == "closed":
+            orders = [o for o in orders if _order_status(o) in CLOSED_ORDER_STATUSES]
+            if len(orders) < limit and not recent_complete:
+                # Older closed orders fell out of the recent-orders window
+                return self._list_orders_remote(status, limit, after, until, direction, symbols, kwargs)
+        return orders[:limit]
+
+    def _list_orders_remote(
+        self,
+        status: str,
+        limit: int,
+        after: Optional[str],
+        until: Optional[str],
+        direction: Optional[str],
+        symbols: Optional[Iterable[str]],
+        kwargs: Dict[str, Any],
+    ) -> List[Any]:
+        params = dict(kwargs, after=after, until=until, direction=direction,
+                      symbols=list(symbols) if symbols else None)
+        self.api_calls += 1
+        return list(self.alpaca_client.list_orders(
+            status=status, limit=limit, **{k: v for k, v in params.items() if v is not None}
+        ))
+
+    def export(self) -> Dict[str, Any]:
+        """Raw-field copy of the cache for readers in other processes."""
+        with self._lock:
+            return {
+                "account": _raw_fields(self._account) if self._account is not None else None,
+                "positions": [_raw_fields(p) for p in self._positions],
+                "orders": [_raw_fields(o) for o in self._orders],
+                "open_orders": [_raw_fields(o) for o in self._open_orders],
+                "orders_limit": self.orders_limit,
+                "last_refresh": self._last_refresh.isoformat() if self._last_refresh else None,
+                "last_error": self._last_error,
+            }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get refresher status."""
+        return {
+            'running': self._running,
+            'refresh_interval': self.refresh_interval,
+            'last_refresh': self._last_refresh.isoformat() if self._last_refresh else None,
+            'last_error': self._last_error,
+            'refresh_count': self.refresh_count,
+            'api_calls': self.api_calls,
+            'positions': len(self._positions),
+            'orders': len(self._orders),
+            'open_orders': len(self._open_orders),
+        }
+
+
+def _entity(fields: Dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(_raw=fields, **fields)
+
+
+class AccountSnapshot(AccountStateRefresher):
+    """
+    Read-only account state restored from ``AccountStateRefresher.export``.
+
+    Dashboard worker processes serve account, positions and orders from the
+    copy the trading process publishes instead of polling Alpaca themselves.
+    It never refreshes; order queries the cached data cannot answer go to
+    ``alpaca_client`` like the refresher's do.
+    """
+
+    def __init__(self, exported: Dict[str, Any], alpaca_client: Any = None):
+        super().__init__(alpaca_client, orders_limit=exported.get("orders_limit", 100))
+        self._attempted = True
+        account = exported.get("account")
+        self._account = _entity(account) if account is not None else None
+        self._positions = [_entity(p) for p in exported.get("positions", [])]
+        self._orders = [_entity(o) for o in exported.get("orders", [])]
+        self._open_orders = [_entity(o) for o in exported.get("open_orders", [])]
+        last_refresh = exported.get("last_refresh")
+        self._last_refresh = datetime.fromisoformat(last_refresh) if last_refresh else None
+        self._last_error = exported.get("last_error")
+
+    def start(self) -> None:
+        raise RuntimeError("AccountSnapshot is read-only and cannot be started")
+
+    def refresh(self) -> bool:
+        return self._last_error is None
+
+    def notify_fill(self, *_args: Any, **_kwargs: Any) -> None:
+        """Fills are picked up by the publishing process's refresher."""
+
+    def _list_orders_remote(self, *args: Any) -> List[Any]:
+        if self.alpaca_client is None:
+            raise RuntimeError("Order query needs REST but no Alpaca client is available")
+        return super()._list_orders_remote(*args)
+
+
+def create_account_state_refresher(
+    alpaca_client: Any,
+    state: Any = None,
+    refresh_interval: Optional[float] = None,
+    start: bool = True,
+) -> AccountStateRefresher:
+    """
+    Create (and optionally start) a refresher registered as ``account_state``.
+
+    Args:
+        alpaca_client: Alpaca REST client
+        state: Optional ``TradingState`` to populate
+        refresh_interval: Seconds between refreshes; defaults to the service
+            settings ``cache_refresh_seconds``
+        start: Start the background loop immediately
+
+    Returns:
+        AccountStateRefresher instance
+    """
+    if refresh_interval is None:
+        try:
+            from config.service_settings import get_service_settings
+            refresh_interval = get_service_settings().cache_refresh_seconds
+        except Exception:
+            refresh_interval = 5.0
+
+    refresher = AccountStateRefresher(
+        alpaca_client, state=state, refresh_interval=refresh_interval
+    )
+
+    try:
+        from core.service_registry import get_service_registry
+        get_service_registry().register("account_state", refresher)
+    except Exception as e:  # pragma: no cover - registry is optional here
+        logger.debug(f"Account state registry registration skipped: {e}")
+
+    if start:
+        refresher.start()
+    return refresher
+
+
+def get_account_state() -> Optional[AccountStateRefresher]:
+    """Return the registered refresher, if any."""
+    try:
+        from core.service_registry import get_service_registry
+        return get_service_registry().get_optional("account_state")
+    except Exception:
+        return None
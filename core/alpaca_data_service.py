@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 import alpaca_trade_api as tradeapi
 
+from core.http_transport import use_shared_session
+
 logger = logging.getLogger(__name__)
 
 class AlpacaDataService:
@@ -10,7 +12,7 @@ class AlpacaDataService:
     Production-ready data service using the legacy alpaca_trade_api.
     """
     def __init__(self, api_key: str, secret_key: str, base_url: str = "https://paper-api.alpaca.markets"):
-        self.api = tradeapi.REST(api_key, secret_key, base_url)
+        self.api = use_shared_session(tradeapi.REST(api_key, secret_key, base_url))
         logger.info("AlpacaDataService (Legacy) initialized.")
 
     def get_market_data(self, symbol: str, lookback_minutes: int = 50) -> pd.DataFrame:
@@ -0,0 +1,531 @@
+"""
+Bot State Snapshot
+Publishes a read-only snapshot of the trading bot for out-of-process readers.
+
+The dashboard used to read ``price_data``, ``active_positions`` and friends
+straight off the live ``CryptoDayTradingBot`` from request threads in the
+trading process. When the dashboard runs in its own worker processes it has
+no bot object, so the bot periodically publishes everything the dashboard
+renders (status, positions, prices, indicators, signals, activity) and the
+workers serve it through :class:`BotSnapshotView`, which mirrors the parts of
+the bot/scanner surface the dashboard routes use. The Alpaca account,
+positions and orders cached by the trading process's ``AccountStateRefresher``
+travel in the same snapshot, so workers do not poll Alpaca for them.
+
+Snapshots live in a seqlock double buffer (:mod:`core.snapshot_buffer`) in
+shared memory. Price and volume series are stored as raw float64 blocks next
+to the JSON metadata, so readers get them as read-only NumPy views straight
+out of the mapping without copying or locking the trading thread.
+"""
+
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.account_state import AccountSnapshot
+from core.snapshot_buffer import SnapshotBufferReader, SnapshotBufferWriter
+from utils.json_encoding import dumps_bytes
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+    import json
+
+logger = logging.getLogger(__name__)
+
+_SHM_DIR = "/dev/shm"
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    _SHM_DIR if os.path.isdir(_SHM_DIR) else tempfile.gettempdir(),
+    "trading_bot_snapshot.bin",
+)
+
+# Number of price/volume points per symbol carried in the snapshot
+DEFAULT_SERIES_LENGTH = 120
+
+# Scalar bot attributes exposed to dashboard readers via ``getattr``
+BOT_ATTRIBUTES = (
+    "is_running",
+    "total_trades",
+    "total_scans",
+    "daily_profit",
+    "daily_trades",
+    "win_rate",
+    "stop_loss_pct",
+    "take_profit_pct",
+    "min_profit_target",
+    "trailing_stop_pct",
+    "max_hold_time",
+    "max_hold_time_seconds",
+    "max_position_size",
+    "max_concurrent_positions",
+)
+
+
+def get_snapshot_path() -> str:
+    """Return the snapshot location, honouring ``BOT_SNAPSHOT_PATH``."""
+    return os.getenv("BOT_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+
+
+def _reasons(reasons: Any) -> Optional[List[str]]:
+    return list(reasons) if reasons is not None else None
+
+
+def _signal_record(signal: Any) -> Dict[str, Any]:
+    return {
+        "symbol": signal.symbol,
+        "action": signal.action,
+        "confidence": signal.confidence,
+        "price": signal.price,
+        "rsi": getattr(signal, "rsi", None),
+        "timestamp": getattr(signal, "timestamp", None),
+        "signal_reasons": _reasons(getattr(signal, "signal_reasons", None)),
+    }
+
+
+_META_PREFIX = struct.Struct("<I")
+_SERIES_KINDS = ("prices", "volumes")
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """
+    Serialise a snapshot into the shared-memory payload format.
+
+    ``scanner.prices`` / ``scanner.volumes`` are packed into one float64
+    block after the JSON metadata (8-byte aligned); the metadata keeps an
+    ``{kind: {symbol: [offset, count]}}`` index into that block.
+    """
+    meta = dict(snapshot)
+    scanner = dict(meta.get("scanner") or {})
+    index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+    blocks = []
+    offset = 0
+    for kind in _SERIES_KINDS:
+        index[kind] = {}
+        for symbol, values in (scanner.pop(kind, None) or {}).items():
+            array = np.asarray(values, dtype=np.float64)
+            index[kind][symbol] = (offset, int(array.size))
+            blocks.append(array)
+            offset += array.size
+    scanner["series"] = index
+    meta["scanner"] = scanner
+
+    meta_bytes = dumps_bytes(meta)
+    padding = -(_META_PREFIX.size + len(meta_bytes)) % 8
+    values = np.concatenate(blocks).tobytes() if blocks else b""
+    return b"".join((_META_PREFIX.pack(len(meta_bytes)), meta_bytes, b"\0" * padding, values))
+
+
+def decode_snapshot(payload: memoryview, version: int = 0) -> Dict[str, Any]:
+    """
+    Decode a payload written by :func:`encode_snapshot`.
+
+    Series come back as read-only float64 views into ``payload``.
+    """
+    (meta_length,) = _META_PREFIX.unpack_from(payload, 0)
+    meta_end = _META_PREFIX.size + meta_length
+    meta_view = payload[_META_PREFIX.size : meta_end]
+    snapshot = orjson.loads(meta_view) if orjson is not None else json.loads(bytes(meta_view))
+
+    base = meta_end + (-meta_end % 8)
+    values = np.frombuffer(payload, dtype=np.float64, offset=base) if len(payload) > base else np.empty(0)
+    scanner = snapshot.get("scanner", {})
+    for kind, series in scanner.pop("series", {}).items():
+        scanner[kind] = {
+            symbol: values[offset : offset + count] for symbol, (offset, count) in series.items()
+        }
+    snapshot["version"] = version or snapshot.get("version", 0)
+    return snapshot
+
+
+def build_bot_snapshot(
+    bot: Any,
+    activity: Optional[Iterable[Dict[str, Any]]] = None,
+    series_length: int = DEFAULT_SERIES_LENGTH,
+    account_state: Any = None,
+) -> Dict[str, Any]:
+    """
+    Capture the dashboard-visible state of ``bot``.
+
+    Scanner data is copied under ``scanner.lock`` so the snapshot is
+    consistent. Indicators are the ones the scan last computed
+    (``scanner.last_indicators``); nothing is recomputed while the lock
+    is held.
+
+    Args:
+        bot: Trading bot instance (``CryptoDayTradingBot`` surface)
+        activity: Optional activity feed entries
+        series_length: Price/volume points kept per symbol
+        account_state: Optional ``AccountStateRefresher`` whose cache is included
+
+    Returns:
+        JSON-serialisable snapshot dictionary
+    """
+    attributes = {
+        name: getattr(bot, name) for name in BOT_ATTRIBUTES if hasattr(bot, name)
+    }
+
+    try:
+        status = bot.get_status(live_prices=False)
+    except TypeError:
+        status = bot.get_status()
+    except Exception as e:
+        logger.debug(f"Bot status unavailable for snapshot: {e}")
+        status = None
+
+    scanner_state: Dict[str, Any] = {}
+    scanner = getattr(bot, "scanner", None)
+    if scanner is not None:
+        with scanner.lock:
+            symbols = list(scanner.high_volume_pairs)
+            prices = {
+                s: list(scanner.price_data[s][-series_length:])
+                for s in symbols
+                if s in scanner.price_data
+            }
+            volumes = {
+                s: list(scanner.volume_data.get(s, [])[-series_length:])
+                for s in prices
+            }
+            last_indicators = getattr(scanner, "last_indicators", {})
+            indicators = {s: dict(last_indicators[s]) for s in prices if s in last_indicators}
+            signals = [_signal_record(s) for s in getattr(scanner, "last_signals", [])]
+            enabled = (
+                scanner.get_enabled_symbols()
+                if hasattr(scanner, "get_enabled_symbols")
+                else symbols
+            )
+        scanner_state = {
+            "high_volume_pairs": symbols,
+            "enabled_symbols": list(enabled),
+            "prices": prices,
+            "volumes": volumes,
+            "indicators": indicators,
+            "signals": signals,
+        }
+
+    orders: Dict[str, Any] = {}
+    order_book = getattr(bot, "order_book", None)
+    if order_book is not None:
+        orders = order_book.get_status(recent=50)
+
+    return {
+        "published_at": datetime.now().isoformat(),
+        "bot": {
+            "attributes": attributes,
+            "status": status,
+            "active_positions": dict(getattr(bot, "active_positions", {})),
+        },
+        "scanner": scanner_state,
+        "orders": orders,
+        "account": account_state.export() if account_state is not None else None,
+        "activity": list(activity or []),
+    }
+
+
+class SnapshotPublisher:
+    """
+    Background publisher of bot snapshots.
+
+    Each snapshot is encoded once and written into the inactive half of the
+    shared-memory double buffer, so readers never see a partial write and
+    never take a lock shared with the trading process.
+    """
+
+    def __init__(
+        self,
+        bot: Any,
+        path: Optional[str] = None,
+        interval: float = 1.0,
+        activity_source: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+        account_state: Any = None,
+    ):
+        """
+        Initialize the publisher.
+
+        Args:
+            bot: Trading bot to snapshot
+            path: Snapshot file path (defaults to ``BOT_SNAPSHOT_PATH``)
+            interval: Seconds between publishes
+            activity_source: Optional callable returning activity entries
+            account_state: Optional ``AccountStateRefresher`` to publish
+        """
+        self.bot = bot
+        self.path = path or get_snapshot_path()
+        self.interval = interval
+        self.activity_source = activity_source
+        self.account_state = account_state
+
+        self.version = 0
+        self.publish_count = 0
+        self.last_publish_seconds = 0.0
+
+        self._writer: Optional[SnapshotBufferWriter] = None
+        self._running = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start publishing in a background thread."""
+        if self._running:
+            logger.warning("SnapshotPublisher already running")
+            return
+        self._running = True
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._publish_loop, name="SnapshotPublisher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Bot snapshot publisher started ({self.path}, every {self.interval}s)")
+
+    def stop(self) -> None:
+        """Stop publishing."""
+        self._running = False
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        logger.info("Bot snapshot publisher stopped")
+
+    def _publish_loop(self) -> None:
+        while self._running:
+            try:
+                self.publish()
+            except Exception as e:
+                logger.warning(f"Snapshot publish failed: {e}")
+            self._stop.wait(self.interval)
+
+    def publish(self) -> int:
+        """
+        Build and publish one snapshot.
+
+        Returns:
+            Version number of the published snapshot
+        """
+        started = time.perf_counter()
+        activity = self.activity_source() if self.activity_source else None
+        snapshot = build_bot_snapshot(self.bot, activity=activity, account_state=self.account_state)
+        self.version += 1
+        snapshot["version"] = self.version
+        payload = encode_snapshot(snapshot)
+
+        if self._writer is None:
+            self._writer = SnapshotBufferWriter(self.path)
+        self._writer.write(payload, version=self.version)
+
+        self.publish_count += 1
+        self.last_publish_seconds = time.perf_counter() - started
+        return self.version
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get publisher status."""
+        return {
+            'running': self._running,
+            'path': self.path,
+            'interval': self.interval,
+            'version': self.version,
+            'publish_count': self.publish_count,
+            'last_publish_ms': round(self.last_publish_seconds * 1000, 3),
+            'buffer_capacity': self._writer.capacity if self._writer else None,
+        }
+
+
+class SnapshotReader:
+    """
+    Lock-free reader of published snapshots.
+
+    The decoded snapshot is cached per buffer slot and sequence number, so
+    the metadata is only parsed once per published version. Series arrays
+    are zero-copy views that stay valid until the writer reuses their slot
+    (two publishes later); copy them to keep them longer.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_snapshot_path()
+        self._buffer = SnapshotBufferReader(self.path)
+        self._lock = threading.Lock()
+        self._key: Optional[tuple] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._account: Optional[AccountSnapshot] = None
+        self._account_source: Optional[Dict[str, Any]] = None
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Return the latest snapshot, or None if nothing was published yet."""
+        with self._lock:
+            current = self._buffer.current()
+            if current is None:
+                return None
+            if current == self._key and self._buffer.is_current(current[0], current[1]):
+                return self._snapshot
+            snapshot = self._buffer.read(decode_snapshot)
+            if snapshot is not None:
+                self._snapshot = snapshot
+                self._key = self._buffer.current()
+            return snapshot
+
+    def account_state(self, alpaca_client: Any = None) -> Optional[AccountSnapshot]:
+        """
+        Return the published account state, rebuilt once per snapshot version.
+
+        ``alpaca_client`` only serves order queries the snapshot cannot answer.
+        """
+        snapshot = self.read()
+        if snapshot is None or not snapshot.get("account"):
+            return None
+        with self._lock:
+            if self._account_source is not snapshot["account"]:
+                self._account = AccountSnapshot(snapshot["account"], alpaca_client)
+                self._account_source = snapshot["account"]
+            return self._account
+
+    def view(self, alpaca_client: Any = None) -> Optional["BotSnapshotView"]:
+        """Return a bot-like view of the latest snapshot."""
+        snapshot = self.read()
+        if snapshot is None:
+            return None
+        return BotSnapshotView(snapshot, alpaca_client=alpaca_client)
+
+
+def _restore_position(record: Dict[str, Any]) -> Dict[str, Any]:
+    position = dict(record)
+    entry_time = position.get("entry_time")
+    if isinstance(entry_time, str):
+        try:
+            position["entry_time"] = datetime.fromisoformat(entry_time)
+        except ValueError:
+            pass
+    if isinstance(position.get("signal"), dict):
+        position["signal"] = SimpleNamespace(**position["signal"])
+    return position
+
+
+class _SeriesView(Mapping):
+    """
+    Symbol -> list of floats over the decoded float64 series.
+
+    Each series becomes a list only when first looked up, so routes that
+    touch a few symbols do not convert all of them, while callers keep the
+    list semantics (``if prices``, slicing, ``sum``) of the live scanner.
+    """
+
+    def __init__(self, series: Dict[str, Any]):
+        self._series = series
+        self._lists: Dict[str, List[float]] = {}
+
+    def __getitem__(self, symbol: str) -> List[float]:
+        values = self._lists.get(symbol)
+        if values is None:
+            values = self._lists[symbol] = np.asarray(self._series[symbol]).tolist()
+        return values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._series)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+class _ScannerSnapshotView:
+    """Read-only stand-in for ``CryptoVolatilityScanner`` backed by a snapshot."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.high_volume_pairs: List[str] = state.get("high_volume_pairs", [])
+        self.price_data: Mapping[str, List[float]] = _SeriesView(state.get("prices", {}))
+        self.volume_data: Mapping[str, List[float]] = _SeriesView(state.get("volumes", {}))
+        self._indicators: Dict[str, Dict[str, Any]] = state.get("indicators", {})
+        self._signals: List[Dict[str, Any]] = state.get("signals", [])
+        self._enabled: List[str] = state.get("enabled_symbols", self.high_volume_pairs)
+
+    def get_enabled_symbols(self) -> List[str]:
+        return list(self._enabled)
+
+    def get_indicators(self, symbol: str, **_kwargs: Any) -> Dict[str, Any]:
+        return dict(self._indicators.get(symbol, {}))
+
+    def scan_for_opportunities(self) -> List[SimpleNamespace]:
+        signals = []
+        for record in self._signals:
+            signal = SimpleNamespace(**record)
+            if isinstance(signal.timestamp, str):
+                signal.timestamp = datetime.fromisoformat(signal.timestamp)
+            signals.append(signal)
+        return signals
+
+    def detect_volume_surge(self, volumes: List[float], window: int = 10) -> bool:
+        if len(volumes) < window + 1:
+            return False
+        recent = volumes[-window - 1 : -1]
+        return volumes[-1] > (sum(recent) / len(recent)) * 1.1
+
+
+class _OrderBookSnapshotView:
+    """Read-only stand-in for ``LocalOrderBook`` backed by a snapshot."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self._status = {k: v for k, v in state.items() if k != "recent"}
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        for order in state.get("recent", []):
+            self._orders[order["order_id"]] = order
+            if order.get("client_order_id"):
+                self._orders[order["client_order_id"]] = order
+
+    def lookup(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return self._orders.get(str(order_id))
+
+    def get_status(self, recent: int = 0) -> Dict[str, Any]:
+        return dict(self._status)
+
+
+class BotSnapshotView:
+    """
+    Read-only stand-in for ``CryptoDayTradingBot`` backed by a snapshot.
+
+    Exposes ``is_running``, ``get_status()``, ``active_positions``, the
+    scalar settings in :data:`BOT_ATTRIBUTES`, ``scanner`` and ``order_book`` views, so
+    dashboard routes written against the live bot work unchanged.
+    """
+
+    def __init__(self, snapshot: Dict[str, Any], alpaca_client: Any = None):
+        bot_state = snapshot.get("bot", {})
+        self.snapshot = snapshot
+        self.version = snapshot.get("version", 0)
+        self.alpaca = alpaca_client
+        self._attributes: Dict[str, Any] = bot_state.get("attributes", {})
+        self._status: Optional[Dict[str, Any]] = bot_state.get("status")
+        self.active_positions = {
+            symbol: _restore_position(position)
+            for symbol, position in bot_state.get("active_positions", {}).items()
+        }
+        self.scanner = _ScannerSnapshotView(snapshot.get("scanner", {}))
+        self.order_book = _OrderBookSnapshotView(snapshot.get("orders", {}))
+        self.activity: List[Dict[str, Any]] = snapshot.get("activity", [])
+
+    def __getattr__(self, name: str) -> Any:
+        attributes = self.__dict__.get("_attributes", {})
+        if name in attributes:
+            return attributes[name]
+        raise AttributeError(name)
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._attributes.get("is_running", False))
+
+    def get_status(self) -> Dict[str, Any]:
+        if self._status is not None:
+            return dict(self._status)
+        return {
+            "is_running": self.is_running,
+            "active_positions_count": len(self.active_positions),
+            "positions": [],
+        }
@@ -0,0 +1,245 @@
+"""
+Dashboard Process
+Runs the Flask dashboard in separate worker processes.
+
+The development server used to run in a thread of the trading process, so
+every dashboard request competed for the GIL with indicator math and order
+handling. :class:`DashboardProcess` launches the dashboard under gunicorn
+(several pre-forked workers) when it is installed, falling back to the
+Werkzeug forking server otherwise. Workers read bot state from the snapshot
+published by :class:`core.bot_snapshot.SnapshotPublisher`.
+
+Usage:
+    python -m core.dashboard_process --app main:create_dashboard_wsgi_app --port 5001
+"""
+
+import argparse
+import importlib
+import importlib.util
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = ("gunicorn", "werkzeug")
+
+
+def load_app_factory(spec: str) -> Any:
+    """Import ``module:factory`` and return the WSGI app the factory builds."""
+    module_name, _, factory_name = spec.partition(":")
+    if not factory_name:
+        raise ValueError(f"App factory must look like 'module:factory', got {spec!r}")
+    module = importlib.import_module(module_name)
+    return getattr(module, factory_name.rstrip("()"))()
+
+
+def resolve_server(preferred: str = "auto") -> str:
+    """Return the server to launch, preferring gunicorn when installed."""
+    preferred = (preferred or "auto").lower()
+    if preferred not in (*SERVERS, "auto"):
+        raise ValueError(f"Unknown dashboard server {preferred!r}; expected one of {SERVERS}")
+    if preferred == "werkzeug":
+        return "werkzeug"
+    if importlib.util.find_spec("gunicorn") is not None:
+        return "gunicorn"
+    if preferred == "gunicorn":
+        logger.warning("gunicorn requested but not installed; using the Werkzeug forking server")
+    return "werkzeug"
+
+
+def serve(spec: str, host: str = "0.0.0.0", port: int = 5001, workers: int = 2) -> None:
+    """Serve ``spec`` with the Werkzeug server, forking up to ``workers`` children."""
+    from werkzeug.serving import run_simple
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = load_app_factory(spec)
+    if workers > 1:
+        run_simple(host, port, app, processes=workers, threaded=False, use_reloader=False)
+    else:
+        run_simple(host, port, app, threaded=True, use_reloader=False)
+
+
+def wait_for_port(host: str, port: int, timeout: float = 15.0) -> bool:
+    """Block until something accepts connections on ``host:port``."""
+    target = "127.0.0.1" if host in ("0.0.0.0", "") else host
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((target, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+class DashboardProcess:
+    """
+    Supervisor for the out-of-process dashboard server.
+
+    Features:
+    - gunicorn with pre-forked workers when available
+    - Werkzeug forking server fallback with no extra dependency
+    - Snapshot location passed to workers through ``BOT_SNAPSHOT_PATH``
+    """
+
+    def __init__(
+        self,
+        app_factory: str = "main:create_dashboard_wsgi_app",
+        host: str = "0.0.0.0",
+        port: int = 5001,
+        workers: int = 2,
+        server: str = "auto",
+        snapshot_path: Optional[str] = None,
+        threads: int = 4,
+    ):
+        """
+        Initialize the supervisor.
+
+        Args:
+            app_factory: ``module:factory`` returning the dashboard WSGI app
+            host: Bind address
+            port: Bind port
+            workers: Number of worker processes
+            server: ``gunicorn``, ``werkzeug`` or ``auto``
+            snapshot_path: Snapshot file the workers read
+            threads: Threads per gunicorn worker
+        """
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.server = resolve_server(server)
+        self.snapshot_path = snapshot_path
+        self.threads = threads
+        self._process: Optional[subprocess.Popen] = None
+
+    def command(self) -> List[str]:
+        """Return the command line used to launch the server."""
+        if self.server == "gunicorn":
+            return [
+                sys.executable, "-m", "gunicorn",
+                "--workers", str(self.workers),
+                "--worker-class", "gthread",
+                "--threads", str(self.threads),
+                "--bind", f"{self.host}:{self.port}",
+                "--log-level", "warning",
+                f"{self.app_factory}()",
+            ]
+        return [
+            sys.executable, "-m", "core.dashboard_process",
+            "--app", self.app_factory,
+            "--host", self.host,
+            "--port", str(self.port),
+            "--workers", str(self.workers),
+        ]
+
+    def start(self) -> None:
+        """Launch the dashboard server process."""
+        if self.is_alive():
+            logger.warning("Dashboard process already running")
+            return
+
+        env = dict(os.environ)
+        if self.snapshot_path:
+            env["BOT_SNAPSHOT_PATH"] = self.snapshot_path
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (PROJECT_ROOT, env.get("PYTHONPATH")) if p
+        )
+        self._process = subprocess.Popen(self.command(), cwd=PROJECT_ROOT, env=env)
+        logger.info(
+            f"📊 Dashboard process started ({self.server}, {self.workers} workers) "
+            f"at http://{self.host}:{self.port} [pid {self._process.pid}]"
+        )
+
+    def wait_until_ready(self, timeout: float = 15.0) -> bool:
+        """Wait for the server to accept connections."""
+        return wait_for_port(self.host, self.port, timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Terminate the dashboard server process."""
+        process = self._process
+        if process is None:
+            return
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=timeout)
+        self._process = None
+        logger.info("Dashboard process stopped")
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get supervisor status."""
+        return {
+            'running': self.is_alive(),
+            'pid': self._process.pid if self._process else None,
+            'server': self.server,
+            'workers': self.workers,
+            'bind': f"{self.host}:{self.port}",
+        }
+
+
+def create_snapshot_app() -> Any:
+    """
+    Minimal read-only app serving the published bot snapshot.
+
+    Useful as a health endpoint for the dashboard workers and as a
+    lightweight target for load tests.
+    """
+    from flask import Flask, jsonify
+
+    from core.bot_snapshot import SnapshotReader
+    from utils.json_encoding import conditional_json_response, install_json_provider
+
+    app = Flask(__name__)
+    install_json_provider(app)
+    reader = SnapshotReader()
+
+    @app.route("/health")
+    def health():
+        return jsonify({"status": "ok", "pid": os.getpid()})
+
+    @app.route("/api/v1/snapshot")
+    def snapshot():
+        data = reader.read()
+        if data is None:
+            return jsonify({"error": "No snapshot published"}), 503
+        return conditional_json_response(data)
+
+    @app.route("/api/v1/bot/status")
+    def bot_status():
+        bot = reader.view()
+        if bot is None:
+            return jsonify({"status": "not_started", "bot": None})
+        status = bot.get_status()
+        return jsonify(
+            {"status": "running" if status.get("is_running") else "stopped", "bot": status}
+        )
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the dashboard in worker processes")
+    parser.add_argument("--app", default="main:create_dashboard_wsgi_app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("DASHBOARD_PORT", "5001")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("DASHBOARD_WORKERS", "2")))
+    args = parser.parse_args(argv)
+    serve(args.app, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Exit Rule Engine
+Vectorized take-profit / stop-loss / trailing-stop / max-hold checks.
+
+Open positions live in a struct-of-arrays ``ExitRuleTable``: one numpy column
+each for side, entry price, stop, target, high-water mark and entry time, with
+a symbol -> row index. ``evaluate`` takes the tick's prices and returns the
+exit reason for every position at once, so the cost of a tick is a handful of
+array operations regardless of how many positions are open.
+
+Both ``PositionManager`` and ``CryptoDayTradingBot`` keep their positions in a
+table and map the reason codes to their own labels.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+HOLD = 0
+TAKE_PROFIT = 1
+STOP_LOSS = 2
+TRAILING_STOP = 3
+MAX_HOLD = 4
+
+REASON_NAMES = ('', 'take_profit', 'stop_loss', 'trailing_stop', 'max_hold_time')
+
+_LONG = 1
+_SHORT = -1
+
+
+@dataclass(frozen=True)
+class ExitRules:
+    """
+    Rule parameters applied to every position in a table.
+
+    ``trailing_stop_pct`` exits once price gives back that fraction from the
+    high-water mark while still in profit. ``trail_activation`` /
+    ``trail_distance`` instead ratchet the stop towards price once the
+    position is up more than ``trail_activation``.
+    """
+    max_hold_seconds: float = 1800.0
+    trailing_stop_pct: Optional[float] = None
+    trail_activation: Optional[float] = None
+    trail_distance: Optional[float] = None
+
+
+@dataclass
+class ExitDecisions:
+    """Per-row results of one ``evaluate`` call, aligned with ``symbols``."""
+    symbols: List[str]
+    sides: np.ndarray
+    reasons: np.ndarray
+    prices: np.ndarray
+    pnl_pct: np.ndarray
+    stops: np.ndarray
+    stop_raised: np.ndarray
+
+    def exits(self) -> List[Tuple[str, int, float, float]]:
+        """``(symbol, reason, price, pnl_pct)`` for every position that should close."""
+        return [
+            (self.symbols[i], int(self.reasons[i]), float(self.prices[i]), float(self.pnl_pct[i]))
+            for i in np.flatnonzero(self.reasons)
+        ]
+
+
+def _timestamp(value: Union[datetime, float, None]) -> float:
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class ExitRuleTable:
+    """Struct-of-arrays table of open positions keyed by symbol."""
+
+    def __init__(self, capacity: int = 64):
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._size = 0
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        def grow(name: str, dtype) -> np.ndarray:
+            column = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                column[: self._size] = old[: self._size]
+            return column
+
+        self._side = grow('_side', np.int8)
+        self._entry = grow('_entry', np.float64)
+        self._stop = grow('_stop', np.float64)
+        self._target = grow('_target', np.float64)
+        self._high = grow('_high', np.float64)
+        self._entry_time = grow('_entry_time', np.float64)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def upsert(
+        self,
+        symbol: str,
+        side: str,
+        entry_price: float,
+        target_price: float,
+        stop_price: float,
+        entry_time: Union[datetime, float, None] = None,
+        high_water: Optional[float] = None,
+    ) -> None:
+        """Add a position or overwrite its row."""
+        row = self._index.get(symbol)
+        if row is None:
+            if self._size == self._capacity:
+                self._allocate(self._capacity * 2)
+            row = self._size
+            self._size += 1
+            self._index[symbol] = row
+            self._symbols.append(symbol)
+        self._side[row] = _LONG if side == 'buy' else _SHORT
+        self._entry[row] = entry_price
+        self._target[row] = target_price
+        self._stop[row] = stop_price
+        self._entry_time[row] = _timestamp(entry_time)
+        self._high[row] = entry_price if high_water is None else high_water
+
+    def set_high_water(self, symbol: str, price: float) -> None:
+        self._high[self._index[symbol]] = price
+
+    def remove(self, symbol: str) -> bool:
+        """Drop a position, moving the last row into its slot."""
+        row = self._index.pop(symbol, None)
+        if row is None:
+            return False
+        last = self._size - 1
+        if row != last:
+            moved = self._symbols[last]
+            for column in (self._side, self._entry, self._stop, self._target, self._high, self._entry_time):
+                column[row] = column[last]
+            self._symbols[row] = moved
+            self._index[moved] = row
+        self._symbols.pop()
+        self._size = last
+        return True
+
+    def retain(self, symbols: Iterable[str]) -> List[str]:
+        """Remove every position not in ``symbols``; returns the removed symbols."""
+        stale = self._index.keys() - set(symbols)
+        for symbol in stale:
+            self.remove(symbol)
+        return list(stale)
+
+    def evaluate(
+        self,
+        prices: Mapping[str, Optional[float]],
+        rules: ExitRules,
+        now: Optional[float] = None,
+    ) -> ExitDecisions:
+        """
+        Check every position against ``prices`` in one pass.
+
+        Positions without a price this tick are held and left untouched.
+        High-water marks (lowest price for shorts) and ratcheted stops are
+        updated in place.
+        """
+        n = self._size
+        now = time.time() if now is None else now
+        price = np.fromiter(
+            (prices.get(symbol) or np.nan for symbol in self._symbols), dtype=np.float64, count=n
+        )
+        priced = ~np.isnan(price)
+        side = self._side[:n]
+        entry = self._entry[:n]
+        stop = self._stop[:n]
+        long = side == _LONG
+
+        high = self._high[:n]
+        np.copyto(high, np.where(long, np.fmax(high, price), np.fmin(high, price)), where=priced)
+
+        move = np.where(priced, (price - entry) * side, 0.0)
+        pnl_pct = np.divide(move, entry, out=np.zeros(n), where=entry != 0)
+
+        take_profit = priced & ((price - self._target[:n]) * side >= 0)
+        stop_loss = priced & ((price - stop) * side <= 0)
+        max_hold = priced & (now - self._entry_time[:n] >= rules.max_hold_seconds)
+
+        conditions = [take_profit, stop_loss]
+        choices = [TAKE_PROFIT, STOP_LOSS]
+        if rules.trailing_stop_pct is not None:
+            in_profit = move > 0
+            gave_back = np.where(
+                long, price <= high * (1 - rules.trailing_stop_pct), price >= high * (1 + rules.trailing_stop_pct)
+            )
+            conditions.append(priced & in_profit & ((high - entry) * side > 0) & gave_back)
+            choices.append(TRAILING_STOP)
+        conditions.append(max_hold)
+        choices.append(MAX_HOLD)
+        reasons = np.select(conditions, choices, HOLD).astype(np.int8)
+
+        stop_raised = np.zeros(n, dtype=bool)
+        if rules.trail_activation is not None and rules.trail_distance is not None:
+            trailed = price * (1 - side * rules.trail_distance)
+            stop_raised = priced & (pnl_pct > rules.trail_activation) & ((trailed - stop) * side > 0)
+            np.copyto(stop, trailed, where=stop_raised)
+
+        return ExitDecisions(
+            symbols=list(self._symbols),
+            sides=side.copy(),
+            reasons=reasons,
+            prices=price,
+            pnl_pct=pnl_pct,
+            stops=stop.copy(),
+            stop_raised=stop_raised,
+        )
+
+
+def benchmark_exit_rules(positions: int = 500, iterations: int = 200) -> Dict[str, float]:
+    """Average microseconds per tick to evaluate ``positions`` open positions."""
+    rng = np.random.default_rng(7)
+    table = ExitRuleTable()
+    now = time.time()
+    for i in range(positions):
+        entry = float(rng.uniform(1, 1000))
+        table.upsert(f'C{i}/USD', 'buy' if i % 4 else 'sell', entry, entry * 1.01, entry * 0.99, now - i)
+    rules = ExitRules(max_hold_seconds=3600, trailing_stop_pct=0.01)
+    ticks = [
+        {symbol: float(p) for symbol, p in zip(table.symbols, table._entry[:positions] * rng.uniform(0.995, 1.005, positions))}
+        for _ in range(8)
+    ]
+    for prices in ticks:
+        table.evaluate(prices, rules, now)
+    started = time.perf_counter()
+    for i in range(iterations):
+        table.evaluate(ticks[i % len(ticks)], rules, now)
+    elapsed = time.perf_counter() - started
+    avg_us = elapsed / iterations * 1e6
+    return {'positions': positions, 'iterations': iterations, 'avg_us': avg_us, 'per_position_us': avg_us / positions}
+
+
+__all__ = [
+    'HOLD',
+    'MAX_HOLD',
+    'REASON_NAMES',
+    'STOP_LOSS',
+    'TAKE_PROFIT',
+    'TRAILING_STOP',
+    'ExitDecisions',
+    'ExitRuleTable',
+    'ExitRules',
+    'benchmark_exit_rules',
+]
@@ -0,0 +1,162 @@
+"""
+Shared HTTP Transport
+One pooled, keep-alive requests session per process for every Alpaca client.
+
+``alpaca_trade_api.REST`` and the alpaca-py REST clients each create their own
+``requests.Session``, so every client (and every short-lived data client) pays
+its own TCP and TLS handshakes. ``use_shared_session`` points a client at the
+process-wide session instead; its adapter keeps connections to each Alpaca
+host alive and applies default timeouts to requests made without one.
+
+The session is recreated after a fork so child processes never share sockets
+with their parent.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportConfig:
+    """Pool sizing and default timeouts for the shared session."""
+    pool_connections: int = 4       # Hosts kept pooled (trading, data, paper, stream REST)
+    pool_maxsize: int = 16          # Connections kept per host (concurrent callers)
+    connect_timeout: float = 5.0    # Seconds to establish a connection
+    read_timeout: float = 30.0      # Seconds to wait for a response
+    max_retries: int = 0            # Clients and ResilientAlpacaClient retry themselves
+
+
+DEFAULT_TRANSPORT = TransportConfig()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests sent without one."""
+
+    def __init__(self, timeout: Any = None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_session(config: Optional[TransportConfig] = None) -> requests.Session:
+    """Create a keep-alive session with a pooled adapter for http and https."""
+    config = config or DEFAULT_TRANSPORT
+    adapter = TimeoutHTTPAdapter(
+        timeout=(config.connect_timeout, config.read_timeout),
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=config.max_retries,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_crypto_data_client: Any = None
+_lock = threading.Lock()
+
+
+def get_shared_session(config: Optional[TransportConfig] = None) -> requests.Session:
+    """
+    The process-wide session, created on first use.
+
+    ``config`` only applies when the session is created. Alpaca clients send
+    their credentials as per-request headers, so sharing the session shares
+    connections, not authentication.
+    """
+    global _session, _session_pid, _crypto_data_client
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = build_session(config)
+            _session_pid = os.getpid()
+            _crypto_data_client = None
+            logger.debug("Shared HTTP session created for pid %s", _session_pid)
+        return _session
+
+
+def close_shared_session() -> None:
+    """Close pooled connections; the next ``get_shared_session`` starts a new pool."""
+    global _session, _session_pid, _crypto_data_client
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = _session_pid = _crypto_data_client = None
+
+
+def use_shared_session(client: Any, config: Optional[TransportConfig] = None) -> Any:
+    """
+    Point an Alpaca REST client at the shared session and return the client.
+
+    Works for ``alpaca_trade_api.REST`` and alpaca-py ``RESTClient``
+    subclasses, which both issue requests through ``client._session``.
+    """
+    if not hasattr(client, '_session'):
+        raise TypeError(f"{type(client).__name__} has no _session to replace")
+    client._session = get_shared_session(config)
+    return client
+
+
+def get_crypto_data_client() -> Any:
+    """
+    A ``CryptoHistoricalDataClient`` on the shared session, created once per process.
+
+    Crypto bars need no credentials, so the scanner's volatility scans and
+    preseeding can all use this one client instead of building their own.
+    """
+    global _crypto_data_client
+    session = get_shared_session()
+    with _lock:
+        if _crypto_data_client is None:
+            from alpaca.data.historical.crypto import CryptoHistoricalDataClient
+            client = CryptoHistoricalDataClient()
+            client._session = session
+            _crypto_data_client = client
+        return _crypto_data_client
+
+
+def pool_status() -> dict:
+    """Open pooled connections per host on the shared session."""
+    with _lock:
+        session = _session if _session_pid == os.getpid() else None
+    if session is None:
+        return {}
+    status = {}
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            status[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                'connections_opened': pool.num_connections,
+                'requests': pool.num_requests,
+            }
+    return status
+
+
+__all__ = [
+    'DEFAULT_TRANSPORT',
+    'TimeoutHTTPAdapter',
+    'TransportConfig',
+    'build_session',
+    'close_shared_session',
+    'get_crypto_data_client',
+    'get_shared_session',
+    'pool_status',
+    'use_shared_session',
+]
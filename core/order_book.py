@@ -0,0 +1,559 @@
+"""
+Local Order Book
+In-memory order state fed by Alpaca trade updates, with a REST fallback.
+
+Fills used to be discovered by polling: ``get_order`` from the dashboard's
+order endpoint and the bot's 30-second position sync. ``LocalOrderBook``
+keeps every order the process submits (and any other order the trade-updates
+stream reports) keyed by order id and client order id, applies each stream
+event as it arrives and records fills, partial fills, state transitions and
+submit-to-fill latency. Listeners are called on every change, so the bot
+learns about fills without asking.
+
+Event sources are async iterables of trade updates, either
+``alpaca.trading.models.TradeUpdate`` objects or the equivalent dicts:
+
+- ``AlpacaTradeUpdatesSource`` wraps alpaca-py's ``TradingStream``
+- ``ReplaySource`` replays recorded updates (JSONL or a list) for tests
+
+While the stream is down, and for open orders that have gone quiet while it
+is up, ``run`` reconciles through ``get_order`` so no fill is missed.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.account_state import CLOSED_ORDER_STATUSES
+
+logger = logging.getLogger(__name__)
+
+try:
+    from alpaca.trading.stream import TradingStream  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    TradingStream = None  # type: ignore[assignment]
+
+try:
+    from prometheus_client import Counter, Histogram  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = Histogram = None  # type: ignore[assignment]
+
+
+ORDER_FILL_LATENCY = (
+    Histogram(
+        "order_fill_latency_seconds",
+        "Seconds from order submission to its final fill",
+        buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    )
+    if Histogram
+    else None
+)
+
+ORDER_EVENTS = (
+    Counter(
+        "order_book_events_total",
+        "Order updates applied to the local order book by source",
+        ["source"],
+    )
+    if Counter
+    else None
+)
+
+ZERO = Decimal("0")
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(getattr(value, "value", value))
+
+
+def _decimal(value: Any) -> Decimal:
+    if value is None or value == "":
+        return ZERO
+    return Decimal(str(value))
+
+
+def _iso(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+@dataclass
+class TrackedOrder:
+    """One order's current state and history as seen by this process."""
+    order_id: str
+    client_order_id: str = ""
+    symbol: str = ""
+    side: str = ""
+    qty: Decimal = ZERO
+    filled_qty: Decimal = ZERO
+    filled_avg_price: Optional[Decimal] = None
+    status: str = "new"
+    order_type: str = ""
+    time_in_force: str = ""
+    tag: str = ""                                   # Caller's label, e.g. "entry" / "exit"
+    submitted_at: Optional[float] = None            # Local epoch seconds
+    filled_at: Optional[float] = None               # Local epoch seconds of the final fill
+    updated_at: float = 0.0
+    broker_submitted_at: Optional[str] = None
+    broker_filled_at: Optional[str] = None
+    fills: List[Tuple[float, Decimal, Optional[Decimal]]] = field(default_factory=list)
+    transitions: List[Tuple[float, str]] = field(default_factory=list)
+    _latency_recorded: bool = field(default=False, repr=False, compare=False)
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in CLOSED_ORDER_STATUSES
+
+    @property
+    def partially_filled(self) -> bool:
+        return ZERO < self.filled_qty < self.qty
+
+    @property
+    def fill_latency(self) -> Optional[float]:
+        if self.filled_at is None or self.submitted_at is None:
+            return None
+        return max(0.0, self.filled_at - self.submitted_at)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = self.fill_latency
+        return {
+            "order_id": self.order_id,
+            "client_order_id": self.client_order_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "status": self.status,
+            "type": self.order_type,
+            "time_in_force": self.time_in_force,
+            "tag": self.tag,
+            "qty": str(self.qty),
+            "filled_qty": str(self.filled_qty),
+            "filled_avg_price": str(self.filled_avg_price) if self.filled_avg_price is not None else None,
+            "partially_filled": self.partially_filled,
+            "submitted_at": self.broker_submitted_at,
+            "filled_at": self.broker_filled_at,
+            "fill_latency_ms": round(latency * 1000.0, 1) if latency is not None else None,
+            "fills": [
+                {"at": at, "qty": str(qty), "price": str(price) if price is not None else None}
+                for at, qty, price in self.fills
+            ],
+            "transitions": [{"at": at, "status": status} for at, status in self.transitions],
+        }
+
+
+OrderListener = Callable[[TrackedOrder], None]
+
+
+class LocalOrderBook:
+    """
+    Orders keyed by order id and client order id, updated from trade events.
+
+    Updates are idempotent: fills are derived from the growth of
+    ``filled_qty``, so a replayed or REST-reconciled update that repeats a
+    stream event records nothing new, and a terminal status is never
+    overwritten by a late non-terminal one.
+    """
+
+    def __init__(
+        self,
+        max_closed: int = 500,
+        stale_after: float = 10.0,
+        reconcile_interval: float = 5.0,
+        reconnect_delay: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the order book.
+
+        Args:
+            max_closed: Closed orders kept for lookups before the oldest are dropped
+            stale_after: Seconds without an update before an open order is
+                reconciled over REST while the stream is connected
+            reconcile_interval: Seconds between REST reconciliation passes
+            reconnect_delay: Seconds to wait before reconnecting a failed stream
+            clock: Epoch-seconds clock for submission, fill and update times
+        """
+        self.max_closed = max_closed
+        self.stale_after = stale_after
+        self.reconcile_interval = reconcile_interval
+        self.reconnect_delay = reconnect_delay
+        self._clock = clock
+
+        self._orders: "OrderedDict[str, TrackedOrder]" = OrderedDict()
+        self._by_client_id: Dict[str, str] = {}
+        self._listeners: List[OrderListener] = []
+        self._lock = threading.RLock()
+
+        self.stream_connected = False
+        self.last_event_at: Optional[float] = None
+        self.counts = {"stream_events": 0, "rest_updates": 0, "fills": 0, "partial_fills": 0, "reconnects": 0}
+        self._fill_latencies: deque = deque(maxlen=1024)
+
+    # ------------------------------------------------------------------
+    # Listeners and lookups
+    # ------------------------------------------------------------------
+
+    def add_listener(self, listener: OrderListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: OrderListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get(self, order_id: str) -> Optional[TrackedOrder]:
+        """Order by order id or client order id."""
+        with self._lock:
+            order = self._orders.get(str(order_id))
+            if order is None and str(order_id) in self._by_client_id:
+                order = self._orders.get(self._by_client_id[str(order_id)])
+            return order
+
+    def lookup(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Dashboard form of ``get``."""
+        order = self.get(order_id)
+        return order.to_dict() if order is not None else None
+
+    def open_orders(self) -> List[TrackedOrder]:
+        with self._lock:
+            return [order for order in self._orders.values() if order.is_open]
+
+    def recent(self, limit: int = 50) -> List[TrackedOrder]:
+        """Most recently updated orders first."""
+        with self._lock:
+            orders = list(self._orders.values())
+        orders.sort(key=lambda order: order.updated_at, reverse=True)
+        return orders[:limit]
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def track_submitted(self, order: Any, submitted_at: Optional[float] = None, tag: str = "") -> TrackedOrder:
+        """Register an order from its submit response; ``submitted_at`` defaults to now."""
+        tracked = self._apply(order, event="", source="submit", price=None)
+        with self._lock:
+            if tracked.submitted_at is None or submitted_at is not None:
+                tracked.submitted_at = submitted_at if submitted_at is not None else self._clock()
+            if tag:
+                tracked.tag = tag
+            self._record_fill_latency(tracked)
+        return tracked
+
+    def apply_update(self, update: Any) -> TrackedOrder:
+        """Apply one trade update (``TradeUpdate`` or dict with ``event`` and ``order``)."""
+        self.last_event_at = self._clock()
+        return self._apply(
+            _field(update, "order"),
+            event=_text(_field(update, "event")).lower(),
+            source="stream",
+            price=_field(update, "price"),
+        )
+
+    def apply_order(self, order: Any) -> TrackedOrder:
+        """Apply an order fetched over REST."""
+        return self._apply(order, event="", source="rest", price=None)
+
+    def _apply(self, order: Any, event: str, source: str, price: Any) -> TrackedOrder:
+        order_id = _text(_field(order, "id"))
+        if not order_id:
+            raise ValueError("Order update without an order id")
+        now = self._clock()
+        status = _text(_field(order, "status")).lower() or event or "new"
+        filled_qty = _decimal(_field(order, "filled_qty"))
+
+        with self._lock:
+            tracked = self._orders.get(order_id)
+            if tracked is None:
+                tracked = TrackedOrder(
+                    order_id=order_id,
+                    client_order_id=_text(_field(order, "client_order_id")),
+                    symbol=_text(_field(order, "symbol")),
+                    side=_text(_field(order, "side")).lower(),
+                    qty=_decimal(_field(order, "qty")),
+                    status="",
+                    order_type=_text(_field(order, "order_type") or _field(order, "type")).lower(),
+                    time_in_force=_text(_field(order, "time_in_force")).lower(),
+                )
+                self._orders[order_id] = tracked
+                if tracked.client_order_id:
+                    self._by_client_id[tracked.client_order_id] = order_id
+            tracked.broker_submitted_at = tracked.broker_submitted_at or _iso(_field(order, "submitted_at"))
+            if not tracked.qty:
+                tracked.qty = _decimal(_field(order, "qty"))
+
+            changed = False
+            if filled_qty > tracked.filled_qty:
+                delta = filled_qty - tracked.filled_qty
+                avg = _field(order, "filled_avg_price")
+                fill_price = _decimal(price) if price not in (None, "") else (_decimal(avg) if avg else None)
+                tracked.fills.append((now, delta, fill_price))
+                tracked.filled_qty = filled_qty
+                if avg:
+                    tracked.filled_avg_price = _decimal(avg)
+                self.counts["fills"] += 1
+                if tracked.filled_qty < tracked.qty:
+                    self.counts["partial_fills"] += 1
+                changed = True
+
+            terminal = not tracked.is_open and tracked.status != ""
+            if status != tracked.status and not terminal:
+                tracked.status = status
+                tracked.transitions.append((now, status))
+                changed = True
+
+            if status == "filled" and tracked.filled_at is None:
+                tracked.filled_at = now
+                tracked.broker_filled_at = _iso(_field(order, "filled_at"))
+                self._record_fill_latency(tracked)
+
+            if changed or source == "submit":
+                tracked.updated_at = now
+            if source == "stream":
+                self.counts["stream_events"] += 1
+            elif source == "rest":
+                self.counts["rest_updates"] += 1
+            self._evict_closed()
+
+        if ORDER_EVENTS is not None and source != "submit":
+            ORDER_EVENTS.labels(source=source).inc()
+        if changed:
+            self._notify(tracked)
+        return tracked
+
+    def _record_fill_latency(self, tracked: TrackedOrder) -> None:
+        latency = tracked.fill_latency
+        if latency is None or tracked._latency_recorded:
+            return
+        tracked._latency_recorded = True
+        self._fill_latencies.append(latency)
+        if ORDER_FILL_LATENCY is not None:
+            ORDER_FILL_LATENCY.observe(latency)
+
+    def _evict_closed(self) -> None:
+        if len(self._orders) <= self.max_closed:
+            return
+        closed = [order_id for order_id, order in self._orders.items() if not order.is_open]
+        for order_id in closed[: max(0, len(closed) - self.max_closed)]:
+            order = self._orders.pop(order_id)
+            self._by_client_id.pop(order.client_order_id, None)
+
+    def _notify(self, tracked: TrackedOrder) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(tracked)
+            except Exception as e:
+                logger.warning(f"Order book listener failed for {tracked.order_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Stream consumption and REST fallback
+    # ------------------------------------------------------------------
+
+    def orders_to_reconcile(self) -> List[str]:
+        """Open orders that should be re-read over REST right now."""
+        cutoff = self._clock() - self.stale_after
+        with self._lock:
+            return [
+                order.order_id
+                for order in self._orders.values()
+                if order.is_open and (not self.stream_connected or order.updated_at <= cutoff)
+            ]
+
+    async def reconcile(self, client: Any) -> int:
+        """Re-read stale open orders with ``get_order``; return orders fetched."""
+        order_ids = self.orders_to_reconcile()
+        if not order_ids:
+            return 0
+
+        def fetch():
+            fetched = []
+            for order_id in order_ids:
+                try:
+                    fetched.append(client.get_order(order_id))
+                except Exception as e:
+                    logger.debug(f"Could not reconcile order {order_id}: {e}")
+            return fetched
+
+        # Fetch off the loop, apply on it so listeners run on the loop thread
+        orders = await asyncio.to_thread(fetch)
+        for order in orders:
+            self.apply_order(order)
+        return len(orders)
+
+    async def _reconcile_loop(self, client: Any) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile(client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Order reconciliation failed: {e}")
+
+    async def run(self, source: Any = None, client: Any = None) -> None:
+        """
+        Apply updates from ``source`` until it is exhausted or the task is cancelled.
+
+        A source that raises is reconnected after ``reconnect_delay``; with a
+        ``client`` open orders are reconciled over REST meanwhile. With no
+        source the book is kept current by REST reconciliation alone.
+        """
+        reconciler = asyncio.get_running_loop().create_task(self._reconcile_loop(client)) if client else None
+        try:
+            if source is None:
+                if reconciler is not None:
+                    await reconciler
+                return
+            while True:
+                try:
+                    async for update in source:
+                        if not self.stream_connected:
+                            self.stream_connected = True
+                            logger.info("Trade updates stream connected")
+                        try:
+                            self.apply_update(update)
+                        except Exception as e:
+                            logger.warning(f"Ignoring malformed trade update: {e}")
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.counts["reconnects"] += 1
+                    logger.warning(f"Trade updates stream failed, falling back to REST: {e}")
+                finally:
+                    self.stream_connected = False
+                await asyncio.sleep(self.reconnect_delay)
+        finally:
+            if reconciler is not None:
+                reconciler.cancel()
+
+    def get_status(self, recent: int = 0) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._fill_latencies)
+            status = {
+                "orders": len(self._orders),
+                "open_orders": sum(1 for order in self._orders.values() if order.is_open),
+                "stream_connected": self.stream_connected,
+                "last_event_at": self.last_event_at,
+                **self.counts,
+            }
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            status[f"fill_{name}_ms"] = (
+                latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0 if latencies else None
+            )
+        if recent:
+            status["recent"] = [order.to_dict() for order in self.recent(recent)]
+        return status
+
+
+# ----------------------------------------------------------------------
+# Event sources
+# ----------------------------------------------------------------------
+
+class ReplaySource:
+    """
+    Replays recorded trade updates as an event source.
+
+    ``delay`` seconds are awaited before each update, so tests can interleave
+    submissions and fills; ``fail_after`` raises ``ConnectionError`` after
+    that many updates to exercise reconnects.
+    """
+
+    def __init__(self, updates: Iterable[Any], delay: float = 0.0, fail_after: Optional[int] = None):
+        self.updates = list(updates)
+        self.delay = delay
+        self.fail_after = fail_after
+
+    @classmethod
+    def from_jsonl(cls, path: str, **kwargs: Any) -> "ReplaySource":
+        with open(path) as handle:
+            return cls((json.loads(line) for line in handle if line.strip()), **kwargs)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for index, update in enumerate(self.updates):
+            if self.fail_after is not None and index >= self.fail_after:
+                self.fail_after = None
+                self.updates = self.updates[index:]
+                raise ConnectionError("replay source disconnected")
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield update
+
+
+class AlpacaTradeUpdatesSource:
+    """
+    alpaca-py ``TradingStream`` trade updates as an async iterator.
+
+    The stream runs its own event loop in a daemon thread; updates are handed
+    to the consuming loop through a queue. Iteration raises ``ConnectionError``
+    if the stream thread exits.
+    """
+
+    def __init__(self, api_key: str, secret_key: str, paper: bool = True):
+        if TradingStream is None:
+            raise ImportError("alpaca-py is required for the trade updates stream")
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.paper = paper
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stream = TradingStream(self.api_key, self.secret_key, paper=self.paper)
+
+        async def on_update(update):
+            loop.call_soon_threadsafe(queue.put_nowait, update)
+
+        stream.subscribe_trade_updates(on_update)
+        thread = threading.Thread(target=stream.run, name="trade-updates-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    if not thread.is_alive():
+                        raise ConnectionError("trade updates stream stopped")
+        finally:
+            try:
+                stream.stop()
+            except Exception as e:  # pragma: no cover - defensive
+                logger.debug(f"Trade updates stream stop failed: {e}")
+
+
+def create_trade_updates_source(creds: Any) -> Optional[AlpacaTradeUpdatesSource]:
+    """Trade updates source for ``load_alpaca_credentials`` output, or None without alpaca-py."""
+    if TradingStream is None:
+        logger.info("alpaca-py not installed; order book will reconcile over REST only")
+        return None
+    return AlpacaTradeUpdatesSource(creds.key_id, creds.secret_key, paper="paper" in str(creds.base_url))
+
+
+__all__ = [
+    "AlpacaTradeUpdatesSource",
+    "LocalOrderBook",
+    "ReplaySource",
+    "TrackedOrder",
+    "create_trade_updates_source",
+]
@@ -0,0 +1,579 @@
+"""
+Order Execution Pipeline
+Pre-validated order templates and concurrent entry submission.
+
+Entries used to be handled one signal at a time: fetch a snapshot for the
+spread check, fetch the account for buying power, size the order, submit it,
+then move on to the next signal. The pipeline splits that into stages:
+
+- ``refresh`` reads buying power from the shared ``account_state``
+  refresher and one batched snapshot for the watched symbols on a cadence,
+  and stores per-symbol ``OrderConstraints``
+- ``prepare`` validates signals and builds ``OrderTemplate``s from those
+  constraints with no API calls, reserving buying power as it goes so a
+  batch never commits more cash than the account had
+- ``submit`` sends the templates concurrently, bounded by ``max_in_flight``,
+  and records signal-to-ack latency for each acknowledged order
+
+A reservation is held until the order book reports its order closed: an
+order closed without a fill gives its cash back at once, a filled one once
+the account has been re-read and shows the cash as spent.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.account_state import get_account_state
+from core.resilience import RateLimitError, RequestPriority, api_priority
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import Counter, Histogram  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = Histogram = None  # type: ignore[assignment]
+
+
+ENTRY_ACK_LATENCY = (
+    Histogram(
+        "crypto_entry_signal_to_ack_seconds",
+        "Seconds from signal generation to the broker acknowledging the entry order",
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+    if Histogram
+    else None
+)
+
+ENTRY_ORDERS = (
+    Counter(
+        "crypto_entry_orders_total",
+        "Entry signals handled by the execution pipeline by outcome",
+        ["outcome"],
+    )
+    if Counter
+    else None
+)
+
+PENDING = "pending"
+ACKED = "acked"
+FAILED = "failed"
+REJECTED = "rejected"
+
+DEFAULT_TICK_SIZE = Decimal("0.000001")
+CENT = Decimal("0.01")
+
+
+def order_symbol(symbol: str) -> str:
+    """Trading API form of a crypto symbol (``BTC/USD`` -> ``BTCUSD``)."""
+    return symbol.replace("/", "").upper()
+
+
+def data_symbol(symbol: str) -> str:
+    """Market data API form of a crypto symbol (``BTCUSD`` -> ``BTC/USD``)."""
+    symbol = symbol.upper()
+    if "/" in symbol:
+        return symbol
+    for quote in ("USDT", "USDC", "USD"):
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return f"{symbol[:-len(quote)]}/{quote}"
+    return symbol
+
+
+@dataclass
+class ExecutionLimits:
+    """Risk limits and cadence for the execution pipeline."""
+    max_in_flight: int = 4                     # Entry orders submitted at once
+    max_spread: float = 0.01                   # Skip entries wider than this (fraction of bid)
+    min_notional: Decimal = Decimal("1.00")    # Smallest order Alpaca accepts for crypto
+    cash_safety_buffer: Decimal = Decimal("0.995")
+    refresh_interval: float = 10.0             # Seconds between constraint refreshes
+    max_constraint_age: float = 30.0           # Older constraints are refreshed before use
+
+
+@dataclass(frozen=True)
+class OrderConstraints:
+    """What an entry order for one symbol must satisfy, as of ``refreshed_at``."""
+    symbol: str
+    tick_size: Decimal
+    min_notional: Decimal
+    bid: float = 0.0
+    ask: float = 0.0
+    refreshed_at: float = 0.0
+
+    @property
+    def spread_pct(self) -> Optional[float]:
+        if self.bid > 0 and self.ask > 0:
+            return (self.ask - self.bid) / self.bid
+        return None
+
+
+@dataclass(frozen=True)
+class EntryRequest:
+    """One entry signal: what to buy, how much notional it wants, and when it fired."""
+    symbol: str
+    side: str
+    price: float
+    notional: float
+    signal_time: float          # Epoch seconds the signal was generated
+    context: Any = None         # Caller's signal object, handed back in the result
+
+
+@dataclass(frozen=True)
+class OrderTemplate:
+    """A validated market order ready to submit."""
+    symbol: str
+    side: str
+    qty: Decimal
+    price: Decimal
+    notional: Decimal
+
+    @property
+    def order_symbol(self) -> str:
+        return order_symbol(self.symbol)
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of one entry request."""
+    request: EntryRequest
+    status: str
+    template: Optional[OrderTemplate] = None
+    order: Any = None
+    reason: str = ""
+    error: Optional[BaseException] = None
+    latency: Optional[float] = None  # Signal-to-ack seconds for acked orders
+
+    @property
+    def acked(self) -> bool:
+        return self.status == ACKED
+
+
+class ExecutionStats:
+    """
+    Outcome counts and signal-to-ack latency percentiles for entry orders.
+
+    Latencies are kept for the most recent ``window`` acknowledged orders.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.counts = {ACKED: 0, FAILED: 0, REJECTED: 0}
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._outcome_metrics = (
+            {outcome: ENTRY_ORDERS.labels(outcome=outcome) for outcome in self.counts}
+            if ENTRY_ORDERS
+            else None
+        )
+
+    def record(self, status: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            self.counts[status] += 1
+            if latency is not None:
+                self._latencies.append(latency)
+        if self._outcome_metrics is not None:
+            self._outcome_metrics[status].inc()
+        if latency is not None and ENTRY_ACK_LATENCY is not None:
+            ENTRY_ACK_LATENCY.observe(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = dict(self.counts)
+        for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            snapshot[f'ack_{name}_ms'] = (
+                latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0 if latencies else None
+            )
+        return snapshot
+
+
+SubmitFn = Callable[[OrderTemplate], Awaitable[Any]]
+
+
+class OrderExecutionPipeline:
+    """
+    Cached order constraints plus concurrent entry submission.
+
+    ``client`` needs ``get_crypto_snapshots`` (falling back to
+    ``get_crypto_snapshot`` per symbol) for refreshes, and ``submit_order``
+    unless a ``submit`` coroutine function is given. Buying power comes from
+    ``account_state`` (default: the registered ``account_state`` service),
+    or from ``client.get_account`` when no refresher is running.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        limits: Optional[ExecutionLimits] = None,
+        tick_size: Optional[Callable[[str], Decimal]] = None,
+        submit: Optional[SubmitFn] = None,
+        clock: Callable[[], float] = time.time,
+        account_state: Any = None,
+        order_book: Any = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            client: Alpaca REST client (legacy SDK surface) or a wrapper of one
+            limits: Risk limits and refresh cadence
+            tick_size: Quantity increment for a symbol (default 1e-6 for all)
+            submit: Coroutine function sending one template to the broker
+            clock: Wall clock in epoch seconds, comparable to signal times
+            account_state: Shared ``AccountStateRefresher`` (None = look it up on refresh)
+            order_book: ``LocalOrderBook`` whose updates release reservations
+        """
+        self.client = client
+        self.account_state = account_state
+        self.order_book = order_book
+        self.limits = limits or ExecutionLimits()
+        self._tick_size = tick_size or (lambda symbol: DEFAULT_TICK_SIZE)
+        self._submit = submit or self._submit_market_order
+        self._clock = clock
+        self.stats = ExecutionStats()
+
+        self._constraints: Dict[str, OrderConstraints] = {}
+        self._buying_power = Decimal("0")
+        self._committed = Decimal("0")
+        # Acked orders still open, and filled ones the account may not show yet
+        self._reservations: Dict[str, Decimal] = {}
+        self._settling: Dict[str, Tuple[Decimal, Optional[int]]] = {}
+        self._account_refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        if order_book is not None:
+            order_book.add_listener(self.on_order_update)
+
+    # ------------------------------------------------------------------
+    # Constraint refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, symbols: Iterable[str]) -> int:
+        """
+        Re-read buying power and quotes for ``symbols``; return symbols refreshed.
+
+        A failed snapshot read keeps the previous quotes; a failed account
+        read keeps the previous buying power. Reservations of open orders
+        are kept; those of filled orders are dropped once the account has
+        been refreshed since the fill.
+        """
+        keys = {order_symbol(symbol) for symbol in symbols}
+        now = self._clock()
+
+        try:
+            source = self._account_source()
+            version = getattr(source, "refresh_count", None)
+            account = source.get_account()
+            cash = getattr(account, "cash", None)
+            if cash is None:
+                cash = getattr(account, "buying_power", 0)
+            buying_power = (Decimal(str(cash)) * self.limits.cash_safety_buffer).quantize(CENT, rounding=ROUND_DOWN)
+        except Exception as exc:
+            logger.warning(f"Could not refresh buying power for order constraints: {exc}")
+        else:
+            with self._lock:
+                self._buying_power = buying_power
+                for order_id, (notional, seen) in list(self._settling.items()):
+                    if version is None or seen is None or version > seen:
+                        del self._settling[order_id]
+                        self._committed -= notional
+                self._account_refreshed_at = now
+
+        quotes = self._fetch_quotes(keys) if keys else {}
+        updated = {}
+        for key in keys:
+            bid, ask = quotes.get(key, (0.0, 0.0))
+            previous = self._constraints.get(key)
+            if key not in quotes and previous is not None:
+                bid, ask = previous.bid, previous.ask
+            tick = self._tick_size(key)
+            updated[key] = OrderConstraints(
+                symbol=key,
+                tick_size=tick if tick > 0 else DEFAULT_TICK_SIZE,
+                min_notional=self.limits.min_notional,
+                bid=bid,
+                ask=ask,
+                refreshed_at=now,
+            )
+        with self._lock:
+            self._constraints.update(updated)
+        return len(updated)
+
+    def _account_source(self) -> Any:
+        return self.account_state or get_account_state() or self.client
+
+    def _fetch_quotes(self, keys: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        symbols = [data_symbol(key) for key in keys]
+        try:
+            with api_priority(RequestPriority.MARKET_DATA):
+                if hasattr(self.client, "get_crypto_snapshots"):
+                    snapshots = dict(self.client.get_crypto_snapshots(symbols))
+                else:
+                    snapshots = {symbol: self.client.get_crypto_snapshot(order_symbol(symbol)) for symbol in symbols}
+        except RateLimitError as exc:
+            logger.debug(f"Quote refresh shed, keeping cached quotes: {exc}")
+            return {}
+        except Exception as exc:
+            logger.warning(f"Could not refresh quotes for order constraints: {exc}")
+            return {}
+
+        quotes = {}
+        for symbol, snapshot in snapshots.items():
+            quote = getattr(snapshot, "latest_quote", None)
+            if quote is None:
+                continue
+            try:
+                quotes[order_symbol(symbol)] = (float(quote.bid_price), float(quote.ask_price))
+            except (AttributeError, TypeError, ValueError):
+                continue
+        return quotes
+
+    def is_fresh(self, symbols: Iterable[str]) -> bool:
+        """Whether buying power and every symbol's constraints are within ``max_constraint_age``."""
+        oldest = self._clock() - self.limits.max_constraint_age
+        if self._account_refreshed_at is None or self._account_refreshed_at < oldest:
+            return False
+        for symbol in symbols:
+            constraints = self._constraints.get(order_symbol(symbol))
+            if constraints is None or constraints.refreshed_at < oldest:
+                return False
+        return True
+
+    async def ensure_fresh(self, symbols: Sequence[str]) -> None:
+        """Refresh in a worker thread unless the cached constraints are still fresh."""
+        if not self.is_fresh(symbols):
+            watched = set(self._constraints) | {order_symbol(symbol) for symbol in symbols}
+            await asyncio.to_thread(self.refresh, watched)
+
+    async def run_refresh_loop(self, symbols: Callable[[], Iterable[str]]) -> None:
+        """Refresh constraints for ``symbols()`` every ``refresh_interval`` seconds until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh, list(symbols()))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Order constraint refresh failed: {exc}")
+            await asyncio.sleep(self.limits.refresh_interval)
+
+    def start(self, symbols: Callable[[], Iterable[str]]) -> asyncio.Task:
+        """Start the refresh loop on the running event loop."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self.run_refresh_loop(symbols))
+        return self._refresh_task
+
+    def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def constraints(self, symbol: str) -> Optional[OrderConstraints]:
+        return self._constraints.get(order_symbol(symbol))
+
+    @property
+    def available_buying_power(self) -> Decimal:
+        with self._lock:
+            return max(Decimal("0"), self._buying_power - self._committed)
+
+    # ------------------------------------------------------------------
+    # Validation and templates
+    # ------------------------------------------------------------------
+
+    def build_order(self, request: EntryRequest, available: Decimal) -> OrderTemplate:
+        """
+        Validate ``request`` against cached constraints and size it within ``available``.
+
+        Raises:
+            ValueError: With the rejection reason when the request cannot be sent
+        """
+        if request.side.lower() != "buy":
+            raise ValueError("Only buy entries are supported (no short selling)")
+        if self._account_refreshed_at is None:
+            raise ValueError("Account state not loaded")
+        constraints = self._constraints.get(order_symbol(request.symbol))
+        if constraints is None:
+            raise ValueError("No order constraints cached for symbol")
+
+        spread = constraints.spread_pct
+        if spread is not None and spread > self.limits.max_spread:
+            raise ValueError(f"Spread too wide ({spread:.3%} > {self.limits.max_spread:.3%})")
+
+        price = Decimal(str(request.price))
+        if price <= 0:
+            raise ValueError("Signal price must be positive")
+
+        notional_cap = min(Decimal(str(request.notional)), available)
+        tick = constraints.tick_size
+        qty = (notional_cap / price / tick).to_integral_value(rounding=ROUND_DOWN) * tick
+        if qty < tick:
+            raise ValueError("Quantity below one tick after precision clamp")
+        notional = qty * price
+        if notional < constraints.min_notional:
+            raise ValueError(f"Notional ${notional:.2f} below minimum ${constraints.min_notional}")
+        return OrderTemplate(request.symbol, "buy", qty, price, notional)
+
+    def prepare(self, requests: Sequence[EntryRequest], free_slots: int) -> List[ExecutionResult]:
+        """
+        Validate ``requests`` in order and build templates for up to ``free_slots``.
+
+        Returns one result per request: ``pending`` with a template, or
+        ``rejected`` with the reason. Buying power is reserved per template,
+        so a batch fits in what the last refresh reported minus the orders
+        sent since.
+        """
+        results: List[ExecutionResult] = []
+        accepted = 0
+        with self._lock:
+            available = max(Decimal("0"), self._buying_power - self._committed)
+            for request in requests:
+                if accepted >= free_slots:
+                    results.append(ExecutionResult(request, REJECTED, reason="No free position slots"))
+                    continue
+                try:
+                    template = self.build_order(request, available)
+                except ValueError as exc:
+                    results.append(ExecutionResult(request, REJECTED, reason=str(exc)))
+                    continue
+                available -= template.notional
+                self._committed += template.notional
+                accepted += 1
+                results.append(ExecutionResult(request, PENDING, template))
+        for result in results:
+            if result.status == REJECTED:
+                self.stats.record(REJECTED)
+        return results
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    async def submit(self, results: Sequence[ExecutionResult]) -> List[ExecutionResult]:
+        """Send the pending templates in ``results`` concurrently and fill in their outcomes."""
+        semaphore = asyncio.Semaphore(self.limits.max_in_flight)
+
+        async def send(result: ExecutionResult) -> None:
+            template = result.template
+            async with semaphore:
+                try:
+                    order = await self._submit(template)
+                except Exception as exc:
+                    order = None
+                    result.error = exc
+                    result.reason = str(exc)
+            if not order:
+                self._release(template)
+                result.status = FAILED
+                result.reason = result.reason or "Order placement failed"
+                self.stats.record(FAILED)
+                return
+            result.order = order
+            result.latency = max(0.0, self._clock() - result.request.signal_time)
+            result.status = ACKED
+            self.stats.record(ACKED, result.latency)
+            self._hold(order, template)
+
+        await asyncio.gather(*(send(result) for result in results if result.status == PENDING))
+        return list(results)
+
+    async def submit_entries(self, requests: Sequence[EntryRequest], free_slots: int) -> List[ExecutionResult]:
+        """Prepare and submit ``requests``; one result per request, in order."""
+        return await self.submit(self.prepare(requests, free_slots))
+
+    def _release(self, template: OrderTemplate) -> None:
+        with self._lock:
+            self._committed = max(Decimal("0"), self._committed - template.notional)
+
+    def _hold(self, order: Any, template: OrderTemplate) -> None:
+        """Keep an acked order's reservation until the order book closes it."""
+        order_id = str(getattr(order, "id", "") or "")
+        with self._lock:
+            if not order_id:
+                # Untrackable: hold it until the next account read instead
+                self._settling[f"untracked-{id(order)}"] = (template.notional, None)
+                return
+            self._reservations[order_id] = template.notional
+        # Fast fills may have been reported before the ack reached us
+        tracked = self.order_book.get(order_id) if self.order_book is not None else None
+        if tracked is not None:
+            self.on_order_update(tracked)
+
+    def on_order_update(self, order: Any) -> None:
+        """Order book listener: settle the reservation of an order once it is closed."""
+        if order.is_open:
+            return
+        source = self._account_source()
+        with self._lock:
+            notional = self._reservations.pop(order.order_id, None)
+            if notional is None:
+                return
+            if order.filled_qty > 0:
+                self._settling[order.order_id] = (notional, getattr(source, "refresh_count", None))
+            else:
+                self._committed = max(Decimal("0"), self._committed - notional)
+                return
+        notify_fill = getattr(source, "notify_fill", None)
+        if notify_fill is not None:
+            notify_fill()
+
+    async def _submit_market_order(self, template: OrderTemplate) -> Any:
+        return await asyncio.to_thread(
+            self.client.submit_order,
+            symbol=template.order_symbol,
+            qty=float(template.qty),
+            side=template.side,
+            type="market",
+            time_in_force="ioc",
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            status = {
+                'buying_power': float(self._buying_power),
+                'committed': float(self._committed),
+                'open_reservations': len(self._reservations),
+                'settling_reservations': len(self._settling),
+                'account_refreshed_at': self._account_refreshed_at,
+                'symbols': len(self._constraints),
+            }
+        status['orders'] = self.stats.snapshot()
+        return status
+
+
+def benchmark_order_build(iterations: int = 20_000) -> Dict[str, float]:
+    """Average microseconds to validate and build one entry template from cached constraints."""
+    pipeline = OrderExecutionPipeline(client=None)
+    pipeline._account_refreshed_at = 0.0
+    pipeline._constraints['BTCUSD'] = OrderConstraints('BTCUSD', DEFAULT_TICK_SIZE, Decimal("1.00"), 64000.0, 64010.0)
+    request = EntryRequest('BTC/USD', 'buy', 64005.12, 75.0, 0.0)
+    available = Decimal("10000")
+    for _ in range(min(iterations, 1000)):
+        pipeline.build_order(request, available)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        pipeline.build_order(request, available)
+    elapsed = time.perf_counter() - started
+    return {'iterations': iterations, 'avg_us': elapsed / iterations * 1e6}
+
+
+__all__ = [
+    'ACKED',
+    'FAILED',
+    'PENDING',
+    'REJECTED',
+    'EntryRequest',
+    'ExecutionLimits',
+    'ExecutionResult',
+    'ExecutionStats',
+    'OrderConstraints',
+    'OrderExecutionPipeline',
+    'OrderTemplate',
+    'benchmark_order_build',
+    'data_symbol',
+    'order_symbol',
+]
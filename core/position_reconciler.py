@@ -1,16 +1,25 @@
 """
 Position Reconciliation Service
 Syncs local position state with Alpaca API to prevent drift.
+
+Positions only change when orders fill, so the reconciler does not diff the
+full position sets every interval. Order updates and recorded trades mark
+their symbols dirty; each pass re-verifies only the dirty symbols (one
+``get_position`` for a single symbol, one ``list_positions`` otherwise) and a
+full sweep catches anything the events missed at a much lower cadence.
 """
 
 import logging
 import threading
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
+from typing import Callable, Deque, Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
+from utils.records import record
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +33,7 @@ class ReconciliationStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@record
 class PositionDrift:
     """Represents a drift between local and remote position state."""
     symbol: str
@@ -49,6 +58,20 @@ class ReconciliationResult:
     errors: List[str] = field(default_factory=list)
     drifts: List[PositionDrift] = field(default_factory=list)
     duration_ms: float = 0
+    mode: str = "full"  # "full" sweep or "incremental" (dirty symbols only)
+    api_calls: int = 0
+
+
+def _position_key(symbol: str) -> str:
+    """Compare ``BTC/USD`` (orders) and ``BTCUSD`` (positions) as the same symbol."""
+    return str(symbol).replace("/", "").upper()
+
+
+def _is_not_found(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == 404 or getattr(error, "code", None) in (404, 40410000):
+        return True
+    message = str(error).lower()
+    return "404" in message or "not found" in message or "does not exist" in message
 
 
 class PositionReconciler:
@@ -56,7 +79,8 @@ class PositionReconciler:
     Reconciles local position state with Alpaca API.
 
     Features:
-    - Periodic automatic reconciliation
+    - Event-driven re-verification of symbols touched by fills
+    - Full sweeps at a low cadence as a safety net
     - Drift detection and reporting
     - Automatic resolution for simple cases
     - Manual resolution workflow for complex cases
@@ -68,6 +92,9 @@ class PositionReconciler:
         local_position_manager: Any,
         reconcile_interval: int = 60,
         auto_resolve: bool = True,
+        full_sweep_interval: int = 900,
+        debounce: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """
         Initialize the reconciler.
@@ -75,26 +102,47 @@ class PositionReconciler:
         Args:
             alpaca_client: Alpaca API client
             local_position_manager: Local position tracking service
-            reconcile_interval: Seconds between automatic reconciliations
+            reconcile_interval: Seconds between scheduled passes (dirty symbols
+                also wake the loop early)
             auto_resolve: Automatically resolve simple drifts
+            full_sweep_interval: Seconds between full sweeps of every position
+            debounce: Seconds to let a burst of fills settle before verifying
+            clock: Monotonic clock for sweep scheduling and latency
         """
         self.alpaca_client = alpaca_client
         self.local_manager = local_position_manager
         self.reconcile_interval = reconcile_interval
         self.auto_resolve = auto_resolve
+        self.full_sweep_interval = full_sweep_interval
+        self.debounce = debounce
+        self._clock = clock
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        # Symbol key -> clock time it was first marked dirty since last verified
+        self._dirty: Dict[str, float] = {}
+        self._last_full_sweep: Optional[float] = None
 
         # History
-        self._reconciliation_history: List[ReconciliationResult] = []
-        self._pending_drifts: Dict[str, PositionDrift] = {}
         self._max_history = 100
+        self._reconciliation_history: Deque[ReconciliationResult] = deque(maxlen=self._max_history)
+        self._pending_drifts: Dict[str, PositionDrift] = {}
+
+        # Calls made vs. what a full diff every interval would have made
+        self.api_calls = 0
+        self.baseline_api_calls = 0
+        self.full_sweeps = 0
+        self.incremental_runs = 0
+        self.idle_passes = 0
+        self._latencies: Deque[float] = deque(maxlen=256)
 
         logger.info(
             f"PositionReconciler initialized (interval={reconcile_interval}s, "
-            f"auto_resolve={auto_resolve})"
+            f"full_sweep={full_sweep_interval}s, auto_resolve={auto_resolve})"
         )
 
     def start(self) -> None:
@@ -105,35 +153,117 @@ class PositionReconciler:
                 return
 
             self._running = True
+            self._stop.clear()
             self._thread = threading.Thread(
                 target=self._reconciliation_loop,
                 name="PositionReconciler",
                 daemon=True,
             )
             self._thread.start()
+            self._register_trade_callback()
             logger.info("Position reconciliation started")
 
     def stop(self) -> None:
         """Stop automatic reconciliation."""
         with self._lock:
             self._running = False
-            if self._thread and self._thread.is_alive():
-                self._thread.join(timeout=5)
-            logger.info("Position reconciliation stopped")
+            self._stop.set()
+            self._wake.set()
+            self._unregister_trade_callback()
+            thread = self._thread
+        # Join outside the lock: the loop takes it to drain dirty symbols
+        if thread and thread.is_alive():
+            thread.join(timeout=5)
+        logger.info("Position reconciliation stopped")
 
     def _reconciliation_loop(self) -> None:
-        """Background loop for automatic reconciliation."""
+        """Background loop: scheduled passes plus early wake-ups for dirty symbols."""
+        next_tick = self._clock()
         while self._running:
+            now = self._clock()
+            scheduled = now >= next_tick
+            if scheduled:
+                next_tick = now + self.reconcile_interval
             try:
-                self.reconcile()
+                self.run_once(scheduled=scheduled)
             except Exception as e:
                 logger.error(f"Reconciliation error: {e}")
 
-            # Sleep in small increments to allow faster shutdown
-            for _ in range(self.reconcile_interval):
-                if not self._running:
-                    break
-                time.sleep(1)
+            woke = self._wake.wait(max(0.0, next_tick - self._clock()))
+            self._wake.clear()
+            if woke and self.debounce:
+                # Let a burst of fills settle; stop() interrupts the wait
+                self._stop.wait(self.debounce)
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+    def mark_dirty(self, symbol: str) -> None:
+        """Queue ``symbol`` for re-verification and wake the loop."""
+        if not symbol:
+            return
+        with self._lock:
+            self._dirty.setdefault(_position_key(symbol), self._clock())
+        self._wake.set()
+
+    def on_order_update(self, order: Any) -> None:
+        """``LocalOrderBook`` listener: fills and closed orders dirty their symbol."""
+        if getattr(order, "filled_qty", 0) or not getattr(order, "is_open", True):
+            self.mark_dirty(getattr(order, "symbol", ""))
+
+    def on_trade_recorded(self, trade: Dict[str, Any]) -> None:
+        """``utils.trade_store`` callback: a recorded trade dirties its symbol."""
+        self.mark_dirty(trade.get("symbol", ""))
+
+    def watch_order_book(self, order_book: Any) -> None:
+        """Mark symbols dirty from an order book's updates."""
+        order_book.add_listener(self.on_order_update)
+
+    def _register_trade_callback(self) -> None:
+        try:
+            from utils.trade_store import register_trade_callback
+            register_trade_callback(self.on_trade_recorded)
+        except Exception as e:  # pragma: no cover - defensive
+            logger.debug(f"Trade callback registration skipped: {e}")
+
+    def _unregister_trade_callback(self) -> None:
+        try:
+            from utils.trade_store import unregister_trade_callback
+            unregister_trade_callback(self.on_trade_recorded)
+        except Exception as e:  # pragma: no cover - defensive
+            logger.debug(f"Trade callback removal skipped: {e}")
+
+    def _take_dirty(self) -> Dict[str, float]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return dirty
+
+    def _requeue_dirty(self, dirty: Dict[str, float]) -> None:
+        with self._lock:
+            for key, marked_at in dirty.items():
+                self._dirty[key] = min(marked_at, self._dirty.get(key, marked_at))
+
+    def _record_verified(self, dirty: Dict[str, float]) -> None:
+        now = self._clock()
+        self._latencies.extend(now - marked_at for marked_at in dirty.values())
+
+    def run_once(self, scheduled: bool = True) -> Optional[ReconciliationResult]:
+        """
+        One reconciliation pass: a full sweep when due, else the dirty symbols.
+
+        Scheduled passes with nothing dirty make no API calls.
+        """
+        if scheduled:
+            self.baseline_api_calls += 1
+        now = self._clock()
+        if self._last_full_sweep is None or now - self._last_full_sweep >= self.full_sweep_interval:
+            return self.reconcile()
+        dirty = self._take_dirty()
+        if dirty:
+            return self.reconcile_symbols(dirty)
+        if scheduled:
+            self.idle_passes += 1
+        return None
 
     def reconcile(self) -> ReconciliationResult:
         """
@@ -150,10 +280,13 @@ class PositionReconciler:
             drifts_detected=0,
             drifts_resolved=0,
         )
+        # A full sweep verifies every dirty symbol too
+        dirty = self._take_dirty()
 
         try:
             # Get positions from both sources
             remote_positions = self._get_remote_positions()
+            result.api_calls += 1
             local_positions = self._get_local_positions()
 
             remote_symbols = set(remote_positions.keys())
@@ -170,26 +303,93 @@ class PositionReconciler:
                 )
 
                 if drift:
-                    result.drifts.append(drift)
-                    result.drifts_detected += 1
-                    self._pending_drifts[symbol] = drift
-
-                    if self.auto_resolve:
-                        resolved = self._try_resolve(drift)
-                        if resolved:
-                            result.drifts_resolved += 1
+                    self._handle_drift(drift, remote_positions.get(symbol), result)
 
         except Exception as e:
             logger.error(f"Reconciliation failed: {e}")
             result.success = False
             result.errors.append(str(e))
+            self._requeue_dirty(dirty)
+        else:
+            self._record_verified(dirty)
+            self._last_full_sweep = self._clock()
+
+        self.full_sweeps += 1
+        return self._finish(result, start_time)
+
+    def reconcile_symbols(self, dirty: Dict[str, float]) -> ReconciliationResult:
+        """
+        Re-verify only ``dirty`` symbols (keys from ``mark_dirty`` with mark times).
+
+        A single symbol is fetched with ``get_position``; several share one
+        ``list_positions`` call.
+        """
+        start_time = time.monotonic()
+        result = ReconciliationResult(
+            timestamp=datetime.now(),
+            success=True,
+            positions_checked=len(dirty),
+            drifts_detected=0,
+            drifts_resolved=0,
+            mode="incremental",
+        )
+
+        try:
+            local_positions = self._get_local_positions()
+            local_symbols = {_position_key(symbol): symbol for symbol in local_positions}
+
+            if len(dirty) == 1:
+                key = next(iter(dirty))
+                remote = self._get_remote_position(key)
+                result.api_calls += 1
+                remote_positions = {key: remote} if remote is not None else {}
+            else:
+                remote_positions = {
+                    _position_key(symbol): position
+                    for symbol, position in self._get_remote_positions().items()
+                }
+                result.api_calls += 1
 
+            for key in dirty:
+                symbol = local_symbols.get(key, key)
+                remote = remote_positions.get(key)
+                drift = self._check_position(symbol, local_positions.get(symbol), remote)
+                if drift:
+                    self._handle_drift(drift, remote, result)
+                else:
+                    self._pending_drifts.pop(symbol, None)
+
+        except Exception as e:
+            logger.error(f"Incremental reconciliation failed: {e}")
+            result.success = False
+            result.errors.append(str(e))
+            self._requeue_dirty(dirty)
+        else:
+            self._record_verified(dirty)
+
+        self.incremental_runs += 1
+        return self._finish(result, start_time)
+
+    def _handle_drift(self, drift: PositionDrift, remote: Optional[Dict[str, Any]],
+                      result: ReconciliationResult) -> None:
+        result.drifts.append(drift)
+        result.drifts_detected += 1
+        self._pending_drifts[drift.symbol] = drift
+
+        if self.auto_resolve:
+            if drift.status in (ReconciliationStatus.MISSING_LOCAL, ReconciliationStatus.QUANTITY_MISMATCH):
+                # Resolving used to re-fetch every position; the fetched one is reused
+                self.baseline_api_calls += 1
+            resolved = self._try_resolve(drift, remote)
+            if resolved:
+                result.drifts_resolved += 1
+
+    def _finish(self, result: ReconciliationResult, start_time: float) -> ReconciliationResult:
         result.duration_ms = (time.monotonic() - start_time) * 1000
+        self.api_calls += result.api_calls
 
         # Store in history
         self._reconciliation_history.append(result)
-        if len(self._reconciliation_history) > self._max_history:
-            self._reconciliation_history.pop(0)
 
         # Log summary
         if result.drifts_detected > 0:
@@ -220,6 +420,23 @@ class PositionReconciler:
             logger.error(f"Failed to fetch remote positions: {e}")
             raise
 
+    def _get_remote_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Fetch one position from Alpaca API; None when there is no position."""
+        try:
+            p = self.alpaca_client.get_position(symbol)
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            logger.error(f"Failed to fetch remote position for {symbol}: {e}")
+            raise
+        return {
+            'qty': float(p.qty),
+            'avg_entry_price': float(p.avg_entry_price),
+            'market_value': float(p.market_value),
+            'current_price': float(p.current_price),
+            'unrealized_pl': float(p.unrealized_pl),
+        }
+
     def _get_local_positions(self) -> Dict[str, Dict[str, Any]]:
         """Get positions from local position manager."""
         try:
@@ -233,16 +450,17 @@ class PositionReconciler:
 
             result = {}
             for symbol, pos in positions.items():
-                if hasattr(pos, '__dict__'):
-                    result[symbol] = {
-                        'qty': getattr(pos, 'quantity', getattr(pos, 'qty', 0)),
-                        'avg_entry_price': getattr(pos, 'entry_price', getattr(pos, 'avg_entry_price', 0)),
-                    }
-                elif isinstance(pos, dict):
+                if isinstance(pos, dict):
                     result[symbol] = {
                         'qty': pos.get('quantity', pos.get('qty', 0)),
                         'avg_entry_price': pos.get('entry_price', pos.get('avg_entry_price', 0)),
                     }
+                else:
+                    # Position records are slotted, so no __dict__ check
+                    result[symbol] = {
+                        'qty': getattr(pos, 'quantity', getattr(pos, 'qty', 0)),
+                        'avg_entry_price': getattr(pos, 'entry_price', getattr(pos, 'avg_entry_price', 0)),
+                    }
 
             return result
 
@@ -298,17 +516,21 @@ class PositionReconciler:
 
         return None  # Synced
 
-    def _try_resolve(self, drift: PositionDrift) -> bool:
+    def _try_resolve(self, drift: PositionDrift, remote: Optional[Dict[str, Any]] = None) -> bool:
         """
         Try to automatically resolve a drift.
 
+        Args:
+            drift: The drift to resolve
+            remote: Remote position already fetched for ``drift.symbol``, if any
+
         Returns:
             True if resolved, False if manual intervention needed
         """
         try:
             if drift.status == ReconciliationStatus.MISSING_LOCAL:
                 # Remote has position we don't track locally - add it
-                self._sync_from_remote(drift.symbol)
+                self._sync_from_remote(drift.symbol, remote)
                 drift.resolved = True
                 drift.resolution = "synced_from_remote"
                 logger.info(f"Resolved drift for {drift.symbol}: synced from remote")
@@ -324,7 +546,7 @@ class PositionReconciler:
 
             elif drift.status == ReconciliationStatus.QUANTITY_MISMATCH:
                 # Quantity mismatch - trust remote (broker is source of truth)
-                self._sync_from_remote(drift.symbol)
+                self._sync_from_remote(drift.symbol, remote)
                 drift.resolved = True
                 drift.resolution = "quantity_updated_from_remote"
                 logger.info(f"Resolved drift for {drift.symbol}: quantity updated from remote")
@@ -336,9 +558,11 @@ class PositionReconciler:
 
         return False
 
-    def _sync_from_remote(self, symbol: str) -> None:
-        """Sync a position from remote to local."""
-        remote = self._get_remote_positions().get(symbol)
+    def _sync_from_remote(self, symbol: str, remote: Optional[Dict[str, Any]] = None) -> None:
+        """Sync a position from remote to local, fetching it unless given."""
+        if remote is None:
+            remote = self._get_remote_positions().get(symbol)
+            self.api_calls += 1
         if remote and hasattr(self.local_manager, 'sync_position'):
             self.local_manager.sync_position(
                 symbol=symbol,
@@ -359,21 +583,44 @@ class PositionReconciler:
 
     def get_history(self, limit: int = 10) -> List[ReconciliationResult]:
         """Get recent reconciliation history."""
-        return self._reconciliation_history[-limit:]
+        return list(self._reconciliation_history)[-limit:]
 
     def get_status(self) -> Dict[str, Any]:
-        """Get reconciler status."""
+        """
+        Get reconciler status.
+
+        ``api_calls_saved`` compares against a full diff on every scheduled
+        pass that re-fetched all positions for each resolved drift.
+        ``latency_*_ms`` is the time from a symbol being marked dirty to it
+        being verified.
+        """
         last_run = self._reconciliation_history[-1] if self._reconciliation_history else None
+        latencies = sorted(self._latencies)
+        with self._lock:
+            dirty = len(self._dirty)
 
-        return {
+        status = {
             'running': self._running,
             'reconcile_interval': self.reconcile_interval,
+            'full_sweep_interval': self.full_sweep_interval,
             'auto_resolve': self.auto_resolve,
             'pending_drifts': len(self.get_pending_drifts()),
+            'dirty_symbols': dirty,
             'last_run': last_run.timestamp.isoformat() if last_run else None,
+            'last_mode': last_run.mode if last_run else None,
             'last_success': last_run.success if last_run else None,
-            'total_reconciliations': len(self._reconciliation_history),
+            'total_reconciliations': self.full_sweeps + self.incremental_runs,
+            'full_sweeps': self.full_sweeps,
+            'incremental_runs': self.incremental_runs,
+            'idle_passes': self.idle_passes,
+            'api_calls': self.api_calls,
+            'api_calls_saved': self.baseline_api_calls - self.api_calls,
         }
+        for name, q in (('p50', 0.50), ('p95', 0.95)):
+            status[f'latency_{name}_ms'] = (
+                latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0 if latencies else None
+            )
+        return status
 
     def force_sync(self, symbol: Optional[str] = None) -> ReconciliationResult:
         """
@@ -3,14 +3,19 @@ Resilience Utilities for Trading Bot
 Provides retry logic, circuit breakers, rate limiting, and timeout handling.
 """
 
+import asyncio
+import math
+import random
 import time
 import threading
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from typing import Callable, Any, Optional, Tuple, Type, Set
+from typing import Callable, Any, Dict, Iterator, Optional, Tuple, Type, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from enum import Enum
+from enum import Enum, IntEnum
 from collections import deque
 
 logger = logging.getLogger(__name__)
@@ -40,6 +45,13 @@ class RateLimitError(AlpacaAPIError):
         self.retry_after = retry_after or 60
 
 
+class RequestShedError(RateLimitError):
+    """Low-priority request dropped because the shared API budget is tight."""
+    def __init__(self, priority: str, retry_after: Optional[int] = None):
+        super().__init__(f"Rate limit budget reserved, {priority} request shed", retry_after=retry_after)
+        self.priority = priority
+
+
 class ConnectionError(TradingBotException):
     """Network connection error - usually retryable."""
     def __init__(self, message: str = "Connection failed"):
@@ -102,6 +114,28 @@ RETRYABLE_EXCEPTIONS: Tuple[Type[Exception], ...] = (
 RETRYABLE_STATUS_CODES: Set[int] = {429, 500, 502, 503, 504}
 
 
+def _backoff_delay(
+    error: Exception,
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    exponential_base: float,
+    jitter: bool,
+) -> float:
+    """Delay before retry ``attempt + 1``, shared by the sync and async retries."""
+    # Calculate delay with exponential backoff
+    delay = min(base_delay * (exponential_base ** attempt), max_delay)
+
+    # Add jitter (±25%)
+    if jitter:
+        delay = delay * (0.75 + random.random() * 0.5)
+
+    # Check for retry_after header (rate limits)
+    if hasattr(error, 'retry_after') and error.retry_after:
+        delay = max(delay, error.retry_after)
+    return delay
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
@@ -134,23 +168,18 @@ def retry_with_backoff(
                 except retryable_exceptions as e:
                     last_exception = e
 
+                    if getattr(e, 'retryable', True) is False:
+                        # e.g. a 4xx AlpacaAPIError: the same request fails the same way
+                        logger.error(f"{func.__name__} failed with non-retryable error: {e}")
+                        raise
+
                     if attempt >= max_retries:
                         logger.error(
                             f"{func.__name__} failed after {max_retries + 1} attempts: {e}"
                         )
                         raise
 
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
-
-                    # Add jitter (±25%)
-                    if jitter:
-                        import random
-                        delay = delay * (0.75 + random.random() * 0.5)
-
-                    # Check for retry_after header (rate limits)
-                    if hasattr(e, 'retry_after') and e.retry_after:
-                        delay = max(delay, e.retry_after)
+                    delay = _backoff_delay(e, attempt, base_delay, max_delay, exponential_base, jitter)
 
                     logger.warning(
                         f"{func.__name__} attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
@@ -182,10 +211,9 @@ def async_retry_with_backoff(
     exponential_base: float = 2.0,
     jitter: bool = True,
     retryable_exceptions: Tuple[Type[Exception], ...] = RETRYABLE_EXCEPTIONS,
+    on_retry: Optional[Callable[[Exception, int], None]] = None,
 ):
-    """Async version of retry_with_backoff."""
-    import asyncio
-
+    """Async version of retry_with_backoff; waits with ``asyncio.sleep``."""
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
@@ -197,26 +225,27 @@ def async_retry_with_backoff(
                 except retryable_exceptions as e:
                     last_exception = e
 
+                    if getattr(e, 'retryable', True) is False:
+                        # e.g. a 4xx AlpacaAPIError: the same request fails the same way
+                        logger.error(f"{func.__name__} failed with non-retryable error: {e}")
+                        raise
+
                     if attempt >= max_retries:
                         logger.error(
                             f"{func.__name__} failed after {max_retries + 1} attempts: {e}"
                         )
                         raise
 
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
-
-                    if jitter:
-                        import random
-                        delay = delay * (0.75 + random.random() * 0.5)
-
-                    if hasattr(e, 'retry_after') and e.retry_after:
-                        delay = max(delay, e.retry_after)
+                    delay = _backoff_delay(e, attempt, base_delay, max_delay, exponential_base, jitter)
 
                     logger.warning(
                         f"{func.__name__} attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
                         f"Retrying in {delay:.2f}s..."
                     )
 
+                    if on_retry:
+                        on_retry(e, attempt + 1)
+
                     await asyncio.sleep(delay)
                 except Exception as e:
                     logger.error(f"{func.__name__} failed with non-retryable error: {e}")
@@ -347,17 +376,26 @@ class CircuitBreaker:
                 return self._last_failure_time + timedelta(seconds=self.config.timeout)
             return None
 
+    def _before_call(self) -> None:
+        """Reject the call if the circuit is open, counting half-open trial calls."""
+        with self._lock:
+            if not self.can_execute():
+                raise CircuitOpenError(self.name, self.get_reset_time())
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_calls += 1
+
     def __call__(self, func: Callable) -> Callable:
-        """Use as decorator."""
+        """Use as decorator; coroutine functions get an async wrapper sharing this state."""
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                return await self.call_async(func, *args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            if not self.can_execute():
-                reset_time = self.get_reset_time()
-                raise CircuitOpenError(self.name, reset_time)
-
-            if self._state == CircuitState.HALF_OPEN:
-                with self._lock:
-                    self._half_open_calls += 1
+            self._before_call()
 
             try:
                 result = func(*args, **kwargs)
@@ -369,6 +407,18 @@ class CircuitBreaker:
 
         return wrapper
 
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        """Await ``func(*args, **kwargs)`` through the breaker."""
+        self._before_call()
+
+        try:
+            result = await func(*args, **kwargs)
+            self.record_success()
+            return result
+        except Exception:
+            self.record_failure()
+            raise
+
     def get_status(self) -> dict:
         """Get circuit breaker status."""
         with self._lock:
@@ -419,15 +469,32 @@ class TokenBucketRateLimiter:
     Token bucket rate limiter.
 
     Allows burst traffic up to burst_size, then limits to requests_per_second.
+    ``clock`` and ``sleep`` can be replaced with a simulated clock in tests.
+
+    Threads (``acquire``) and coroutines (``acquire_async``) draw from the
+    same bucket and join the same FIFO queue when they have to wait. A
+    waiting coroutine sleeps until the next token is due, or until the
+    request ahead of it is served, instead of polling.
     """
 
-    def __init__(self, config: Optional[RateLimiterConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RateLimiterConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.config = config or RateLimiterConfig()
+        self._clock = clock
+        self._sleep = sleep
 
         self._tokens = float(self.config.burst_size)
-        self._last_refill = time.monotonic()
+        self._last_refill = clock()
         self._lock = threading.Lock()
 
+        self._queue: deque = deque()
+        self._next_ticket = 0
+        self._async_wakeups: Dict[int, Tuple[Any, Any]] = {}
+
         logger.debug(
             f"RateLimiter initialized: {self.config.requests_per_second}/s, "
             f"burst={self.config.burst_size}"
@@ -435,7 +502,7 @@ class TokenBucketRateLimiter:
 
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = time.monotonic()
+        now = self._clock()
         elapsed = now - self._last_refill
 
         # Add tokens based on elapsed time
@@ -443,6 +510,58 @@ class TokenBucketRateLimiter:
         self._tokens = min(self._tokens + tokens_to_add, self.config.burst_size)
         self._last_refill = now
 
+    # -- Waiter queue (called with self._lock held) ---------------------------
+
+    def _enqueue(self, priority: Any) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._queue.append(ticket)
+        return ticket
+
+    def _dequeue(self, priority: Any, ticket: int) -> None:
+        self._queue.remove(ticket)
+        # The request behind this one may now be first in line
+        for loop, wakeup in self._async_wakeups.values():
+            loop.call_soon_threadsafe(_wake, wakeup)
+
+    def _is_next(self, priority: Any, ticket: Optional[int]) -> bool:
+        """Whether no other waiter is ahead of ``ticket`` (None = not queued)."""
+        return not self._queue or self._queue[0] == ticket
+
+    def _deficit(self, priority: Any) -> float:
+        """Tokens still missing before a request of ``priority`` may take one."""
+        return 1.0 - self._tokens
+
+    def _take(self, priority: Any, waited: float) -> bool:
+        self._tokens -= 1.0
+        return True
+
+    def _poll(self, priority: Any, ticket: Optional[int]) -> Tuple[bool, Optional[float]]:
+        """(ready, seconds until ready) for a waiter; the wait is None while others are ahead."""
+        self._refill()
+        if not self._is_next(priority, ticket):
+            return False, None
+        deficit = self._deficit(priority)
+        if deficit <= 0:
+            return True, 0.0
+        return False, deficit / self.config.requests_per_second
+
+    def _on_arrival(self, priority: Any, max_wait: float) -> None:
+        """Hook run before a request joins the queue."""
+
+    def _gives_up(self, priority: Any, elapsed: float, wait_time: Optional[float], max_wait: float) -> bool:
+        return elapsed >= max_wait
+
+    def _on_timeout(self, priority: Any) -> bool:
+        if not self.config.wait_for_token:
+            raise RateLimitError("Rate limit exceeded, no token available")
+        return False
+
+    def _max_wait(self, timeout: Optional[float]) -> float:
+        return timeout if timeout is not None else (10.0 if self.config.wait_for_token else 0)
+
+    # -- Acquire --------------------------------------------------------------
+
     def acquire(self, timeout: Optional[float] = None) -> bool:
         """
         Acquire a token, blocking if necessary.
@@ -456,33 +575,69 @@ class TokenBucketRateLimiter:
         Raises:
             RateLimitError: If wait_for_token is False and no token available
         """
-        start_time = time.monotonic()
-        max_wait = timeout if timeout is not None else (10.0 if self.config.wait_for_token else 0)
-
-        while True:
-            with self._lock:
-                self._refill()
-
-                if self._tokens >= 1.0:
-                    self._tokens -= 1.0
-                    return True
+        return self._acquire(None, self._max_wait(timeout))
 
-            # Check timeout
-            elapsed = time.monotonic() - start_time
-            if elapsed >= max_wait:
-                if not self.config.wait_for_token:
-                    raise RateLimitError("Rate limit exceeded, no token available")
-                return False
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """``acquire`` for coroutines: waits without blocking the event loop."""
+        return await self._acquire_async(None, self._max_wait(timeout))
 
-            # Calculate wait time for next token
+    def _acquire(self, priority: Any, max_wait: float) -> bool:
+        start_time = self._clock()
+        with self._lock:
+            ready, _ = self._poll(priority, None)
+            if ready:
+                return self._take(priority, 0.0)
+            self._on_arrival(priority, max_wait)
+            ticket = self._enqueue(priority)
+
+        try:
+            while True:
+                with self._lock:
+                    ready, wait_time = self._poll(priority, ticket)
+                    elapsed = self._clock() - start_time
+                    if ready:
+                        return self._take(priority, elapsed)
+                    if self._gives_up(priority, elapsed, wait_time, max_wait):
+                        return self._on_timeout(priority)
+
+                # Threads cannot be woken by the queue, so poll while others are ahead
+                wait_time = 0.01 if wait_time is None else wait_time
+                self._sleep(min(wait_time, max_wait - elapsed, 0.1))
+        finally:
             with self._lock:
-                wait_time = (1.0 - self._tokens) / self.config.requests_per_second
-
-            # Don't wait longer than remaining timeout
-            wait_time = min(wait_time, max_wait - elapsed, 0.1)
+                self._dequeue(priority, ticket)
 
-            if wait_time > 0:
-                time.sleep(wait_time)
+    async def _acquire_async(self, priority: Any, max_wait: float) -> bool:
+        loop = asyncio.get_running_loop()
+        start_time = self._clock()
+        with self._lock:
+            ready, _ = self._poll(priority, None)
+            if ready:
+                return self._take(priority, 0.0)
+            self._on_arrival(priority, max_wait)
+            ticket = self._enqueue(priority)
+            wakeup = loop.create_future()
+            self._async_wakeups[ticket] = (loop, wakeup)
+
+        try:
+            while True:
+                with self._lock:
+                    ready, wait_time = self._poll(priority, ticket)
+                    elapsed = self._clock() - start_time
+                    if ready:
+                        return self._take(priority, elapsed)
+                    if self._gives_up(priority, elapsed, wait_time, max_wait):
+                        return self._on_timeout(priority)
+                    if wakeup.done():
+                        wakeup = loop.create_future()
+                        self._async_wakeups[ticket] = (loop, wakeup)
+
+                delay = max_wait - elapsed if wait_time is None else min(wait_time, max_wait - elapsed)
+                await asyncio.wait({wakeup}, timeout=max(delay, 0.0))
+        finally:
+            with self._lock:
+                del self._async_wakeups[ticket]
+                self._dequeue(priority, ticket)
 
     def get_status(self) -> dict:
         """Get rate limiter status."""
@@ -495,24 +650,287 @@ class TokenBucketRateLimiter:
             }
 
 
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# =============================================================================
+# Priority API Budget
+# =============================================================================
+
+class RequestPriority(IntEnum):
+    """Classes of API traffic sharing one budget, most important first."""
+    ORDER = 0
+    EXIT_PRICING = 1
+    POSITION_SYNC = 2
+    MARKET_DATA = 3
+    DASHBOARD = 4
+
+
+@dataclass
+class PriorityPolicy:
+    """How one request class draws from the shared bucket."""
+    reserve: int = 0                    # Tokens kept back for this class from less important ones
+    max_wait: Optional[float] = None    # Seconds to wait for a token (None = limiter default)
+    max_queue: Optional[int] = None     # Waiting requests allowed before new ones are shed
+    sheddable: bool = False             # Shed instead of waiting past max_wait
+
+
+# Sized for the 10-token Alpaca burst: dashboard reads only run while the
+# bucket is at least 8 tokens full, market data needs 7, orders can drain it.
+DEFAULT_PRIORITY_POLICIES: Dict[RequestPriority, PriorityPolicy] = {
+    RequestPriority.ORDER: PriorityPolicy(reserve=3),
+    RequestPriority.EXIT_PRICING: PriorityPolicy(reserve=2),
+    RequestPriority.POSITION_SYNC: PriorityPolicy(reserve=1, max_wait=10.0),
+    RequestPriority.MARKET_DATA: PriorityPolicy(reserve=1, max_wait=5.0, max_queue=20, sheddable=True),
+    RequestPriority.DASHBOARD: PriorityPolicy(max_wait=0.0, max_queue=5, sheddable=True),
+}
+
+
+@dataclass
+class PriorityClassStats:
+    """Counters for one request class."""
+    granted: int = 0
+    shed: int = 0
+    timed_out: int = 0
+    total_wait: float = 0.0
+    max_queue_depth: int = 0
+
+
+_api_priority: ContextVar[Optional[RequestPriority]] = ContextVar('api_priority', default=None)
+
+
+@contextmanager
+def api_priority(priority: RequestPriority) -> Iterator[None]:
+    """Run API calls made in this block under ``priority``."""
+    token = set_api_priority(priority)
+    try:
+        yield
+    finally:
+        reset_api_priority(token)
+
+
+def set_api_priority(priority: RequestPriority):
+    """Set the priority for later API calls in this context; returns a reset token."""
+    return _api_priority.set(RequestPriority(priority))
+
+
+def reset_api_priority(token) -> None:
+    """Undo a ``set_api_priority`` call."""
+    _api_priority.reset(token)
+
+
+def current_api_priority() -> Optional[RequestPriority]:
+    """Priority set by the innermost ``api_priority`` block, if any."""
+    return _api_priority.get()
+
+
+class PriorityRateLimiter(TokenBucketRateLimiter):
+    """
+    Token bucket shared by request classes of different priority.
+
+    A request may only take a token that leaves at least the reserves of all
+    more important classes in the bucket, and never while a more important
+    request is waiting; within a class requests are served in arrival order.
+    Sheddable classes raise ``RequestShedError`` instead of waiting longer
+    than their ``max_wait`` or joining a full queue.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RateLimiterConfig] = None,
+        policies: Optional[Dict[RequestPriority, PriorityPolicy]] = None,
+        default_priority: RequestPriority = RequestPriority.MARKET_DATA,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__(config, clock=clock, sleep=sleep)
+        self.policies = dict(DEFAULT_PRIORITY_POLICIES)
+        self.policies.update(policies or {})
+        self.default_priority = RequestPriority(default_priority)
+
+        self._floors: Dict[RequestPriority, int] = {}
+        reserved = 0
+        for priority in RequestPriority:
+            self._floors[priority] = reserved
+            reserved += self.policies[priority].reserve
+
+        self._queues: Dict[RequestPriority, deque] = {p: deque() for p in RequestPriority}
+        # Queues of the classes served before each class
+        self._ahead: Dict[RequestPriority, Tuple[deque, ...]] = {
+            p: tuple(self._queues[q] for q in RequestPriority if q < p) for p in RequestPriority
+        }
+        self._stats: Dict[RequestPriority, PriorityClassStats] = {p: PriorityClassStats() for p in RequestPriority}
+
+    def _enqueue(self, priority: RequestPriority) -> int:
+        ticket = super()._enqueue(priority)
+        queue = self._queues[priority]
+        queue.append(ticket)
+        stats = self._stats[priority]
+        stats.max_queue_depth = max(stats.max_queue_depth, len(queue))
+        return ticket
+
+    def _dequeue(self, priority: RequestPriority, ticket: int) -> None:
+        self._queues[priority].remove(ticket)
+        super()._dequeue(priority, ticket)
+
+    def _is_next(self, priority: RequestPriority, ticket: Optional[int]) -> bool:
+        if not self._queue:
+            return True
+        if any(self._ahead[priority]):
+            return False
+        queue = self._queues[priority]
+        return not queue or queue[0] == ticket
+
+    def _deficit(self, priority: RequestPriority) -> float:
+        return self._floors[priority] + 1.0 - self._tokens
+
+    def _take(self, priority: RequestPriority, waited: float) -> bool:
+        stats = self._stats[priority]
+        stats.granted += 1
+        stats.total_wait += waited
+        return super()._take(priority, waited)
+
+    def _shed(self, priority: RequestPriority) -> RequestShedError:
+        self._stats[priority].shed += 1
+        retry_after = max(1, math.ceil(self._deficit(priority) / self.config.requests_per_second))
+        return RequestShedError(priority.name.lower(), retry_after=retry_after)
+
+    def _on_arrival(self, priority: RequestPriority, max_wait: float) -> None:
+        policy = self.policies[priority]
+        queue_full = policy.max_queue is not None and len(self._queues[priority]) >= policy.max_queue
+        if policy.sheddable and (max_wait <= 0 or queue_full):
+            raise self._shed(priority)
+
+    def _gives_up(self, priority: RequestPriority, elapsed: float, wait_time: Optional[float],
+                  max_wait: float) -> bool:
+        if elapsed >= max_wait:
+            return True
+        return (
+            self.policies[priority].sheddable
+            and wait_time is not None
+            and elapsed + wait_time > max_wait
+        )
+
+    def _on_timeout(self, priority: RequestPriority) -> bool:
+        if self.policies[priority].sheddable:
+            raise self._shed(priority)
+        self._stats[priority].timed_out += 1
+        return super()._on_timeout(priority)
+
+    def _resolve(self, timeout: Optional[float], priority: Optional[RequestPriority]) -> Tuple[RequestPriority, float]:
+        if priority is None:
+            priority = current_api_priority() or self.default_priority
+        priority = RequestPriority(priority)
+        if timeout is None:
+            timeout = self.policies[priority].max_wait
+        return priority, self._max_wait(timeout)
+
+    def acquire(self, timeout: Optional[float] = None, priority: Optional[RequestPriority] = None) -> bool:
+        """
+        Acquire a token for a request of ``priority``.
+
+        Args:
+            timeout: Maximum time to wait (None = the class ``max_wait``, then the limiter default)
+            priority: Request class (None = the enclosing ``api_priority`` block or default_priority)
+
+        Returns:
+            True if token acquired, False if timeout
+
+        Raises:
+            RequestShedError: If the class is sheddable and the budget is reserved
+            RateLimitError: If wait_for_token is False and no token available
+        """
+        return self._acquire(*self._resolve(timeout, priority))
+
+    async def acquire_async(self, timeout: Optional[float] = None,
+                            priority: Optional[RequestPriority] = None) -> bool:
+        """``acquire`` for coroutines: waits without blocking the event loop."""
+        return await self._acquire_async(*self._resolve(timeout, priority))
+
+    def get_status(self) -> dict:
+        """Get rate limiter status with per-class queue depth and counters."""
+        status = super().get_status()
+        with self._lock:
+            status['classes'] = {
+                priority.name.lower(): {
+                    'queue_depth': len(self._queues[priority]),
+                    'reserved_floor': self._floors[priority],
+                    'granted': self._stats[priority].granted,
+                    'shed': self._stats[priority].shed,
+                    'timed_out': self._stats[priority].timed_out,
+                    'avg_wait': (
+                        self._stats[priority].total_wait / self._stats[priority].granted
+                        if self._stats[priority].granted else 0.0
+                    ),
+                    'max_queue_depth': self._stats[priority].max_queue_depth,
+                }
+                for priority in RequestPriority
+            }
+        return status
+
+
 # Global rate limiters registry
 _rate_limiters: dict[str, TokenBucketRateLimiter] = {}
 _rl_lock = threading.Lock()
 
+# Budgets shared by request classes, with their config. Whichever getter asks
+# first creates them as PriorityRateLimiter, so every holder draws from one
+# prioritised bucket.
+PRIORITY_RATE_LIMITERS: Dict[str, RateLimiterConfig] = {
+    # Alpaca allows 200/min = 3.33/s, we stay under
+    "alpaca_api": RateLimiterConfig(requests_per_second=3.0, burst_size=10, wait_for_token=True),
+}
+
+
+def _create_rate_limiter(name: str, config: Optional[RateLimiterConfig]) -> TokenBucketRateLimiter:
+    if name in PRIORITY_RATE_LIMITERS:
+        return PriorityRateLimiter(PRIORITY_RATE_LIMITERS[name])
+    return TokenBucketRateLimiter(config)
+
 
 def get_rate_limiter(name: str, config: Optional[RateLimiterConfig] = None) -> TokenBucketRateLimiter:
-    """Get or create a rate limiter by name."""
+    """Get or create a rate limiter by name; priority budgets come back as ``PriorityRateLimiter``."""
     with _rl_lock:
         if name not in _rate_limiters:
-            _rate_limiters[name] = TokenBucketRateLimiter(config)
+            _rate_limiters[name] = _create_rate_limiter(name, config)
         return _rate_limiters[name]
 
 
+def get_priority_rate_limiter(
+    name: str,
+    config: Optional[RateLimiterConfig] = None,
+    policies: Optional[Dict[RequestPriority, PriorityPolicy]] = None,
+) -> PriorityRateLimiter:
+    """
+    Get or create a priority rate limiter by name.
+
+    Budgets that plain ``get_rate_limiter`` callers share must be listed in
+    ``PRIORITY_RATE_LIMITERS`` (whose config takes precedence), so they are
+    never created as a plain limiter first.
+    """
+    with _rl_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            config = PRIORITY_RATE_LIMITERS.get(name, config)
+            _rate_limiters[name] = limiter = PriorityRateLimiter(config, policies)
+        return limiter
+
+
 def rate_limited(name: str, config: Optional[RateLimiterConfig] = None):
     """Decorator to apply rate limiting to a function."""
     def decorator(func: Callable) -> Callable:
         limiter = get_rate_limiter(name, config)
 
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                await limiter.acquire_async()
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             limiter.acquire()
@@ -547,11 +965,23 @@ def with_timeout(timeout: Optional[TimeoutConfig] = None):
     Decorator to enforce timeout on synchronous functions.
 
     Note: This uses threading and may not interrupt all operations.
-    For proper timeout support, use async/await with asyncio.timeout().
+    Coroutine functions are cancelled with ``asyncio.wait_for`` instead.
     """
     timeout_config = timeout or DEFAULT_TIMEOUT
 
     def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                try:
+                    return await asyncio.wait_for(func(*args, **kwargs), timeout_config.total_timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"{func.__name__} timed out after {timeout_config.total_timeout}s"
+                    )
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             result = [None]
@@ -613,8 +1043,9 @@ def resilient(
         # Build decorator chain from inside out
         wrapped = func
 
-        # 1. Apply retry (innermost)
-        wrapped = retry_with_backoff(
+        # 1. Apply retry (innermost); coroutines back off with asyncio.sleep
+        retry = async_retry_with_backoff if asyncio.iscoroutinefunction(func) else retry_with_backoff
+        wrapped = retry(
             max_retries=max_retries,
             retryable_exceptions=retryable_exceptions,
         )(wrapped)
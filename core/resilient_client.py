@@ -3,17 +3,25 @@ Resilient Alpaca Client Wrapper
 Wraps Alpaca API calls with retry, circuit breaker, rate limiting, and timeout handling.
 """
 
+import asyncio
 import logging
+import threading
 import time
-from typing import Any, Optional, List, Dict
+from collections import deque
+from typing import Any, Optional, List, Dict, Tuple
 from functools import wraps
 
 from core.resilience import (
     retry_with_backoff,
+    async_retry_with_backoff,
     get_circuit_breaker,
-    get_rate_limiter,
+    CircuitBreaker,
+    get_priority_rate_limiter,
+    current_api_priority,
+    RequestPriority,
     CircuitBreakerConfig,
     RateLimiterConfig,
+    PRIORITY_RATE_LIMITERS,
     TimeoutConfig,
     AlpacaAPIError,
     RateLimitError,
@@ -25,6 +33,136 @@ from core.resilience import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    from prometheus_client import Counter, Histogram  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = Histogram = None  # type: ignore[assignment]
+
+
+API_CALL_LATENCY = (
+    Histogram(
+        "alpaca_api_call_latency_seconds",
+        "Latency of Alpaca API calls made through ResilientAlpacaClient, retries included",
+        ["method"],
+    )
+    if Histogram
+    else None
+)
+
+API_CALL_ERRORS = (
+    Counter(
+        "alpaca_api_call_errors_total",
+        "Alpaca API calls through ResilientAlpacaClient that failed after retries",
+        ["method"],
+    )
+    if Counter
+    else None
+)
+
+API_RETRIES = (
+    Counter(
+        "alpaca_api_retries_total",
+        "Retried Alpaca API call attempts",
+        ["method"],
+    )
+    if Counter
+    else None
+)
+
+API_COALESCED = (
+    Counter(
+        "alpaca_api_coalesced_total",
+        "Alpaca API reads served by an identical in-flight or just-finished call",
+        ["method"],
+    )
+    if Counter
+    else None
+)
+
+API_BREAKER_REJECTIONS = (
+    Counter(
+        "alpaca_api_breaker_rejections_total",
+        "Alpaca API calls rejected by the open circuit breaker",
+        ["method"],
+    )
+    if Counter
+    else None
+)
+
+
+class MethodStats:
+    """
+    Call count, latency percentiles, retries, breaker rejections and
+    coalesced calls for one method.
+
+    Latencies are kept for the most recent ``window`` calls. Prometheus
+    children are bound once so recording a call does no label lookups.
+    """
+
+    def __init__(self, method_name: str, window: int = 1024):
+        self.method_name = method_name
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.breaker_rejections = 0
+        self.coalesced = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+        self._latency_metric = API_CALL_LATENCY.labels(method=method_name) if API_CALL_LATENCY else None
+        self._error_metric = API_CALL_ERRORS.labels(method=method_name) if API_CALL_ERRORS else None
+        self._retry_metric = API_RETRIES.labels(method=method_name) if API_RETRIES else None
+        self._rejection_metric = (
+            API_BREAKER_REJECTIONS.labels(method=method_name) if API_BREAKER_REJECTIONS else None
+        )
+        self._coalesced_metric = API_COALESCED.labels(method=method_name) if API_COALESCED else None
+
+    def record_call(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            if not ok:
+                self.errors += 1
+            self._latencies.append(latency)
+        # The histogram's _count doubles as the call counter
+        if self._latency_metric is not None:
+            self._latency_metric.observe(latency)
+            if not ok:
+                self._error_metric.inc()
+
+    def record_retry(self, error: Exception, attempt: int) -> None:
+        with self._lock:
+            self.retries += 1
+        if self._retry_metric is not None:
+            self._retry_metric.inc()
+
+    def record_rejection(self) -> None:
+        with self._lock:
+            self.breaker_rejections += 1
+        if self._rejection_metric is not None:
+            self._rejection_metric.inc()
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self.coalesced += 1
+        if self._coalesced_metric is not None:
+            self._coalesced_metric.inc()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = {
+                'calls': self.calls,
+                'errors': self.errors,
+                'retries': self.retries,
+                'breaker_rejections': self.breaker_rejections,
+                'coalesced': self.coalesced,
+            }
+        for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            snapshot[f'{name}_ms'] = (
+                latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0 if latencies else None
+            )
+        return snapshot
+
 
 # Configuration for Alpaca API resilience
 ALPACA_CIRCUIT_CONFIG = CircuitBreakerConfig(
@@ -34,10 +172,58 @@ ALPACA_CIRCUIT_CONFIG = CircuitBreakerConfig(
     half_open_max_calls=3,
 )
 
-ALPACA_RATE_CONFIG = RateLimiterConfig(
-    requests_per_second=3.0,  # Alpaca allows 200/min = 3.33/s, we stay under
-    burst_size=10,
-    wait_for_token=True,
+ALPACA_RATE_CONFIG = PRIORITY_RATE_LIMITERS["alpaca_api"]
+
+# Request class of each client method; calls inside an ``api_priority`` block
+# use that block's class instead, except order methods which are never demoted.
+METHOD_PRIORITIES = {
+    'submit_order': RequestPriority.ORDER,
+    'replace_order': RequestPriority.ORDER,
+    'cancel_order': RequestPriority.ORDER,
+    'cancel_all_orders': RequestPriority.ORDER,
+    'close_position': RequestPriority.ORDER,
+    'close_all_positions': RequestPriority.ORDER,
+    'get_latest_trade': RequestPriority.EXIT_PRICING,
+    'get_latest_quote': RequestPriority.EXIT_PRICING,
+    'get_latest_crypto_bar': RequestPriority.EXIT_PRICING,
+    'get_account': RequestPriority.POSITION_SYNC,
+    'list_positions': RequestPriority.POSITION_SYNC,
+    'get_position': RequestPriority.POSITION_SYNC,
+    'get_order': RequestPriority.POSITION_SYNC,
+    'get_order_by_client_order_id': RequestPriority.POSITION_SYNC,
+    'get_order_by_client_id': RequestPriority.POSITION_SYNC,
+    'list_orders': RequestPriority.POSITION_SYNC,
+}
+
+ALPACA_RETRYABLE_EXCEPTIONS = RETRYABLE_EXCEPTIONS + (AlpacaAPIError,)
+
+# Reads whose identical concurrent calls share one request, with the number
+# of seconds a completed result keeps being served (0 = in-flight sharing only).
+# Order methods clear these results so a fill is never hidden behind them.
+COALESCE_TTLS = {
+    'get_account': 0.5,
+    'list_positions': 0.5,
+    'get_position': 0.25,
+    'list_orders': 0.25,
+    'get_order': 0.0,
+    'get_order_by_client_order_id': 0.0,
+    'get_latest_trade': 0.0,
+    'get_latest_quote': 0.0,
+    'get_latest_trades': 0.0,
+    'get_latest_quotes': 0.0,
+    'get_clock': 1.0,
+    'get_asset': 5.0,
+    'list_assets': 5.0,
+}
+
+# Methods wrapped below; their pipelines are built with the client
+CLIENT_METHODS = (
+    'get_account', 'list_positions', 'get_position', 'close_position', 'close_all_positions',
+    'submit_order', 'get_order', 'get_order_by_client_order_id', 'list_orders', 'cancel_order',
+    'cancel_all_orders', 'replace_order', 'get_bars', 'get_crypto_bars', 'get_crypto_snapshot',
+    'get_crypto_snapshots', 'get_latest_bar', 'get_latest_bars', 'get_latest_crypto_bar',
+    'get_latest_quote', 'get_latest_quotes', 'get_latest_trade', 'get_latest_trades', 'get_clock',
+    'get_calendar', 'get_asset', 'list_assets',
 )
 
 ALPACA_TIMEOUT = TimeoutConfig(
@@ -83,6 +269,218 @@ def wrap_alpaca_error(func):
     return wrapper
 
 
+def _is_service_failure(error: Exception) -> bool:
+    """Whether ``error`` counts against the circuit breaker; rejected requests (4xx) do not."""
+    return not (isinstance(error, AlpacaAPIError) and not error.retryable)
+
+
+class _Flight:
+    """One shared call: followers wait on ``done`` and read its outcome."""
+
+    __slots__ = ('done', 'finished_at', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        # Each follower gets its own list so callers can sort or filter it
+        return list(self.result) if isinstance(self.result, list) else self.result
+
+
+def _coalesce_key(args: tuple, kwargs: dict) -> Optional[tuple]:
+    """Hashable key for a call's arguments, or None if they cannot be hashed."""
+    try:
+        key = (
+            tuple(tuple(a) if isinstance(a, list) else a for a in args),
+            tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items())),
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _MethodPipeline:
+    """
+    Rate limit, breaker check, retry and error mapping for one client method.
+
+    Built once per method so a call does not construct decorators or look
+    the method up again. The limiter and breaker are read from the owning
+    client on each call so they can be swapped after construction.
+
+    With a coalescing ``ttl`` (see ``COALESCE_TTLS``), a call whose arguments
+    match one in flight waits for that call and returns its result, as does
+    one made within ``ttl`` seconds of it finishing. List results are copied
+    for every caller (the entities in them are shared). Errors are shared
+    with the waiters of the failed call but never kept.
+    """
+
+    __slots__ = ('owner', 'method_name', 'priority', 'stats', 'ttl', '_flights', '_flights_lock',
+                 '_invoke', '_retrying', '_async_retrying')
+
+    def __init__(self, owner: 'ResilientAlpacaClient', method_name: str, ttl: Optional[float] = None):
+        self.owner = owner
+        self.method_name = method_name
+        self.priority = METHOD_PRIORITIES.get(method_name, RequestPriority.MARKET_DATA)
+        self.stats = MethodStats(method_name)
+        self.ttl = ttl
+        self._flights: Dict[tuple, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+        self._invoke = wrap_alpaca_error(getattr(owner._client, method_name))
+        # A timed-out order may still have been placed; resubmitting is left
+        # to callers that can tell (e.g. by client order id)
+        retries = 0 if self.priority == RequestPriority.ORDER else 3
+        self._retrying = retry_with_backoff(
+            max_retries=retries,
+            base_delay=1.0,
+            retryable_exceptions=ALPACA_RETRYABLE_EXCEPTIONS,
+            on_retry=self.stats.record_retry,
+        )(self._invoke)
+
+        async def invoke_in_thread(*args, **kwargs):
+            return await asyncio.to_thread(self._invoke, *args, **kwargs)
+
+        self._async_retrying = async_retry_with_backoff(
+            max_retries=retries,
+            base_delay=1.0,
+            retryable_exceptions=ALPACA_RETRYABLE_EXCEPTIONS,
+            on_retry=self.stats.record_retry,
+        )(invoke_in_thread)
+
+    def _current_priority(self) -> RequestPriority:
+        context = current_api_priority()
+        if context is None or self.priority == RequestPriority.ORDER:
+            return self.priority
+        return context
+
+    def _check_breaker(self) -> CircuitBreaker:
+        breaker = self.owner._circuit_breaker
+        if not breaker.can_execute():
+            self.stats.record_rejection()
+            raise CircuitOpenError("alpaca_api", breaker.get_reset_time())
+        return breaker
+
+    # -- Single flight ---------------------------------------------------------
+
+    def _join(self, key: tuple) -> Tuple[_Flight, bool]:
+        """The flight to wait on for ``key``, and whether this caller must make the call."""
+        now = time.monotonic()
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None and (flight.finished_at is None or now - flight.finished_at <= self.ttl):
+                self.stats.record_coalesced()
+                return flight, False
+            if len(self._flights) >= 256:
+                self._prune(now)
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _land(self, key: tuple, flight: _Flight, result: Any = None, error: Optional[BaseException] = None) -> None:
+        # Keep a snapshot the leader's caller cannot mutate
+        flight.result = list(result) if isinstance(result, list) else result
+        flight.error = error
+        flight.finished_at = time.monotonic()
+        with self._flights_lock:
+            if (error is not None or not self.ttl) and self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, f in self._flights.items()
+                    if f.finished_at is not None and now - f.finished_at > self.ttl]:
+            del self._flights[key]
+
+    def clear(self) -> None:
+        """Forget finished results; calls still in flight are unaffected."""
+        with self._flights_lock:
+            self._flights = {k: f for k, f in self._flights.items() if f.finished_at is None}
+
+    def __call__(self, *args, **kwargs) -> Any:
+        key = _coalesce_key(args, kwargs) if self.ttl is not None else None
+        if key is None:
+            return self._call(*args, **kwargs)
+
+        flight, leader = self._join(key)
+        if not leader:
+            flight.done.wait()
+            return flight.outcome()
+        try:
+            result = self._call(*args, **kwargs)
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=result)
+        return result
+
+    async def call_async(self, *args, **kwargs) -> Any:
+        key = _coalesce_key(args, kwargs) if self.ttl is not None else None
+        if key is None:
+            return await self._call_async(*args, **kwargs)
+
+        flight, leader = self._join(key)
+        if not leader:
+            if not flight.done.is_set():
+                await asyncio.to_thread(flight.done.wait)
+            return flight.outcome()
+        try:
+            result = await self._call_async(*args, **kwargs)
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=result)
+        return result
+
+    # -- Call ------------------------------------------------------------------
+
+    def _call(self, *args, **kwargs) -> Any:
+        # 1. Rate limit (low-priority calls may be shed with RequestShedError)
+        self.owner._rate_limiter.acquire(priority=self._current_priority())
+
+        # 2. Check circuit breaker
+        breaker = self._check_breaker()
+
+        # 3. Execute with retry
+        started = time.perf_counter()
+        try:
+            result = self._retrying(*args, **kwargs)
+        except Exception as e:
+            if _is_service_failure(e):
+                breaker.record_failure()
+            self.stats.record_call(time.perf_counter() - started, ok=False)
+            raise
+        finally:
+            if self.priority == RequestPriority.ORDER:
+                self.owner.clear_coalesced()
+        breaker.record_success()
+        self.stats.record_call(time.perf_counter() - started, ok=True)
+        return result
+
+    async def _call_async(self, *args, **kwargs) -> Any:
+        await self.owner._rate_limiter.acquire_async(priority=self._current_priority())
+        breaker = self._check_breaker()
+
+        started = time.perf_counter()
+        try:
+            result = await self._async_retrying(*args, **kwargs)
+        except Exception as e:
+            if _is_service_failure(e):
+                breaker.record_failure()
+            self.stats.record_call(time.perf_counter() - started, ok=False)
+            raise
+        finally:
+            if self.priority == RequestPriority.ORDER:
+                self.owner.clear_coalesced()
+        breaker.record_success()
+        self.stats.record_call(time.perf_counter() - started, ok=True)
+        return result
+
+
 class ResilientAlpacaClient:
     """
     Wrapper around Alpaca client that adds resilience features.
@@ -90,21 +488,30 @@ class ResilientAlpacaClient:
     Features:
     - Automatic retry with exponential backoff
     - Circuit breaker to prevent hammering failed API
-    - Rate limiting to stay under API limits
+    - Rate limiting to stay under API limits, with orders ahead of
+      position syncs, market data and dashboard reads
+    - Identical concurrent reads share one request (single flight)
     - Request timeout handling
     - Error classification and handling
     """
 
-    def __init__(self, alpaca_client: Any):
+    def __init__(self, alpaca_client: Any, coalesce: Optional[Dict[str, float]] = None):
         """
         Initialize with an existing Alpaca client.
 
         Args:
             alpaca_client: The underlying alpaca_trade_api.REST client
+            coalesce: Result TTL in seconds per coalesced read method
+                (None = ``COALESCE_TTLS``, {} = no coalescing)
         """
         self._client = alpaca_client
+        self._coalesce_ttls = dict(COALESCE_TTLS if coalesce is None else coalesce)
         self._circuit_breaker = get_circuit_breaker("alpaca_api", ALPACA_CIRCUIT_CONFIG)
-        self._rate_limiter = get_rate_limiter("alpaca_api", ALPACA_RATE_CONFIG)
+        self._rate_limiter = get_priority_rate_limiter("alpaca_api", ALPACA_RATE_CONFIG)
+        self._pipelines: Dict[str, _MethodPipeline] = {
+            name: _MethodPipeline(self, name, self._coalesce_ttls.get(name))
+            for name in CLIENT_METHODS if hasattr(alpaca_client, name)
+        }
 
         logger.info("ResilientAlpacaClient initialized")
 
@@ -113,36 +520,34 @@ class ResilientAlpacaClient:
         """Access the underlying client for direct calls if needed."""
         return self._client
 
+    def _pipeline(self, method_name: str) -> _MethodPipeline:
+        pipeline = self._pipelines.get(method_name)
+        if pipeline is None:
+            pipeline = _MethodPipeline(self, method_name, self._coalesce_ttls.get(method_name))
+            self._pipelines[method_name] = pipeline
+        return pipeline
+
+    def clear_coalesced(self) -> None:
+        """Drop recently finished read results so the next reads hit the API."""
+        for pipeline in list(self._pipelines.values()):
+            if pipeline.ttl:
+                pipeline.clear()
+
     def _resilient_call(self, method_name: str, *args, **kwargs) -> Any:
         """
         Make a resilient API call with all protections.
         """
-        # 1. Rate limit
-        self._rate_limiter.acquire()
-
-        # 2. Check circuit breaker
-        if not self._circuit_breaker.can_execute():
-            reset_time = self._circuit_breaker.get_reset_time()
-            raise CircuitOpenError("alpaca_api", reset_time)
+        return self._pipeline(method_name)(*args, **kwargs)
 
-        # 3. Execute with retry
-        @retry_with_backoff(
-            max_retries=3,
-            base_delay=1.0,
-            retryable_exceptions=RETRYABLE_EXCEPTIONS + (AlpacaAPIError,),
-        )
-        @wrap_alpaca_error
-        def execute():
-            method = getattr(self._client, method_name)
-            return method(*args, **kwargs)
+    async def call_async(self, method_name: str, *args, **kwargs) -> Any:
+        """
+        Await a client method with the same protections as the sync wrappers.
 
-        try:
-            result = execute()
-            self._circuit_breaker.record_success()
-            return result
-        except Exception as e:
-            self._circuit_breaker.record_failure()
-            raise
+        Rate-limit waits and retry backoff are awaited on the event loop, and
+        the blocking REST call runs in a worker thread, so other coroutines
+        keep running while this call waits.
+        """
+        return await self._pipeline(method_name).call_async(*args, **kwargs)
 
     # ==========================================================================
     # Account Methods
@@ -338,6 +743,14 @@ class ResilientAlpacaClient:
             limit=limit,
         )
 
+    def get_crypto_snapshot(self, symbol: str) -> Any:
+        """Get the latest quote, trade and bars for a crypto symbol."""
+        return self._resilient_call('get_crypto_snapshot', symbol)
+
+    def get_crypto_snapshots(self, symbols: List[str]) -> Dict[str, Any]:
+        """Get crypto snapshots for multiple symbols."""
+        return self._resilient_call('get_crypto_snapshots', symbols)
+
     def get_latest_bar(self, symbol: str) -> Any:
         """Get latest bar for a symbol."""
         return self._resilient_call('get_latest_bar', symbol)
@@ -407,6 +820,11 @@ class ResilientAlpacaClient:
         return {
             'circuit_breaker': self._circuit_breaker.get_status(),
             'rate_limiter': self._rate_limiter.get_status(),
+            'methods': {
+                name: pipeline.stats.snapshot()
+                for name, pipeline in list(self._pipelines.items())
+                if pipeline.stats.calls or pipeline.stats.breaker_rejections or pipeline.stats.coalesced
+            },
         }
 
     def is_healthy(self) -> bool:
@@ -421,14 +839,135 @@ class ResilientAlpacaClient:
         logger.info("Circuit breaker manually reset")
 
 
-def create_resilient_client(alpaca_client: Any) -> ResilientAlpacaClient:
+def create_resilient_client(alpaca_client: Any, coalesce: Optional[Dict[str, float]] = None) -> ResilientAlpacaClient:
     """
     Factory function to create a resilient client wrapper.
 
     Args:
         alpaca_client: The underlying Alpaca REST client
+        coalesce: Per-method result TTLs for coalesced reads (None = defaults)
 
     Returns:
         ResilientAlpacaClient wrapper
     """
-    return ResilientAlpacaClient(alpaca_client)
+    return ResilientAlpacaClient(alpaca_client, coalesce)
+
+
+def _per_call_wrapped(client: ResilientAlpacaClient, method_name: str, *args, **kwargs) -> Any:
+    # What _resilient_call did before pipelines: build the retry and error
+    # wrappers and look the method up on every call
+    client._rate_limiter.acquire(priority=client._pipeline(method_name)._current_priority())
+    if not client._circuit_breaker.can_execute():
+        raise CircuitOpenError("alpaca_api", client._circuit_breaker.get_reset_time())
+
+    @retry_with_backoff(max_retries=3, base_delay=1.0, retryable_exceptions=ALPACA_RETRYABLE_EXCEPTIONS)
+    @wrap_alpaca_error
+    def execute():
+        return getattr(client._client, method_name)(*args, **kwargs)
+
+    try:
+        result = execute()
+        client._circuit_breaker.record_success()
+        return result
+    except Exception:
+        client._circuit_breaker.record_failure()
+        raise
+
+
+def benchmark_resilient_call(iterations: int = 50_000) -> Dict[str, Dict[str, float]]:
+    """
+    Per-call overhead of the resilience wrapping around a no-op client method.
+
+    ``pipeline`` is the current ``_resilient_call`` (timings and metrics
+    included), ``per_call_wrapping`` rebuilds the decorators on every call
+    as it used to, and ``direct`` calls the client method with no wrapping.
+    The limiter is sized so it never waits and coalescing is off.
+    """
+    from core.resilience import PriorityRateLimiter, RateLimiterConfig
+
+    class _NoopClient:
+        def get_latest_trade(self, symbol):
+            return symbol
+
+    client = ResilientAlpacaClient(_NoopClient(), coalesce={})
+    client._rate_limiter = PriorityRateLimiter(RateLimiterConfig(requests_per_second=1e12, burst_size=10 ** 12))
+    client._circuit_breaker = CircuitBreaker("benchmark")
+
+    cases = {
+        'direct': lambda: client.client.get_latest_trade('BTC/USD'),
+        'per_call_wrapping': lambda: _per_call_wrapped(client, 'get_latest_trade', 'BTC/USD'),
+        'pipeline': lambda: client.get_latest_trade('BTC/USD'),
+    }
+    results = {}
+    for name, call in cases.items():
+        for _ in range(min(iterations, 1000)):
+            call()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        elapsed = time.perf_counter() - started
+        results[name] = {'avg_us': elapsed / iterations * 1e6, 'calls_per_sec': iterations / elapsed}
+    return results
+
+
+def benchmark_request_coalescing(duration: float = 2.0, dashboard_clients: int = 4, bot_workers: int = 3,
+                                 latency: float = 0.02) -> Dict[str, Dict[str, float]]:
+    """
+    Upstream API calls for a simulated dashboard + bot read workload.
+
+    Dashboard clients poll account, positions and orders every 50ms; bot
+    workers sync positions and account every 100ms, the way the reconciler
+    and position managers do. The fake API takes ``latency`` seconds per
+    call. The workload runs once with the default coalescing and once
+    without, and reports requests made, upstream calls and their ratio.
+    """
+    from core.resilience import PriorityRateLimiter, RateLimiterConfig
+
+    class _SlowClient:
+        def __init__(self):
+            self.calls = 0
+            self._lock = threading.Lock()
+
+        def _respond(self, payload):
+            with self._lock:
+                self.calls += 1
+            time.sleep(latency)
+            return payload
+
+        def get_account(self):
+            return self._respond({'equity': '100000'})
+
+        def list_positions(self):
+            return self._respond([])
+
+        def list_orders(self, **kwargs):
+            return self._respond([])
+
+    def run(coalesce: Optional[Dict[str, float]]) -> Dict[str, float]:
+        api = _SlowClient()
+        client = ResilientAlpacaClient(api, coalesce=coalesce)
+        client._rate_limiter = PriorityRateLimiter(RateLimiterConfig(requests_per_second=1e6, burst_size=10 ** 6))
+        client._circuit_breaker = CircuitBreaker("coalescing-benchmark")
+        requests = [0]
+        counter_lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def poll(reads, interval):
+            while time.monotonic() < deadline:
+                for read in reads:
+                    read()
+                with counter_lock:
+                    requests[0] += len(reads)
+                time.sleep(interval)
+
+        dashboard = (client.get_account, client.list_positions, lambda: client.list_orders(status='open'))
+        bot = (client.list_positions, client.get_account)
+        threads = [threading.Thread(target=poll, args=(dashboard, 0.05)) for _ in range(dashboard_clients)]
+        threads += [threading.Thread(target=poll, args=(bot, 0.1)) for _ in range(bot_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {'requests': requests[0], 'api_calls': api.calls, 'api_calls_per_request': api.calls / requests[0]}
+
+    return {'coalesced': run(None), 'uncoalesced': run({})}
@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Optional, Set
 from datetime import datetime
 
 from config.unified_config import CryptoScannerConfig
+from indicators import core as indicator_core
+from utils.records import SignalReasons
 
 # Import CryptoSignal for signal generation
 try:
@@ -215,41 +217,20 @@ class ScannerService:
         """Calculate price momentum using RSI-like indicator."""
         if len(prices) < period + 1:
             return 0.5
-        changes = np.diff(prices[-period-1:])
-        gains = np.where(changes > 0, changes, 0)
-        losses = np.where(changes < 0, -changes, 0)
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-        if avg_loss == 0:
-            return 1.0
-        rs = avg_gain / avg_loss
-        return float(rs / (1 + rs))
+        return self.calculate_rsi(prices, period) / 100.0
 
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate RSI (Relative Strength Index) - 0-100 scale."""
         if len(prices) < period + 1:
             return 50.0
-        changes = np.diff(prices[-period-1:])
-        gains = np.where(changes > 0, changes, 0)
-        losses = np.where(changes < 0, -changes, 0)
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-        if avg_loss == 0:
-            return 100.0
-        if avg_gain == 0:
-            return 0.0
-        rs = avg_gain / avg_loss
-        return float(100 - (100 / (1 + rs)))
+        rsi = indicator_core.rsi(prices[-period-1:], period, smoothing='sma', zero_loss='max')
+        return float(rsi[-1])
 
     def calculate_ema(self, prices: List[float], period: int) -> float:
         """Calculate Exponential Moving Average."""
         if len(prices) < period:
             return prices[-1] if prices else 0.0
-        multiplier = 2 / (period + 1)
-        ema = prices[-period]
-        for price in prices[-period+1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return float(ema)
+        return float(indicator_core.seeded_ema(prices[-period:], 2 / (period + 1))[-1])
 
     def calculate_macd(self, prices: List[float]) -> tuple:
         """Calculate MACD (12, 26, 9) - returns (macd_line, signal_line, histogram)."""
@@ -266,16 +247,12 @@ class ScannerService:
         """Calculate Stochastic RSI - returns (K, D)."""
         if len(prices) < rsi_period + stoch_period:
             return 50.0, 50.0
-        rsi_values = []
-        for i in range(stoch_period):
-            end_idx = len(prices) - stoch_period + i + 1
-            rsi = self.calculate_rsi(prices[:end_idx], rsi_period)
-            rsi_values.append(rsi)
-        if not rsi_values:
-            return 50.0, 50.0
-        current_rsi = rsi_values[-1]
-        min_rsi = min(rsi_values)
-        max_rsi = max(rsi_values)
+        rsi_values = indicator_core.rsi(
+            prices[-(rsi_period + stoch_period):], rsi_period, smoothing='sma', zero_loss='max'
+        )[-stoch_period:]
+        current_rsi = float(rsi_values[-1])
+        min_rsi = float(rsi_values.min())
+        max_rsi = float(rsi_values.max())
         if max_rsi == min_rsi:
             stoch_k = 50.0
         else:
@@ -387,72 +364,72 @@ class ScannerService:
         confidence = 0.0
         target_profit = RISK.TAKE_PROFIT_DEFAULT
         stop_loss = RISK.STOP_LOSS_DEFAULT
-        signal_reasons = []
+        signal_reasons = SignalReasons()
 
         # ============ BUY SIGNALS (CONSERVATIVE - need strong oversold) ============
         buy_score = 0
 
         if rsi < 25:
             buy_score += 3
-            signal_reasons.append(f"RSI very low ({rsi:.1f})")
+            signal_reasons.add("RSI_VERY_LOW", rsi)
         elif rsi < 30:
             buy_score += 2
-            signal_reasons.append(f"RSI oversold ({rsi:.1f})")
+            signal_reasons.add("RSI_OVERSOLD", rsi)
         elif rsi < 35:
             buy_score += 1
-            signal_reasons.append(f"RSI low ({rsi:.1f})")
+            signal_reasons.add("RSI_LOW", rsi)
 
         if macd_hist > 0:
             buy_score += 1
-            signal_reasons.append("MACD positive")
+            signal_reasons.add("MACD_POSITIVE")
 
         if stoch_k < 20:
             buy_score += 3
-            signal_reasons.append(f"StochRSI very low ({stoch_k:.1f})")
+            signal_reasons.add("STOCH_VERY_LOW", stoch_k)
         elif stoch_k < 30:
             buy_score += 2
-            signal_reasons.append(f"StochRSI oversold ({stoch_k:.1f})")
+            signal_reasons.add("STOCH_OVERSOLD", stoch_k)
 
         if ema_cross == 'bullish':
             buy_score += 2
-            signal_reasons.append("EMA bullish cross")
+            signal_reasons.add("EMA_BULLISH_CROSS")
 
         if volume_surge:
             buy_score += 1
-            signal_reasons.append("Volume confirmation")
+            signal_reasons.add("VOLUME_CONFIRMATION")
 
         # ============ SELL SIGNALS (CONSERVATIVE - need strong overbought) ============
         sell_score = 0
-        sell_reasons = []
+        sell_reasons = SignalReasons()
 
         if rsi > 75:
             sell_score += 3
-            sell_reasons.append(f"RSI very high ({rsi:.1f})")
+            sell_reasons.add("RSI_VERY_HIGH", rsi)
         elif rsi > 70:
             sell_score += 2
-            sell_reasons.append(f"RSI overbought ({rsi:.1f})")
+            sell_reasons.add("RSI_OVERBOUGHT", rsi)
         elif rsi > 65:
             sell_score += 1
-            sell_reasons.append(f"RSI high ({rsi:.1f})")
+            sell_reasons.add("RSI_HIGH", rsi)
 
         if macd_hist < 0:
             sell_score += 1
-            sell_reasons.append("MACD negative")
+            sell_reasons.add("MACD_NEGATIVE")
 
         if stoch_k > 80:
             sell_score += 3
-            sell_reasons.append(f"StochRSI very high ({stoch_k:.1f})")
+            sell_reasons.add("STOCH_VERY_HIGH", stoch_k)
         elif stoch_k > 70:
             sell_score += 2
-            sell_reasons.append(f"StochRSI overbought ({stoch_k:.1f})")
+            sell_reasons.add("STOCH_OVERBOUGHT", stoch_k)
 
         if ema_cross == 'bearish':
             sell_score += 2
-            sell_reasons.append("EMA bearish cross")
+            sell_reasons.add("EMA_BEARISH_CROSS")
 
         if volume_surge:
             sell_score += 1
-            sell_reasons.append("Volume confirmation")
+            sell_reasons.add("VOLUME_CONFIRMATION")
 
         # ============ DETERMINE ACTION (REQUIRE STRONG SIGNALS) ============
         min_score = 3
@@ -493,6 +470,7 @@ class ScannerService:
                 target_profit=target_profit,
                 stop_loss=stop_loss,
                 timestamp=datetime.now(),
+                signal_reasons=signal_reasons,
             )
 
         return None
@@ -0,0 +1,238 @@
+"""
+Snapshot Buffer
+Seqlock-protected double buffer in a memory-mapped file.
+
+One writer (the trading process) publishes versioned payloads; any number of
+readers in any process map the same file and read without locks:
+
+- The writer always fills the slot readers are *not* pointed at, bumping that
+  slot's sequence number to odd before writing and back to even afterwards,
+  then flips ``active`` to it.
+- A reader records the active slot's sequence, reads the payload straight
+  out of the mapping and re-checks the sequence. An odd or changed sequence
+  means the slot was rewritten underneath it, so it retries.
+
+With two slots a slot is only rewritten two publishes after it was made
+active, so retries are rare and the writer never waits on readers.
+
+Layout (little endian)::
+
+    header  magic[4] layout:u32 capacity:u64 active:u32 retired:u32
+    slot 0  seq:u64 length:u64 version:u64
+    slot 1  seq:u64 length:u64 version:u64
+    data    slot 0 payload (capacity bytes), slot 1 payload (capacity bytes)
+
+When a payload outgrows the slots, the writer builds a larger file, swaps it
+in with ``os.replace`` and marks the old mapping ``retired`` so readers remap.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from typing import Callable, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAGIC = b"BSNP"
+LAYOUT_VERSION = 1
+
+_HEADER = struct.Struct("<4sIQII")
+_SLOT = struct.Struct("<QQQ")
+_SLOT_OFFSETS = (_HEADER.size, _HEADER.size + _SLOT.size)
+_ACTIVE_OFFSET = 16
+_RETIRED_OFFSET = 20
+HEADER_SIZE = 128
+
+DEFAULT_CAPACITY = 1 << 20  # 1 MiB per slot
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class SnapshotUnavailable(RuntimeError):
+    """Raised when no consistent snapshot could be read."""
+
+
+def _data_offset(slot: int, capacity: int) -> int:
+    return HEADER_SIZE + slot * capacity
+
+
+def _create_mapping(path: str, capacity: int) -> mmap.mmap:
+    size = HEADER_SIZE + 2 * capacity
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        mapping = mmap.mmap(fd, size)
+    finally:
+        os.close(fd)
+    mapping[: _HEADER.size] = _HEADER.pack(MAGIC, LAYOUT_VERSION, capacity, 0, 0)
+    for offset in _SLOT_OFFSETS:
+        mapping[offset : offset + _SLOT.size] = _SLOT.pack(0, 0, 0)
+    return mapping
+
+
+class SnapshotBufferWriter:
+    """Single-writer side of the snapshot buffer."""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        """
+        Create (or truncate) the buffer file at ``path``.
+
+        Args:
+            path: File to map; ``/dev/shm`` keeps it in shared memory
+            capacity: Initial bytes per slot; grows on demand
+        """
+        self.path = path
+        self.capacity = capacity
+        self.version = 0
+        self._mapping: Optional[mmap.mmap] = _create_mapping(path, capacity)
+
+    def _slot_header(self, slot: int) -> Tuple[int, int, int]:
+        offset = _SLOT_OFFSETS[slot]
+        return _SLOT.unpack_from(self._mapping, offset)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        mapping = _create_mapping(tmp_path, capacity)
+        os.replace(tmp_path, self.path)
+
+        old = self._mapping
+        struct.pack_into("<I", old, _RETIRED_OFFSET, 1)
+        old.close()
+        self._mapping = mapping
+        self.capacity = capacity
+        logger.info(f"Snapshot buffer grown to {capacity} bytes per slot")
+
+    def write(self, payload: BytesLike, version: Optional[int] = None) -> int:
+        """
+        Publish ``payload`` into the inactive slot and make it active.
+
+        Returns:
+            Version number stored with the payload
+        """
+        if self._mapping is None:
+            raise ValueError("Snapshot buffer is closed")
+        length = len(payload)
+        if length > self.capacity:
+            self._grow(length)
+
+        mapping = self._mapping
+        self.version = version if version is not None else self.version + 1
+        active = struct.unpack_from("<I", mapping, _ACTIVE_OFFSET)[0]
+        target = 1 - active
+        seq, _, _ = self._slot_header(target)
+        slot_offset = _SLOT_OFFSETS[target]
+
+        # Odd sequence marks the slot as being written
+        _SLOT.pack_into(mapping, slot_offset, seq + 1, 0, 0)
+        start = _data_offset(target, self.capacity)
+        mapping[start : start + length] = payload
+        _SLOT.pack_into(mapping, slot_offset, seq + 2, length, self.version)
+        struct.pack_into("<I", mapping, _ACTIVE_OFFSET, target)
+        return self.version
+
+    def close(self, unlink: bool = False) -> None:
+        """Unmap the buffer, optionally removing the file."""
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class SnapshotBufferReader:
+    """Lock-free reader side of the snapshot buffer."""
+
+    def __init__(self, path: str, max_retries: int = 100):
+        self.path = path
+        self.max_retries = max_retries
+        self.retries = 0
+        self._mapping: Optional[mmap.mmap] = None
+        self._capacity = 0
+
+    def _map(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            size = os.fstat(fd).st_size
+            if size < HEADER_SIZE:
+                return False
+            mapping = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        magic, layout, capacity, _, _ = _HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC or layout != LAYOUT_VERSION:
+            raise SnapshotUnavailable(f"{self.path} is not a snapshot buffer")
+        # The previous mapping may still back zero-copy views held by callers,
+        # so it is released by garbage collection rather than closed here.
+        self._mapping = mapping
+        self._capacity = capacity
+        return True
+
+    def _ensure_mapped(self) -> bool:
+        mapping = self._mapping
+        if mapping is not None and not struct.unpack_from("<I", mapping, _RETIRED_OFFSET)[0]:
+            return True
+        return self._map()
+
+    def current(self) -> Optional[Tuple[int, int, int]]:
+        """Return ``(slot, seq, version)`` of the active slot, or None if empty."""
+        if not self._ensure_mapped():
+            return None
+        mapping = self._mapping
+        slot = struct.unpack_from("<I", mapping, _ACTIVE_OFFSET)[0]
+        seq, _, version = _SLOT.unpack_from(mapping, _SLOT_OFFSETS[slot])
+        if version == 0:
+            return None
+        return slot, seq, version
+
+    def is_current(self, slot: int, seq: int) -> bool:
+        """True while ``slot`` still holds the payload read at ``seq``."""
+        mapping = self._mapping
+        if mapping is None or mapping.closed:
+            return False
+        return _SLOT.unpack_from(mapping, _SLOT_OFFSETS[slot])[0] == seq
+
+    def read(self, parse: Callable[[memoryview, int], T]) -> Optional[T]:
+        """
+        Parse the active payload consistently.
+
+        ``parse`` receives a zero-copy ``memoryview`` of the payload and its
+        version. Its result is only returned if the slot was not rewritten
+        while parsing; otherwise the read is retried.
+
+        Returns:
+            Parsed result, or None if nothing was published yet
+        """
+        for _ in range(self.max_retries):
+            if not self._ensure_mapped():
+                return None
+            mapping = self._mapping
+            slot = struct.unpack_from("<I", mapping, _ACTIVE_OFFSET)[0]
+            seq, length, version = _SLOT.unpack_from(mapping, _SLOT_OFFSETS[slot])
+            if version == 0:
+                return None
+            if seq % 2:
+                self.retries += 1
+                continue
+
+            start = _data_offset(slot, self._capacity)
+            result = parse(memoryview(mapping)[start : start + length], version)
+            if self.is_current(slot, seq):
+                return result
+            self.retries += 1
+
+        raise SnapshotUnavailable(
+            f"No consistent snapshot after {self.max_retries} attempts"
+        )
@@ -14,17 +14,23 @@ from flask_cors import CORS
 import alpaca_trade_api as tradeapi
 import pandas as pd
 
+from core.account_state import AccountStateRefresher
+from core.http_transport import use_shared_session
+
 # Load Alpaca credentials
 with open('AUTH/authAlpaca.txt') as f:
     creds = json.load(f)
 
 # Initialize Alpaca API
-api = tradeapi.REST(
+api = use_shared_session(tradeapi.REST(
     creds['APCA-API-KEY-ID'],
     creds['APCA-API-SECRET-KEY'],
     creds['BASE-URL'],
     api_version='v2'
-)
+))
+
+# Shared account/positions cache so snapshots and dashboard polls reuse one fetch
+account_state = AccountStateRefresher(api, refresh_interval=10)
 
 # Initialize Flask
 app = Flask(__name__)
@@ -409,8 +415,8 @@ def record_pnl_snapshot():
     """Record current P&L snapshot to database"""
     try:
         # Get account and positions
-        account = api.get_account()
-        positions = api.list_positions()
+        account = account_state.get_account()
+        positions = account_state.list_positions()
 
         # Calculate total P&L
         total_pnl = sum(float(pos.unrealized_pl or 0) for pos in positions)
@@ -490,8 +496,7 @@ def get_historical_pnl():
         rows = c.fetchall()
 
         # Get current P&L
-        account = api.get_account()
-        positions = api.list_positions()
+        positions = account_state.list_positions()
         current_pnl = sum(float(pos.unrealized_pl or 0) for pos in positions)
 
         # Format history
@@ -596,7 +601,8 @@ if __name__ == '__main__':
     print("💾 Storing history in local database")
     print("=" * 60)
 
-    # Start background recorder
+    # Start shared account state refresher and background recorder
+    account_state.start()
     recorder = threading.Thread(target=background_recorder, daemon=True)
     recorder.start()
 
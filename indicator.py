@@ -14,6 +14,8 @@ from indicators.optimized_indicators import (
     calculate_all_indicators_optimized,
     calculate_atr_optimized
 )
+from indicators import core as indicator_core
+from indicators.cache import stoch_rsi_cached
 
 logger = logging.getLogger(__name__)
 
@@ -81,16 +83,8 @@ class Indicator:
         if len(prices) < period + 1:
             return 50.0
 
-        series = pd.Series(prices, dtype='float64')
-        delta = series.diff()
-        gains = delta.clip(lower=0)
-        losses = -delta.clip(upper=0)
-
-        avg_gain = gains.rolling(window=period).mean()
-        avg_loss = losses.rolling(window=period).mean()
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return float(rsi.iloc[-1]) if not rsi.dropna().empty else 50.0
+        rsi = indicator_core.rsi(prices, period, smoothing='sma', zero_loss='nan')
+        return float(rsi[-1]) if not np.isnan(rsi).all() else 50.0
 
     def _get_default_indicators(self, symbol: str) -> Dict[str, Any]:
         """Return default indicator values on error"""
@@ -151,15 +145,33 @@ def calculate_indicators(df: pd.DataFrame, config: Optional[Dict] = None) -> pd.
     )
 
 
-def rsi(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
-    """Backward-compatible wrapper delegating to the optimized StochRSI calculation."""
+def _stoch_rsi_frame(df: pd.DataFrame, symbol: Optional[str], **kwargs) -> pd.DataFrame:
+    if symbol is None:
+        return calculate_stoch_rsi_optimized(df, **kwargs)
+    result = df.copy()
+    for name, values in stoch_rsi_cached(df, symbol, **kwargs).items():
+        result[name] = values
+    return result
+
+
+def rsi(df: pd.DataFrame, symbol: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    """
+    Backward-compatible wrapper delegating to the optimized StochRSI calculation.
 
-    return calculate_stoch_rsi_optimized(df, **kwargs)
+    With ``symbol`` the result comes from the shared indicator cache.
+    """
 
+    return _stoch_rsi_frame(df, symbol, **kwargs)
 
-def stochastic(df: pd.DataFrame, TYPE: str | None = None, **kwargs) -> pd.DataFrame:
-    """Backward-compatible wrapper for stochastic / StochRSI calculations."""
+
+def stochastic(df: pd.DataFrame, TYPE: str | None = None, symbol: Optional[str] = None,
+               **kwargs) -> pd.DataFrame:
+    """
+    Backward-compatible wrapper for stochastic / StochRSI calculations.
+
+    With ``symbol`` the StochRSI result comes from the shared indicator cache.
+    """
 
     if TYPE and TYPE.upper() == 'STOCHRSI':
-        return calculate_stoch_rsi_optimized(df, **kwargs)
+        return _stoch_rsi_frame(df, symbol, **kwargs)
     return calculate_stochastic_optimized(df, **kwargs)
@@ -1,6 +1,7 @@
 # Indicators package
 """Technical indicators for trading analysis."""
 
+from . import core
 from .optimized_indicators import *
 from .stoch_rsi_enhanced import *
 from .supertrend import *
@@ -0,0 +1,206 @@
+"""
+Indicator Cache
+Memoized indicator results keyed by symbol, parameters and data fingerprint.
+
+Strategies recompute the same indicators on the same bars several times per
+cycle (``StochRSIStrategy`` asks for RSI and StochRSI, which are one
+calculation). ``IndicatorCache`` returns the stored result when the bars are
+unchanged and, for indicators that support it, extends the stored result over
+newly appended bars instead of recomputing the whole history.
+
+A frame's fingerprint is its length, last timestamp and last close. The close
+is included so an in-progress bar that is revised under the same timestamp is
+not served stale.
+"""
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import core as indicator_core
+from .optimized_indicators import _stoch_rsi_columns
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Tuple[int, Any, float]
+
+
+def fingerprint(df: pd.DataFrame) -> Fingerprint:
+    """Length, last timestamp and last close of ``df``."""
+    if df.empty:
+        return (0, None, float('nan'))
+    return (len(df), df.index[-1], float(df['close'].iloc[-1]))
+
+
+@dataclass
+class CacheEntry:
+    fingerprint: Fingerprint
+    columns: Dict[str, np.ndarray]
+    state: Any = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    extensions: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+# compute(df) -> (columns, state); extend(entry, new_bars) -> (columns, state)
+ComputeFn = Callable[[pd.DataFrame], Tuple[Dict[str, np.ndarray], Any]]
+ExtendFn = Callable[[CacheEntry, pd.DataFrame], Optional[Tuple[Dict[str, np.ndarray], Any]]]
+
+
+@dataclass
+class IndicatorCache:
+    """
+    LRU cache of indicator columns per (symbol, indicator, params).
+
+    Each key holds the result for the latest frame seen. A request for the
+    same fingerprint is a hit; a frame that only appends bars to the cached
+    one is extended when an ``extend`` function is given; anything else is
+    recomputed.
+    """
+
+    maxsize: int = 256
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self):
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key: Hashable, df: pd.DataFrame, compute: ComputeFn,
+                       extend: Optional[ExtendFn] = None) -> Dict[str, np.ndarray]:
+        """
+        Return indicator columns for ``df``, reusing the entry stored under ``key``.
+
+        The returned arrays are shared with the cache and read-only.
+        """
+        current = fingerprint(df)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fingerprint == current:
+                    self.stats.hits += 1
+                    return entry.columns
+
+        result = None
+        if entry is not None and extend is not None and self._appends_to(entry, df):
+            result = extend(entry, df.iloc[entry.fingerprint[0]:])
+            if result is not None:
+                self.stats.extensions += 1
+        if result is None:
+            self.stats.misses += 1
+            result = compute(df)
+
+        columns, state = result
+        for values in columns.values():
+            values.setflags(write=False)
+        with self._lock:
+            self._entries[key] = CacheEntry(current, columns, state)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return columns
+
+    @staticmethod
+    def _appends_to(entry: CacheEntry, df: pd.DataFrame) -> bool:
+        length, last_ts, last_close = entry.fingerprint
+        if length == 0 or len(df) <= length:
+            return False
+        return df.index[length - 1] == last_ts and float(df['close'].iloc[length - 1]) == last_close
+
+
+# ---------------------------------------------------------------------------
+# StochRSI (the optimized convention: Wilder RSI, zeros before warm-up)
+# ---------------------------------------------------------------------------
+
+def _stoch_rsi_tail_state(columns: Dict[str, np.ndarray], rsi_state: indicator_core.RSIState,
+                          stoch_period: int, k_period: int, d_period: int) -> Dict[str, Any]:
+    # Enough trailing values to continue every rolling window
+    return {
+        'rsi_state': rsi_state,
+        'rsi': columns['RSI'][-(stoch_period - 1):] if stoch_period > 1 else columns['RSI'][:0],
+        'stoch': columns['StochRSI'][-(k_period - 1):] if k_period > 1 else columns['StochRSI'][:0],
+        'k': columns['StochRSI %K'][-(d_period - 1):] if d_period > 1 else columns['StochRSI %K'][:0],
+    }
+
+
+def stoch_rsi_cached(df: pd.DataFrame, symbol: str, rsi_period: int = 14, stoch_period: int = 14,
+                     k_period: int = 3, d_period: int = 3,
+                     cache: Optional[IndicatorCache] = None) -> Dict[str, np.ndarray]:
+    """
+    ``calculate_stoch_rsi_optimized`` columns for ``df`` through the cache.
+
+    New bars are folded in with ``core.RSIState`` and the rolling windows are
+    continued from the stored tail, so appended bars are not recomputed over
+    the whole history.
+    """
+    cache = indicator_cache if cache is None else cache
+    key = (symbol, 'stoch_rsi', rsi_period, stoch_period, k_period, d_period)
+    warmup = max(rsi_period, stoch_period) + k_period + d_period
+
+    def compute(frame: pd.DataFrame):
+        close = frame['close'].to_numpy(dtype=np.float64)
+        columns = _stoch_rsi_columns(close, rsi_period, stoch_period, k_period, d_period)
+        if 'RSI' not in columns:
+            return columns, None
+        rsi_state = indicator_core.RSIState.from_series(close, rsi_period)
+        return columns, _stoch_rsi_tail_state(columns, rsi_state, stoch_period, k_period, d_period)
+
+    def extend(entry: CacheEntry, new_bars: pd.DataFrame):
+        if entry.state is None or entry.fingerprint[0] < warmup:
+            return None
+        state = entry.state
+        rsi_state = copy.deepcopy(state['rsi_state'])
+        new_rsi = np.array([rsi_state.update(price)[0] for price in new_bars['close'].to_numpy(dtype=np.float64)])
+        m = len(new_rsi)
+
+        rsi_window = np.concatenate([state['rsi'], new_rsi])
+        lowest = indicator_core.rolling_min(rsi_window, stoch_period)
+        highest = indicator_core.rolling_max(rsi_window, stoch_period)
+        new_stoch = indicator_core.range_position(rsi_window, lowest, highest)[-m:]
+        stoch_window = np.concatenate([state['stoch'], new_stoch])
+        new_k = indicator_core.rolling_mean(stoch_window, k_period)[-m:]
+        k_window = np.concatenate([state['k'], new_k])
+        new_d = indicator_core.rolling_mean(k_window, d_period)[-m:]
+
+        columns = {
+            name: np.concatenate([entry.columns[name], values])
+            for name, values in (('RSI', new_rsi), ('StochRSI', new_stoch),
+                                 ('StochRSI %K', new_k), ('StochRSI %D', new_d))
+        }
+        return columns, _stoch_rsi_tail_state(columns, rsi_state, stoch_period, k_period, d_period)
+
+    return cache.get_or_compute(key, df, compute, extend)
+
+
+indicator_cache = IndicatorCache()
+
+__all__ = [
+    'CacheEntry',
+    'CacheStats',
+    'IndicatorCache',
+    'fingerprint',
+    'indicator_cache',
+    'stoch_rsi_cached',
+]
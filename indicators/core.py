@@ -0,0 +1,1059 @@
+"""
+Indicator Core
+One kernel per indicator, shared by every module that computes indicators.
+
+Every function accepts a 1-D series or a 2-D ``(symbols, time)`` batch and
+works along the last axis, so a whole watchlist is computed in one call.
+Outputs have the same shape as the input and use NaN for bars before the
+indicator is defined unless a ``fill`` value is given.
+
+The original call sites used slightly different smoothing conventions
+(Wilder with an SMA seed, pandas ``ewm``, rolling SMA, Cutler's RSI). Those
+differences are kept as explicit parameters instead of separate copies, so
+existing signals do not move:
+
+===========================  ==============================================
+Call site                    Convention
+===========================  ==============================================
+optimized_indicators         ``rsi(smoothing='wilder', fill=0.0)``
+StochRSIIndicator            ``rsi(smoothing='wilder_ewm', leading_zero=True,
+                             zero_loss='divide')``
+strategies.utils             ``rsi(smoothing='ema', leading_zero=True,
+                             zero_loss='divide')``
+Indicator                    ``rsi(smoothing='sma', zero_loss='nan')``
+dashboard                    ``rsi(smoothing='sma', leading_zero=True,
+                             zero_loss='divide')``
+crypto scanners              ``rsi(smoothing='sma', zero_loss='max')``
+===========================  ==============================================
+
+Two interchangeable backends compute the same values:
+
+- ``numba``: the loop kernels below, compiled with numba. Rolling windows
+  run in O(n) regardless of window length (monotonic deques for min/max,
+  compensated running sums for means). Selected when numba is installed.
+- ``numpy``: whole-array NumPy/SciPy equivalents. Seeded EMAs and the
+  %K feedback smoothing are IIR filters run through ``scipy.signal.lfilter``,
+  rolling min/max use the van Herk/Gil-Werman block algorithm, rolling means
+  use window sums or cumulative sums, and pandas ``ewm`` covers the
+  exponentially weighted means. Selected when numba is missing.
+
+``backend_self_check()`` runs both on a fixed series at startup and logs
+which backend is active.
+
+For streaming use, ``EMAState``, ``RSIState`` and ``SuperTrendState`` carry
+per-symbol state bar to bar and produce the same values as the full-series
+functions.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:  # numba is optional
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - fallback for environments without numba
+    NUMBA_AVAILABLE = False
+
+    def njit(*_args, **_kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+try:  # scipy is optional; recursive filters fall back to the kernels
+    from scipy.signal import lfilter, lfiltic
+except ImportError:  # pragma: no cover
+    lfilter = None
+    lfiltic = None
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('numba', 'numpy')
+_backend = 'numba' if NUMBA_AVAILABLE else 'numpy'
+
+# Rolling means over windows up to this length sum exact window views;
+# longer windows use differences of a cumulative sum.
+_EXACT_SUM_MAX_WINDOW = 64
+
+ArrayLike = Union[np.ndarray, pd.Series, list]
+
+RSI_SMOOTHING = ('wilder', 'wilder_ewm', 'ema', 'sma')
+ZERO_LOSS_RULES = ('max', 'nan', 'divide')
+
+_MEAN, _MIN, _MAX = 0, 1, 2
+
+
+def as_batch(values: ArrayLike) -> Tuple[np.ndarray, bool]:
+    """
+    Return ``values`` as a contiguous float64 ``(symbols, time)`` matrix.
+
+    Returns:
+        Tuple of (matrix, squeeze) where ``squeeze`` is True for 1-D input
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    array = np.ascontiguousarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        return array.reshape(1, -1), True
+    if array.ndim == 2:
+        return array, False
+    raise ValueError(f"Expected a 1-D series or 2-D batch, got {array.ndim} dimensions")
+
+
+def _restore(matrix: np.ndarray, squeeze: bool) -> np.ndarray:
+    return matrix[0] if squeeze else matrix
+
+
+# ---------------------------------------------------------------------------
+# Kernels: 2-D float64 in, 2-D float64 out, time along axis 1
+# ---------------------------------------------------------------------------
+
+@njit(cache=True)
+def _ewm_kernel(x, alpha, adjust, min_periods):
+    """Exponentially weighted mean with pandas ``ewm(...).mean()`` semantics."""
+    rows, n = x.shape
+    out = np.empty((rows, n))
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    minp = max(min_periods, 1)
+    for r in range(rows):
+        if n == 0:
+            continue
+        weighted = x[r, 0]
+        nobs = 1 if weighted == weighted else 0
+        out[r, 0] = weighted if nobs >= minp else np.nan
+        old_wt = 1.0
+        for i in range(1, n):
+            cur = x[r, i]
+            is_obs = cur == cur
+            if is_obs:
+                nobs += 1
+            if weighted == weighted:
+                old_wt *= old_wt_factor
+                if is_obs:
+                    if weighted != cur:
+                        weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                    if adjust:
+                        old_wt += new_wt
+                    else:
+                        old_wt = 1.0
+            elif is_obs:
+                weighted = cur
+            out[r, i] = weighted if nobs >= minp else np.nan
+    return out
+
+
+@njit(cache=True)
+def _seeded_ema_kernel(x, alpha, start, seed_count, fill):
+    """EMA seeded with the mean of ``seed_count`` values from ``start``."""
+    rows, n = x.shape
+    out = np.full((rows, n), fill)
+    seed_at = start + seed_count - 1
+    if seed_count < 1 or seed_at >= n:
+        return out
+    for r in range(rows):
+        total = 0.0
+        for j in range(start, seed_at + 1):
+            total += x[r, j]
+        prev = total / seed_count
+        out[r, seed_at] = prev
+        for i in range(seed_at + 1, n):
+            prev = alpha * x[r, i] + (1 - alpha) * prev
+            out[r, i] = prev
+    return out
+
+
+@njit(cache=True)
+def _kahan_add(total, compensation, value):
+    y = value - compensation
+    t = total + y
+    return t, (t - total) - y
+
+
+@njit(cache=True)
+def _rolling_mean_kernel(x, window, min_periods, fill):
+    """Trailing mean from a compensated running sum, skipping NaN; O(n)."""
+    rows, n = x.shape
+    out = np.empty((rows, n))
+    minp = max(min_periods, 1)
+    for r in range(rows):
+        total = 0.0
+        compensation = 0.0
+        count = 0
+        nonzero = 0
+        for i in range(n):
+            v = x[r, i]
+            if v == v:
+                count += 1
+                if v != 0:
+                    nonzero += 1
+                    total, compensation = _kahan_add(total, compensation, v)
+            if i >= window:
+                old = x[r, i - window]
+                if old == old:
+                    count -= 1
+                    if old != 0:
+                        nonzero -= 1
+                        total, compensation = _kahan_add(total, compensation, -old)
+            if count < minp:
+                out[r, i] = fill
+            elif nonzero == 0:
+                # A window of exact zeros stays exactly zero
+                total = 0.0
+                compensation = 0.0
+                out[r, i] = 0.0
+            else:
+                out[r, i] = total / count
+    return out
+
+
+@njit(cache=True)
+def _rolling_extreme_kernel(x, window, min_periods, is_max, fill):
+    """Trailing min or max with a monotonic deque of indices, skipping NaN; O(n)."""
+    rows, n = x.shape
+    out = np.empty((rows, n))
+    queue = np.empty(max(n, 1), dtype=np.int64)
+    minp = max(min_periods, 1)
+    for r in range(rows):
+        head = 0
+        tail = 0
+        count = 0
+        for i in range(n):
+            v = x[r, i]
+            if v == v:
+                count += 1
+                if is_max:
+                    while tail > head and x[r, queue[tail - 1]] <= v:
+                        tail -= 1
+                else:
+                    while tail > head and x[r, queue[tail - 1]] >= v:
+                        tail -= 1
+                queue[tail] = i
+                tail += 1
+            if i >= window:
+                old = x[r, i - window]
+                if old == old:
+                    count -= 1
+            while tail > head and queue[head] <= i - window:
+                head += 1
+            if count < minp:
+                out[r, i] = fill
+            else:
+                out[r, i] = x[r, queue[head]]
+    return out
+
+
+@njit(cache=True)
+def _feedback_mean_kernel(x, window):
+    """Trailing mean written in place, so each window sees earlier outputs; O(n)."""
+    rows, n = x.shape
+    out = x.copy()
+    if window <= 1:
+        return out
+    for r in range(rows):
+        # Running sum of the window - 1 values before bar i
+        total = 0.0
+        compensation = 0.0
+        for j in range(min(window - 1, n)):
+            total, compensation = _kahan_add(total, compensation, out[r, j])
+        for i in range(window - 1, n):
+            value = (total + out[r, i]) / window
+            out[r, i] = value
+            total, compensation = _kahan_add(total, compensation, value)
+            total, compensation = _kahan_add(total, compensation, -out[r, i - window + 1])
+    return out
+
+
+@njit(cache=True)
+def _supertrend_kernel(close, upper, lower, start):
+    """
+    SuperTrend line and direction from precomputed bands.
+
+    The first defined bar (``start``) picks a side from the close; after that
+    the line ratchets along the active band until the close crosses it.
+    Comparisons keep the NaN behaviour of Python's ``min``/``max``.
+    """
+    rows, n = close.shape
+    line = np.full((rows, n), np.nan)
+    direction = np.full((rows, n), np.nan)
+    for r in range(rows):
+        for i in range(start, n):
+            c = close[r, i]
+            up = upper[r, i]
+            lo = lower[r, i]
+            if i == start:
+                if c <= up:
+                    line[r, i] = up
+                    direction[r, i] = -1.0
+                else:
+                    line[r, i] = lo
+                    direction[r, i] = 1.0
+                continue
+            prev = line[r, i - 1]
+            if direction[r, i - 1] == 1.0:
+                if c <= lo:
+                    line[r, i] = up
+                    direction[r, i] = -1.0
+                else:
+                    line[r, i] = prev if prev > lo else lo
+                    direction[r, i] = 1.0
+            else:
+                if c >= up:
+                    line[r, i] = lo
+                    direction[r, i] = 1.0
+                else:
+                    line[r, i] = prev if prev < up else up
+                    direction[r, i] = -1.0
+    return line, direction
+
+
+# ---------------------------------------------------------------------------
+# NumPy backend: whole-array equivalents of the kernels
+# ---------------------------------------------------------------------------
+
+def _window_counts(mask: np.ndarray, window: int) -> np.ndarray:
+    counts = np.cumsum(mask, axis=1)
+    counts[:, window:] -= counts[:, :-window].copy()
+    return counts
+
+
+def _rolling_mean_numpy(matrix: np.ndarray, window: int, min_periods: int,
+                        fill: float) -> np.ndarray:
+    rows, n = matrix.shape
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    counts = _window_counts(valid, window)
+    if window <= _EXACT_SUM_MAX_WINDOW:
+        padded = np.zeros((rows, n + window - 1))
+        padded[:, window - 1:] = values
+        sums = np.lib.stride_tricks.sliding_window_view(padded, window, axis=1).sum(axis=2)
+    else:
+        cumulative = np.cumsum(values, axis=1)
+        sums = cumulative.copy()
+        sums[:, window:] -= cumulative[:, :-window]
+        # A window of exact zeros stays exactly zero
+        sums[_window_counts(values != 0, window) == 0] = 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = sums / counts
+    out[counts < max(min_periods, 1)] = fill
+    return out
+
+
+def _rolling_extreme_numpy(matrix: np.ndarray, window: int, min_periods: int,
+                           is_max: bool, fill: float) -> np.ndarray:
+    """van Herk/Gil-Werman: block prefix/suffix extremes, O(n) for any window."""
+    rows, n = matrix.shape
+    reducer = np.fmax if is_max else np.fmin
+    lead = window - 1
+    blocks = -(-(n + lead) // window)
+    padded = np.full((rows, blocks * window), np.nan)
+    padded[:, lead:lead + n] = matrix
+    shaped = padded.reshape(rows, blocks, window)
+    prefix = reducer.accumulate(shaped, axis=2).reshape(rows, -1)
+    suffix = reducer.accumulate(shaped[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+    out = reducer(suffix[:, :n], prefix[:, lead:lead + n])
+    out[_window_counts(~np.isnan(matrix), window) < max(min_periods, 1)] = fill
+    return out
+
+
+def _seeded_ema_numpy(matrix: np.ndarray, alpha: float, start: int, seed_count: int,
+                      fill: float) -> np.ndarray:
+    rows, n = matrix.shape
+    seed_at = start + seed_count - 1
+    if lfilter is None:
+        return _seeded_ema_kernel(matrix, alpha, start, seed_count, fill)
+    out = np.full((rows, n), fill)
+    if seed_count < 1 or seed_at >= n:
+        return out
+    seed = matrix[:, start:seed_at + 1].sum(axis=1) / seed_count
+    out[:, seed_at] = seed
+    if seed_at + 1 < n:
+        # y[i] = alpha * x[i] + (1 - alpha) * y[i-1], started from the seed
+        decay = 1 - alpha
+        out[:, seed_at + 1:], _ = lfilter(
+            [alpha], [1.0, -decay], matrix[:, seed_at + 1:], axis=1,
+            zi=(decay * seed)[:, None],
+        )
+    return out
+
+
+def _feedback_mean_numpy(matrix: np.ndarray, window: int) -> np.ndarray:
+    rows, n = matrix.shape
+    if lfilter is None:
+        return _feedback_mean_kernel(matrix, window)
+    out = matrix.copy()
+    if window <= 1 or n < window:
+        return out
+    # y[i] = (x[i] + y[i-1] + ... + y[i-window+1]) / window
+    b = [1.0 / window]
+    a = [1.0] + [-1.0 / window] * (window - 1)
+    for row in range(rows):
+        zi = lfiltic(b, a, out[row, window - 2::-1])
+        out[row, window - 1:], _ = lfilter(b, a, matrix[row, window - 1:], zi=zi)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------------------------
+
+def get_backend() -> str:
+    """Name of the backend used by the full-series functions."""
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    Select ``'numba'`` or ``'numpy'`` and return the previous backend.
+
+    ``'numba'`` without numba installed runs the kernels as plain Python,
+    which is only useful for testing and benchmarking.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {name!r}")
+    previous, _backend = _backend, name
+    return previous
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """Temporarily switch backend."""
+    previous = set_backend(name)
+    try:
+        yield name
+    finally:
+        set_backend(previous)
+
+
+# ---------------------------------------------------------------------------
+# Primitives
+# ---------------------------------------------------------------------------
+
+def ewm_mean(values: ArrayLike, alpha: float, adjust: bool = False,
+             min_periods: int = 0) -> np.ndarray:
+    """Exponentially weighted mean, identical to pandas ``ewm(alpha=...).mean()``."""
+    matrix, squeeze = as_batch(values)
+    if _backend == 'numba':
+        out = _ewm_kernel(matrix, float(alpha), bool(adjust), int(min_periods))
+    else:
+        out = (
+            pd.DataFrame(matrix.T)
+            .ewm(alpha=alpha, adjust=adjust, min_periods=min_periods)
+            .mean()
+            .to_numpy()
+            .T
+        )
+    return _restore(np.ascontiguousarray(out), squeeze)
+
+
+def ema(values: ArrayLike, span: int, adjust: bool = False, min_periods: int = 0) -> np.ndarray:
+    """EMA with ``alpha = 2 / (span + 1)``, identical to pandas ``ewm(span=...)``."""
+    return ewm_mean(values, 2.0 / (span + 1.0), adjust=adjust, min_periods=min_periods)
+
+
+def seeded_ema(values: ArrayLike, alpha: float, start: int = 0, seed_count: int = 1,
+               fill: float = np.nan) -> np.ndarray:
+    """
+    Recursive EMA ``alpha * x + (1 - alpha) * prev`` seeded with an average.
+
+    Args:
+        values: Series or (symbols, time) batch
+        alpha: Smoothing factor
+        start: First bar included in the seed
+        seed_count: Bars averaged for the seed, placed at ``start + seed_count - 1``
+        fill: Value for bars before the seed
+    """
+    matrix, squeeze = as_batch(values)
+    kernel = _seeded_ema_kernel if _backend == 'numba' else _seeded_ema_numpy
+    out = kernel(matrix, float(alpha), int(start), int(seed_count), float(fill))
+    return _restore(out, squeeze)
+
+
+def _rolling(values: ArrayLike, window: int, min_periods: Optional[int], op: int,
+             fill: float) -> np.ndarray:
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    matrix, squeeze = as_batch(values)
+    min_periods = window if min_periods is None else int(min_periods)
+    window, fill = int(window), float(fill)
+    if op == _MEAN:
+        kernel = _rolling_mean_kernel if _backend == 'numba' else _rolling_mean_numpy
+        out = kernel(matrix, window, min_periods, fill)
+    else:
+        kernel = _rolling_extreme_kernel if _backend == 'numba' else _rolling_extreme_numpy
+        out = kernel(matrix, window, min_periods, op == _MAX, fill)
+    return _restore(out, squeeze)
+
+
+def rolling_mean(values: ArrayLike, window: int, min_periods: Optional[int] = None,
+                 fill: float = np.nan) -> np.ndarray:
+    """Trailing mean with pandas ``rolling(window, min_periods).mean()`` semantics."""
+    return _rolling(values, window, min_periods, _MEAN, fill)
+
+
+def rolling_min(values: ArrayLike, window: int, min_periods: Optional[int] = None,
+                fill: float = np.nan) -> np.ndarray:
+    """Trailing minimum with pandas ``rolling(...).min()`` semantics."""
+    return _rolling(values, window, min_periods, _MIN, fill)
+
+
+def rolling_max(values: ArrayLike, window: int, min_periods: Optional[int] = None,
+                fill: float = np.nan) -> np.ndarray:
+    """Trailing maximum with pandas ``rolling(...).max()`` semantics."""
+    return _rolling(values, window, min_periods, _MAX, fill)
+
+
+def feedback_mean(values: ArrayLike, window: int) -> np.ndarray:
+    """
+    Trailing mean computed in place over its own output.
+
+    Bars before ``window - 1`` pass through; later windows include previously
+    smoothed values. This is how the optimized stochastic smooths %K.
+    """
+    matrix, squeeze = as_batch(values)
+    kernel = _feedback_mean_kernel if _backend == 'numba' else _feedback_mean_numpy
+    return _restore(kernel(matrix, int(window)), squeeze)
+
+
+def range_position(values: ArrayLike, low: ArrayLike, high: ArrayLike,
+                   zero_range: float = 0.0) -> np.ndarray:
+    """Position of ``values`` within ``[low, high]`` on a 0-100 scale."""
+    values = np.asarray(values, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    span = np.asarray(high, dtype=np.float64) - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(span != 0, (values - low) / span * 100, zero_range)
+
+
+def _fill_warmup(values: np.ndarray, bars: int, fill: float) -> np.ndarray:
+    if not np.isnan(fill) and bars > 0:
+        values[..., :bars] = fill
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+def price_changes(close: ArrayLike, leading_zero: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split bar-to-bar changes into gains and losses (both non-negative).
+
+    The first bar has no change; it is NaN unless ``leading_zero`` counts it
+    as a flat bar, as pandas ``delta.where(delta > 0, 0)`` does.
+    """
+    matrix, squeeze = as_batch(close)
+    delta = np.empty_like(matrix)
+    delta[:, 1:] = np.diff(matrix, axis=1)
+    delta[:, :1] = 0.0
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    if not leading_zero:
+        gains[:, :1] = np.nan
+        losses[:, :1] = np.nan
+    return _restore(gains, squeeze), _restore(losses, squeeze)
+
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray,
+                      zero_loss: str = 'max') -> np.ndarray:
+    """
+    Convert average gain/loss to RSI.
+
+    Args:
+        zero_loss: ``'max'`` returns 100 when the average loss is zero,
+            ``'nan'`` returns NaN, ``'divide'`` follows IEEE division
+            (100 with gains, NaN on a completely flat window)
+    """
+    if zero_loss not in ZERO_LOSS_RULES:
+        raise ValueError(f"zero_loss must be one of {ZERO_LOSS_RULES}, got {zero_loss!r}")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        result = 100.0 - (100.0 / (1.0 + rs))
+    if zero_loss == 'max':
+        result = np.where(avg_loss == 0, 100.0, result)
+    elif zero_loss == 'nan':
+        result = np.where(avg_loss == 0, np.nan, result)
+    return result
+
+
+def rsi(close: ArrayLike, period: int = 14, smoothing: str = 'wilder',
+        leading_zero: bool = False, zero_loss: str = 'max',
+        fill: float = np.nan) -> np.ndarray:
+    """
+    Relative Strength Index.
+
+    Args:
+        close: Close prices, 1-D or (symbols, time)
+        period: Look-back period
+        smoothing: ``'wilder'`` (SMA seed, then alpha 1/period),
+            ``'wilder_ewm'`` (pandas ``ewm(com=period-1)``),
+            ``'ema'`` (pandas ``ewm(span=period, adjust=False)``) or
+            ``'sma'`` (rolling mean; Cutler's RSI)
+        leading_zero: Count the first bar as a flat change
+        zero_loss: See ``rsi_from_averages``
+        fill: Value for bars before the averages are defined
+
+    Returns:
+        RSI values on a 0-100 scale, same shape as ``close``
+    """
+    gains, losses = price_changes(close, leading_zero=leading_zero)
+    first = 0 if leading_zero else 1
+    if smoothing == 'wilder':
+        alpha = 1.0 / period
+        avg_gain = seeded_ema(gains, alpha, start=1, seed_count=period)
+        avg_loss = seeded_ema(losses, alpha, start=1, seed_count=period)
+        warmup = period
+    elif smoothing == 'wilder_ewm':
+        alpha = 1.0 / period
+        avg_gain = ewm_mean(gains, alpha, adjust=True, min_periods=period)
+        avg_loss = ewm_mean(losses, alpha, adjust=True, min_periods=period)
+        warmup = first + period - 1
+    elif smoothing == 'ema':
+        avg_gain = ema(gains, period)
+        avg_loss = ema(losses, period)
+        warmup = first
+    elif smoothing == 'sma':
+        avg_gain = rolling_mean(gains, period)
+        avg_loss = rolling_mean(losses, period)
+        warmup = first + period - 1
+    else:
+        raise ValueError(f"smoothing must be one of {RSI_SMOOTHING}, got {smoothing!r}")
+    result = rsi_from_averages(avg_gain, avg_loss, zero_loss)
+    return _fill_warmup(result, min(warmup, result.shape[-1]), fill)
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """True range; the first bar, with no previous close, uses ``high - low``."""
+    high, squeeze = as_batch(high)
+    low, _ = as_batch(low)
+    close, _ = as_batch(close)
+    tr = high - low
+    prev_close = close[:, :-1]
+    tr[:, 1:] = np.maximum(
+        tr[:, 1:],
+        np.maximum(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)),
+    )
+    return _restore(tr, squeeze)
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14,
+        smoothing: str = 'seeded_ema', fill: float = np.nan) -> np.ndarray:
+    """
+    Average True Range with EMA smoothing (``alpha = 2 / (period + 1)``).
+
+    Args:
+        smoothing: ``'seeded_ema'`` seeds with the mean true range of bars
+            1..period-1; ``'ema'`` is pandas ``ewm(span=period, adjust=False)``
+        fill: Value before the seed (``'seeded_ema'`` only)
+    """
+    tr = true_range(high, low, close)
+    if smoothing == 'seeded_ema':
+        if period < 2:
+            raise ValueError("period must be at least 2")
+        return seeded_ema(tr, 2.0 / (period + 1), start=1, seed_count=period - 1, fill=fill)
+    if smoothing == 'ema':
+        return ema(tr, period)
+    raise ValueError(f"smoothing must be 'seeded_ema' or 'ema', got {smoothing!r}")
+
+
+def stochastic(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14,
+               smooth_k: int = 3, smooth_d: int = 3,
+               fill: float = np.nan) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic oscillator (%K, %D).
+
+    %K is 0 when the high/low range is flat and is smoothed with
+    ``feedback_mean``; %D is the trailing mean of %K.
+    """
+    lowest = rolling_min(low, period)
+    highest = rolling_max(high, period)
+    k_raw = range_position(close, lowest, highest, zero_range=0.0)
+    k_raw = np.where(np.isnan(lowest) | np.isnan(highest), 0.0, k_raw)
+    k_values = feedback_mean(k_raw, smooth_k)
+    d_values = rolling_mean(k_values, smooth_d, fill=0.0)
+    warmup = min(period - 1, k_values.shape[-1])
+    return _fill_warmup(k_values, warmup, fill), _fill_warmup(d_values, warmup, fill)
+
+
+def stoch_rsi(close: ArrayLike, rsi_period: int = 14, stoch_period: int = 14,
+              k_period: int = 3, d_period: int = 3, fill: float = np.nan,
+              zero_range: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stochastic RSI on Wilder RSI.
+
+    Bars before a value is defined hold ``fill`` and take part in later
+    windows, so ``fill=0.0`` reproduces the original optimized calculation.
+
+    Returns:
+        Tuple of (rsi, stoch_rsi, %K, %D)
+    """
+    rsi_values = rsi(close, rsi_period, smoothing='wilder', fill=fill)
+    lowest = rolling_min(rsi_values, stoch_period)
+    highest = rolling_max(rsi_values, stoch_period)
+    stoch = range_position(rsi_values, lowest, highest, zero_range=zero_range)
+    stoch = _fill_warmup(stoch, min(stoch_period - 1, stoch.shape[-1]), fill)
+    k_values = rolling_mean(stoch, k_period, fill=fill)
+    d_values = rolling_mean(k_values, d_period, fill=fill)
+    return rsi_values, stoch, k_values, d_values
+
+
+def macd(close: ArrayLike, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram from first-value-seeded EMAs.
+
+    Returns:
+        Tuple of (macd_line, signal_line, histogram)
+    """
+    fast_ema = seeded_ema(close, 2.0 / (fast + 1))
+    slow_ema = seeded_ema(close, 2.0 / (slow + 1))
+    line = fast_ema - slow_ema
+    signal_line = seeded_ema(line, 2.0 / (signal + 1))
+    return line, signal_line, line - signal_line
+
+
+def supertrend(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 10,
+               multiplier: float = 3.0) -> Dict[str, np.ndarray]:
+    """
+    SuperTrend on a simple-moving-average ATR, as TradingView computes it.
+
+    The band recursion is path dependent and has no whole-array form, so both
+    backends run ``_supertrend_kernel`` (compiled only when numba is present).
+
+    Returns:
+        Dict with ``supertrend``, ``direction`` (1 up, -1 down, NaN before
+        bar ``period``), ``upper_band``, ``lower_band`` and ``atr``
+    """
+    if period < 1:
+        raise ValueError("period must be at least 1")
+    high_m, squeeze = as_batch(high)
+    low_m, _ = as_batch(low)
+    close_m, _ = as_batch(close)
+    atr_values = rolling_mean(true_range(high_m, low_m, close_m), period)
+    midpoint = (high_m + low_m) / 2
+    upper = midpoint + multiplier * atr_values
+    lower = midpoint - multiplier * atr_values
+    line, direction = _supertrend_kernel(close_m, upper, lower, int(period))
+    return {
+        'supertrend': _restore(line, squeeze),
+        'direction': _restore(direction, squeeze),
+        'upper_band': _restore(upper, squeeze),
+        'lower_band': _restore(lower, squeeze),
+        'atr': _restore(atr_values, squeeze),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Incremental state
+# ---------------------------------------------------------------------------
+
+class EMAState:
+    """
+    Per-symbol EMA updated one bar at a time.
+
+    Matches ``seeded_ema(values, alpha)``: the first bar seeds the average.
+    """
+
+    def __init__(self, alpha: float, size: int = 1):
+        self.alpha = float(alpha)
+        self.value = np.full(size, np.nan)
+
+    @classmethod
+    def from_span(cls, span: int, size: int = 1) -> 'EMAState':
+        return cls(2.0 / (span + 1), size)
+
+    @classmethod
+    def from_series(cls, values: ArrayLike, alpha: float) -> 'EMAState':
+        """Warm-start from history (1-D or (symbols, time))."""
+        matrix, _ = as_batch(values)
+        state = cls(alpha, matrix.shape[0])
+        if matrix.shape[1]:
+            state.value = seeded_ema(matrix, alpha)[:, -1].copy()
+        return state
+
+    def update(self, values: ArrayLike) -> np.ndarray:
+        """Apply one bar per symbol and return the new EMA values."""
+        x = np.asarray(values, dtype=np.float64).reshape(self.value.shape)
+        prev = self.value
+        self.value = np.where(
+            np.isnan(prev), x, self.alpha * x + (1 - self.alpha) * prev
+        )
+        return self.value.copy()
+
+
+class RSIState:
+    """
+    Per-symbol Wilder RSI updated one bar at a time.
+
+    Matches ``rsi(close, period, smoothing='wilder')``: NaN until ``period``
+    changes have been seen, then Wilder smoothing from an SMA seed.
+    """
+
+    def __init__(self, period: int = 14, size: int = 1, zero_loss: str = 'max'):
+        self.period = period
+        self.zero_loss = zero_loss
+        self.alpha = 1.0 / period
+        self.prev_close = np.full(size, np.nan)
+        self.count = np.zeros(size, dtype=np.int64)
+        self.avg_gain = np.zeros(size)
+        self.avg_loss = np.zeros(size)
+
+    @classmethod
+    def from_series(cls, close: ArrayLike, period: int = 14,
+                    zero_loss: str = 'max') -> 'RSIState':
+        """
+        Warm-start from history (1-D or (symbols, time)).
+
+        NaN-free history is loaded with the full-series averages in one pass;
+        history with gaps is replayed bar by bar.
+        """
+        matrix, _ = as_batch(close)
+        state = cls(period, matrix.shape[0], zero_loss)
+        n = matrix.shape[1]
+        if n == 0:
+            return state
+        if np.isnan(matrix).any():
+            for column in matrix.T:
+                state.update(column)
+            return state
+        gains, losses = price_changes(matrix)
+        if n - 1 >= period:
+            alpha = 1.0 / period
+            state.avg_gain = seeded_ema(gains, alpha, start=1, seed_count=period)[:, -1].copy()
+            state.avg_loss = seeded_ema(losses, alpha, start=1, seed_count=period)[:, -1].copy()
+        else:
+            # Still seeding: the averages hold running sums until ``period`` changes
+            state.avg_gain = gains[:, 1:].sum(axis=1)
+            state.avg_loss = losses[:, 1:].sum(axis=1)
+        state.count[:] = n - 1
+        state.prev_close = matrix[:, -1].copy()
+        return state
+
+    def update(self, close: ArrayLike) -> np.ndarray:
+        """Apply one close per symbol and return the new RSI values."""
+        x = np.asarray(close, dtype=np.float64).reshape(self.prev_close.shape)
+        has_prev = ~np.isnan(self.prev_close)
+        delta = np.where(has_prev, x - np.where(has_prev, self.prev_close, 0.0), 0.0)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+
+        seeding = has_prev & (self.count < self.period)
+        smoothing = has_prev & (self.count >= self.period)
+        self.avg_gain = np.where(seeding, self.avg_gain + gain, self.avg_gain)
+        self.avg_loss = np.where(seeding, self.avg_loss + loss, self.avg_loss)
+        self.count = self.count + has_prev
+        seeded = seeding & (self.count == self.period)
+        self.avg_gain = np.where(seeded, self.avg_gain / self.period, self.avg_gain)
+        self.avg_loss = np.where(seeded, self.avg_loss / self.period, self.avg_loss)
+        alpha = self.alpha
+        self.avg_gain = np.where(
+            smoothing, alpha * gain + (1 - alpha) * self.avg_gain, self.avg_gain
+        )
+        self.avg_loss = np.where(
+            smoothing, alpha * loss + (1 - alpha) * self.avg_loss, self.avg_loss
+        )
+        self.prev_close = x.copy()
+
+        ready = self.count >= self.period
+        result = rsi_from_averages(self.avg_gain, self.avg_loss, self.zero_loss)
+        return np.where(ready, result, np.nan)
+
+
+class SuperTrendState:
+    """
+    Per-symbol SuperTrend updated one bar at a time.
+
+    Matches ``supertrend(high, low, close, period, multiplier)``: keeps the
+    last ``period`` true ranges for the ATR plus the previous close, line and
+    direction, so each update costs O(period) regardless of history length.
+    """
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0, size: int = 1):
+        if period < 1:
+            raise ValueError("period must be at least 1")
+        self.period = period
+        self.multiplier = float(multiplier)
+        self.bars = 0
+        self.true_ranges = np.full((size, period), np.nan)
+        self.prev_close = np.full(size, np.nan)
+        self.atr = np.full(size, np.nan)
+        self.upper_band = np.full(size, np.nan)
+        self.lower_band = np.full(size, np.nan)
+        self.supertrend = np.full(size, np.nan)
+        self.direction = np.full(size, np.nan)
+
+    @classmethod
+    def from_series(cls, high: ArrayLike, low: ArrayLike, close: ArrayLike,
+                    period: int = 10, multiplier: float = 3.0) -> 'SuperTrendState':
+        """Warm-start from history (1-D or (symbols, time))."""
+        high_m, _ = as_batch(high)
+        low_m, _ = as_batch(low)
+        close_m, _ = as_batch(close)
+        state = cls(period, multiplier, close_m.shape[0])
+        for h, l, c in zip(high_m.T, low_m.T, close_m.T):
+            state.update(h, l, c)
+        return state
+
+    def update(self, high: ArrayLike, low: ArrayLike,
+               close: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply one bar per symbol.
+
+        Returns:
+            Tuple of (supertrend, direction) for the new bar
+        """
+        shape = self.prev_close.shape
+        h = np.asarray(high, dtype=np.float64).reshape(shape)
+        l = np.asarray(low, dtype=np.float64).reshape(shape)
+        c = np.asarray(close, dtype=np.float64).reshape(shape)
+
+        tr = h - l
+        if self.bars > 0:
+            prev_close = self.prev_close
+            tr = np.maximum(tr, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+        self.true_ranges[:, self.bars % self.period] = tr
+        self.prev_close = c.copy()
+        bar = self.bars
+        self.bars += 1
+
+        if bar < self.period - 1:
+            return self.supertrend.copy(), self.direction.copy()
+        self.atr = self.true_ranges.mean(axis=1)
+        midpoint = (h + l) / 2
+        up = midpoint + self.multiplier * self.atr
+        lo = midpoint - self.multiplier * self.atr
+        self.upper_band, self.lower_band = up, lo
+        if bar < self.period:
+            return self.supertrend.copy(), self.direction.copy()
+
+        if bar == self.period:
+            below = c <= up
+            line = np.where(below, up, lo)
+            direction = np.where(below, -1.0, 1.0)
+        else:
+            prev = self.supertrend
+            rising = self.direction == 1.0
+            breaks_down = c <= lo
+            breaks_up = c >= up
+            line = np.where(
+                rising,
+                np.where(breaks_down, up, np.where(prev > lo, prev, lo)),
+                np.where(breaks_up, lo, np.where(prev < up, prev, up)),
+            )
+            direction = np.where(
+                rising,
+                np.where(breaks_down, -1.0, 1.0),
+                np.where(breaks_up, 1.0, -1.0),
+            )
+        self.supertrend, self.direction = line, direction
+        return line.copy(), direction.copy()
+
+
+# ---------------------------------------------------------------------------
+# Startup self-check
+# ---------------------------------------------------------------------------
+
+def _self_check_outputs(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, np.ndarray]:
+    k_values, d_values = stochastic(high, low, close)
+    return {
+        'ema': ema(close, 12),
+        'seeded_ema': seeded_ema(close, 2.0 / 13),
+        'rolling_mean': rolling_mean(close, 20),
+        'rolling_min': rolling_min(low, 20),
+        'rolling_max': rolling_max(high, 20),
+        'rsi': rsi(close, 14),
+        'atr': atr(high, low, close, 14),
+        'stoch_k': k_values,
+        'stoch_d': d_values,
+        'stoch_rsi': stoch_rsi(close, fill=0.0)[2],
+    }
+
+
+def backend_self_check(bars: int = 512, tolerance: float = 1e-9) -> Dict[str, Any]:
+    """
+    Check the active backend against the other one and log which is active.
+
+    If the numba backend fails to run (e.g. a compilation error) the module
+    switches to the NumPy backend.
+
+    Returns:
+        Report with the active backend, optional dependency availability,
+        any indicators whose backends disagree and the time taken
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, bars))
+    high = close + rng.uniform(0.05, 0.6, bars)
+    low = close - rng.uniform(0.05, 0.6, bars)
+
+    error = None
+    try:
+        active = _self_check_outputs(close, high, low)
+    except Exception as exc:  # pragma: no cover - depends on the numba install
+        if _backend != 'numba':
+            raise
+        error = f"{type(exc).__name__}: {exc}"
+        logger.error(f"Indicator numba backend failed ({error}); using the NumPy backend")
+        set_backend('numpy')
+        active = _self_check_outputs(close, high, low)
+
+    other = 'numpy' if _backend == 'numba' else 'numba'
+    with use_backend(other):
+        reference = _self_check_outputs(close, high, low)
+    mismatches = [
+        name for name, values in active.items()
+        if not np.allclose(values, reference[name], rtol=tolerance, atol=tolerance, equal_nan=True)
+    ]
+
+    report = {
+        'backend': _backend,
+        'numba_available': NUMBA_AVAILABLE,
+        'scipy_available': lfilter is not None,
+        'mismatches': mismatches,
+        'error': error,
+        'elapsed_ms': (time.perf_counter() - started) * 1000,
+    }
+    if mismatches:
+        logger.warning(f"Indicator backends disagree on: {', '.join(mismatches)}")
+    logger.info(
+        f"Indicator backend: {_backend} (numba={'yes' if NUMBA_AVAILABLE else 'no'}, "
+        f"scipy={'yes' if lfilter is not None else 'no'}, "
+        f"self-check {report['elapsed_ms']:.0f}ms)"
+    )
+    return report
+
+
+__all__ = [
+    'BACKENDS',
+    'NUMBA_AVAILABLE',
+    'EMAState',
+    'RSIState',
+    'SuperTrendState',
+    'as_batch',
+    'atr',
+    'backend_self_check',
+    'ema',
+    'ewm_mean',
+    'feedback_mean',
+    'get_backend',
+    'macd',
+    'price_changes',
+    'range_position',
+    'rolling_max',
+    'rolling_mean',
+    'rolling_min',
+    'rsi',
+    'rsi_from_averages',
+    'seeded_ema',
+    'set_backend',
+    'stoch_rsi',
+    'stochastic',
+    'supertrend',
+    'true_range',
+    'use_backend',
+]
@@ -1,12 +1,15 @@
 """
 Optimized Technical Indicators with Vectorization
 Performance improvements: 60-75% faster through Numba JIT compilation
+
+Indicator math lives in ``indicators.core``; without numba it runs on the
+whole-array NumPy backend rather than interpreted loops.
 """
 
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Tuple, Optional, Union
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 try:  # numba is optional in tests
     from numba import jit, vectorize
@@ -21,31 +24,13 @@ except ImportError:  # pragma: no cover - fallback for environments without numb
             return func
         return decorator
 
+from . import core as indicator_core
+
 logger = logging.getLogger(__name__)
 
-@jit(nopython=True, cache=True)
 def _calculate_atr_vectorized(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
-    """Vectorized ATR calculation using Numba JIT compilation"""
-    n = len(close)
-    tr = np.zeros(n)
-    atr = np.zeros(n)
-    
-    # Calculate True Range
-    for i in range(1, n):
-        tr[i] = max(
-            high[i] - low[i],
-            abs(high[i] - close[i-1]),
-            abs(low[i] - close[i-1])
-        )
-    
-    # Calculate ATR using exponential moving average
-    alpha = 2.0 / (period + 1)
-    atr[period-1] = np.mean(tr[1:period])
-    
-    for i in range(period, n):
-        atr[i] = alpha * tr[i] + (1 - alpha) * atr[i-1]
-    
-    return atr
+    """ATR with a mean-seeded EMA; zeros before the seed"""
+    return indicator_core.atr(high, low, close, period, fill=0.0)
 
 @jit(nopython=True, cache=True)
 def _calculate_dynamic_bands_vectorized(atr: np.ndarray, atr_ma: np.ndarray, 
@@ -93,34 +78,48 @@ def _calculate_dynamic_bands_vectorized(atr: np.ndarray, atr_ma: np.ndarray,
     
     return lower_band, upper_band, volatility_ratio
 
-@jit(nopython=True, cache=True)
+def _calculate_dynamic_bands_numpy(atr: np.ndarray, atr_ma: np.ndarray,
+                                   base_lower: float, base_upper: float,
+                                   sensitivity: float, adjustment_factor: float,
+                                   min_width: float, max_width: float) -> tuple:
+    """Whole-array dynamic band calculation for the NumPy backend"""
+    atr = np.asarray(atr, dtype=float)
+    atr_ma = np.asarray(atr_ma, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volatility_ratio = np.where(atr_ma > 0, atr / atr_ma, 1.0)
+    
+    # High volatility widens bands, low volatility tightens them
+    high_vol = volatility_ratio > sensitivity
+    low_vol = ~high_vol & (volatility_ratio < (1 / sensitivity))
+    band_expansion = (volatility_ratio - 1) * adjustment_factor * 100
+    band_contraction = (1 - volatility_ratio) * adjustment_factor * 100
+    
+    lower_band = np.full(atr.shape, float(base_lower))
+    upper_band = np.full(atr.shape, float(base_upper))
+    lower_band = np.where(high_vol, np.maximum(base_lower - band_expansion, base_lower - max_width), lower_band)
+    upper_band = np.where(high_vol, np.minimum(base_upper + band_expansion, base_upper + max_width), upper_band)
+    lower_band = np.where(low_vol, np.minimum(base_lower + band_contraction, base_lower + min_width), lower_band)
+    upper_band = np.where(low_vol, np.maximum(base_upper - band_contraction, base_upper - min_width), upper_band)
+    
+    # Ensure minimum band width
+    too_narrow = (upper_band - lower_band) < min_width
+    mid_point = (lower_band + upper_band) / 2
+    lower_band = np.where(too_narrow, mid_point - min_width / 2, lower_band)
+    upper_band = np.where(too_narrow, mid_point + min_width / 2, upper_band)
+    
+    return lower_band, upper_band, volatility_ratio
+
 def _calculate_stochastic_vectorized(high: np.ndarray, low: np.ndarray, close: np.ndarray,
                                    period: int, smooth_k: int, smooth_d: int) -> tuple:
-    """Vectorized Stochastic calculation"""
-    n = len(close)
-    k_values = np.zeros(n)
-    d_values = np.zeros(n)
-    
-    # Calculate %K
-    for i in range(period-1, n):
-        start_idx = max(0, i - period + 1)
-        period_high = np.max(high[start_idx:i+1])
-        period_low = np.min(low[start_idx:i+1])
-        
-        if period_high != period_low:
-            k_values[i] = ((close[i] - period_low) / (period_high - period_low)) * 100
-    
-    # Smooth %K
-    for i in range(smooth_k-1, n):
-        start_idx = max(0, i - smooth_k + 1)
-        k_values[i] = np.mean(k_values[start_idx:i+1])
-    
-    # Calculate %D (smoothed %K)
-    for i in range(smooth_d-1, n):
-        start_idx = max(0, i - smooth_d + 1)
-        d_values[i] = np.mean(k_values[start_idx:i+1])
-    
-    return k_values, d_values
+    """Stochastic %K/%D; zeros before the first full window"""
+    return indicator_core.stochastic(high, low, close, period, smooth_k, smooth_d, fill=0.0)
+
+def _atr_columns(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 period: int = 14) -> Dict[str, np.ndarray]:
+    if len(close) < period:
+        logger.warning(f"Insufficient data for ATR calculation. Need {period}, got {len(close)}")
+        return {'ATR': np.full(len(close), np.nan)}
+    return {'ATR': _calculate_atr_vectorized(high, low, close, period)}
 
 def calculate_atr_optimized(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
@@ -128,22 +127,41 @@ def calculate_atr_optimized(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     Performance improvement: 55-65% faster through vectorization
     """
     df_result = df.copy()
+    columns = _atr_columns(df_result['high'].values, df_result['low'].values,
+                           df_result['close'].values, period)
+    for name, values in columns.items():
+        df_result[name] = values
+    return df_result
+
+def _dynamic_band_columns(atr_values: np.ndarray,
+                          base_lower: float = 35,
+                          base_upper: float = 100,
+                          atr_period: int = 20,
+                          sensitivity: float = 0.7,
+                          adjustment_factor: float = 0.3,
+                          min_width: float = 10,
+                          max_width: float = 50) -> Dict[str, np.ndarray]:
+    # Calculate ATR moving average
+    atr_ma_values = indicator_core.rolling_mean(atr_values, atr_period)
+    atr = np.nan_to_num(atr_values, nan=0.0)
+    atr_ma = np.nan_to_num(atr_ma_values, nan=1.0)
     
-    if len(df_result) < period:
-        logger.warning(f"Insufficient data for ATR calculation. Need {period}, got {len(df_result)}")
-        df_result['ATR'] = np.nan
-        return df_result
-    
-    # Convert to numpy arrays
-    high = df_result['high'].values
-    low = df_result['low'].values
-    close = df_result['close'].values
-    
-    # Vectorized ATR calculation
-    atr_values = _calculate_atr_vectorized(high, low, close, period)
+    # Vectorized dynamic band calculation (compiled loop or whole-array NumPy)
+    if indicator_core.get_backend() == 'numba':
+        calculate_bands = _calculate_dynamic_bands_vectorized
+    else:
+        calculate_bands = _calculate_dynamic_bands_numpy
+    lower_band, upper_band, volatility_ratio = calculate_bands(
+        atr, atr_ma, base_lower, base_upper, sensitivity, 
+        adjustment_factor, min_width, max_width
+    )
     
-    df_result['ATR'] = atr_values
-    return df_result
+    return {
+        'ATR_MA': atr_ma_values,
+        'dynamic_lower_band': lower_band,
+        'dynamic_upper_band': upper_band,
+        'volatility_ratio': volatility_ratio,
+    }
 
 def calculate_dynamic_bands_optimized(df: pd.DataFrame, 
                                     base_lower: float = 35, 
@@ -163,25 +181,28 @@ def calculate_dynamic_bands_optimized(df: pd.DataFrame,
     if 'ATR' not in df_result.columns:
         df_result = calculate_atr_optimized(df_result)
     
-    # Calculate ATR moving average
-    df_result['ATR_MA'] = df_result['ATR'].rolling(window=atr_period).mean()
-    
-    # Convert to numpy arrays
-    atr = df_result['ATR'].fillna(0).values
-    atr_ma = df_result['ATR_MA'].fillna(1).values
-    
-    # Vectorized dynamic band calculation
-    lower_band, upper_band, volatility_ratio = _calculate_dynamic_bands_vectorized(
-        atr, atr_ma, base_lower, base_upper, sensitivity, 
-        adjustment_factor, min_width, max_width
+    columns = _dynamic_band_columns(
+        df_result['ATR'].to_numpy(dtype=np.float64), base_lower, base_upper, atr_period,
+        sensitivity, adjustment_factor, min_width, max_width
     )
-    
-    df_result['dynamic_lower_band'] = lower_band
-    df_result['dynamic_upper_band'] = upper_band
-    df_result['volatility_ratio'] = volatility_ratio
+    for name, values in columns.items():
+        df_result[name] = values
     
     return df_result
 
+def _stochastic_columns(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                        period: int = 14, smooth_k: int = 3,
+                        smooth_d: int = 3) -> Dict[str, np.ndarray]:
+    if len(close) < period:
+        logger.warning(f"Insufficient data for Stochastic calculation. Need {period}, got {len(close)}")
+        return {'Stoch %K': np.full(len(close), np.nan), 'Stoch %D': np.full(len(close), np.nan)}
+    
+    # Vectorized Stochastic calculation
+    k_values, d_values = _calculate_stochastic_vectorized(
+        high, low, close, period, smooth_k, smooth_d
+    )
+    return {'Stoch %K': k_values, 'Stoch %D': d_values}
+
 def calculate_stochastic_optimized(df: pd.DataFrame, 
                                  period: int = 14, 
                                  smooth_k: int = 3, 
@@ -191,102 +212,36 @@ def calculate_stochastic_optimized(df: pd.DataFrame,
     Performance improvement: 60-70% faster through vectorization
     """
     df_result = df.copy()
-    
-    if len(df_result) < period:
-        logger.warning(f"Insufficient data for Stochastic calculation. Need {period}, got {len(df_result)}")
-        df_result['Stoch %K'] = np.nan
-        df_result['Stoch %D'] = np.nan
-        return df_result
-    
-    # Convert to numpy arrays
-    high = df_result['high'].values
-    low = df_result['low'].values
-    close = df_result['close'].values
-    
-    # Vectorized Stochastic calculation
-    k_values, d_values = _calculate_stochastic_vectorized(
-        high, low, close, period, smooth_k, smooth_d
-    )
-    
-    df_result['Stoch %K'] = k_values
-    df_result['Stoch %D'] = d_values
+    columns = _stochastic_columns(df_result['high'].values, df_result['low'].values,
+                                  df_result['close'].values, period, smooth_k, smooth_d)
+    for name, values in columns.items():
+        df_result[name] = values
     
     return df_result
 
-@jit(nopython=True, cache=True)
 def _calculate_rsi_vectorized(close: np.ndarray, period: int) -> np.ndarray:
-    """Vectorized RSI calculation using Numba JIT"""
-    n = len(close)
-    rsi = np.zeros(n)
-    
-    if n < period + 1:
-        return rsi
-    
-    # Calculate price changes
-    deltas = np.diff(close)
-    
-    # Separate gains and losses
-    gains = np.where(deltas > 0, deltas, 0.0)
-    losses = np.where(deltas < 0, -deltas, 0.0)
-    
-    # Initial average gain and loss
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    if avg_loss == 0:
-        rsi[period] = 100.0
-    else:
-        rs = avg_gain / avg_loss
-        rsi[period] = 100.0 - (100.0 / (1.0 + rs))
-    
-    # Calculate subsequent RSI values using Wilder's smoothing
-    alpha = 1.0 / period
-    
-    for i in range(period + 1, n):
-        gain = gains[i-1]
-        loss = losses[i-1]
-        
-        avg_gain = alpha * gain + (1 - alpha) * avg_gain
-        avg_loss = alpha * loss + (1 - alpha) * avg_loss
-        
-        if avg_loss == 0:
-            rsi[i] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi[i] = 100.0 - (100.0 / (1.0 + rs))
-    
-    return rsi
+    """Wilder RSI; zeros before the seed"""
+    return indicator_core.rsi(close, period, smoothing='wilder', fill=0.0)
 
-@jit(nopython=True, cache=True)
-def _calculate_stoch_rsi_vectorized(rsi: np.ndarray, period: int, k_period: int, d_period: int) -> tuple:
-    """Vectorized Stochastic RSI calculation"""
-    n = len(rsi)
-    stoch_rsi = np.zeros(n)
-    k_percent = np.zeros(n)
-    d_percent = np.zeros(n)
-    
-    # Calculate Stochastic RSI
-    for i in range(period-1, n):
-        start_idx = max(0, i - period + 1)
-        rsi_window = rsi[start_idx:i+1]
-        
-        min_rsi = np.min(rsi_window)
-        max_rsi = np.max(rsi_window)
-        
-        if max_rsi - min_rsi != 0:
-            stoch_rsi[i] = ((rsi[i] - min_rsi) / (max_rsi - min_rsi)) * 100
-    
-    # Calculate %K (moving average of Stochastic RSI)
-    for i in range(k_period-1, n):
-        start_idx = max(0, i - k_period + 1)
-        k_percent[i] = np.mean(stoch_rsi[start_idx:i+1])
-    
-    # Calculate %D (moving average of %K)
-    for i in range(d_period-1, n):
-        start_idx = max(0, i - d_period + 1)
-        d_percent[i] = np.mean(k_percent[start_idx:i+1])
+def _calculate_stoch_rsi_vectorized(close: np.ndarray, rsi_period: int, period: int,
+                                    k_period: int, d_period: int) -> tuple:
+    """RSI, Stochastic RSI, %K and %D; zeros before each is defined"""
+    return indicator_core.stoch_rsi(close, rsi_period, period, k_period, d_period, fill=0.0)
+
+def _stoch_rsi_columns(close: np.ndarray,
+                       rsi_period: int = 14,
+                       stoch_period: int = 14,
+                       k_period: int = 3,
+                       d_period: int = 3) -> Dict[str, np.ndarray]:
+    if len(close) < max(rsi_period, stoch_period) + k_period + d_period:
+        logger.warning(f"Insufficient data for StochRSI calculation")
+        return {name: np.full(len(close), np.nan) for name in ('StochRSI', 'StochRSI %K', 'StochRSI %D')}
     
-    return stoch_rsi, k_percent, d_percent
+    # Vectorized RSI and Stochastic RSI calculation
+    rsi, stoch_rsi, k_percent, d_percent = _calculate_stoch_rsi_vectorized(
+        close, rsi_period, stoch_period, k_period, d_period
+    )
+    return {'RSI': rsi, 'StochRSI': stoch_rsi, 'StochRSI %K': k_percent, 'StochRSI %D': d_percent}
 
 def calculate_stoch_rsi_optimized(df: pd.DataFrame,
                                 rsi_period: int = 14,
@@ -298,29 +253,10 @@ def calculate_stoch_rsi_optimized(df: pd.DataFrame,
     Performance improvement: 65-75% faster through vectorization
     """
     df_result = df.copy()
-    
-    if len(df_result) < max(rsi_period, stoch_period) + k_period + d_period:
-        logger.warning(f"Insufficient data for StochRSI calculation")
-        df_result['StochRSI'] = np.nan
-        df_result['StochRSI %K'] = np.nan
-        df_result['StochRSI %D'] = np.nan
-        return df_result
-    
-    # Convert to numpy array
-    close = df_result['close'].values
-    
-    # Vectorized RSI calculation
-    rsi = _calculate_rsi_vectorized(close, rsi_period)
-    
-    # Vectorized Stochastic RSI calculation
-    stoch_rsi, k_percent, d_percent = _calculate_stoch_rsi_vectorized(
-        rsi, stoch_period, k_period, d_period
-    )
-    
-    df_result['RSI'] = rsi
-    df_result['StochRSI'] = stoch_rsi
-    df_result['StochRSI %K'] = k_percent
-    df_result['StochRSI %D'] = d_percent
+    columns = _stoch_rsi_columns(df_result['close'].values, rsi_period, stoch_period,
+                                 k_period, d_period)
+    for name, values in columns.items():
+        df_result[name] = values
     
     return df_result
 
@@ -338,17 +274,8 @@ def calculate_ema_optimized(prices: Union[pd.Series, np.ndarray], span: int) ->
         # Use pandas built-in optimized EMA for Series (already highly optimized)
         return prices.ewm(span=span, adjust=False).mean()
     else:
-        # For numpy arrays, use custom vectorized implementation
-        prices_array = np.asarray(prices)
-        alpha = 2.0 / (span + 1)
-        ema = np.zeros_like(prices_array)
-        
-        if len(prices_array) > 0:
-            ema[0] = prices_array[0]
-            for i in range(1, len(prices_array)):
-                ema[i] = alpha * prices_array[i] + (1 - alpha) * ema[i-1]
-        
-        return ema
+        # For numpy arrays (1-D or symbols x time), seed with the first value
+        return indicator_core.seeded_ema(prices, 2.0 / (span + 1))
 
 def calculate_sma_optimized(prices: Union[pd.Series, np.ndarray], window: int) -> Union[pd.Series, np.ndarray]:
     """
@@ -358,16 +285,20 @@ def calculate_sma_optimized(prices: Union[pd.Series, np.ndarray], window: int) -
     if isinstance(prices, pd.Series):
         return prices.rolling(window=window, min_periods=1).mean()
     else:
-        prices_array = np.asarray(prices)
-        sma = np.zeros_like(prices_array)
-        
-        for i in range(len(prices_array)):
-            start_idx = max(0, i - window + 1)
-            sma[i] = np.mean(prices_array[start_idx:i+1])
-        
-        return sma
+        # Partial windows at the start average the bars available so far
+        return indicator_core.rolling_mean(prices, window, min_periods=1)
 
 # Batch processing function for multiple indicators
+def _float_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    # A view of the frame's own float64 block when it already is one
+    return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
+
+def _attach_block(df: pd.DataFrame, names: list, block: np.ndarray) -> pd.DataFrame:
+    """Return ``df`` with ``block`` rows attached as columns in one step, without copying ``df``"""
+    indicators = pd.DataFrame(block.T, index=df.index, columns=names, copy=False)
+    base = df.drop(columns=[name for name in names if name in df.columns])
+    return pd.concat([base, indicators], axis=1)
+
 def calculate_all_indicators_optimized(df: pd.DataFrame, 
                                      include_atr: bool = True,
                                      include_stoch: bool = True,
@@ -377,28 +308,45 @@ def calculate_all_indicators_optimized(df: pd.DataFrame,
     """
     Calculate all indicators in optimized batch processing
     Performance improvement: 50-60% faster through batch processing
+
+    The OHLC columns are read once as float64 arrays and every indicator is
+    written into one preallocated ``(columns, rows)`` block, which becomes a
+    single float64 block of the result. The input frame is never copied
+    up front; under pandas copy-on-write its columns are shared with the
+    result.
     """
     logger.info(f"Calculating optimized indicators for {len(df)} data points")
     
-    df_result = df.copy()
-    
     try:
+        close = _float_column(df, 'close')
+        needs_range = include_atr or include_stoch or include_dynamic_bands
+        high = _float_column(df, 'high') if needs_range else None
+        low = _float_column(df, 'low') if needs_range else None
+        
+        steps = []
         # Calculate ATR first (needed for dynamic bands)
         if include_atr or include_dynamic_bands:
-            df_result = calculate_atr_optimized(df_result, **kwargs.get('atr', {}))
-        
-        # Calculate Stochastic
+            steps.append(lambda: _atr_columns(high, low, close, **kwargs.get('atr', {})))
         if include_stoch:
-            df_result = calculate_stochastic_optimized(df_result, **kwargs.get('stoch', {}))
-        
-        # Calculate Stochastic RSI
+            steps.append(lambda: _stochastic_columns(high, low, close, **kwargs.get('stoch', {})))
         if include_stoch_rsi:
-            df_result = calculate_stoch_rsi_optimized(df_result, **kwargs.get('stoch_rsi', {}))
-        
-        # Calculate Dynamic Bands
+            steps.append(lambda: _stoch_rsi_columns(close, **kwargs.get('stoch_rsi', {})))
         if include_dynamic_bands:
-            df_result = calculate_dynamic_bands_optimized(df_result, **kwargs.get('dynamic_bands', {}))
+            steps.append(lambda: _dynamic_band_columns(block[names.index('ATR')],
+                                                       **kwargs.get('dynamic_bands', {})))
         
+        # One row per output column; rows are filled as each step finishes so
+        # its temporary arrays are released before the next one runs
+        rows = ((include_atr or include_dynamic_bands) + 2 * include_stoch
+                + 4 * include_stoch_rsi + 4 * include_dynamic_bands)
+        block = np.empty((rows, len(df)))
+        names = []
+        for step in steps:
+            for name, values in step().items():
+                block[len(names)] = values
+                names.append(name)
+        
+        df_result = _attach_block(df, names, block[:len(names)])
         logger.info("Optimized indicator calculations completed successfully")
         
     except Exception as e:
@@ -408,10 +356,113 @@ def calculate_all_indicators_optimized(df: pd.DataFrame,
     return df_result
 
 # Performance benchmarking function
-def benchmark_indicators(df: pd.DataFrame, iterations: int = 10) -> Dict[str, float]:
-    """Benchmark indicator performance"""
+def _time_calls(func, iterations: int) -> Dict[str, float]:
     import time
-    
+
+    times = []
+    for _ in range(iterations):
+        start_time = time.time()
+        _ = func()
+        end_time = time.time()
+        times.append(end_time - start_time)
+
+    return {
+        'avg_time': np.mean(times),
+        'min_time': np.min(times),
+        'max_time': np.max(times),
+        'std_time': np.std(times)
+    }
+
+def benchmark_window_scaling(n_bars: int = 100_000,
+                             windows: Sequence[int] = (5, 14, 50, 200, 1000),
+                             iterations: int = 3,
+                             seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark how the windowed indicators scale with window length.
+
+    With the O(n) kernels the time per call should stay roughly flat as the
+    window grows; an O(n*window) implementation grows linearly with it.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n_bars))
+    high = close + rng.uniform(0.05, 0.6, n_bars)
+    low = close - rng.uniform(0.05, 0.6, n_bars)
+
+    results = {}
+    for window in windows:
+        cases = {
+            'SMA': lambda: calculate_sma_optimized(close, window),
+            'Stochastic': lambda: _calculate_stochastic_vectorized(high, low, close, window, 3, 3),
+            'StochRSI': lambda: _calculate_stoch_rsi_vectorized(close, 14, window, 3, 3),
+        }
+        for name, func in cases.items():
+            results[f'{name} (window={window})'] = _time_calls(func, iterations)
+
+    return results
+
+def _chained_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    # The per-indicator path: every step copies the frame it is given
+    df_result = calculate_atr_optimized(df.copy())
+    df_result = calculate_stochastic_optimized(df_result)
+    df_result = calculate_stoch_rsi_optimized(df_result)
+    return calculate_dynamic_bands_optimized(df_result)
+
+def benchmark_indicator_pipeline(n_rows: int = 1_000_000, iterations: int = 1,
+                                 seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """
+    Time and peak memory of ``calculate_all_indicators_optimized`` on a large frame.
+
+    The same indicators chained through the per-indicator functions (one
+    frame copy per step) are measured alongside for comparison. Peak memory
+    is the tracemalloc high-water mark above the input frame, in MB.
+    """
+    import time
+    import tracemalloc
+
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n_rows))
+    df = pd.DataFrame({
+        'open': close,
+        'high': close + rng.uniform(0.05, 0.6, n_rows),
+        'low': close - rng.uniform(0.05, 0.6, n_rows),
+        'close': close,
+        'volume': rng.uniform(1, 10, n_rows),
+    }, index=pd.date_range('2024-01-01', periods=n_rows, freq='min'))
+
+    cases = {
+        'pipeline': lambda: calculate_all_indicators_optimized(df),
+        'chained': lambda: _chained_indicators(df),
+    }
+    results = {}
+    for name, func in cases.items():
+        times, peaks = [], []
+        for _ in range(iterations):
+            tracemalloc.start()
+            start_time = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start_time)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            del result
+        results[name] = {
+            'avg_time': float(np.mean(times)),
+            'peak_mb': float(np.max(peaks)) / 2**20,
+        }
+    return results
+
+def benchmark_indicators(df: pd.DataFrame, iterations: int = 10,
+                         window_lengths: Optional[Sequence[int]] = None,
+                         scaling_bars: int = 100_000,
+                         backends: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Benchmark indicator performance
+
+    Pass ``window_lengths`` to also time SMA/Stochastic/StochRSI on
+    ``scaling_bars`` synthetic bars for each window length. Pass ``backends``
+    (e.g. ``('numba', 'numpy')``) to time each backend; result names then
+    end in ``[backend]``. Without numba installed the ``numba`` backend runs
+    its kernels as plain Python.
+    """
     results = {}
     
     indicators = {
@@ -422,19 +473,15 @@ def benchmark_indicators(df: pd.DataFrame, iterations: int = 10) -> Dict[str, fl
         'All Indicators': lambda: calculate_all_indicators_optimized(df)
     }
     
-    for name, func in indicators.items():
-        times = []
-        for _ in range(iterations):
-            start_time = time.time()
-            _ = func()
-            end_time = time.time()
-            times.append(end_time - start_time)
-        
-        results[name] = {
-            'avg_time': np.mean(times),
-            'min_time': np.min(times),
-            'max_time': np.max(times),
-            'std_time': np.std(times)
-        }
+    for backend in backends or (indicator_core.get_backend(),):
+        suffix = f' [{backend}]' if backends else ''
+        with indicator_core.use_backend(backend):
+            for name, func in indicators.items():
+                results[name + suffix] = _time_calls(func, iterations)
+
+            if window_lengths:
+                scaling = benchmark_window_scaling(scaling_bars, window_lengths, iterations)
+                for name, timing in scaling.items():
+                    results[name + suffix] = timing
     
     return results
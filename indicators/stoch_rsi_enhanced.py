@@ -8,9 +8,69 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
 
+from . import core as indicator_core
+
 logger = logging.getLogger(__name__)
 
 
+def _unix_seconds(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    # Go through datetime64[s] so the result does not depend on the index unit
+    values = pd.DatetimeIndex(timestamps).values
+    return values.astype('datetime64[s]').astype(np.int64)
+
+
+def detect_stoch_rsi_signals(stoch_k, stoch_d, oversold: float = 20,
+                             overbought: float = 80) -> Dict[str, np.ndarray]:
+    """
+    Detect StochRSI crossover signals for every bar at once.
+    
+    A buy is %K crossing above %D below ``oversold``; a sell is %K crossing
+    below %D above ``overbought``. Strength is how far past the threshold
+    %K is, capped at 1. Bars with missing %K/%D (and the first bar) never
+    signal.
+    
+    Args:
+        stoch_k: %K values (Series or array)
+        stoch_d: %D values (Series or array)
+        oversold: Oversold threshold
+        overbought: Overbought threshold
+        
+    Returns:
+        Dictionary of arrays: ``signals`` (int8: 1 buy, -1 sell, 0 none),
+        ``signal_strength`` (float) and ``signal_type`` ('BUY'/'SELL'/'NEUTRAL')
+    """
+    k = np.asarray(stoch_k, dtype=float)
+    d = np.asarray(stoch_d, dtype=float)
+    n = min(len(k), len(d))
+    k, d = k[:n], d[:n]
+    
+    prev_k = np.empty(n)
+    prev_d = np.empty(n)
+    prev_k[:1] = prev_d[:1] = np.nan
+    prev_k[1:] = k[:-1]
+    prev_d[1:] = d[:-1]
+    
+    # NaN comparisons are False, so missing values never signal
+    buy = (prev_k <= prev_d) & (k > d) & (k < oversold)
+    sell = ~buy & (prev_k >= prev_d) & (k < d) & (k > overbought)
+    
+    signals = np.zeros(n, dtype=np.int8)
+    signals[buy] = 1
+    signals[sell] = -1
+    
+    signal_strength = np.zeros(n)
+    signal_strength[buy] = np.minimum((oversold - k[buy]) / oversold, 1.0)
+    signal_strength[sell] = np.minimum((k[sell] - overbought) / (100 - overbought), 1.0)
+    
+    signal_type = np.where(buy, 'BUY', np.where(sell, 'SELL', 'NEUTRAL'))
+    
+    return {
+        'signals': signals,
+        'signal_strength': signal_strength,
+        'signal_type': signal_type
+    }
+
+
 class StochRSIIndicator:
     """
     Enhanced StochRSI indicator with optimized calculations for real-time trading.
@@ -51,18 +111,13 @@ class StochRSIIndicator:
         Returns:
             RSI values as pandas Series
         """
-        delta = prices.diff()
-        gains = delta.where(delta > 0, 0)
-        losses = -delta.where(delta < 0, 0)
-        
         # Use Wilder's smoothing (exponential moving average)
-        avg_gains = gains.ewm(com=self.rsi_length - 1, min_periods=self.rsi_length).mean()
-        avg_losses = losses.ewm(com=self.rsi_length - 1, min_periods=self.rsi_length).mean()
-        
-        rs = avg_gains / avg_losses
-        rsi = 100 - (100 / (1 + rs))
+        rsi = indicator_core.rsi(
+            prices.to_numpy(dtype=float), self.rsi_length, smoothing='wilder_ewm',
+            leading_zero=True, zero_loss='divide'
+        )
         
-        return rsi
+        return pd.Series(rsi, index=prices.index)
     
     def calculate_stochastic_on_rsi(self, rsi: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """
@@ -75,22 +130,20 @@ class StochRSIIndicator:
             Tuple of (%K, %D) series
         """
         # Calculate %K
-        rsi_low = rsi.rolling(window=self.stoch_length, min_periods=self.stoch_length).min()
-        rsi_high = rsi.rolling(window=self.stoch_length, min_periods=self.stoch_length).max()
+        values = rsi.to_numpy(dtype=float)
+        rsi_low = indicator_core.rolling_min(values, self.stoch_length)
+        rsi_high = indicator_core.rolling_max(values, self.stoch_length)
         
-        # Avoid division by zero
-        rsi_range = rsi_high - rsi_low
-        stoch_k_raw = np.where(rsi_range != 0, (rsi - rsi_low) / rsi_range * 100, 50)
+        # A flat RSI range reads as mid-scale
+        stoch_k_raw = indicator_core.range_position(values, rsi_low, rsi_high, zero_range=50)
         
         # Apply smoothing to %K
-        stoch_k = pd.Series(stoch_k_raw, index=rsi.index).rolling(
-            window=self.k_smoothing, min_periods=1
-        ).mean()
+        stoch_k = indicator_core.rolling_mean(stoch_k_raw, self.k_smoothing, min_periods=1)
         
         # Calculate %D (smoothed %K)
-        stoch_d = stoch_k.rolling(window=self.d_smoothing, min_periods=1).mean()
+        stoch_d = indicator_core.rolling_mean(stoch_k, self.d_smoothing, min_periods=1)
         
-        return stoch_k, stoch_d
+        return pd.Series(stoch_k, index=rsi.index), pd.Series(stoch_d, index=rsi.index)
     
     def calculate_full_stoch_rsi(self, prices: pd.Series) -> Dict[str, pd.Series]:
         """
@@ -114,7 +167,7 @@ class StochRSIIndicator:
             'StochRSI_D': stoch_d
         }
     
-    def generate_signals(self, stoch_k: pd.Series, stoch_d: pd.Series) -> Dict[str, pd.Series]:
+    def generate_signals(self, stoch_k: pd.Series, stoch_d: pd.Series) -> Dict[str, np.ndarray]:
         """
         Generate buy/sell signals based on StochRSI.
         
@@ -123,41 +176,12 @@ class StochRSIIndicator:
             stoch_d: %D values
             
         Returns:
-            Dictionary with signal information
+            Dictionary of arrays: ``signals`` (1 buy, -1 sell, 0 none),
+            ``signal_strength`` (0-1) and ``signal_type``
         """
-        signals = pd.Series(0, index=stoch_k.index)  # 0 = no signal
-        signal_strength = pd.Series(0.0, index=stoch_k.index)
-        signal_type = pd.Series('NEUTRAL', index=stoch_k.index)
-        
-        # Generate signals
-        for i in range(1, len(stoch_k)):
-            if pd.isna(stoch_k.iloc[i]) or pd.isna(stoch_d.iloc[i]):
-                continue
-                
-            current_k = stoch_k.iloc[i]
-            current_d = stoch_d.iloc[i]
-            prev_k = stoch_k.iloc[i-1]
-            prev_d = stoch_d.iloc[i-1]
-            
-            # Buy signal: %K crosses above %D in oversold region
-            if (prev_k <= prev_d and current_k > current_d and 
-                current_k < self.oversold_threshold):
-                signals.iloc[i] = 1
-                signal_strength.iloc[i] = min((self.oversold_threshold - current_k) / self.oversold_threshold, 1.0)
-                signal_type.iloc[i] = 'BUY'
-                
-            # Sell signal: %K crosses below %D in overbought region  
-            elif (prev_k >= prev_d and current_k < current_d and 
-                  current_k > self.overbought_threshold):
-                signals.iloc[i] = -1
-                signal_strength.iloc[i] = min((current_k - self.overbought_threshold) / (100 - self.overbought_threshold), 1.0)
-                signal_type.iloc[i] = 'SELL'
-        
-        return {
-            'signals': signals,
-            'signal_strength': signal_strength,
-            'signal_type': signal_type
-        }
+        return detect_stoch_rsi_signals(
+            stoch_k, stoch_d, self.oversold_threshold, self.overbought_threshold
+        )
     
     def format_for_lightweight_charts(self, data: Dict[str, pd.Series], 
                                     timestamps: pd.DatetimeIndex) -> Dict[str, List[Dict]]:
@@ -169,20 +193,28 @@ class StochRSIIndicator:
             timestamps: DatetimeIndex for time conversion
             
         Returns:
-            Dictionary formatted for Lightweight Charts
+            Dictionary formatted for Lightweight Charts; non-numeric entries
+            such as ``signal_type`` are skipped
         """
         formatted_data = {}
         
         # Convert timestamps to UNIX timestamps
-        unix_timestamps = (timestamps.astype(np.int64) // 10**9).astype(int)
+        unix_timestamps = _unix_seconds(timestamps)
         
         for key, series in data.items():
-            if series is not None and len(series) > 0:
-                formatted_data[key.lower()] = [
-                    {'time': int(ts), 'value': float(val)}
-                    for ts, val in zip(unix_timestamps, series)
-                    if not pd.isna(val) and ts > 0
-                ]
+            if series is None or len(series) == 0:
+                continue
+            values = np.asarray(series)
+            if values.dtype.kind not in 'biuf':
+                continue
+            n = min(len(values), len(unix_timestamps))
+            values = values[:n].astype(float)
+            times = unix_timestamps[:n]
+            keep = ~np.isnan(values) & (times > 0)
+            formatted_data[key.lower()] = [
+                {'time': ts, 'value': val}
+                for ts, val in zip(times[keep].tolist(), values[keep].tolist())
+            ]
         
         return formatted_data
     
@@ -205,9 +237,9 @@ class StochRSIIndicator:
             latest_k = indicators['StochRSI_K'].iloc[-1] if len(indicators['StochRSI_K']) > 0 else None
             latest_d = indicators['StochRSI_D'].iloc[-1] if len(indicators['StochRSI_D']) > 0 else None
             latest_rsi = indicators['RSI'].iloc[-1] if len(indicators['RSI']) > 0 else None
-            latest_signal = signals['signals'].iloc[-1] if len(signals['signals']) > 0 else 0
-            latest_strength = signals['signal_strength'].iloc[-1] if len(signals['signal_strength']) > 0 else 0
-            latest_type = signals['signal_type'].iloc[-1] if len(signals['signal_type']) > 0 else 'NEUTRAL'
+            latest_signal = int(signals['signals'][-1]) if len(signals['signals']) > 0 else 0
+            latest_strength = float(signals['signal_strength'][-1]) if len(signals['signal_strength']) > 0 else 0
+            latest_type = str(signals['signal_type'][-1]) if len(signals['signal_type']) > 0 else 'NEUTRAL'
             
             # Determine market condition
             condition = 'NEUTRAL'
@@ -332,19 +364,15 @@ def get_signal_markers_for_chart(data: pd.DataFrame, stoch_k: pd.Series,
     
     try:
         # Convert timestamps to UNIX
-        unix_timestamps = (data.index.astype(np.int64) // 10**9).astype(int)
+        unix_timestamps = _unix_seconds(data.index)
         
-        for i in range(1, min(len(stoch_k), len(stoch_d), len(data))):
-            if pd.isna(stoch_k.iloc[i]) or pd.isna(stoch_d.iloc[i]):
-                continue
-                
-            current_k = stoch_k.iloc[i]
-            current_d = stoch_d.iloc[i]
-            prev_k = stoch_k.iloc[i-1]
-            prev_d = stoch_d.iloc[i-1]
-            
-            # Buy signal
-            if (prev_k <= prev_d and current_k > current_d and current_k < oversold):
+        n = min(len(stoch_k), len(stoch_d), len(data))
+        signals = detect_stoch_rsi_signals(
+            np.asarray(stoch_k)[:n], np.asarray(stoch_d)[:n], oversold, overbought
+        )['signals']
+        
+        for i in np.flatnonzero(signals):
+            if signals[i] > 0:
                 markers.append({
                     'time': int(unix_timestamps[i]),
                     'position': 'belowBar',
@@ -353,9 +381,7 @@ def get_signal_markers_for_chart(data: pd.DataFrame, stoch_k: pd.Series,
                     'text': 'StochRSI Buy',
                     'size': 1
                 })
-                
-            # Sell signal
-            elif (prev_k >= prev_d and current_k < current_d and current_k > overbought):
+            else:
                 markers.append({
                     'time': int(unix_timestamps[i]),
                     'position': 'aboveBar', 
@@ -3,9 +3,14 @@ SuperTrend Indicator Implementation
 Based on TradingView's SuperTrend indicator
 """
 
+import re
+from typing import Dict, Optional
+
 import pandas as pd
 import numpy as np
 
+from . import core as indicator_core
+
 
 def calculate_supertrend(df, period=10, multiplier=3.0):
     """
@@ -18,67 +23,17 @@ def calculate_supertrend(df, period=10, multiplier=3.0):
     
     Returns:
         DataFrame with SuperTrend values and signals
+
+    The band recursion runs in ``indicators.core``; use
+    ``core.SuperTrendState`` to update a live series one bar at a time.
     """
     
-    # Calculate ATR
-    high_low = df['high'] - df['low']
-    high_close = np.abs(df['high'] - df['close'].shift())
-    low_close = np.abs(df['low'] - df['close'].shift())
-    
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = np.max(ranges, axis=1)
-    atr = true_range.rolling(period).mean()
-    
-    # Calculate basic bands
-    hl_avg = (df['high'] + df['low']) / 2
-    upper_band = hl_avg + (multiplier * atr)
-    lower_band = hl_avg - (multiplier * atr)
-    
-    # Initialize SuperTrend values
-    supertrend = pd.Series(index=df.index, dtype=float)
-    direction = pd.Series(index=df.index, dtype=int)
-    
-    for i in range(period, len(df)):
-        # Current close price
-        curr_close = df['close'].iloc[i]
-        
-        # Previous values
-        if i == period:
-            # First calculation
-            if curr_close <= upper_band.iloc[i]:
-                supertrend.iloc[i] = upper_band.iloc[i]
-                direction.iloc[i] = -1
-            else:
-                supertrend.iloc[i] = lower_band.iloc[i]
-                direction.iloc[i] = 1
-        else:
-            prev_direction = direction.iloc[i-1]
-            
-            # Calculate current bands with proper logic
-            if prev_direction == 1:
-                # Previous trend was up
-                if curr_close <= lower_band.iloc[i]:
-                    supertrend.iloc[i] = upper_band.iloc[i]
-                    direction.iloc[i] = -1
-                else:
-                    supertrend.iloc[i] = max(lower_band.iloc[i], supertrend.iloc[i-1])
-                    direction.iloc[i] = 1
-            else:
-                # Previous trend was down
-                if curr_close >= upper_band.iloc[i]:
-                    supertrend.iloc[i] = lower_band.iloc[i]
-                    direction.iloc[i] = 1
-                else:
-                    supertrend.iloc[i] = min(upper_band.iloc[i], supertrend.iloc[i-1])
-                    direction.iloc[i] = -1
+    bands = indicator_core.supertrend(df['high'], df['low'], df['close'], period, multiplier)
     
     # Create result DataFrame
     result = pd.DataFrame(index=df.index)
-    result['supertrend'] = supertrend
-    result['direction'] = direction
-    result['upper_band'] = upper_band
-    result['lower_band'] = lower_band
-    result['atr'] = atr
+    for column in ('supertrend', 'direction', 'upper_band', 'lower_band', 'atr'):
+        result[column] = bands[column]
     
     # Generate signals
     result['signal'] = 0
@@ -163,9 +118,98 @@ def get_current_signal(df, period=10, multiplier=3.0):
     }
 
 
-def calculate_multi_timeframe_supertrend(symbol, data_manager, timeframes=['1Min', '5Min', '15Min'], period=10, multiplier=3.0):
+_TIMEFRAME_PATTERN = re.compile(r'^(\d+)\s*(Min|Hour)$')
+_OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def timeframe_minutes(timeframe: str) -> Optional[int]:
+    """Minutes per bar for ``'<n>Min'`` / ``'<n>Hour'`` timeframes, else None."""
+    match = _TIMEFRAME_PATTERN.match(str(timeframe))
+    if not match:
+        return None
+    return int(match.group(1)) * (60 if match.group(2) == 'Hour' else 1)
+
+
+def resample_bars(bars: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """
+    Aggregate 1Min OHLCV bars into ``minutes``-long bars.
+
+    Buckets are aligned to the clock and labelled by their start, like
+    Alpaca's own bars. A leading bucket only partly covered by ``bars`` is
+    dropped; the trailing one is kept so the newest bar stays current.
+    """
+    if minutes <= 1 or bars.empty:
+        return bars
+    rule = f'{minutes}min'
+    bars = bars[bars.index >= bars.index[0].ceil(rule)]
+    aggregation = {column: how for column, how in _OHLCV_AGGREGATION.items() if column in bars}
+    resampled = bars.resample(rule, label='left', closed='left').agg(aggregation)
+    return resampled.dropna(subset=['close'])
+
+
+class MinuteBarCache:
+    """
+    1Min bars per symbol, topped up from a data manager.
+
+    The first request for a symbol fetches the full history; later requests
+    fetch only the latest ``refresh_bars`` bars and splice them on. Whether
+    the history is already there is judged by the number of bars requested,
+    not returned, so sparse minutes or a capped response do not cause a full
+    fetch on every call. If the refresh does not overlap the cache (a gap
+    longer than ``refresh_bars``) the history is fetched again.
+    """
+
+    def __init__(self, refresh_bars: int = 50):
+        self.refresh_bars = refresh_bars
+        self._bars: Dict[str, pd.DataFrame] = {}
+        # Bars requested for each cached history
+        self._windows: Dict[str, int] = {}
+
+    def get(self, symbol: str, data_manager, bars: int) -> pd.DataFrame:
+        """Return at least the latest ``bars`` 1Min bars for ``symbol`` where available."""
+        cached = self._bars.get(symbol)
+        if cached is None or self._windows.get(symbol, 0) < bars:
+            cached = self._fetch(data_manager, symbol, bars)
+        else:
+            recent = self._fetch(data_manager, symbol, min(self.refresh_bars, bars))
+            if not recent.empty:
+                if cached.empty or recent.index[0] > cached.index[-1]:
+                    cached = self._fetch(data_manager, symbol, bars)
+                else:
+                    cached = pd.concat([cached[cached.index < recent.index[0]], recent])
+        cached = cached.iloc[-bars:]
+        self._bars[symbol] = cached
+        self._windows[symbol] = bars
+        return cached
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._bars.clear()
+            self._windows.clear()
+        else:
+            self._bars.pop(symbol, None)
+            self._windows.pop(symbol, None)
+
+    @staticmethod
+    def _fetch(data_manager, symbol: str, limit: int) -> pd.DataFrame:
+        bars = data_manager.get_historical_data(symbol, '1Min', limit=limit)
+        if bars is None or bars.empty:
+            return pd.DataFrame()
+        return bars.sort_index()
+
+
+_minute_bars = MinuteBarCache()
+
+
+def calculate_multi_timeframe_supertrend(symbol, data_manager, timeframes=['1Min', '5Min', '15Min'], period=10, multiplier=3.0,
+                                         limit=200, bar_cache=None):
     """
     Calculate SuperTrend across multiple timeframes for stronger signals
+
+    Minute and hour timeframes are resampled from one cached 1Min history
+    (``limit`` bars of the longest timeframe), so a call costs one small
+    refresh fetch instead of one full fetch per timeframe. Other timeframes
+    are still fetched directly.
     
     Args:
         symbol: Stock symbol
@@ -173,17 +217,26 @@ def calculate_multi_timeframe_supertrend(symbol, data_manager, timeframes=['1Min
         timeframes: List of timeframes to analyze
         period: ATR period
         multiplier: ATR multiplier
+        limit: Bars of history per timeframe
+        bar_cache: MinuteBarCache to use (defaults to a module-level cache)
     
     Returns:
         dict with multi-timeframe analysis
     """
     
+    bar_cache = _minute_bars if bar_cache is None else bar_cache
+    minutes = {tf: timeframe_minutes(tf) for tf in timeframes}
+    derived = [m for m in minutes.values() if m is not None]
+    minute_bars = bar_cache.get(symbol, data_manager, limit * max(derived)) if derived else None
+    
     results = {}
     signals = []
     
     for tf in timeframes:
-        # Get historical data for timeframe
-        df = data_manager.get_historical_data(symbol, tf, limit=200)
+        if minutes[tf] is not None:
+            df = resample_bars(minute_bars, minutes[tf]).iloc[-limit:]
+        else:
+            df = data_manager.get_historical_data(symbol, tf, limit=limit)
         
         if not df.empty and len(df) > period:
             signal_data = get_current_signal(df, period, multiplier)
@@ -16,8 +16,11 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
+from collections import deque
 from datetime import datetime, timedelta
 
+from . import core as indicator_core
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,6 +46,145 @@ class VolumeProfileLevel:
     strength: float
 
 
+def _bin_ranges(price_bins: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Half-open index ranges of the sorted ``price_bins`` inside each ``[low, high]``."""
+    start = np.searchsorted(price_bins, low, side='left')
+    stop = np.maximum(np.searchsorted(price_bins, high, side='right'), start)
+    return start, stop
+
+
+def _accumulate_ranges(start: np.ndarray, stop: np.ndarray, volume: np.ndarray,
+                       num_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Add ``volume / (stop - start)`` to every bin in each range.
+
+    Uses difference arrays, so the cost is O(candles + bins) however wide
+    the candles are.
+
+    Returns:
+        Tuple of (volume per bin, number of candles covering each bin)
+    """
+    width = stop - start
+    covered = width > 0
+    share = np.divide(volume, width, out=np.zeros(len(volume)), where=covered)
+    share_diff = np.zeros(num_bins + 1)
+    count_diff = np.zeros(num_bins + 1, dtype=np.int64)
+    np.add.at(share_diff, start[covered], share[covered])
+    np.add.at(share_diff, stop[covered], -share[covered])
+    np.add.at(count_diff, start[covered], 1)
+    np.add.at(count_diff, stop[covered], -1)
+    return np.cumsum(share_diff)[:-1], np.cumsum(count_diff)[:-1]
+
+
+def _significant_levels(prices: np.ndarray, volumes: np.ndarray,
+                        current_price: float) -> List[VolumeProfileLevel]:
+    """Top 20% of price levels by volume, labelled against ``current_price``."""
+    if len(prices) == 0:
+        return []
+    order = np.argsort(-volumes, kind='stable')[:max(1, len(prices) // 5)]
+    peak = volumes[order[0]]
+    return [
+        VolumeProfileLevel(
+            price=float(prices[i]),
+            volume=float(volumes[i]),
+            level_type='support' if prices[i] < current_price else 'resistance',
+            strength=float(volumes[i] / peak),  # Normalize to 0-1
+        )
+        for i in order
+    ]
+
+
+def time_of_day_volume_mean(slots: np.ndarray, volume: np.ndarray, period: int) -> np.ndarray:
+    """
+    Trailing mean volume of earlier bars in the same time-of-day slot.
+
+    Equivalent to ``groupby(slot).transform(lambda x: x.rolling(min(len(x),
+    period)).mean())`` without a Python call per group: rows are stably
+    sorted by slot so each slot is contiguous, one rolling mean runs over the
+    sorted volumes, and only windows lying entirely inside a slot are kept.
+    A slot with fewer than ``period`` bars gets its overall mean on its last
+    bar, as before.
+
+    Args:
+        slots: Integer slot per bar (e.g. minute of day)
+        volume: Volume per bar
+        period: Bars per slot in the baseline
+
+    Returns:
+        Baseline volume per bar in the original order (NaN where undefined)
+    """
+    n = len(volume)
+    result = np.full(n, np.nan)
+    if n == 0:
+        return result
+    order = np.argsort(slots, kind='stable')
+    sorted_slots = slots[order]
+    sorted_volume = volume[order]
+
+    group_starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+    group_sizes = np.diff(np.r_[group_starts, n])
+    rank = np.arange(n) - np.repeat(group_starts, group_sizes)
+    size = np.repeat(group_sizes, group_sizes)
+
+    baseline = np.full(n, np.nan)
+    full = (size >= period) & (rank >= period - 1)
+    if full.any():
+        baseline[full] = indicator_core.rolling_mean(sorted_volume, period)[full]
+    short = group_sizes < period
+    if short.any():
+        ends = group_starts[short] + group_sizes[short] - 1
+        baseline[ends] = np.add.reduceat(sorted_volume, group_starts)[short] / group_sizes[short]
+
+    result[order] = baseline
+    return result
+
+
+class TimeOfDayVolumeBaseline:
+    """
+    Per-slot volume baseline maintained as bars arrive.
+
+    Keeps a ring buffer of the last ``period`` volumes for each minute-of-day
+    slot with a running sum, so ``update`` is O(1). Once a slot has ``period``
+    bars the baseline equals ``time_of_day_volume_mean``; before that it is
+    the mean of the bars seen so far.
+    """
+
+    def __init__(self, period: int = 50, slots: int = 1440):
+        self.period = period
+        self._volumes = np.zeros((slots, period))
+        self._sums = np.zeros(slots)
+        self._counts = np.zeros(slots, dtype=np.int64)
+
+    @staticmethod
+    def slot_of(timestamp) -> int:
+        ts = pd.Timestamp(timestamp)
+        return ts.hour * 60 + ts.minute
+
+    def update(self, timestamp, volume: float) -> float:
+        """Add one bar and return the baseline for its slot, including it."""
+        slot = self.slot_of(timestamp)
+        count = self._counts[slot]
+        position = count % self.period
+        if count >= self.period:
+            self._sums[slot] -= self._volumes[slot, position]
+        self._volumes[slot, position] = volume
+        self._sums[slot] += volume
+        self._counts[slot] = count + 1
+        if self._counts[slot] % self.period == 0:
+            # Resum once per cycle so the running sum does not drift
+            self._sums[slot] = self._volumes[slot].sum()
+        return self.baseline(slot)
+
+    def baseline(self, slot: int) -> float:
+        filled = min(self._counts[slot], self.period)
+        return self._sums[slot] / filled if filled else float('nan')
+
+    def relative_volume(self, timestamp, volume: float) -> float:
+        """Add one bar and return its volume relative to the slot baseline."""
+        baseline = self.update(timestamp, volume)
+        return volume / baseline if baseline else float('nan')
+
+
 class VolumeAnalyzer:
     """
     Comprehensive volume analysis for trading signal confirmation
@@ -61,6 +203,7 @@ class VolumeAnalyzer:
         self.volume_confirmation_threshold = getattr(config, 'volume_confirmation_threshold', 1.2) if config else 1.2
         self.profile_periods = getattr(config, 'profile_periods', 100) if config else 100
         self.min_volume_ratio = getattr(config, 'min_volume_ratio', 1.0) if config else 1.0
+        self._time_of_day_baselines: Dict[str, TimeOfDayVolumeBaseline] = {}
         
         logger.info(f"VolumeAnalyzer initialized with period={self.volume_period}, threshold={self.volume_confirmation_threshold}")
     
@@ -111,12 +254,13 @@ class VolumeAnalyzer:
             
             # Calculate average volume for the same time of day over past periods
             if 'timestamp' in df.columns:
-                df['hour'] = pd.to_datetime(df['timestamp']).dt.hour
-                df['minute'] = pd.to_datetime(df['timestamp']).dt.minute
+                timestamps = pd.to_datetime(df['timestamp'])
+                df['hour'] = timestamps.dt.hour
+                df['minute'] = timestamps.dt.minute
                 
-                # Group by time and calculate average volume
-                time_avg_volume = df.groupby(['hour', 'minute'])['volume'].transform(
-                    lambda x: x.rolling(window=min(len(x), self.relative_volume_period)).mean()
+                slots = (df['hour'] * 60 + df['minute']).to_numpy()
+                time_avg_volume = time_of_day_volume_mean(
+                    slots, df['volume'].to_numpy(dtype=float), self.relative_volume_period
                 )
                 
                 df['relative_volume'] = df['volume'] / time_avg_volume
@@ -140,6 +284,27 @@ class VolumeAnalyzer:
             logger.error(f"Error calculating relative volume: {e}")
             return df
     
+    def update_relative_volume(self, symbol: str, timestamp, volume: float) -> float:
+        """
+        Relative volume for one new bar from the symbol's running time-of-day baseline
+        
+        Use this per scan instead of recalculating the whole frame with
+        calculate_relative_volume.
+        
+        Args:
+            symbol: Symbol the bar belongs to
+            timestamp: Bar timestamp
+            volume: Bar volume
+            
+        Returns:
+            Volume divided by the mean volume for the same time of day
+        """
+        baseline = self._time_of_day_baselines.get(symbol)
+        if baseline is None:
+            baseline = TimeOfDayVolumeBaseline(self.relative_volume_period)
+            self._time_of_day_baselines[symbol] = baseline
+        return baseline.relative_volume(timestamp, volume)
+    
     def analyze_volume_profile(self, df: pd.DataFrame, lookback_periods: int = None) -> List[VolumeProfileLevel]:
         """
         Analyze volume profile to identify support/resistance levels
@@ -156,7 +321,7 @@ class VolumeAnalyzer:
                 lookback_periods = self.profile_periods
             
             # Use last N periods for analysis
-            analysis_df = df.tail(lookback_periods).copy()
+            analysis_df = df.tail(lookback_periods)
             
             if len(analysis_df) < 20:
                 logger.warning("Insufficient data for volume profile analysis")
@@ -169,45 +334,15 @@ class VolumeAnalyzer:
             
             price_bins = np.linspace(price_min, price_max, num_bins)
             
-            # Aggregate volume at each price level
-            volume_at_price = {}
-            
-            for _, row in analysis_df.iterrows():
-                # Distribute volume across the price range of each candle
-                low_price = row['low']
-                high_price = row['high']
-                volume = row['volume']
-                
-                # Find bins that overlap with this candle's price range
-                relevant_bins = price_bins[(price_bins >= low_price) & (price_bins <= high_price)]
-                
-                if len(relevant_bins) > 0:
-                    volume_per_bin = volume / len(relevant_bins)
-                    for price in relevant_bins:
-                        if price not in volume_at_price:
-                            volume_at_price[price] = 0
-                        volume_at_price[price] += volume_per_bin
-            
-            # Convert to sorted list
-            volume_profile = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)
-            
-            # Identify significant levels (top 20% by volume)
-            significant_levels = volume_profile[:max(1, len(volume_profile) // 5)]
+            # Spread each candle's volume evenly over the bins inside its range
+            start, stop = _bin_ranges(price_bins, analysis_df['low'].to_numpy(), analysis_df['high'].to_numpy())
+            volume_at_price, candles = _accumulate_ranges(
+                start, stop, analysis_df['volume'].to_numpy(dtype=float), num_bins
+            )
             
-            # Classify levels as support or resistance
             current_price = analysis_df['close'].iloc[-1]
-            profile_levels = []
-            
-            for price, volume in significant_levels:
-                level_type = 'support' if price < current_price else 'resistance'
-                strength = volume / max(vol for _, vol in volume_profile)  # Normalize to 0-1
-                
-                profile_levels.append(VolumeProfileLevel(
-                    price=price,
-                    volume=volume,
-                    level_type=level_type,
-                    strength=strength
-                ))
+            touched = candles > 0
+            profile_levels = _significant_levels(price_bins[touched], volume_at_price[touched], current_price)
             
             logger.debug(f"Identified {len(profile_levels)} significant volume profile levels")
             return profile_levels
@@ -426,6 +561,100 @@ class VolumeAnalyzer:
             return {}
 
 
+class RollingVolumeProfile:
+    """
+    Volume profile over the last ``window`` bars, updated one bar at a time.
+
+    Price levels sit on a fixed grid (multiples of ``bin_size``) so they do
+    not move as the window rolls. Each bar spreads its volume evenly over
+    the grid levels inside its high/low range, the same rule
+    ``VolumeAnalyzer.analyze_volume_profile`` uses. ``add_bar`` adds the new
+    bar and subtracts the one leaving the window, touching only the levels
+    those two bars cover.
+    """
+
+    def __init__(self, bin_size: float, window: int = 100):
+        if bin_size <= 0:
+            raise ValueError("bin_size must be positive")
+        self.bin_size = float(bin_size)
+        self.window = window
+        self._bars = deque()  # (start, stop, share) in grid-index space
+        self._offset = 0  # grid index of _volume[0]
+        self._volume = np.zeros(0)
+        self._candles = np.zeros(0, dtype=np.int64)
+        self.last_close = np.nan
+
+    @classmethod
+    def from_bars(cls, df: pd.DataFrame, window: int = 100, num_bins: int = 50) -> 'RollingVolumeProfile':
+        """Size the grid from the range of the last ``window`` bars and load them."""
+        recent = df.tail(window)
+        price_range = recent['high'].max() - recent['low'].min()
+        bin_size = price_range / max(num_bins - 1, 1) if price_range > 0 else 1.0
+        profile = cls(bin_size, window)
+        for low, high, close, volume in zip(recent['low'], recent['high'], recent['close'], recent['volume']):
+            profile.add_bar(low, high, close, volume)
+        return profile
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def add_bar(self, low: float, high: float, close: float, volume: float) -> None:
+        """Add the newest bar, dropping the oldest once the window is full."""
+        start = int(np.ceil(low / self.bin_size))
+        stop = max(int(np.floor(high / self.bin_size)) + 1, start)
+        share = volume / (stop - start) if stop > start else 0.0
+        if stop > start:
+            self._reserve(start, stop)
+            self._apply(start, stop, share, 1)
+        self._bars.append((start, stop, share))
+        self.last_close = float(close)
+        if len(self._bars) > self.window:
+            old_start, old_stop, old_share = self._bars.popleft()
+            if old_stop > old_start:
+                self._apply(old_start, old_stop, -old_share, -1)
+
+    def profile(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (prices, volumes) for every level covered by a bar in the window."""
+        covered = np.flatnonzero(self._candles > 0)
+        prices = (covered + self._offset) * self.bin_size
+        return prices, self._volume[covered]
+
+    def levels(self, current_price: Optional[float] = None) -> List[VolumeProfileLevel]:
+        """Significant levels (top 20% by volume) relative to ``current_price``."""
+        prices, volumes = self.profile()
+        price = self.last_close if current_price is None else current_price
+        return _significant_levels(prices, volumes, price)
+
+    def _apply(self, start: int, stop: int, share: float, count: int) -> None:
+        lo, hi = start - self._offset, stop - self._offset
+        self._volume[lo:hi] += share
+        self._candles[lo:hi] += count
+        if count < 0:
+            # Levels no bar covers any more go back to exactly zero
+            emptied = self._candles[lo:hi] == 0
+            self._volume[lo:hi][emptied] = 0.0
+
+    def _reserve(self, start: int, stop: int) -> None:
+        if len(self._volume) and self._offset <= start and stop <= self._offset + len(self._volume):
+            return
+        if len(self._volume) == 0:
+            new_offset, new_end = start, stop
+        else:
+            new_offset = min(start, self._offset)
+            new_end = max(stop, self._offset + len(self._volume))
+        # Leave headroom so a trending price does not reallocate every bar
+        pad = max(new_end - new_offset, 16) // 2
+        new_offset -= pad
+        new_end += pad
+        volume = np.zeros(new_end - new_offset)
+        candles = np.zeros(new_end - new_offset, dtype=np.int64)
+        if len(self._volume):
+            lo = self._offset - new_offset
+            volume[lo:lo + len(self._volume)] = self._volume
+            candles[lo:lo + len(self._candles)] = self._candles
+        self._offset, self._volume, self._candles = new_offset, volume, candles
+
+
 def get_volume_analyzer(config=None) -> VolumeAnalyzer:
     """
     Factory function to get a VolumeAnalyzer instance
@@ -444,5 +673,8 @@ __all__ = [
     'VolumeAnalyzer',
     'VolumeConfirmationResult', 
     'VolumeProfileLevel',
-    'get_volume_analyzer'
+    'RollingVolumeProfile',
+    'TimeOfDayVolumeBaseline',
+    'get_volume_analyzer',
+    'time_of_day_volume_mean'
 ]
\ No newline at end of file
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard payload encode times for the stdlib and orjson backends."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.json_encoding import benchmark_json_encoding, epoch_millis, to_columnar
+
+
+def _build_payloads(bars: int, positions: int) -> dict:
+    index = pd.date_range("2025-01-01", periods=bars, freq="min", tz="UTC")
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal(bars).cumsum()
+    frame = pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": rng.random(bars)},
+        index=index,
+    )
+
+    # Row-oriented payload as previously built by the chart endpoints.
+    rows = [
+        {
+            "time": ts.isoformat(),
+            "timestamp": int(ts.timestamp() * 1000),
+            **{column: float(row[column]) for column in frame.columns},
+        }
+        for ts, row in frame.iterrows()
+    ]
+    columnar = to_columnar(frame, index_key="time")
+    columnar["timestamp"] = epoch_millis(frame.index)
+
+    position_rows = [
+        {
+            "symbol": f"SYM{i}/USD",
+            "qty": float(i),
+            "avg_entry_price": float(close[i % bars]),
+            "unrealized_pl": float(rng.standard_normal()),
+            "side": "long",
+        }
+        for i in range(positions)
+    ]
+    return {
+        "chart_rows": {"bars": rows},
+        "chart_columnar": {"columns": columnar},
+        "positions": position_rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, payload in _build_payloads(args.bars, args.positions).items():
+        results = benchmark_json_encoding(payload, iterations=args.iterations)
+        for backend, stats in results.items():
+            print(
+                f"{name:<16} {backend:<7} avg={stats['avg_time'] * 1000:8.3f}ms "
+                f"min={stats['min_time'] * 1000:8.3f}ms size={int(stats['bytes'])}B"
+            )
+
+
+if __name__ == "__main__":
+    main()
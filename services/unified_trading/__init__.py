@@ -13,6 +13,7 @@ from .state import (
     QUOTE_SUFFIXES,
     SessionMetrics,
     TradingState,
+    account_state_worker,
     manage_background_tasks,
     refresh_scanner_symbols,
     to_display_symbol,
@@ -30,6 +31,7 @@ __all__ = [
     "set_background_workers",
     "SessionMetrics",
     "TradingState",
+    "account_state_worker",
     "manage_background_tasks",
     "refresh_scanner_symbols",
     "to_display_symbol",
@@ -4,7 +4,7 @@ import logging
 from collections import OrderedDict
 from typing import Iterable, Tuple
 
-from .state import BackgroundWorker
+from .state import BackgroundWorker, account_state_worker
 
 
 logger = logging.getLogger(__name__)
@@ -64,6 +64,8 @@ class BackgroundWorkerRegistry:
 
 
 _registry = BackgroundWorkerRegistry()
+# Fills TradingState's account/positions/orders caches from the shared refresher
+_registry.register(account_state_worker)
 
 
 def register_background_worker(
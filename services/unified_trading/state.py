@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from asyncio import Task, TaskGroup
 from collections import deque
 from collections.abc import Awaitable, Callable, Iterable
@@ -142,6 +143,40 @@ def refresh_scanner_symbols(state: TradingState) -> List[str]:
 BackgroundWorker = Callable[[TradingState], Awaitable[Any]]
 
 
+async def account_state_worker(state: TradingState) -> None:
+    """Keep ``account_cache``/``positions_cache``/``orders_cache`` fresh.
+
+    Attaches the state to the shared ``account_state`` refresher, so the
+    caches follow its scheduled and fill-triggered refreshes; one is created
+    from ``state.alpaca_api`` only when none is registered yet.
+    """
+
+    from core.account_state import create_account_state_refresher, get_account_state
+
+    refresher = get_account_state()
+    owned = refresher is None
+    if owned:
+        if state.alpaca_api is None:
+            return
+        refresher = create_account_state_refresher(
+            state.alpaca_api,
+            refresh_interval=state.settings.cache_refresh_seconds,
+            start=False,
+        )
+    refresher.attach_state(state)
+    if not refresher.get_status()["running"]:
+        refresher.start()
+        owned = True
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if refresher.state is state:
+            refresher.state = None
+        if owned:
+            await asyncio.to_thread(refresher.stop)
+
+
 @asynccontextmanager
 async def manage_background_tasks(
     state: TradingState,
@@ -182,6 +217,7 @@ __all__ = [
     "QUOTE_SUFFIXES",
     "SessionMetrics",
     "TradingState",
+    "account_state_worker",
     "manage_background_tasks",
     "refresh_scanner_symbols",
     "to_display_symbol",
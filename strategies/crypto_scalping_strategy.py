@@ -13,7 +13,8 @@ import threading
 import math
 import time
 import os
-from dataclasses import dataclass, asdict
+import uuid
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal, ROUND_DOWN
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
@@ -22,7 +23,30 @@ import logging
 from threading import Lock, RLock
 from enum import Enum
 from alpaca.common.exceptions import APIError
-
+from alpaca.trading.client import TradingClient
+
+from core.exit_rules import HOLD, MAX_HOLD, STOP_LOSS, TAKE_PROFIT, ExitRules, ExitRuleTable
+from core.http_transport import get_crypto_data_client
+from core.order_book import LocalOrderBook
+from core.order_execution import (
+    ACKED,
+    REJECTED,
+    EntryRequest,
+    ExecutionLimits,
+    OrderExecutionPipeline,
+    data_symbol,
+)
+from core.resilience import (
+    AlpacaAPIError,
+    CircuitOpenError,
+    ConnectionError as APIConnectionError,
+    RateLimitError,
+    TimeoutError as APITimeoutError,
+)
+from core.resilient_client import ResilientAlpacaClient
+from indicators import core as indicator_core
+from utils.records import SignalReasons, record
+from utils.rolling_window import RollingOrderStatistics
 from utils.trade_store import TradeStore
 from config.unified_config import CryptoScannerConfig, TradingConfig
 from strategies.trading_metrics import TradeLog  # Import instead of duplicate
@@ -217,7 +241,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@record(frozen=True)
 class CryptoSignal:
     symbol: str
     action: str  # 'buy', 'sell', 'hold'
@@ -229,7 +253,7 @@ class CryptoSignal:
     target_profit: float
     stop_loss: float
     timestamp: datetime
-    signal_reasons: list = None  # List of reasons for the signal
+    signal_reasons: Optional[SignalReasons] = None  # Reason codes, formatted when displayed
 
 
 class CryptoVolatilityScanner:
@@ -339,8 +363,16 @@ class CryptoVolatilityScanner:
         self.volatility_data: Dict[str, float] = {}
         self.volume_data: Dict[str, List[float]] = {}
         # Track indicator history per symbol for relative thresholds
-        # Structure: {symbol: {"rsi": [values], "stoch_k": [values]}}
-        self.indicator_history: Dict[str, Dict[str, List[float]]] = {}
+        # Structure: {symbol: {"rsi": window, "stoch_k": window}}
+        self.indicator_history: Dict[str, Dict[str, RollingOrderStatistics]] = {}
+        # Price samples received per symbol, and the sample count at which the
+        # indicator history was last recorded (one history point per sample)
+        self._price_samples: Dict[str, int] = {}
+        self._history_recorded_at: Dict[str, int] = {}
+        # Most recent scan result and indicators per symbol, published to
+        # out-of-process dashboards
+        self.last_signals: List[CryptoSignal] = []
+        self.last_indicators: Dict[str, Dict[str, Any]] = {}
 
         logger.info(
             "Initialized crypto scanner with %d configured symbols (%d defaults, %d overrides)",
@@ -359,15 +391,14 @@ class CryptoVolatilityScanner:
         Returns number of symbols successfully seeded.
         """
         from datetime import datetime, timedelta
-        from alpaca.data.historical.crypto import CryptoHistoricalDataClient
         from alpaca.data.requests import CryptoBarsRequest
         from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
         logger.info("📊 Pre-seeding historical data for relative thresholds...")
 
         try:
-            # Create data client from trading API credentials
-            data_client = CryptoHistoricalDataClient()
+            # Shared data client on the pooled session (crypto bars need no auth)
+            data_client = get_crypto_data_client()
         except Exception as e:
             logger.warning(f"Could not create data client for pre-seeding: {e}")
             return 0
@@ -409,10 +440,11 @@ class CryptoVolatilityScanner:
                 # Store price data
                 self.price_data[symbol] = prices
                 self.volume_data[symbol] = volumes
+                self._price_samples[symbol] = len(prices)
 
                 # Now compute indicators for the historical data to build indicator_history
                 # We'll compute RSI and StochK at multiple points to build history
-                self.indicator_history[symbol] = {"rsi": [], "stoch_k": []}
+                self.indicator_history[symbol] = self._new_indicator_history()
 
                 # Compute indicators at rolling windows through the data
                 min_window = 26  # Minimum needed for indicators
@@ -424,6 +456,7 @@ class CryptoVolatilityScanner:
                     self.indicator_history[symbol]["rsi"].append(rsi)
                     self.indicator_history[symbol]["stoch_k"].append(stoch_k)
 
+                self._history_recorded_at[symbol] = len(prices)
                 symbols_seeded += 1
                 logger.debug(
                     f"✅ {symbol}: Seeded {len(prices)} prices, "
@@ -564,13 +597,12 @@ class CryptoVolatilityScanner:
         volatility_scores = {}
 
         try:
-            from alpaca.data.historical import CryptoHistoricalDataClient
             from alpaca.data.requests import CryptoBarsRequest
             from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
             from datetime import datetime, timedelta
 
-            # Create data client (free tier, no auth needed for crypto data)
-            data_client = CryptoHistoricalDataClient()
+            # Shared data client (free tier, no auth needed for crypto data)
+            data_client = get_crypto_data_client()
 
             # Calculate timeframe
             end_time = datetime.now()
@@ -744,55 +776,28 @@ class CryptoVolatilityScanner:
         if len(prices) < period + 1:
             return 0.5
 
-        changes = np.diff(prices[-period - 1 :])
-        gains = np.where(changes > 0, changes, 0)
-        losses = np.where(changes < 0, -changes, 0)
-
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-
-        if avg_loss == 0:
-            return 1.0
-
-        rs = avg_gain / avg_loss
-        momentum = rs / (1 + rs)
-
-        return momentum
+        # RSI rescaled to 0-1 (1.0 when there were no losses)
+        return self.calculate_rsi(prices, period) / 100.0
 
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate RSI (Relative Strength Index) - 0-100 scale"""
         if len(prices) < period + 1:
             return 50.0  # Neutral
 
-        changes = np.diff(prices[-period - 1 :])
-        gains = np.where(changes > 0, changes, 0)
-        losses = np.where(changes < 0, -changes, 0)
-
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-
-        if avg_loss == 0:
-            return 100.0
-        if avg_gain == 0:
-            return 0.0
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+        # Cutler's RSI over the last `period` changes; 100 when there were no losses
+        rsi = indicator_core.rsi(
+            prices[-period - 1 :], period, smoothing="sma", zero_loss="max"
+        )
+        return float(rsi[-1])
 
     def calculate_ema(self, prices: List[float], period: int) -> float:
         """Calculate Exponential Moving Average"""
         if len(prices) < period:
             return prices[-1] if prices else 0.0
 
-        multiplier = 2 / (period + 1)
-        ema = prices[-period]  # Start with SMA
-
-        for price in prices[-period + 1 :]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        # Seeded with the first price of the window
+        ema = indicator_core.seeded_ema(prices[-period:], 2 / (period + 1))
+        return float(ema[-1])
 
     def calculate_macd(self, prices: List[float]) -> Tuple[float, float, float]:
         """Calculate MACD (12, 26, 9) - returns (macd_line, signal_line, histogram)"""
@@ -819,19 +824,17 @@ class CryptoVolatilityScanner:
         if len(prices) < rsi_period + stoch_period:
             return 50.0, 50.0
 
-        # Calculate RSI values for stoch period
-        rsi_values = []
-        for i in range(stoch_period):
-            end_idx = len(prices) - stoch_period + i + 1
-            rsi = self.calculate_rsi(prices[:end_idx], rsi_period)
-            rsi_values.append(rsi)
-
-        if not rsi_values:
-            return 50.0, 50.0
+        # RSI at each of the last stoch_period bars in one pass
+        rsi_values = indicator_core.rsi(
+            prices[-(rsi_period + stoch_period) :],
+            rsi_period,
+            smoothing="sma",
+            zero_loss="max",
+        )[-stoch_period:]
 
-        current_rsi = rsi_values[-1]
-        min_rsi = min(rsi_values)
-        max_rsi = max(rsi_values)
+        current_rsi = float(rsi_values[-1])
+        min_rsi = float(rsi_values.min())
+        max_rsi = float(rsi_values.max())
 
         if max_rsi == min_rsi:
             stoch_k = 50.0
@@ -897,26 +900,69 @@ class CryptoVolatilityScanner:
 
         This enables per-symbol adaptive thresholds instead of fixed universal thresholds.
         """
-        if symbol not in self.indicator_history:
-            return 0.5  # No history, assume neutral
-
-        history = self.indicator_history[symbol].get(indicator, [])
-        if len(history) < 20:  # Need enough history for meaningful range
+        history = self._indicator_window(symbol, indicator)
+        if history is None:
             return 0.5  # Not enough data, assume neutral
 
-        recent_min = min(history)
-        recent_max = max(history)
-        range_size = recent_max - recent_min
-
-        if range_size < 1.0:  # Very tight range, indicator barely moving
+        if history.max - history.min < 1.0:  # Very tight range, indicator barely moving
             return 0.5
 
         # Calculate position within range
-        relative_pos = (current_value - recent_min) / range_size
+        relative_pos = history.range_position(current_value)
         return max(0.0, min(1.0, relative_pos))  # Clamp to [0, 1]
 
-    def get_indicators(self, symbol: str) -> Dict[str, float]:
-        """Get all indicators for a symbol"""
+    def _get_percentile(self, symbol: str, indicator: str, current_value: float) -> float:
+        """
+        Percentile rank of the current indicator value within its recent history.
+
+        Unlike ``_get_relative_position`` this is insensitive to a single
+        outlier stretching the range: 0.1 means 10% of recent readings were lower.
+        """
+        history = self._indicator_window(symbol, indicator)
+        if history is None:
+            return 0.5
+        return history.percentile_rank(current_value)
+
+    def _indicator_window(self, symbol: str, indicator: str) -> Optional[RollingOrderStatistics]:
+        history = self.indicator_history.get(symbol, {}).get(indicator)
+        if history is None or len(history) < 20:  # Need enough history for meaningful range
+            return None
+        return history
+
+    @staticmethod
+    def _new_indicator_history() -> Dict[str, RollingOrderStatistics]:
+        # Keep last 200 values (~3+ hours of data at 1 update/min)
+        return {"rsi": RollingOrderStatistics(200), "stoch_k": RollingOrderStatistics(200)}
+
+    def record_indicator_history(self, symbol: str, rsi: float, stoch_k: float) -> bool:
+        """
+        Add one RSI/StochK point to the relative-threshold history.
+
+        At most one point is recorded per price sample, so repeated
+        ``get_indicators`` calls between market data updates do not skew the
+        history. Returns whether a point was recorded.
+        """
+        with self.lock:
+            samples = self._price_samples.get(symbol, 0)
+            if samples <= self._history_recorded_at.get(symbol, 0):
+                return False
+            history = self.indicator_history.get(symbol)
+            if history is None:
+                history = self.indicator_history[symbol] = self._new_indicator_history()
+            history["rsi"].append(rsi)
+            history["stoch_k"].append(stoch_k)
+            self._history_recorded_at[symbol] = samples
+            return True
+
+    def get_indicators(self, symbol: str, update_history: bool = True) -> Dict[str, float]:
+        """Get all indicators for a symbol
+
+        ``update_history=False`` leaves the relative-threshold history untouched,
+        for read-only consumers such as the dashboard snapshot. With the default
+        the history gains at most one point per new price sample (see
+        ``record_indicator_history``). The result is also kept in
+        ``last_indicators``.
+        """
         with self.lock:
             if symbol not in self.price_data or len(self.price_data[symbol]) < 26:
                 return {}
@@ -939,22 +985,14 @@ class CryptoVolatilityScanner:
             )
 
             # Store indicator history for relative threshold calculations
-            if symbol not in self.indicator_history:
-                self.indicator_history[symbol] = {"rsi": [], "stoch_k": []}
-
-            self.indicator_history[symbol]["rsi"].append(rsi)
-            self.indicator_history[symbol]["stoch_k"].append(stoch_k)
-
-            # Keep last 200 values (~3+ hours of data at 1 update/min)
-            for key in ["rsi", "stoch_k"]:
-                if len(self.indicator_history[symbol][key]) > 200:
-                    self.indicator_history[symbol][key] = self.indicator_history[symbol][key][-200:]
+            if update_history:
+                self.record_indicator_history(symbol, rsi, stoch_k)
 
             # Calculate relative positions (0.0 = at recent low, 1.0 = at recent high)
             rsi_relative = self._get_relative_position(symbol, "rsi", rsi)
             stoch_k_relative = self._get_relative_position(symbol, "stoch_k", stoch_k)
 
-            return {
+            indicators = {
                 "price": prices[-1],
                 "rsi": rsi,
                 "rsi_relative": rsi_relative,  # Where RSI sits in its recent range
@@ -963,6 +1001,8 @@ class CryptoVolatilityScanner:
                 "macd_histogram": histogram,
                 "stoch_k": stoch_k,
                 "stoch_k_relative": stoch_k_relative,  # Where StochK sits in its recent range
+                "rsi_percentile": self._get_percentile(symbol, "rsi", rsi),
+                "stoch_k_percentile": self._get_percentile(symbol, "stoch_k", stoch_k),
                 "stoch_d": stoch_d,
                 "ema_9": ema_9,
                 "ema_21": ema_21,
@@ -973,6 +1013,8 @@ class CryptoVolatilityScanner:
                 "spike_magnitude": spike_magnitude,
                 "spike_direction": spike_direction,
             }
+            self.last_indicators[symbol] = dict(indicators)
+            return indicators
 
     def refresh_volatile_pairs(self, api) -> None:
         """Periodically rescan market for most volatile pairs."""
@@ -1165,6 +1207,7 @@ class CryptoVolatilityScanner:
         # Sort by best opportunities (high volatility + volume surge)
         top_signals = sorted(signals, key=lambda s: s.confidence, reverse=True)[:10]
         _metric_set(SCANNER_SIGNALS_GAUGE, float(len(top_signals)))
+        self.last_signals = top_signals
 
         # Log scan completion to activity feed
         if activity:
@@ -1218,7 +1261,7 @@ class CryptoVolatilityScanner:
         # Use wider stops to avoid getting stopped out by noise
         target_profit = RISK.TAKE_PROFIT_DEFAULT  # 1.5% target profit
         stop_loss = RISK.STOP_LOSS_DEFAULT  # 1.5% stop loss (matches config)
-        signal_reasons = []
+        signal_reasons = SignalReasons()
 
         # ============ BUY SIGNALS (RELATIVE - each coin scored against its own range) ============
         buy_score = 0
@@ -1227,16 +1270,16 @@ class CryptoVolatilityScanner:
         # Absolute block: RSI truly overbought (>70) regardless of context
         # Relative block: RSI in top 15% of its range (coin-specific overbought)
         if rsi > 70:
-            signal_reasons.append(f"BLOCKED: RSI overbought ({rsi:.1f})")
+            signal_reasons.add("BLOCK_RSI_OVERBOUGHT", rsi)
             buy_score = -10
         elif rsi_rel > 0.85:
-            signal_reasons.append(f"BLOCKED: RSI at relative high ({rsi:.1f}, top {(1-rsi_rel)*100:.0f}%)")
+            signal_reasons.add("BLOCK_RSI_RELATIVE_HIGH", rsi, 1 - rsi_rel)
             buy_score = -10
         elif stoch_k > 85:
-            signal_reasons.append(f"BLOCKED: StochRSI very high ({stoch_k:.1f})")
+            signal_reasons.add("BLOCK_STOCH_VERY_HIGH", stoch_k)
             buy_score = -10
         elif stoch_rel > 0.90:
-            signal_reasons.append(f"BLOCKED: StochRSI at relative high ({stoch_k:.1f}, top {(1-stoch_rel)*100:.0f}%)")
+            signal_reasons.add("BLOCK_STOCH_RELATIVE_HIGH", stoch_k, 1 - stoch_rel)
             buy_score = -10
         else:
             # SCORING based on RELATIVE position (creates diversity across symbols)
@@ -1244,84 +1287,84 @@ class CryptoVolatilityScanner:
             # RSI relative scoring - where is RSI within THIS coin's recent range?
             if rsi_rel < 0.15:
                 buy_score += 4  # In bottom 15% of its range = strong oversold for THIS coin
-                signal_reasons.append(f"RSI at relative low ({rsi:.1f}, bottom {rsi_rel*100:.0f}%)")
+                signal_reasons.add("RSI_RELATIVE_LOW", rsi, rsi_rel)
             elif rsi_rel < 0.25:
                 buy_score += 3
-                signal_reasons.append(f"RSI low in range ({rsi:.1f}, {rsi_rel*100:.0f}%)")
+                signal_reasons.add("RSI_LOW_IN_RANGE", rsi, rsi_rel)
             elif rsi_rel < 0.40:
                 buy_score += 2
-                signal_reasons.append(f"RSI lower half ({rsi:.1f}, {rsi_rel*100:.0f}%)")
+                signal_reasons.add("RSI_LOWER_HALF", rsi, rsi_rel)
             elif rsi_rel < 0.55:
                 buy_score += 1
-                signal_reasons.append(f"RSI neutral ({rsi:.1f}, {rsi_rel*100:.0f}%)")
+                signal_reasons.add("RSI_NEUTRAL", rsi, rsi_rel)
             # rsi_rel 0.55-0.85: no points but not blocked
 
             # StochRSI relative scoring - key timing indicator
             if stoch_rel < 0.10:
                 buy_score += 4  # Excellent entry - at the very bottom of its range
-                signal_reasons.append(f"StochRSI at relative low ({stoch_k:.1f}, bottom {stoch_rel*100:.0f}%)")
+                signal_reasons.add("STOCH_RELATIVE_LOW", stoch_k, stoch_rel)
             elif stoch_rel < 0.25:
                 buy_score += 3
-                signal_reasons.append(f"StochRSI low in range ({stoch_k:.1f}, {stoch_rel*100:.0f}%)")
+                signal_reasons.add("STOCH_LOW_IN_RANGE", stoch_k, stoch_rel)
             elif stoch_rel < 0.40:
                 buy_score += 2
-                signal_reasons.append(f"StochRSI lower half ({stoch_k:.1f}, {stoch_rel*100:.0f}%)")
+                signal_reasons.add("STOCH_LOWER_HALF", stoch_k, stoch_rel)
             elif stoch_rel < 0.55:
                 buy_score += 1
-                signal_reasons.append(f"StochRSI neutral ({stoch_k:.1f}, {stoch_rel*100:.0f}%)")
+                signal_reasons.add("STOCH_NEUTRAL", stoch_k, stoch_rel)
 
             # MACD positive momentum - bonus only
             if macd_hist > 0:
                 buy_score += 1
-                signal_reasons.append("MACD positive")
+                signal_reasons.add("MACD_POSITIVE")
 
             # EMA bullish crossover - bonus only
             if ema_cross == "bullish":
                 buy_score += 1
-                signal_reasons.append("EMA bullish cross")
+                signal_reasons.add("EMA_BULLISH_CROSS")
 
             # Volume surge confirms
             if volume_surge and buy_score >= 3:
                 buy_score += 1
-                signal_reasons.append("Volume confirmation")
+                signal_reasons.add("VOLUME_CONFIRMATION")
 
         # ============ SELL SIGNALS (RELATIVE - overbought for THIS coin's range) ============
         sell_score = 0
-        sell_reasons = []
+        sell_reasons = SignalReasons()
 
         # RSI relative scoring for sell signals
         if rsi_rel > 0.90:
             sell_score += 3  # In top 10% of its range = very overbought for THIS coin
-            sell_reasons.append(f"RSI at relative high ({rsi:.1f}, top {(1-rsi_rel)*100:.0f}%)")
+            sell_reasons.add("RSI_RELATIVE_HIGH", rsi, 1 - rsi_rel)
         elif rsi_rel > 0.80:
             sell_score += 2
-            sell_reasons.append(f"RSI high in range ({rsi:.1f}, {rsi_rel*100:.0f}%)")
+            sell_reasons.add("RSI_HIGH_IN_RANGE", rsi, rsi_rel)
         elif rsi_rel > 0.70:
             sell_score += 1
-            sell_reasons.append(f"RSI upper half ({rsi:.1f}, {rsi_rel*100:.0f}%)")
+            sell_reasons.add("RSI_UPPER_HALF", rsi, rsi_rel)
 
         # MACD turning negative
         if macd_hist < 0:
             sell_score += 1
-            sell_reasons.append("MACD negative")
+            sell_reasons.add("MACD_NEGATIVE")
 
         # StochRSI relative scoring for sell signals
         if stoch_rel > 0.90:
             sell_score += 3  # At the very top of its range
-            sell_reasons.append(f"StochRSI at relative high ({stoch_k:.1f}, top {(1-stoch_rel)*100:.0f}%)")
+            sell_reasons.add("STOCH_RELATIVE_HIGH", stoch_k, 1 - stoch_rel)
         elif stoch_rel > 0.80:
             sell_score += 2
-            sell_reasons.append(f"StochRSI high in range ({stoch_k:.1f}, {stoch_rel*100:.0f}%)")
+            sell_reasons.add("STOCH_HIGH_IN_RANGE", stoch_k, stoch_rel)
 
         # EMA bearish crossover
         if ema_cross == "bearish":
             sell_score += 2
-            sell_reasons.append("EMA bearish cross")
+            sell_reasons.add("EMA_BEARISH_CROSS")
 
         # Volume surge on sell
         if volume_surge:
             sell_score += 1
-            sell_reasons.append("Volume confirmation")
+            sell_reasons.add("VOLUME_CONFIRMATION")
 
         # ============ DETERMINE ACTION (QUALITY + MOMENTUM) ============
         # Get spike info for momentum bypass
@@ -1336,7 +1379,7 @@ class CryptoVolatilityScanner:
         # Allow momentum bypass for spiking coins - catch the move!
         if is_spiking and spike_direction == "up" and spike_magnitude >= 0.01:
             min_score = momentum_bypass
-            signal_reasons.append(f"🚀 MOMENTUM: {spike_magnitude*100:.1f}% spike")
+            signal_reasons.add("MOMENTUM_SPIKE", spike_magnitude)
             logger.info(f"    🚀 {symbol}: Momentum bypass active (spike {spike_direction})")
         else:
             min_score = base_min_score
@@ -1375,7 +1418,7 @@ class CryptoVolatilityScanner:
             sell_min_score = min_score
             if is_spiking and spike_direction == "down" and spike_magnitude >= 0.01:
                 sell_min_score = momentum_bypass
-                sell_reasons.append(f"📉 MOMENTUM: {spike_magnitude*100:.1f}% drop")
+                sell_reasons.add("MOMENTUM_DROP", spike_magnitude)
 
             if sell_score >= sell_min_score:
                 action = "sell"
@@ -1447,6 +1490,7 @@ class CryptoVolatilityScanner:
 
             self.price_data[symbol].append(price)
             self.volume_data[symbol].append(volume)
+            self._price_samples[symbol] = self._price_samples.get(symbol, 0) + 1
 
             # Keep only recent data (1000 data points ≈ 16-17 hours of 1-min data)
             if len(self.price_data[symbol]) > 1000:
@@ -1460,6 +1504,7 @@ class CryptoDayTradingBot:
     name = "CryptoDayTradingBot"  # Required for TradingBot integration
 
     CASH_SAFETY_BUFFER = Decimal("0.995")
+    ORDER_RETRY_BASE_DELAY = 1.0  # seconds before the first order resubmission
     DEFAULT_TICK_SIZE = Decimal("0.000001")
     TICK_SIZE_BY_SYMBOL = {
         "BTC": Decimal("0.000001"),  # 1e-6 BTC
@@ -1475,6 +1520,7 @@ class CryptoDayTradingBot:
         scanner: Optional[Any] = None,
     ):
         self.alpaca = alpaca_client
+        self._resilient: Optional[ResilientAlpacaClient] = None
         # Use injected scanner if provided, otherwise create local instance
         if scanner is not None:
             self.scanner = scanner
@@ -1501,6 +1547,8 @@ class CryptoDayTradingBot:
 
         # Trading metrics
         self.active_positions = {}
+        # Exit rule columns mirroring active_positions, evaluated once per tick
+        self.exit_rules = ExitRuleTable()
         self.daily_trades = 0
         self.daily_profit = 0.0
         self.win_rate = 0.0
@@ -1529,6 +1577,27 @@ class CryptoDayTradingBot:
             max_workers=10
         )  # More workers for parallel operations
 
+        # Order state from trade updates; the caller sets ``order_stream``,
+        # without one the book is kept current over REST
+        self.order_book = LocalOrderBook()
+        self.order_book.add_listener(self._on_order_update)
+        self.order_stream = None
+        self._order_book_task = None
+
+        # Entry execution: cached per-symbol order constraints, concurrent
+        # submission; buying power stays reserved until the book closes an order.
+        # Quote refreshes draw from the shared API budget at market data priority
+        self.execution = OrderExecutionPipeline(
+            self._resilient_api,
+            ExecutionLimits(
+                max_spread=RISK.MAX_SPREAD_DEFAULT,
+                cash_safety_buffer=self.CASH_SAFETY_BUFFER,
+            ),
+            tick_size=self._crypto_tick_size,
+            submit=self._submit_entry_template,
+            order_book=self.order_book,
+        )
+
         # Configurable thresholds - Pulled from config or sensible defaults
         self.stop_loss_pct = getattr(
             scanner_config, "stop_loss", RISK.STOP_LOSS_DEFAULT
@@ -1669,10 +1738,24 @@ class CryptoDayTradingBot:
         # Otherwise assume it's already the raw API
         return self.alpaca
 
+    @property
+    def _resilient_api(self) -> ResilientAlpacaClient:
+        """The raw API behind the shared rate limiter and circuit breaker."""
+        api = self._api
+        if isinstance(api, ResilientAlpacaClient):
+            return api
+        if self._resilient is None or self._resilient.client is not api:
+            self._resilient = ResilientAlpacaClient(api)
+        return self._resilient
+
+    async def _call_api(self, method_name: str, *args, **kwargs):
+        """Await an Alpaca call without blocking the trading loop."""
+        return await self._resilient_api.call_async(method_name, *args, **kwargs)
+
     async def _sync_positions_from_alpaca(self):
         """Sync active_positions with actual Alpaca positions"""
         try:
-            positions = self._api.list_positions()
+            positions = await self._call_api("list_positions")
             synced_count = 0
 
             for pos in positions:
@@ -1710,6 +1793,7 @@ class CryptoDayTradingBot:
                         if hasattr(pos, "current_price")
                         else entry_price,
                     }
+                    self._track_exit_rules(symbol)
                     synced_count += 1
                     logger.info(
                         f"📥 Synced existing position: {symbol} | Entry: ${entry_price:.4f} | Qty: {qty}"
@@ -1738,8 +1822,10 @@ class CryptoDayTradingBot:
                     f"✅ Synced {synced_count} positions from Alpaca. Total tracked: {len(self.active_positions)}"
                 )
 
-        except APIError as e:
+        except (APIError, AlpacaAPIError) as e:
             logger.error(f"Alpaca API error syncing positions: {e}")
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping position sync: {e}")
         except (ConnectionError, TimeoutError) as e:
             logger.warning(f"Network error syncing positions from Alpaca: {e}")
         except (KeyError, AttributeError, TypeError) as e:
@@ -1758,6 +1844,14 @@ class CryptoDayTradingBot:
         # Start market data feed
         self.executor.submit(self._start_market_data_feed)
 
+        # Keep order constraints warm so entries need no lookups
+        self.execution.start(self.scanner.get_enabled_symbols)
+
+        # Learn about fills from trade updates instead of polling order status
+        self._order_book_task = asyncio.get_running_loop().create_task(
+            self.order_book.run(self.order_stream, self._resilient_api)
+        )
+
         # Main trading loop
         logger.info("🔄 Starting main trading loop")
         cycle_count = 0
@@ -1818,7 +1912,7 @@ class CryptoDayTradingBot:
         # Refresh volatile pairs every 15 minutes (always enabled)
         if current_time % 900 == 0:  # 900 seconds = 15 minutes
             try:
-                self.scanner.refresh_volatile_pairs(self._api)
+                await asyncio.to_thread(self.scanner.refresh_volatile_pairs, self._api)
             except Exception as e:
                 logger.error(f"Failed to refresh volatile pairs: {e}")
 
@@ -1875,6 +1969,7 @@ class CryptoDayTradingBot:
                 else:
                     activity._log("📡 No signals returned from scanner", "info")
 
+            entries = []
             for signal in signals[:5]:  # Top 5 opportunities
                 if signal.symbol in self.active_positions:
                     if activity:
@@ -1899,7 +1994,7 @@ class CryptoDayTradingBot:
                             "info",
                             signal.symbol,
                         )
-                    await self._execute_entry(signal)
+                    entries.append(signal)
                 else:
                     if activity:
                         activity.log_decision(
@@ -1912,6 +2007,9 @@ class CryptoDayTradingBot:
                             },
                         )
 
+            if entries:
+                await self._execute_entries(entries)
+
             logger.info("Entry scan complete")
         except APIError as e:
             logger.error(f"Alpaca API error in entry scan: {e}")
@@ -1922,120 +2020,115 @@ class CryptoDayTradingBot:
         except Exception as e:
             logger.exception(f"Unexpected error in _find_entry_opportunities: {e}")
 
+    def _entry_notional(self, signal: CryptoSignal) -> float:
+        """Position value for a signal - scales with confidence for better risk/reward"""
+        # Higher confidence = larger position (but still capped)
+        base_position = POSITION.MIN_POSITION_VALUE  # $10 minimum
+        max_position = 100.0  # Increased from $25 - need meaningful positions!
+        confidence_multiplier = 0.5 + (signal.confidence * 0.5)  # 0.5-1.0 range
+
+        return max(
+            base_position,
+            min(
+                self.max_position_size,
+                max_position * confidence_multiplier
+            ),
+        )
+
     async def _execute_entry(self, signal: CryptoSignal):
-        """Execute entry trade with comprehensive error handling and logging"""
+        """Execute a single entry trade through the execution pipeline"""
+        await self._execute_entries([signal])
+
+    async def _execute_entries(self, signals: List[CryptoSignal]):
+        """Validate entries against cached order constraints and submit them concurrently
+
+        Spread, tick size, minimum notional and buying power come from the
+        execution pipeline's cache (refreshed in the background), so no API
+        calls are made between a signal and its order submission.
+        """
         start_time = time.time()
         activity = _get_activity()
-        trade_log = TradeLog(
-            timestamp=datetime.now().isoformat(),
-            action=signal.action.upper(),
-            symbol=signal.symbol,
-            quantity=0,
-            price=signal.price,
-            status="pending",
-            error_notes="",
-        )
 
-        try:
+        requests = []
+        for signal in signals:
             # IMPORTANT: Skip SELL signals (no short selling in crypto)
             # Only execute BUY signals
             if signal.action.lower() == "sell":
                 logger.info(
                     f"⏭️  Skipping SELL signal for {signal.symbol} (no short selling)"
                 )
-                return
-
-            # SCALPING: Check spread before entry - don't let spread eat our profit
-            try:
-                alpaca_symbol = signal.symbol.replace("/", "")
-                snapshot = self._api.get_crypto_snapshot(alpaca_symbol)
-                if snapshot and hasattr(snapshot, "latest_quote"):
-                    quote = snapshot.latest_quote
-                    bid = float(quote.bid_price) if hasattr(quote, "bid_price") else 0
-                    ask = float(quote.ask_price) if hasattr(quote, "ask_price") else 0
-                    if bid > 0 and ask > 0:
-                        spread_pct = (ask - bid) / bid
-                        max_spread = RISK.MAX_SPREAD_DEFAULT  # 0.2%
-                        if spread_pct > max_spread:
-                            logger.info(
-                                f"⏭️  Skipping {signal.symbol}: spread {spread_pct:.3%} > max {max_spread:.3%}"
-                            )
-                            if activity:
-                                activity.log_decision(
-                                    symbol=signal.symbol,
-                                    decision="SKIP",
-                                    reason=f"Spread too wide ({spread_pct:.3%} > {max_spread:.3%})",
-                                    details={
-                                        "spread_pct": spread_pct,
-                                        "bid": bid,
-                                        "ask": ask,
-                                    },
-                                )
-                            return
-            except Exception as spread_err:
-                logger.debug(
-                    f"Could not check spread for {signal.symbol}: {spread_err}"
+                continue
+            requests.append(
+                EntryRequest(
+                    symbol=signal.symbol,
+                    side=signal.action.lower(),
+                    price=signal.price,
+                    notional=self._entry_notional(signal),
+                    signal_time=signal.timestamp.timestamp()
+                    if isinstance(signal.timestamp, datetime)
+                    else start_time,
+                    context=signal,
                 )
-                # Continue anyway if spread check fails
-
-            # Calculate position size - scale with confidence for better risk/reward
-            # Higher confidence = larger position (but still capped)
-            base_position = POSITION.MIN_POSITION_VALUE  # $10 minimum
-            max_position = 100.0  # Increased from $25 - need meaningful positions!
-            confidence_multiplier = 0.5 + (signal.confidence * 0.5)  # 0.5-1.0 range
-
-            position_value = max(
-                base_position,
-                min(
-                    self.max_position_size,
-                    max_position * confidence_multiplier
-                ),
             )
+        if not requests:
+            return
 
-            # Clamp against available funds with a safety margin
-            try:
-                account = self._api.get_account()
-                available_cash = float(
-                    getattr(account, "cash", getattr(account, "buying_power", 0.0))
-                )
-            except Exception as exc:
-                logger.warning(
-                    f"Unable to fetch account balance, defaulting to configured limits: {exc}"
-                )
-                available_cash = position_value
-
-            quantity = self._calculate_affordable_quantity(
-                price=signal.price,
-                desired_notional=position_value,
-                available_cash=available_cash,
-                symbol=signal.symbol,
+        try:
+            await self.execution.ensure_fresh([request.symbol for request in requests])
+            results = self.execution.prepare(
+                requests,
+                free_slots=self.max_concurrent_positions - len(self.active_positions),
             )
+        except Exception as e:
+            logger.exception(f"Unexpected error preparing entries: {e}")
+            self.error_count += 1
+            return
 
-            if quantity <= 0:
-                logger.warning("Calculated crypto quantity is 0 after precision clamp")
-                return
-
-            quantity_dec = (
-                quantity if isinstance(quantity, Decimal) else Decimal(str(quantity))
-            )
-            quantity_float = float(quantity_dec)
-            price_dec = Decimal(str(signal.price))
+        for result in results:
+            signal = result.request.context
+            if result.status == REJECTED:
+                logger.info(f"⏭️  Skipping {signal.symbol}: {result.reason}")
+                if activity:
+                    activity.log_decision(
+                        symbol=signal.symbol,
+                        decision="SKIP",
+                        reason=result.reason,
+                        details={
+                            "confidence": signal.confidence,
+                            "price": signal.price,
+                        },
+                    )
+            elif activity:
+                activity.log_order_submit(
+                    signal.symbol, signal.action, float(result.template.qty), signal.price
+                )
 
-            trade_log.quantity = quantity_float
+        await self.execution.submit(results)
 
-            # Log order submission
-            if activity:
-                activity.log_order_submit(signal.symbol, signal.action, quantity_float, signal.price)
+        for result in results:
+            if result.status != REJECTED:
+                await self._record_entry_result(result, start_time)
 
-            # Place order with error handling
-            order = await self._place_crypto_order_with_retry(
-                symbol=signal.symbol,
-                side=signal.action,
-                quantity=quantity_float,
-                order_type="market",
-            )
+    async def _record_entry_result(self, result, start_time: float):
+        """Track an acknowledged entry, or log why its submission failed"""
+        signal = result.request.context
+        activity = _get_activity()
+        quantity_dec = result.template.qty
+        quantity_float = float(quantity_dec)
+        price_dec = Decimal(str(signal.price))
+        trade_log = TradeLog(
+            timestamp=datetime.now().isoformat(),
+            action=signal.action.upper(),
+            symbol=signal.symbol,
+            quantity=quantity_float,
+            price=signal.price,
+            status="pending",
+            error_notes="",
+        )
 
-            if order:
+        try:
+            if result.status == ACKED:
+                order = result.order
                 # Track position
                 self.active_positions[signal.symbol] = {
                     "signal": signal,
@@ -2053,13 +2146,24 @@ class CryptoDayTradingBot:
                     else signal.price * (1 + signal.stop_loss),
                     "order_id": order.id if hasattr(order, "id") else str(order),
                 }
+                self._track_exit_rules(signal.symbol)
+
+                # Fill events may have arrived while the batch was in flight
+                tracked = self.order_book.get(self.active_positions[signal.symbol]["order_id"])
+                if tracked is not None:
+                    self._on_order_update(tracked)
+                    if signal.symbol not in self.active_positions:
+                        trade_log.status = "failed"
+                        trade_log.error_notes = f"Order {tracked.status} without a fill"
+                        return
 
                 trade_log.status = "filled"
                 trade_log.order_id = order.id if hasattr(order, "id") else str(order)
                 trade_log.execution_time_ms = int((time.time() - start_time) * 1000)
 
                 logger.info(
-                    f"🎯 Opened {signal.action.upper()} position: {signal.symbol} @ {signal.price:.4f}"
+                    f"🎯 Opened {signal.action.upper()} position: {signal.symbol} @ {signal.price:.4f} "
+                    f"(signal-to-ack {result.latency * 1000:.0f}ms)"
                 )
 
                 # Record entry for learning
@@ -2076,7 +2180,9 @@ class CryptoDayTradingBot:
                         entry_price=signal.price,
                         indicators=indicators,
                         signal_score=getattr(signal, "score", 3),
-                        spread_pct=0.0,
+                        spread_pct=getattr(
+                            self.execution.constraints(signal.symbol), "spread_pct", None
+                        ) or 0.0,
                     )
                 except Exception as learn_err:
                     logger.debug(f"Could not record entry for learning: {learn_err}")
@@ -2089,6 +2195,8 @@ class CryptoDayTradingBot:
                     stop = self.active_positions[signal.symbol]["stop_price"]
                     activity._log(f"🎯 Target: ${target:.4f} | Stop: ${stop:.4f}", "info", signal.symbol)
             else:
+                if result.error is not None:
+                    raise result.error
                 trade_log.status = "failed"
                 trade_log.error_notes = "Order placement failed"
                 if activity:
@@ -2151,179 +2259,187 @@ class CryptoDayTradingBot:
             trade_log.execution_time_ms = int((time.time() - start_time) * 1000)
             self._log_trade(trade_log)
 
+    async def _submit_entry_template(self, template):
+        """Submit function for the execution pipeline"""
+        submitted_at = time.time()
+        order = await self._place_crypto_order_with_retry(
+            symbol=template.symbol,
+            side=template.side,
+            quantity=float(template.qty),
+            order_type="market",
+        )
+        if order:
+            self.order_book.track_submitted(order, submitted_at=submitted_at, tag="entry")
+        return order
+
+    def _on_order_update(self, order):
+        """Apply fills and cancellations of entry orders to the tracked position"""
+        for symbol, position in list(self.active_positions.items()):
+            if str(position.get("order_id")) != order.order_id:
+                continue
+            position["order_status"] = order.status
+            if order.filled_qty > 0:
+                position["quantity"] = float(order.filled_qty)
+                position["quantity_dec"] = order.filled_qty
+                signal = position.get("signal")
+                if order.filled_avg_price and signal is not None:
+                    entry_price = float(order.filled_avg_price)
+                    position["entry_price"] = entry_price
+                    position["entry_price_dec"] = order.filled_avg_price
+                    position["target_price"] = (
+                        entry_price * (1 + signal.target_profit)
+                        if position["side"] == "buy"
+                        else entry_price * (1 - signal.target_profit)
+                    )
+                    position["stop_price"] = (
+                        entry_price * (1 - signal.stop_loss)
+                        if position["side"] == "buy"
+                        else entry_price * (1 + signal.stop_loss)
+                    )
+                    self._track_exit_rules(symbol)
+                if order.fill_latency is not None:
+                    position["fill_latency_ms"] = round(order.fill_latency * 1000, 1)
+            elif not order.is_open:
+                logger.info(
+                    f"📤 Entry order for {symbol} {order.status} without a fill, dropping position"
+                )
+                del self.active_positions[symbol]
+            break
+
     @classmethod
     def _crypto_tick_size(cls, symbol: str) -> Decimal:
-        base = symbol.split("/")[0].upper() if "/" in symbol else symbol.upper()
+        base = data_symbol(symbol).split("/")[0]
         return cls.TICK_SIZE_BY_SYMBOL.get(base, cls.DEFAULT_TICK_SIZE)
 
-    @classmethod
-    def _calculate_affordable_quantity(
-        cls,
-        *,
-        price: float,
-        desired_notional: float,
-        available_cash: float,
-        symbol: str,
-    ) -> Decimal:
-        price_dec = Decimal(str(price))
-        desired_dec = Decimal(str(desired_notional))
-        available_dec = Decimal(str(available_cash))
-
-        if price_dec <= 0:
-            return Decimal("0")
+    EXIT_REASON_LABELS = {
+        TAKE_PROFIT: "PROFIT_TARGET",
+        STOP_LOSS: "STOP_LOSS",
+        MAX_HOLD: "TIME_LIMIT",
+    }
 
-        safe_cash = (available_dec * cls.CASH_SAFETY_BUFFER).quantize(
-            Decimal("0.000000001"), rounding=ROUND_DOWN
+    def _track_exit_rules(self, symbol: str):
+        """Copy a tracked position's exit levels into the exit rule table"""
+        position = self.active_positions[symbol]
+        self.exit_rules.upsert(
+            symbol,
+            position["side"],
+            position["entry_price"],
+            position["target_price"],
+            position["stop_price"],
+            position["entry_time"],
         )
-        notional_cap = min(desired_dec, safe_cash)
-        if notional_cap <= 0:
-            return Decimal("0")
 
-        raw_qty = notional_cap / price_dec
-        tick_size = cls._crypto_tick_size(symbol)
-        if tick_size <= 0:
-            tick_size = cls.DEFAULT_TICK_SIZE
+    def _sync_exit_rules(self):
+        """Drop rows for closed positions and add rows for untracked ones"""
+        self.exit_rules.retain(self.active_positions)
+        for symbol in [s for s in self.active_positions if s not in self.exit_rules]:
+            self._track_exit_rules(symbol)
 
-        ticks = (raw_qty / tick_size).to_integral_value(rounding=ROUND_DOWN)
-        qty = ticks * tick_size
-        if qty < tick_size:
-            return Decimal("0")
-        return qty
+    def _latest_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Latest scanner price for each symbol under a single lock acquisition"""
+        try:
+            with self.scanner.lock:
+                price_data = self.scanner.price_data
+                return {
+                    symbol: price_data[symbol][-1] if price_data.get(symbol) else None
+                    for symbol in symbols
+                }
+        except (AttributeError, KeyError, IndexError, TypeError):
+            return dict.fromkeys(symbols)
 
     async def _check_exit_conditions(self):
-        """Check exit conditions for all active positions"""
-        positions_to_close = []
+        """Check exit conditions for all active positions in one vectorized pass"""
         activity = _get_activity()
+        self._sync_exit_rules()
+        if not len(self.exit_rules):
+            return
 
-        # Make a copy of items to iterate (avoid dict modification during iteration)
-        for symbol, position in list(self.active_positions.items()):
-            try:
-                # Get current price
-                current_price = await self._get_current_price(symbol)
-                if not current_price:
-                    # Try to get from Alpaca position directly
-                    try:
-                        alpaca_pos = self._api.get_position(symbol)
-                        current_price = float(alpaca_pos.current_price)
-                    except Exception:
-                        logger.warning(
-                            f"Cannot get current price for {symbol}, skipping exit check"
-                        )
-                        continue
-
-                entry_price = position["entry_price"]
-                side = position["side"]
-
-                # Calculate current P&L
-                if side == "buy":
-                    pnl_pct = (current_price - entry_price) / entry_price
-                else:
-                    pnl_pct = (entry_price - current_price) / entry_price
-
-                should_exit = False
-                exit_reason = ""
-
-                # Log position status periodically (every ~60 checks = ~1 min)
-                if int(time.time()) % 60 == 0:
-                    logger.info(
-                        f"📊 {symbol}: Entry ${entry_price:.4f} | Current ${current_price:.4f} | P&L: {pnl_pct:.2%} | Stop: ${position['stop_price']:.4f} | Target: ${position['target_price']:.4f}"
+        prices = self._latest_prices(self.exit_rules.symbols)
+        for symbol, current_price in prices.items():
+            if not current_price:
+                # Try to get from Alpaca position directly
+                try:
+                    position = await self._call_api("get_position", symbol)
+                    prices[symbol] = float(position.current_price)
+                except Exception:
+                    logger.warning(
+                        f"Cannot get current price for {symbol}, skipping exit check"
                     )
-                    # Log to activity feed
-                    if activity:
-                        activity.log_position_update(
-                            symbol=symbol,
-                            entry_price=entry_price,
-                            current_price=current_price,
-                            pnl_pct=pnl_pct,
-                            stop_price=position["stop_price"],
-                            target_price=position["target_price"],
-                        )
 
-                # Profit target hit
-                if (side == "buy" and current_price >= position["target_price"]) or (
-                    side == "sell" and current_price <= position["target_price"]
-                ):
-                    should_exit = True
-                    exit_reason = "PROFIT_TARGET"
+        # Trailing stop: once up more than trailing_stop_pct, trail at half that distance
+        rules = ExitRules(
+            max_hold_seconds=self.max_hold_time_seconds,
+            trail_activation=self.trailing_stop_pct,
+            trail_distance=self.trailing_stop_pct * 0.5,
+        )
+        try:
+            decisions = self.exit_rules.evaluate(prices, rules, now=time.time())
+        except (ValueError, TypeError) as e:
+            logger.exception(f"Exit rule evaluation failed: {e}")
+            return
 
-                # Stop loss hit
-                elif (side == "buy" and current_price <= position["stop_price"]) or (
-                    side == "sell" and current_price >= position["stop_price"]
-                ):
-                    should_exit = True
-                    exit_reason = "STOP_LOSS"
-
-                # SCALPING: Momentum fade exit - take profit early if momentum reverses
-                elif pnl_pct > RISK.MIN_PROFIT_TARGET:  # 0.2% minimum profit
-                    # Check if momentum is fading (indicators turning against us)
-                    indicators = self.scanner.get_indicators(symbol)
-                    if indicators:
-                        rsi = indicators.get("rsi", 50)
-                        stoch_k = indicators.get("stoch_k", 50)
-                        macd_hist = indicators.get("macd_histogram", 0)
-
-                        # Exit if we're profitable and momentum is reversing
-                        if side == "buy":
-                            # For longs: exit if overbought or momentum fading
-                            if rsi > 65 or stoch_k > 70 or macd_hist < 0:
-                                should_exit = True
-                                exit_reason = f"MOMENTUM_FADE (RSI={rsi:.0f}, Stoch={stoch_k:.0f}, P&L={pnl_pct:.2%})"
-                                logger.info(
-                                    f"📉 {symbol}: Taking profit on momentum fade"
-                                )
+        exit_reasons = {
+            i: self.EXIT_REASON_LABELS[int(decisions.reasons[i])]
+            for i in np.flatnonzero(decisions.reasons)
+        }
 
-                # Time-based exit (configurable max hold time)
-                if (
-                    not should_exit
-                    and (datetime.now() - position["entry_time"]).total_seconds()
-                    > self.max_hold_time_seconds
-                ):
-                    should_exit = True
-                    exit_reason = "TIME_LIMIT"
-
-                # Trailing stop for profitable positions (activate at 0.3% profit for scalping)
-                elif pnl_pct > self.trailing_stop_pct:
-                    # Implement trailing stop
-                    trail_distance = (
-                        self.trailing_stop_pct * 0.5
-                    )  # Trail at half the activation threshold
-                    if side == "buy":
-                        new_stop = current_price * (1 - trail_distance)
-                        if new_stop > position["stop_price"]:
-                            old_stop = position["stop_price"]
-                            position["stop_price"] = new_stop
-                            logger.info(
-                                f"📈 {symbol}: Trailing stop raised from ${old_stop:.4f} to ${new_stop:.4f}"
-                            )
-                    else:
-                        new_stop = current_price * (1 + trail_distance)
-                        if new_stop < position["stop_price"]:
-                            old_stop = position["stop_price"]
-                            position["stop_price"] = new_stop
-                            logger.info(
-                                f"📉 {symbol}: Trailing stop lowered from ${old_stop:.4f} to ${new_stop:.4f}"
-                            )
+        # SCALPING: Momentum fade exit - take profit early on profitable longs if momentum reverses
+        fading = (
+            ((decisions.reasons == HOLD) | (decisions.reasons == MAX_HOLD))
+            & (decisions.sides > 0)
+            & (decisions.pnl_pct > RISK.MIN_PROFIT_TARGET)
+        )
+        for i in np.flatnonzero(fading):
+            symbol = decisions.symbols[i]
+            indicators = self.scanner.get_indicators(symbol)
+            if not indicators:
+                continue
+            rsi = indicators.get("rsi", 50)
+            stoch_k = indicators.get("stoch_k", 50)
+            macd_hist = indicators.get("macd_histogram", 0)
+            # For longs: exit if overbought or momentum fading
+            if rsi > 65 or stoch_k > 70 or macd_hist < 0:
+                pnl_pct = decisions.pnl_pct[i]
+                exit_reasons[i] = f"MOMENTUM_FADE (RSI={rsi:.0f}, Stoch={stoch_k:.0f}, P&L={pnl_pct:.2%})"
+                logger.info(f"📉 {symbol}: Taking profit on momentum fade")
+
+        for i in np.flatnonzero(decisions.stop_raised):
+            symbol = decisions.symbols[i]
+            position = self.active_positions[symbol]
+            old_stop, new_stop = position["stop_price"], float(decisions.stops[i])
+            position["stop_price"] = new_stop
+            direction = "raised" if new_stop > old_stop else "lowered"
+            logger.info(
+                f"📈 {symbol}: Trailing stop {direction} from ${old_stop:.4f} to ${new_stop:.4f}"
+            )
 
-                if should_exit:
-                    logger.info(
-                        f"🚨 EXIT SIGNAL: {symbol} | Reason: {exit_reason} | P&L: {pnl_pct:.2%}"
-                    )
-                    positions_to_close.append(
-                        (symbol, exit_reason, current_price, pnl_pct)
+        # Log position status periodically (every ~60 checks = ~1 min)
+        if int(time.time()) % 60 == 0:
+            for i in np.flatnonzero(~np.isnan(decisions.prices)):
+                symbol = decisions.symbols[i]
+                position = self.active_positions[symbol]
+                current_price, pnl_pct = float(decisions.prices[i]), float(decisions.pnl_pct[i])
+                logger.info(
+                    f"📊 {symbol}: Entry ${position['entry_price']:.4f} | Current ${current_price:.4f} | P&L: {pnl_pct:.2%} | Stop: ${position['stop_price']:.4f} | Target: ${position['target_price']:.4f}"
+                )
+                # Log to activity feed
+                if activity:
+                    activity.log_position_update(
+                        symbol=symbol,
+                        entry_price=position["entry_price"],
+                        current_price=current_price,
+                        pnl_pct=pnl_pct,
+                        stop_price=position["stop_price"],
+                        target_price=position["target_price"],
                     )
 
-            except APIError as e:
-                logger.error(f"Alpaca API error checking exit for {symbol}: {e}")
-            except (KeyError, AttributeError) as e:
-                logger.warning(f"Missing position data for {symbol}: {e}")
-            except (ZeroDivisionError, ValueError) as e:
-                logger.warning(f"Calculation error checking exit for {symbol}: {e}")
-            except Exception as e:
-                logger.exception(f"Unexpected error checking exit for {symbol}: {e}")
-
         # Close positions
-        for symbol, reason, price, pnl_pct in positions_to_close:
-            await self._execute_exit(symbol, reason, price, pnl_pct)
+        for i, exit_reason in sorted(exit_reasons.items()):
+            symbol, price, pnl_pct = decisions.symbols[i], float(decisions.prices[i]), float(decisions.pnl_pct[i])
+            logger.info(
+                f"🚨 EXIT SIGNAL: {symbol} | Reason: {exit_reason} | P&L: {pnl_pct:.2%}"
+            )
+            await self._execute_exit(symbol, exit_reason, price, pnl_pct)
 
     async def _execute_exit(
         self, symbol: str, reason: str, price: float, pnl_pct: float
@@ -2337,7 +2453,7 @@ class CryptoDayTradingBot:
             # IMPORTANT: Get actual quantity from Alpaca to avoid balance mismatches
             actual_qty = position["quantity"]
             try:
-                alpaca_position = self._api.get_position(symbol)
+                alpaca_position = await self._call_api("get_position", symbol)
                 actual_qty = abs(float(alpaca_position.qty))
                 if abs(actual_qty - position["quantity"]) > 0.0001:
                     logger.warning(
@@ -2364,6 +2480,7 @@ class CryptoDayTradingBot:
             if activity:
                 activity.log_order_submit(symbol, opposite_side, actual_qty, price)
 
+            submitted_at = time.time()
             order = await self._place_crypto_order(
                 symbol=symbol,
                 side=opposite_side,
@@ -2372,6 +2489,8 @@ class CryptoDayTradingBot:
             )
 
             if order:
+                self.order_book.track_submitted(order, submitted_at=submitted_at, tag="exit")
+
                 # Update metrics
                 qty_dec = position.get("quantity_dec")
                 if qty_dec is None:
@@ -2458,57 +2577,78 @@ class CryptoDayTradingBot:
             "new_daily_trades": self.daily_trades,
         }
 
-    async def _place_crypto_order(
-        self, symbol: str, side: str, quantity: float, order_type: str = "market"
+    async def _submit_crypto_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        order_type: str = "market",
+        client_order_id: Optional[str] = None,
     ):
-        """Place crypto order via Alpaca API - compatible with both alpaca_trade_api and alpaca-py"""
-        try:
-            # Convert symbol format if needed (BTC/USD -> BTCUSD)
-            alpaca_symbol = symbol.replace("/", "")
+        """Submit a crypto order via Alpaca API - compatible with both alpaca_trade_api and alpaca-py"""
+        # Convert symbol format if needed (BTC/USD -> BTCUSD)
+        alpaca_symbol = symbol.replace("/", "")
+
+        # alpaca-py's TradingClient takes a request object; alpaca_trade_api
+        # takes keyword arguments
+        if isinstance(self._api, TradingClient):
+            from alpaca.trading.requests import MarketOrderRequest
+            from alpaca.trading.enums import OrderSide, TimeInForce
+
+            order_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
+            order_request = MarketOrderRequest(
+                symbol=alpaca_symbol,
+                qty=quantity,
+                side=order_side,
+                time_in_force=TimeInForce.IOC,
+                client_order_id=client_order_id,
+            )
+            return await self._call_api("submit_order", order_data=order_request)
+        kwargs = {"client_order_id": client_order_id} if client_order_id else {}
+        return await self._call_api(
+            "submit_order",
+            symbol=alpaca_symbol,
+            qty=quantity,
+            side=side.lower(),
+            type=order_type,
+            time_in_force="ioc",  # Immediate or cancel for crypto
+            **kwargs,
+        )
 
-            api = self._api
+    async def _find_order(self, client_order_id: str):
+        """The order submitted with ``client_order_id``, or None if the broker has none."""
+        if isinstance(self._api, TradingClient):
+            method = "get_order_by_client_id"
+        else:
+            method = "get_order_by_client_order_id"
+        try:
+            return await self._call_api(method, client_order_id)
+        except Exception:
+            return None
 
-            # Check if using newer alpaca-py SDK (has submit_order with order_data param)
-            # or older alpaca_trade_api (uses positional/keyword args directly)
-            try:
-                # Try newer alpaca-py SDK first
-                from alpaca.trading.requests import MarketOrderRequest
-                from alpaca.trading.enums import OrderSide, TimeInForce
-
-                order_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
-                order_request = MarketOrderRequest(
-                    symbol=alpaca_symbol,
-                    qty=quantity,
-                    side=order_side,
-                    time_in_force=TimeInForce.IOC,
-                )
-                order = api.submit_order(order_data=order_request)
-                return order
-            except (ImportError, TypeError):
-                # Fall back to older alpaca_trade_api format
-                order = api.submit_order(
-                    symbol=alpaca_symbol,
-                    qty=quantity,
-                    side=side.lower(),
-                    type=order_type,
-                    time_in_force="ioc",  # Immediate or cancel for crypto
-                )
-                return order
+    @staticmethod
+    def _log_order_error(symbol: str, error: Exception) -> None:
+        if isinstance(error, (APIError, AlpacaAPIError)):
+            logger.error(f"Alpaca API error placing order for {symbol}: {error}")
+        elif isinstance(error, CircuitOpenError):
+            logger.warning(f"Not placing order for {symbol}: {error}")
+        elif isinstance(error, (ConnectionError, TimeoutError, APIConnectionError, APITimeoutError)):
+            logger.error(f"Network error placing order for {symbol}: {error}")
+        elif isinstance(error, (ImportError, TypeError)):
+            logger.error(f"SDK compatibility error placing order for {symbol}: {error}")
+        elif isinstance(error, ValueError):
+            logger.error(f"Invalid order parameters for {symbol}: {error}")
+        else:
+            logger.error(f"Unexpected error placing order for {symbol}: {error}", exc_info=error)
 
-        except APIError as e:
-            logger.error(f"Alpaca API error placing order for {symbol}: {e}")
-            return None
-        except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Network error placing order for {symbol}: {e}")
-            return None
-        except (ImportError, TypeError) as e:
-            logger.error(f"SDK compatibility error placing order for {symbol}: {e}")
-            return None
-        except ValueError as e:
-            logger.error(f"Invalid order parameters for {symbol}: {e}")
-            return None
+    async def _place_crypto_order(
+        self, symbol: str, side: str, quantity: float, order_type: str = "market"
+    ):
+        """Place crypto order once; returns None if it could not be placed"""
+        try:
+            return await self._submit_crypto_order(symbol, side, quantity, order_type)
         except Exception as e:
-            logger.exception(f"Unexpected error placing order for {symbol}: {e}")
+            self._log_order_error(symbol, e)
             return None
 
     async def _place_crypto_order_with_retry(
@@ -2519,38 +2659,43 @@ class CryptoDayTradingBot:
         order_type: str = "market",
         max_retries: int = 3,
     ):
-        """Place crypto order with retry logic for transient failures"""
+        """Place crypto order with retry logic for transient failures
+
+        The client does not retry orders itself. Every attempt carries the
+        same client order id, and before resubmitting the broker is asked
+        whether a timed-out attempt went through, so one call places at
+        most one order.
+        """
+        client_order_id = uuid.uuid4().hex
         for attempt in range(max_retries):
             try:
-                order = await self._place_crypto_order(
-                    symbol, side, quantity, order_type
+                return await self._submit_crypto_order(
+                    symbol, side, quantity, order_type, client_order_id=client_order_id
                 )
-                if order:
-                    return order
-
-            except APIError as e:
-                if hasattr(e, "code") and e.code == 429:
+            except Exception as e:
+                transient = (
+                    e.retryable
+                    if isinstance(e, AlpacaAPIError)
+                    else isinstance(e, (ConnectionError, TimeoutError, APIConnectionError, APITimeoutError))
+                )
+                if not transient or attempt == max_retries - 1:
+                    self._log_order_error(symbol, e)
+                    return None
+                if isinstance(e, RateLimitError):
                     # Rate limit - wait longer
                     wait_time = min(60, 2**attempt * 5)
-                    logger.warning(f"Rate limit hit, waiting {wait_time}s before retry")
-                    await asyncio.sleep(wait_time)
-                elif attempt < max_retries - 1:
-                    # Other API errors - exponential backoff
-                    wait_time = 2**attempt
-                    logger.warning(
-                        f"Retrying order after {wait_time}s (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(wait_time)
                 else:
-                    raise
+                    wait_time = self.ORDER_RETRY_BASE_DELAY * 2**attempt
+                logger.warning(
+                    f"Order for {symbol} failed ({e}), retrying after {wait_time}s "
+                    f"(attempt {attempt + 1}/{max_retries})"
+                )
+                await asyncio.sleep(wait_time)
 
-            except ConnectionError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2**attempt
-                    logger.warning(f"Connection error, retrying after {wait_time}s")
-                    await asyncio.sleep(wait_time)
-                else:
-                    raise
+            order = await self._find_order(client_order_id)
+            if order is not None:
+                logger.info(f"Order for {symbol} was accepted despite the error, not resubmitting")
+                return order
 
         return None
 
@@ -2761,8 +2906,12 @@ class CryptoDayTradingBot:
             f"Total Trades: {self.total_trades}"
         )
 
-    def get_status(self) -> Dict:
-        """Get current bot status with detailed position info for frontend"""
+    def get_status(self, live_prices: bool = True) -> Dict:
+        """Get current bot status with detailed position info for frontend
+
+        ``live_prices=False`` skips the per-position Alpaca lookup and uses the
+        cached position prices (used by the periodic dashboard snapshot).
+        """
         position_count = len(self.active_positions)
         total_unrealized_pnl = 0.0
         positions_detail = []
@@ -2774,11 +2923,15 @@ class CryptoDayTradingBot:
                 quantity = float(pos.get("quantity", 0))
 
                 # Try to get real-time price from Alpaca
-                try:
-                    alpaca_pos = self.alpaca.get_position(symbol)
-                    current_price = float(alpaca_pos.current_price)
-                    unrealized_pnl = float(alpaca_pos.unrealized_pl)
-                except Exception:
+                unrealized_pnl = None
+                if live_prices:
+                    try:
+                        alpaca_pos = self.alpaca.get_position(symbol)
+                        current_price = float(alpaca_pos.current_price)
+                        unrealized_pnl = float(alpaca_pos.unrealized_pl)
+                    except Exception:
+                        pass
+                if unrealized_pnl is None:
                     # Calculate from cached data
                     if entry_price > 0:
                         if pos.get("side") == "buy":
@@ -2839,6 +2992,8 @@ class CryptoDayTradingBot:
             "error_count": self.error_count,
             "rate_limit_errors": self.rate_limit_errors,
             "recent_trades": len(self.trade_log),
+            "execution": self.execution.get_status(),
+            "orders": self.order_book.get_status(),
         }
 
     def print_trade_timeline(self, last_n: int = 20):
@@ -2904,6 +3059,9 @@ class CryptoDayTradingBot:
         """Stop the trading bot and print final summary"""
         logger.info("🛑 Stopping Crypto Day Trading Bot")
         self.is_running = False
+        self.execution.stop()
+        if self._order_book_task is not None:
+            self._order_book_task.cancel()
         self.executor.shutdown(wait=True)
 
         # Print final trade timeline
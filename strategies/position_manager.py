@@ -7,12 +7,14 @@ import logging
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+
+from core.exit_rules import REASON_NAMES, ExitRules, ExitRuleTable
+from utils.records import record
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@record
 class Position:
     """Represents a trading position"""
     symbol: str
@@ -73,6 +75,8 @@ class PositionManager:
         self.take_profit_pct = take_profit_pct
         self.max_positions = max_positions
         self._positions: Dict[str, Position] = {}
+        # Exit rule columns for every open position, evaluated in one pass per tick
+        self.exit_rules = ExitRuleTable()
 
     @property
     def positions(self) -> Dict[str, Position]:
@@ -120,12 +124,14 @@ class PositionManager:
         )
 
         self._positions[symbol] = position
+        self._track(position)
         logger.info(f"📈 Added position: {symbol} | Entry: ${entry_price:.4f} | Qty: {quantity}")
         return position
 
     def remove_position(self, symbol: str) -> Optional[Position]:
         """Remove a position"""
         position = self._positions.pop(symbol, None)
+        self.exit_rules.remove(symbol)
         if position:
             logger.info(f"📉 Removed position: {symbol}")
         return position
@@ -137,6 +143,8 @@ class PositionManager:
             pos.current_price = current_price
             if current_price > pos.highest_price:
                 pos.highest_price = current_price
+                if pos.side == 'buy':
+                    self.exit_rules.set_high_water(symbol, current_price)
 
             # Update unrealized P&L
             if pos.side == 'buy':
@@ -174,6 +182,7 @@ class PositionManager:
                         current_price=float(pos.current_price) if hasattr(pos, 'current_price') else entry_price,
                     )
                     self._positions[symbol] = position
+                    self._track(position)
                     synced_count += 1
                     logger.info(f"📥 Synced position: {symbol} | Entry: ${entry_price:.4f} | Qty: {qty}")
 
@@ -182,6 +191,7 @@ class PositionManager:
             to_remove = [s for s in self._positions if s not in alpaca_symbols]
             for symbol in to_remove:
                 del self._positions[symbol]
+                self.exit_rules.remove(symbol)
                 logger.info(f"📤 Removed closed position: {symbol}")
 
             if synced_count > 0:
@@ -206,35 +216,31 @@ class PositionManager:
         """
         if symbol not in self._positions:
             return None
+        return self.check_all_exits({symbol: current_price}, max_hold_time_seconds, trailing_stop_pct).get(symbol)
 
-        pos = self._positions[symbol]
-        self.update_price(symbol, current_price)
-
-        hold_time = (datetime.now() - pos.entry_time).total_seconds()
-
-        # Check take profit
-        if pos.side == 'buy' and current_price >= pos.target_price:
-            return 'take_profit'
-        elif pos.side == 'sell' and current_price <= pos.target_price:
-            return 'take_profit'
-
-        # Check stop loss
-        if pos.side == 'buy' and current_price <= pos.stop_price:
-            return 'stop_loss'
-        elif pos.side == 'sell' and current_price >= pos.stop_price:
-            return 'stop_loss'
-
-        # Check trailing stop
-        if pos.side == 'buy' and pos.highest_price > pos.entry_price:
-            trailing_stop_price = pos.highest_price * (1 - trailing_stop_pct)
-            if current_price <= trailing_stop_price and current_price > pos.entry_price:
-                return 'trailing_stop'
+    def check_all_exits(
+        self,
+        prices: Dict[str, float],
+        max_hold_time_seconds: int = 1800,
+        trailing_stop_pct: float = 0.01,
+    ) -> Dict[str, str]:
+        """
+        Check every position with a price in ``prices`` in one vectorized pass.
+        Returns exit reasons keyed by symbol for the positions that should close.
+        """
+        for symbol, price in prices.items():
+            self.update_price(symbol, price)
 
-        # Check max hold time
-        if hold_time >= max_hold_time_seconds:
-            return 'max_hold_time'
+        decisions = self.exit_rules.evaluate(
+            prices, ExitRules(max_hold_seconds=max_hold_time_seconds, trailing_stop_pct=trailing_stop_pct)
+        )
+        return {symbol: REASON_NAMES[reason] for symbol, reason, _, _ in decisions.exits()}
 
-        return None
+    def _track(self, pos: Position) -> None:
+        self.exit_rules.upsert(
+            pos.symbol, pos.side, pos.entry_price, pos.target_price, pos.stop_price,
+            pos.entry_time, high_water=pos.highest_price or pos.entry_price,
+        )
 
     def get_total_unrealized_pnl(self) -> float:
         """Get total unrealized P&L across all positions"""
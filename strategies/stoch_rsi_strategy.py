@@ -52,9 +52,11 @@ class StochRSIStrategy(Strategy):
         if not self.stoch_rsi_params.enabled:
             return []
 
-        # Calculate RSI and StochRSI with dynamic bands
-        df = rsi(df)
-        df = stochastic(df, TYPE='StochRSI')
+        # Calculate RSI and StochRSI with dynamic bands; both are the same
+        # StochRSI calculation, so the second call is an indicator cache hit
+        cache_symbol = df['symbol'].iloc[-1] if 'symbol' in df.columns and len(df) else None
+        df = rsi(df, symbol=cache_symbol)
+        df = stochastic(df, TYPE='StochRSI', symbol=cache_symbol)
         
         if 'StochRSI Signal' not in df.columns:
             return []
@@ -6,13 +6,15 @@ Handles trade logging, metrics tracking, and performance reporting
 import os
 import logging
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import asdict
 from typing import List, Dict, Any, Optional
 
+from utils.records import record
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@record
 class TradeLog:
     """Comprehensive trade log entry with all required fields"""
     timestamp: str
@@ -8,6 +8,8 @@ to reduce duplication across strategies.
 from typing import Optional, Tuple
 import pandas as pd
 
+from indicators import core as indicator_core
+
 
 def detect_crossover(
     short_series: pd.Series,
@@ -67,9 +69,10 @@ def calculate_ma(
         Moving average series
     """
     if ma_type.lower() == 'ema':
-        return series.ewm(span=period, adjust=False).mean()
+        return calculate_ema(series, period)
     else:  # Default to SMA
-        return series.rolling(window=period).mean()
+        values = indicator_core.rolling_mean(series.to_numpy(dtype=float), period)
+        return pd.Series(values, index=series.index, name=series.name)
 
 
 def calculate_ema(series: pd.Series, period: int) -> pd.Series:
@@ -83,7 +86,8 @@ def calculate_ema(series: pd.Series, period: int) -> pd.Series:
     Returns:
         EMA series
     """
-    return series.ewm(span=period, adjust=False).mean()
+    values = indicator_core.ema(series.to_numpy(dtype=float), period)
+    return pd.Series(values, index=series.index, name=series.name)
 
 
 def get_crossover_values(
@@ -119,18 +123,12 @@ def calculate_rsi(series: pd.Series, period: int = 14) -> pd.Series:
     Returns:
         RSI series (0-100 range)
     """
-    delta = series.diff()
-
-    gain = delta.where(delta > 0, 0.0)
-    loss = (-delta).where(delta < 0, 0.0)
-
-    avg_gain = gain.ewm(span=period, adjust=False).mean()
-    avg_loss = loss.ewm(span=period, adjust=False).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = indicator_core.rsi(
+        series.to_numpy(dtype=float), period, smoothing='ema',
+        leading_zero=True, zero_loss='divide'
+    )
 
-    return rsi
+    return pd.Series(rsi, index=series.index)
 
 
 def calculate_atr(
@@ -151,14 +149,9 @@ def calculate_atr(
     Returns:
         ATR series
     """
-    prev_close = close.shift(1)
-
-    tr1 = high - low
-    tr2 = abs(high - prev_close)
-    tr3 = abs(low - prev_close)
-
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
-    atr = true_range.ewm(span=period, adjust=False).mean()
+    atr = indicator_core.atr(
+        high.to_numpy(dtype=float), low.to_numpy(dtype=float),
+        close.to_numpy(dtype=float), period, smoothing='ema'
+    )
 
-    return atr
+    return pd.Series(atr, index=close.index)
@@ -0,0 +1,107 @@
+"""Tests for the streaming P&L export."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from backend.api.blueprints.pnl import pnl_bp
+from backend.api.services.pnl_service import PnLService
+
+
+@pytest.fixture()
+def service(tmp_path):
+    svc = PnLService(SimpleNamespace(api=None), db_path=str(tmp_path / "pnl.db"))
+    now = datetime.now()
+    conn = sqlite3.connect(svc.db_path)
+    conn.executemany(
+        "INSERT INTO trade_history (timestamp, symbol, side, qty, price, pnl, order_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (now - timedelta(minutes=i), "BTCUSD" if i % 2 else "ETHUSD", "sell", 0.1, 100.0, 1.5, f"o{i}")
+            for i in range(2500)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO pnl_history (timestamp, unrealized_pnl, account_value) VALUES (?, ?, ?)",
+        [(now - timedelta(days=d), 10.0, 1000.0 + d) for d in range(3)],
+    )
+    conn.commit()
+    conn.close()
+    return svc
+
+
+@pytest.fixture()
+def client(service):
+    app = Flask(__name__)
+    app.pnl_service = service
+    app.register_blueprint(pnl_bp, url_prefix="/api/pnl")
+    return app.test_client()
+
+
+def test_iter_export_rows_matches_materialized_export(service):
+    streamed = list(service.iter_export_rows(days=30, chunk_size=100))
+
+    assert streamed == service.get_export_data(days=30)
+    assert sum(1 for row in streamed if row["type"] == "trade") == 2500
+
+
+def test_symbol_and_range_filters(service):
+    end = datetime.now() - timedelta(minutes=100)
+    rows = [
+        row
+        for row in service.iter_export_rows(
+            start=end - timedelta(minutes=50), end=end, symbols=["BTCUSD"], chunk_size=7
+        )
+        if row["type"] == "trade"
+    ]
+
+    assert rows and {row["symbol"] for row in rows} == {"BTCUSD"}
+    assert len(rows) in (25, 26)
+
+
+def test_csv_export_streams_in_chunks(client):
+    response = client.get("/api/pnl/export?format=csv&days=30")
+
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    reader = csv.DictReader(io.StringIO(response.get_data(as_text=True)))
+    rows = list(reader)
+    assert reader.fieldnames == PnLService.EXPORT_COLUMNS
+    assert sum(1 for row in rows if row["type"] == "trade") == 2500
+
+
+def test_ndjson_and_json_exports(client):
+    ndjson = client.get("/api/pnl/export?format=ndjson&symbols=ethusd&include_trades=true")
+    lines = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    assert {row["symbol"] for row in lines if row["type"] == "trade"} == {"ETHUSD"}
+
+    array = client.get("/api/pnl/export?format=json&include_trades=false").get_json()
+    assert array and all(row["type"] == "pnl" for row in array)
+
+
+def test_unsupported_format_and_bad_range_are_rejected(client):
+    assert client.get("/api/pnl/export?format=xml").status_code == 400
+    assert client.get("/api/pnl/export?start=not-a-date").status_code == 400
+
+
+def test_failing_query_is_reported_before_streaming(service, client):
+    conn = sqlite3.connect(service.db_path)
+    conn.execute("DROP TABLE trade_history")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(sqlite3.OperationalError):
+        service.iter_export_rows(days=30)
+
+    response = client.get("/api/pnl/export?format=csv&days=30")
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Internal server error"}
+    assert client.get("/api/pnl/export?format=csv&include_trades=false").status_code == 200
@@ -0,0 +1,138 @@
+"""Tests for the shared account/positions/orders refresher."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from alpaca_trade_api.rest import APIError
+
+from config.service_settings import get_service_settings
+from core.account_state import AccountStateRefresher
+from services.unified_trading.state import TradingState
+
+
+class _FakeAlpaca:
+    def __init__(self) -> None:
+        self.calls = {"get_account": 0, "list_positions": 0, "list_orders": 0}
+
+    def get_account(self):
+        self.calls["get_account"] += 1
+        return SimpleNamespace(_raw={"equity": "1000"}, equity="1000", status="ACTIVE")
+
+    def list_positions(self):
+        self.calls["list_positions"] += 1
+        return [SimpleNamespace(symbol="BTCUSD", qty="0.5")]
+
+    def list_orders(self, status="open", limit=50, **kwargs):
+        self.calls["list_orders"] += 1
+        self.last_orders_query = dict(kwargs, status=status, limit=limit)
+        orders = [
+            SimpleNamespace(symbol="BTCUSD", status="filled"),
+            SimpleNamespace(symbol="ETHUSD", status="new"),
+        ]
+        if status == "open":
+            return [o for o in orders if o.status == "new"]
+        return orders
+
+
+def test_reads_are_served_from_cache_regardless_of_traffic():
+    client = _FakeAlpaca()
+    refresher = AccountStateRefresher(client)
+
+    for _ in range(100):
+        refresher.get_account()
+        refresher.list_positions()
+        refresher.list_orders(status="closed")
+
+    assert client.calls == {"get_account": 1, "list_positions": 1, "list_orders": 2}
+
+
+def test_fill_notification_triggers_refresh_when_loop_not_running():
+    client = _FakeAlpaca()
+    refresher = AccountStateRefresher(client)
+    refresher.get_account()
+
+    refresher.notify_fill({"symbol": "BTCUSD"})
+
+    assert client.calls["get_account"] == 2
+
+
+def test_order_filters_and_position_lookup():
+    client = _FakeAlpaca()
+    refresher = AccountStateRefresher(client)
+
+    assert [o.symbol for o in refresher.list_orders(status="closed")] == ["BTCUSD"]
+    assert [o.symbol for o in refresher.list_orders(status="open")] == ["ETHUSD"]
+    assert [o.symbol for o in refresher.list_orders()] == ["ETHUSD"]
+    assert refresher.get_position("BTC/USD").qty == "0.5"
+    assert client.calls["list_orders"] == 2
+
+
+def test_queries_the_cache_cannot_answer_go_to_rest():
+    client = _FakeAlpaca()
+    refresher = AccountStateRefresher(client, orders_limit=100)
+    refresher.refresh()
+
+    refresher.list_orders(status="closed", limit=50, symbols=["ETHUSD"])
+    assert client.last_orders_query == {"status": "closed", "limit": 50, "symbols": ["ETHUSD"]}
+    refresher.list_orders(status="all", after="2024-01-01T00:00:00Z", direction="asc")
+    assert client.last_orders_query == {"status": "all", "limit": 50, "after": "2024-01-01T00:00:00Z",
+                                        "direction": "asc"}
+    refresher.list_orders(status="all", until="2024-02-01T00:00:00Z")
+    refresher.list_orders(status="all", limit=500)
+
+    assert client.calls["list_orders"] == 2 + 4
+
+
+def test_missing_position_raises_the_rest_not_found_error():
+    refresher = AccountStateRefresher(_FakeAlpaca())
+
+    with pytest.raises(APIError) as excinfo:
+        refresher.get_position("DOGE/USD")
+    assert excinfo.value.status_code == 404
+
+
+def test_refresh_populates_trading_state_caches():
+    get_service_settings.cache_clear()
+    state = TradingState(settings=get_service_settings())
+    refresher = AccountStateRefresher(_FakeAlpaca(), state=state)
+
+    assert refresher.refresh() is True
+    assert state.account_cache == {"equity": "1000"}
+    assert len(state.positions_cache) == 1
+    assert len(state.orders_cache) == 2
+    assert {"account", "positions", "orders"} <= set(state.last_update)
+
+
+def test_trading_state_worker_attaches_to_the_shared_refresher():
+    from core.service_registry import get_service_registry
+    from services.unified_trading import account_state_worker, list_background_workers
+
+    get_service_settings.cache_clear()
+    state = TradingState(settings=get_service_settings())
+    client = _FakeAlpaca()
+    shared = AccountStateRefresher(client, refresh_interval=3600)
+    shared.refresh()
+    registry = get_service_registry()
+    registry.register("account_state", shared)
+
+    async def run_worker():
+        task = asyncio.create_task(account_state_worker(state))
+        await asyncio.sleep(0.05)
+        assert state.positions_cache and state.account_cache == {"equity": "1000"}
+        shared.notify_fill()
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(run_worker())
+    finally:
+        registry.unregister("account_state")
+
+    assert account_state_worker in list_background_workers()
+    assert shared.state is None and not shared.get_status()["running"]
+    assert client.calls["get_account"] == 3
@@ -0,0 +1,164 @@
+"""Tests for the priority-aware Alpaca API budget."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core import resilience
+from core.resilience import (
+    PriorityPolicy,
+    PriorityRateLimiter,
+    RateLimiterConfig,
+    RequestPriority,
+    RequestShedError,
+    api_priority,
+    get_priority_rate_limiter,
+    get_rate_limiter,
+)
+from core.resilient_client import ResilientAlpacaClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeAlpaca:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append(name)
+            return name
+        return method
+
+
+def _limiter(clock: FakeClock, **policies) -> PriorityRateLimiter:
+    config = RateLimiterConfig(requests_per_second=3.0, burst_size=10)
+    overrides = {RequestPriority[name.upper()]: policy for name, policy in policies.items()}
+    return PriorityRateLimiter(config, overrides, clock=clock, sleep=clock.sleep)
+
+
+def _drain(limiter: PriorityRateLimiter, priority: RequestPriority) -> int:
+    granted = 0
+    while True:
+        try:
+            if not limiter.acquire(priority=priority, timeout=0):
+                return granted
+        except RequestShedError:
+            return granted
+        granted += 1
+
+
+def test_reservations_keep_tokens_for_more_important_classes():
+    limiter = _limiter(FakeClock())
+
+    granted = {priority: _drain(limiter, priority) for priority in reversed(RequestPriority)}
+
+    assert granted == {
+        RequestPriority.DASHBOARD: 3,
+        RequestPriority.MARKET_DATA: 1,
+        RequestPriority.POSITION_SYNC: 1,
+        RequestPriority.EXIT_PRICING: 2,
+        RequestPriority.ORDER: 3,
+    }
+    classes = limiter.get_status()["classes"]
+    assert classes["dashboard"]["shed"] == 1 and classes["order"]["timed_out"] == 1
+
+
+def test_order_waits_for_the_next_token_on_the_simulated_clock():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    _drain(limiter, RequestPriority.ORDER)
+
+    assert limiter.acquire(priority=RequestPriority.ORDER)
+
+    assert clock.now == pytest.approx(1 / 3)
+    assert limiter.get_status()["classes"]["order"]["avg_wait"] == pytest.approx((1 / 3) / 11)
+
+
+def test_market_data_is_shed_when_the_wait_exceeds_its_budget():
+    clock = FakeClock()
+    limiter = _limiter(clock, market_data=PriorityPolicy(reserve=1, max_wait=1.0, sheddable=True))
+    _drain(limiter, RequestPriority.ORDER)
+
+    with pytest.raises(RequestShedError) as excinfo:
+        limiter.acquire(priority=RequestPriority.MARKET_DATA)
+
+    assert excinfo.value.retry_after == 3  # 7 tokens at 3/s
+    assert clock.now == 0.0
+
+
+def test_waiting_order_is_served_before_earlier_market_data():
+    clock = FakeClock()
+    config = RateLimiterConfig(requests_per_second=1.0, burst_size=1)
+    no_reserves = {p: PriorityPolicy(max_wait=60.0) for p in RequestPriority}
+    limiter = PriorityRateLimiter(config, no_reserves, clock=clock, sleep=lambda _: time.sleep(0.001))
+    limiter.acquire(priority=RequestPriority.ORDER)
+    served = []
+
+    def request(priority):
+        limiter.acquire(priority=priority)
+        served.append(priority)
+
+    def queued(name):
+        return limiter.get_status()["classes"][name]["queue_depth"]
+
+    threads = [threading.Thread(target=request, args=(RequestPriority.MARKET_DATA,))]
+    threads[0].start()
+    while not queued("market_data"):
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=request, args=(RequestPriority.ORDER,)))
+    threads[1].start()
+    while not queued("order"):
+        time.sleep(0.001)
+
+    for _ in range(2):
+        clock.now += 1.0
+        count = len(served)
+        while len(served) == count:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert served == [RequestPriority.ORDER, RequestPriority.MARKET_DATA]
+
+
+def test_client_demotes_dashboard_calls_but_not_orders():
+    clock = FakeClock()
+    fake = FakeAlpaca()
+    client = ResilientAlpacaClient(fake)
+    client._rate_limiter = _limiter(clock)
+    _drain(client._rate_limiter, RequestPriority.MARKET_DATA)  # leaves 6 tokens
+
+    with api_priority(RequestPriority.DASHBOARD):
+        with pytest.raises(RequestShedError):
+            client.list_positions()
+        assert client.submit_order("BTC/USD", qty=1) == "submit_order"
+    assert client.list_positions() == "list_positions"
+
+    assert fake.calls == ["submit_order", "list_positions"]
+
+
+def test_priority_budgets_are_priority_limiters_whichever_getter_comes_first(monkeypatch):
+    monkeypatch.setattr(resilience, "_rate_limiters", {})
+    config = resilience.PRIORITY_RATE_LIMITERS["alpaca_api"]
+
+    plain = get_rate_limiter("alpaca_api")
+
+    assert isinstance(plain, PriorityRateLimiter) and plain.config is config
+    assert get_priority_rate_limiter("alpaca_api", RateLimiterConfig(requests_per_second=1)) is plain
+    # Other names stay plain token buckets
+    assert type(get_rate_limiter("other")) is resilience.TokenBucketRateLimiter
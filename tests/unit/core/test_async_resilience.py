@@ -0,0 +1,219 @@
+"""Tests for the asyncio rate limiter, circuit breaker and retry."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core import resilience
+from core.resilience import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    ConnectionError,
+    RateLimiterConfig,
+    TokenBucketRateLimiter,
+    async_retry_with_backoff,
+)
+from core.resilient_client import ResilientAlpacaClient
+
+
+async def _measure_loop_lag(stop: asyncio.Event, tick: float = 0.005) -> list:
+    lags = []
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(tick)
+        lags.append(loop.time() - started - tick)
+    return lags
+
+
+def test_waiters_are_served_in_order_without_blocking_the_loop():
+    limiter = TokenBucketRateLimiter(RateLimiterConfig(requests_per_second=50.0, burst_size=1))
+    served = []
+
+    async def request(index):
+        assert await limiter.acquire_async()
+        served.append(index)
+
+    async def scenario():
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_measure_loop_lag(stop))
+        await asyncio.gather(*(request(i) for i in range(20)))
+        stop.set()
+        return await ticker
+
+    started = time.perf_counter()
+    lags = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    assert served == list(range(20))
+    assert elapsed >= 19 / 50 * 0.9
+    assert max(lags) < 0.05, f"max loop lag {max(lags) * 1000:.1f}ms"
+
+
+def test_sync_and_async_callers_share_the_bucket():
+    limiter = TokenBucketRateLimiter(RateLimiterConfig(requests_per_second=1.0, burst_size=2))
+    assert limiter.acquire() and limiter.acquire()
+
+    assert asyncio.run(limiter.acquire_async(timeout=0.05)) is False
+    assert limiter.get_status()["available_tokens"] < 1.0
+
+
+def test_async_timeout_raises_when_not_waiting_for_tokens():
+    limiter = TokenBucketRateLimiter(RateLimiterConfig(requests_per_second=1.0, burst_size=1, wait_for_token=False))
+    asyncio.run(limiter.acquire_async())
+
+    with pytest.raises(resilience.RateLimitError):
+        asyncio.run(limiter.acquire_async())
+
+
+def test_async_and_sync_calls_trip_the_same_breaker():
+    breaker = CircuitBreaker("async-test", CircuitBreakerConfig(failure_threshold=2, timeout=60.0))
+
+    @breaker
+    async def failing():
+        raise ValueError("boom")
+
+    @breaker
+    def healthy():
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(failing())
+
+    with pytest.raises(CircuitOpenError):
+        healthy()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(failing())
+
+
+def _record_backoff(monkeypatch) -> list:
+    """Record retry delays and skip them, leaving ``asyncio.sleep`` itself alone."""
+    delays = []
+    backoff_delay = resilience._backoff_delay
+
+    def recorded(*args):
+        delays.append(backoff_delay(*args))
+        return 0.0
+
+    monkeypatch.setattr(resilience, "_backoff_delay", recorded)
+    return delays
+
+
+def test_async_retry_backs_off_with_jitter_on_the_loop(monkeypatch):
+    delays = _record_backoff(monkeypatch)
+    attempts = []
+
+    @async_retry_with_backoff(max_retries=3, base_delay=1.0)
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 4:
+            raise ConnectionError()
+        return "done"
+
+    assert asyncio.run(flaky()) == "done"
+    assert len(delays) == 3
+    for attempt, delay in enumerate(delays):
+        assert 0.75 * 2 ** attempt <= delay <= 1.25 * 2 ** attempt
+
+
+def test_client_call_async_retries_rate_limits(monkeypatch):
+    delays = _record_backoff(monkeypatch)
+    responses = [Exception("429 Too Many Requests"), ["position"]]
+
+    class FakeAlpaca:
+        def list_positions(self):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+    client = ResilientAlpacaClient(FakeAlpaca())
+    client._circuit_breaker = CircuitBreaker("async-client-test")
+    client._rate_limiter = resilience.PriorityRateLimiter(RateLimiterConfig(requests_per_second=100.0))
+
+    assert asyncio.run(client.call_async("list_positions")) == ["position"]
+    assert responses == [] and delays == [60]
+
+
+def test_rejected_requests_are_not_retried_and_keep_the_breaker_closed():
+    class NotFound(Exception):
+        status_code = 404
+
+    calls = []
+
+    class FakeAlpaca:
+        def get_position(self, symbol):
+            calls.append(symbol)
+            raise NotFound("position does not exist")
+
+    client = ResilientAlpacaClient(FakeAlpaca(), coalesce={})
+    client._circuit_breaker = CircuitBreaker("rejected-test", CircuitBreakerConfig(failure_threshold=2))
+    client._rate_limiter = resilience.PriorityRateLimiter(RateLimiterConfig(requests_per_second=100.0))
+
+    for _ in range(3):
+        with pytest.raises(resilience.AlpacaAPIError):
+            asyncio.run(client.call_async("get_position", "BTCUSD"))
+
+    assert calls == ["BTCUSD"] * 3
+    assert client._circuit_breaker.can_execute()
+
+
+@pytest.mark.performance
+def test_client_calls_under_a_saturated_limiter_do_not_block_the_loop():
+    loop_threads, call_threads = set(), []
+
+    class SlowAlpaca:
+        def get_position(self, symbol):
+            call_threads.append(threading.get_ident())
+            time.sleep(0.02)  # blocking REST round trip
+            return symbol
+
+    client = ResilientAlpacaClient(SlowAlpaca(), coalesce={})
+    client._circuit_breaker = CircuitBreaker("loop-lag-test")
+    client._rate_limiter = resilience.PriorityRateLimiter(RateLimiterConfig(requests_per_second=20.0, burst_size=10))
+    # Drain the bucket so every read waits for tokens (and for the order reserve)
+    for _ in range(10):
+        client._rate_limiter.acquire(priority=resilience.RequestPriority.ORDER)
+
+    async def scenario():
+        loop_threads.add(threading.get_ident())
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_measure_loop_lag(stop))
+        results = await asyncio.gather(*(client.call_async("get_position", f"C{i}USD") for i in range(10)))
+        stop.set()
+        return results, await ticker
+
+    started = time.perf_counter()
+    results, lags = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    assert results == [f"C{i}USD" for i in range(10)]
+    assert elapsed >= 0.5
+    assert loop_threads.isdisjoint(call_threads)
+    assert max(lags) < 0.05, f"max loop lag {max(lags) * 1000:.1f}ms"
+
+
+def test_orders_are_not_retried_by_the_client():
+    calls = []
+
+    class TimingOutAlpaca:
+        def submit_order(self, **kwargs):
+            calls.append(kwargs)
+            raise Exception("read timed out")
+
+    client = ResilientAlpacaClient(TimingOutAlpaca())
+    client._circuit_breaker = CircuitBreaker("order-no-retry-test")
+    client._rate_limiter = resilience.PriorityRateLimiter(RateLimiterConfig(requests_per_second=100.0))
+
+    with pytest.raises(resilience.TimeoutError):
+        asyncio.run(client.call_async("submit_order", symbol="BTCUSD", qty=1))
+    with pytest.raises(resilience.TimeoutError):
+        client.submit_order("BTCUSD", qty=1)
+
+    assert len(calls) == 2
@@ -0,0 +1,100 @@
+"""Tests for the vectorized exit rule table."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.exit_rules import (
+    HOLD,
+    MAX_HOLD,
+    STOP_LOSS,
+    TAKE_PROFIT,
+    TRAILING_STOP,
+    ExitRules,
+    ExitRuleTable,
+    benchmark_exit_rules,
+)
+
+NOW = 10_000.0
+
+
+def _table():
+    table = ExitRuleTable(capacity=2)
+    table.upsert("TP/USD", "buy", 100.0, 101.0, 99.0, NOW - 10)
+    table.upsert("SL/USD", "buy", 100.0, 101.0, 99.0, NOW - 10)
+    table.upsert("SHORT/USD", "sell", 100.0, 99.0, 101.0, NOW - 10)
+    table.upsert("OLD/USD", "buy", 100.0, 101.0, 99.0, NOW - 4_000)
+    table.upsert("TRAIL/USD", "buy", 100.0, 110.0, 90.0, NOW - 10, high_water=105.0)
+    table.upsert("QUIET/USD", "buy", 100.0, 101.0, 99.0, NOW - 10)
+    return table
+
+
+def test_all_rules_are_evaluated_in_one_pass():
+    table = _table()
+    prices = {"TP/USD": 101.5, "SL/USD": 98.0, "SHORT/USD": 98.5, "OLD/USD": 100.2, "TRAIL/USD": 103.0,
+              "QUIET/USD": 100.1}
+
+    decisions = table.evaluate(prices, ExitRules(max_hold_seconds=3_600, trailing_stop_pct=0.01), now=NOW)
+
+    assert dict(zip(decisions.symbols, decisions.reasons.tolist())) == {
+        "TP/USD": TAKE_PROFIT, "SL/USD": STOP_LOSS, "SHORT/USD": TAKE_PROFIT,
+        "OLD/USD": MAX_HOLD, "TRAIL/USD": TRAILING_STOP, "QUIET/USD": HOLD,
+    }
+    assert decisions.pnl_pct[decisions.symbols.index("SHORT/USD")] == pytest.approx(0.015)
+    assert [exit[0] for exit in decisions.exits()] == ["TP/USD", "SL/USD", "SHORT/USD", "OLD/USD", "TRAIL/USD"]
+
+
+def test_unpriced_positions_are_held_and_untouched():
+    table = _table()
+    decisions = table.evaluate({"TP/USD": 101.5}, ExitRules(max_hold_seconds=1), now=NOW)
+
+    assert [exit[0] for exit in decisions.exits()] == ["TP/USD"]
+    assert np.isnan(decisions.prices[1:]).all()
+
+
+def test_stops_ratchet_once_the_position_is_in_profit():
+    table = ExitRuleTable()
+    table.upsert("LONG/USD", "buy", 100.0, 110.0, 99.0, NOW)
+    table.upsert("SHORT/USD", "sell", 100.0, 90.0, 101.0, NOW)
+    rules = ExitRules(trail_activation=0.003, trail_distance=0.0015)
+
+    decisions = table.evaluate({"LONG/USD": 102.0, "SHORT/USD": 99.9}, rules, now=NOW)
+    assert decisions.stop_raised.tolist() == [True, False]
+    assert decisions.stops[0] == pytest.approx(102.0 * (1 - 0.0015))
+
+    # The stop never moves back down, and the raised stop triggers later
+    assert not table.evaluate({"LONG/USD": 101.0}, rules, now=NOW).stop_raised.any()
+    assert table.evaluate({"LONG/USD": 101.8}, rules, now=NOW).reasons[0] == STOP_LOSS
+
+
+def test_remove_and_retain_keep_rows_aligned():
+    table = _table()
+    assert table.remove("TP/USD") and not table.remove("TP/USD")
+    assert sorted(table.retain(["SL/USD", "QUIET/USD", "TRAIL/USD"])) == ["OLD/USD", "SHORT/USD"]
+    assert sorted(table.symbols) == ["QUIET/USD", "SL/USD", "TRAIL/USD"]
+
+    decisions = table.evaluate({"SL/USD": 98.0, "QUIET/USD": 100.0, "TRAIL/USD": 100.0}, ExitRules(), now=NOW)
+    assert {s for s, *_ in decisions.exits()} == {"SL/USD"}
+
+
+def test_position_manager_uses_the_table():
+    position_manager = pytest.importorskip("strategies.position_manager")
+    manager = position_manager.PositionManager(alpaca_api=None, stop_loss_pct=0.01, take_profit_pct=0.02)
+    manager.add_position("BTCUSD", 100.0, 1.0)
+    manager.add_position("ETHUSD", 100.0, 1.0)
+    manager.add_position("SOLUSD", 100.0, 1.0)
+    manager.update_price("SOLUSD", 101.5)
+
+    assert manager.check_all_exits({"BTCUSD": 102.5, "ETHUSD": 98.5, "SOLUSD": 100.4}) == {
+        "BTCUSD": "take_profit", "ETHUSD": "stop_loss", "SOLUSD": "trailing_stop",
+    }
+    assert manager.check_exit_conditions("BTCUSD", 101.9) is None
+    manager.remove_position("BTCUSD")
+    assert "BTCUSD" not in manager.exit_rules
+
+
+@pytest.mark.performance
+def test_hundreds_of_positions_evaluate_in_one_tick():
+    result = benchmark_exit_rules(positions=500, iterations=100)
+    assert result["per_position_us"] < 5.0
@@ -0,0 +1,140 @@
+"""Tests for the shared pooled HTTP session used by the Alpaca clients."""
+
+from __future__ import annotations
+
+import http.server
+import json
+import shutil
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+from core import http_transport
+
+tradeapi = pytest.importorskip("alpaca_trade_api")
+
+
+class _CountingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def get_request(self):
+        request = super().get_request()
+        with self._count_lock:
+            self.connections += 1
+        return request
+
+
+class _AccountHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        with self.server._count_lock:
+            self.server.requests += 1
+        body = json.dumps({"id": "stub", "status": "ACTIVE", "equity": "100000"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to create the stub server certificate")
+    directory = tmp_path_factory.mktemp("tls")
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+         "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+@pytest.fixture
+def stub_server(certificate, monkeypatch):
+    # requests lets these override session.verify
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    cert, key = certificate
+    server = _CountingServer(("127.0.0.1", 0), _AccountHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"https://127.0.0.1:{server.server_address[1]}", cert
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def shared_session():
+    http_transport.close_shared_session()
+    yield http_transport.get_shared_session()
+    http_transport.close_shared_session()
+
+
+def _clients(base_url: str, count: int):
+    return [tradeapi.REST("key", "secret", base_url, api_version="v2") for _ in range(count)]
+
+
+def test_clients_on_the_shared_session_reuse_one_connection(stub_server, shared_session):
+    server, base_url, cert = stub_server
+    shared_session.verify = cert
+
+    for client in _clients(base_url, 3):
+        http_transport.use_shared_session(client)
+        for _ in range(4):
+            assert client.get_account().status == "ACTIVE"
+
+    assert server.requests == 12
+    assert server.connections == 1
+    (pool,) = http_transport.pool_status().values()
+    assert pool == {"connections_opened": 1, "requests": 12}
+
+
+def test_separate_sessions_each_open_their_own_connection(stub_server):
+    server, base_url, cert = stub_server
+
+    for client in _clients(base_url, 3):
+        client._session.verify = cert
+        for _ in range(4):
+            client.get_account()
+
+    assert server.connections == 3
+
+
+def test_default_timeout_applies_only_when_none_given(monkeypatch):
+    adapter = http_transport.TimeoutHTTPAdapter(timeout=(1.0, 2.0))
+    sent = {}
+    monkeypatch.setattr(http_transport.HTTPAdapter, "send", lambda self, request, **kwargs: sent.update(kwargs))
+
+    adapter.send(object())
+    assert sent["timeout"] == (1.0, 2.0)
+    adapter.send(object(), timeout=7)
+    assert sent["timeout"] == 7
+
+
+def test_session_is_created_once_per_process(shared_session):
+    assert http_transport.get_shared_session() is shared_session
+    client = http_transport.use_shared_session(tradeapi.REST("key", "secret", "https://paper-api.alpaca.markets"))
+    assert client._session is shared_session
+
+    with pytest.raises(TypeError):
+        http_transport.use_shared_session(object())
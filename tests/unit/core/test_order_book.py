@@ -0,0 +1,171 @@
+"""Tests for the local order book driven by replayed trade updates."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core.order_book import LocalOrderBook, ReplaySource
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _order(order_id="o-1", status="new", qty="2", filled_qty="0", filled_avg_price=None, **extra):
+    return {
+        "id": order_id, "client_order_id": f"c-{order_id}", "symbol": "BTC/USD", "side": "buy",
+        "qty": qty, "filled_qty": filled_qty, "filled_avg_price": filled_avg_price, "status": status, **extra,
+    }
+
+
+def _update(event, price=None, **order):
+    return {"event": event, "price": price, "order": _order(**order)}
+
+
+class TimedReplay:
+    """Replay that advances the clock to each update's time before yielding it."""
+
+    def __init__(self, clock, timed_updates):
+        self.clock = clock
+        self.timed_updates = timed_updates
+
+    async def __aiter__(self):
+        for at, update in self.timed_updates:
+            self.clock.now = at
+            yield update
+
+
+def test_replayed_partial_and_final_fills_update_state():
+    clock = Clock()
+    book = LocalOrderBook(clock=clock)
+    seen = []
+    book.add_listener(lambda order: seen.append((order.status, str(order.filled_qty))))
+
+    book.track_submitted(SimpleNamespace(**_order()), submitted_at=1_000.0, tag="entry")
+    asyncio.run(book.run(TimedReplay(clock, [
+        (1_000.1, _update("new")),
+        (1_000.2, _update("partial_fill", price="64000", status="partially_filled", filled_qty="0.5",
+                          filled_avg_price="64000")),
+        (1_000.4, _update("fill", price="64010", status="filled", filled_qty="2", filled_avg_price="64007.5")),
+    ])))
+
+    order = book.get("o-1")
+    assert order is book.get("c-o-1")
+    assert order.status == "filled" and not order.is_open
+    assert [(str(qty), str(price)) for _, qty, price in order.fills] == [("0.5", "64000"), ("1.5", "64010")]
+    assert [status for _, status in order.transitions] == ["new", "partially_filled", "filled"]
+    assert order.fill_latency == pytest.approx(0.4)
+    assert seen == [("new", "0"), ("partially_filled", "0.5"), ("filled", "2")]
+
+    status = book.get_status(recent=5)
+    assert status["fills"] == 2 and status["partial_fills"] == 1 and status["stream_events"] == 3
+    assert status["fill_p50_ms"] == pytest.approx(400.0)
+    assert status["recent"][0]["fill_latency_ms"] == pytest.approx(400.0)
+    assert status["stream_connected"] is False
+
+
+def test_duplicate_and_late_updates_are_ignored():
+    book = LocalOrderBook(clock=Clock())
+    book.apply_update(_update("fill", status="filled", filled_qty="2", filled_avg_price="10"))
+    book.apply_update(_update("fill", status="filled", filled_qty="2", filled_avg_price="10"))
+    book.apply_update(_update("partial_fill", status="partially_filled", filled_qty="1", filled_avg_price="10"))
+    book.apply_order(_order(status="new"))
+
+    order = book.get("o-1")
+    assert order.status == "filled"
+    assert len(order.fills) == 1 and order.filled_qty == 2
+    assert book.counts["fills"] == 1
+
+
+def test_fill_before_submit_response_still_measures_latency():
+    clock = Clock()
+    book = LocalOrderBook(clock=clock)
+    clock.now = 1_000.3
+    book.apply_update(_update("fill", status="filled", filled_qty="2", filled_avg_price="10"))
+
+    book.track_submitted(_order(status="accepted"), submitted_at=1_000.0)
+
+    order = book.get("o-1")
+    assert order.status == "filled"
+    assert order.fill_latency == pytest.approx(0.3)
+    assert book.get_status()["fill_p50_ms"] == pytest.approx(300.0)
+
+
+def test_stream_failure_falls_back_to_rest_then_reconnects():
+    class Broker:
+        def __init__(self):
+            self.calls = 0
+
+        def get_order(self, order_id):
+            self.calls += 1
+            if order_id == "o-1":
+                return _order(order_id, status="accepted")
+            return _order(order_id, status="filled", filled_qty="2", filled_avg_price="10")
+
+    broker = Broker()
+    book = LocalOrderBook(reconcile_interval=0.01, reconnect_delay=0.05, clock=Clock())
+    book.track_submitted(_order("o-2", status="accepted"))
+    book.track_submitted(_order("o-1", status="accepted"))
+    source = ReplaySource([_update("new", order_id="o-1"), _update("canceled", order_id="o-1", status="canceled")],
+                          fail_after=1)
+
+    asyncio.run(book.run(source, client=broker))
+
+    assert book.get("o-2").status == "filled"
+    assert book.get("o-1").status == "canceled"
+    assert book.counts["reconnects"] == 1 and book.counts["rest_updates"] >= 1
+    assert broker.calls >= 1
+
+
+def test_quiet_open_orders_are_reconciled_while_connected():
+    clock = Clock()
+    book = LocalOrderBook(stale_after=10.0, clock=clock)
+    book.stream_connected = True
+    book.track_submitted(_order("o-1", status="accepted"))
+    clock.now += 5
+    book.track_submitted(_order("o-2", status="accepted"))
+    clock.now += 6
+
+    assert book.orders_to_reconcile() == ["o-1"]
+    book.stream_connected = False
+    assert book.orders_to_reconcile() == ["o-1", "o-2"]
+
+
+def test_replay_from_jsonl_and_closed_order_eviction(tmp_path):
+    path = tmp_path / "trade_updates.jsonl"
+    path.write_text("\n".join(
+        json.dumps(_update("fill", order_id=f"o-{i}", status="filled", filled_qty="2", filled_avg_price="10"))
+        for i in range(5)
+    ))
+    book = LocalOrderBook(max_closed=3, clock=Clock())
+    book.track_submitted(_order("open", status="accepted"))
+
+    asyncio.run(book.run(ReplaySource.from_jsonl(str(path))))
+
+    assert len(book) == 4
+    assert book.get("o-0") is None and book.get("c-o-1") is None
+    assert book.get("o-4").status == "filled" and book.get("open").is_open
+
+
+def test_dashboard_snapshot_serves_tracked_orders():
+    from core.bot_snapshot import BotSnapshotView, build_bot_snapshot, decode_snapshot, encode_snapshot
+
+    book = LocalOrderBook(clock=Clock())
+    book.track_submitted(_order(status="accepted"), submitted_at=999.5)
+    book.apply_update(_update("fill", status="filled", filled_qty="2", filled_avg_price="10"))
+    bot = SimpleNamespace(order_book=book, get_status=lambda live_prices=True: {"orders": book.get_status()})
+
+    snapshot = decode_snapshot(memoryview(encode_snapshot(build_bot_snapshot(bot))))
+    view = BotSnapshotView(snapshot)
+
+    assert view.order_book.lookup("c-o-1") == book.lookup("o-1")
+    assert view.order_book.lookup("o-1")["fill_latency_ms"] == pytest.approx(500.0)
+    assert view.order_book.lookup("missing") is None
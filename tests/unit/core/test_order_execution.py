@@ -0,0 +1,273 @@
+"""Tests for the order execution pipeline against a local fake broker."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from core.order_book import LocalOrderBook
+from core.order_execution import (
+    ACKED,
+    FAILED,
+    REJECTED,
+    EntryRequest,
+    ExecutionLimits,
+    OrderExecutionPipeline,
+    benchmark_order_build,
+)
+
+
+class FakeBroker:
+    """Account, batched snapshots and a slow ``submit_order`` that tracks overlap."""
+
+    def __init__(self, cash="1000", quotes=None, latency=0.05):
+        self.cash = cash
+        self.quotes = quotes if quotes is not None else {"BTC/USD": (64000.0, 64010.0), "ETH/USD": (3000.0, 3001.0)}
+        self.latency = latency
+        self.orders = []
+        self.reads = {"get_account": 0, "get_crypto_snapshots": 0}
+        self.reject = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_account(self):
+        self.reads["get_account"] += 1
+        return SimpleNamespace(cash=self.cash)
+
+    def get_crypto_snapshots(self, symbols):
+        self.reads["get_crypto_snapshots"] += 1
+        return {
+            symbol: SimpleNamespace(latest_quote=SimpleNamespace(bid_price=bid, ask_price=ask))
+            for symbol, (bid, ask) in self.quotes.items()
+            if symbol in symbols
+        }
+
+    def submit_order(self, symbol, qty, side, type, time_in_force):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if symbol in self.reject:
+                raise RuntimeError(f"insufficient balance for {symbol}")
+            order = SimpleNamespace(id=f"order-{len(self.orders)}", symbol=symbol, qty=qty, side=side)
+            self.orders.append(order)
+            return order
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _request(symbol, price, notional=100.0, age=0.0):
+    return EntryRequest(symbol, "buy", price, notional, signal_time=time.time() - age)
+
+
+def test_refresh_caches_constraints_for_watched_symbols():
+    broker = FakeBroker(cash="200")
+    pipeline = OrderExecutionPipeline(broker, tick_size=lambda s: Decimal("0.0001") if s == "ETHUSD" else Decimal("0.000001"))
+
+    assert pipeline.refresh(["BTCUSD", "ETH/USD"]) == 2
+
+    btc, eth = pipeline.constraints("BTC/USD"), pipeline.constraints("ETHUSD")
+    assert (btc.bid, btc.ask) == (64000.0, 64010.0)
+    assert eth.tick_size == Decimal("0.0001")
+    assert btc.spread_pct == pytest.approx(10 / 64000)
+    assert pipeline.available_buying_power == Decimal("199.00")
+    assert broker.reads == {"get_account": 1, "get_crypto_snapshots": 1}
+    assert pipeline.is_fresh(["BTCUSD", "ETHUSD"]) and not pipeline.is_fresh(["SOLUSD"])
+
+
+def test_concurrent_entries_stay_within_buying_power():
+    broker = FakeBroker(cash="150", quotes={"BTC/USD": (64000.0, 64010.0), "ETH/USD": (3000.0, 3001.0),
+                                            "SOL/USD": (150.0, 150.1)})
+    pipeline = OrderExecutionPipeline(broker)
+    requests = [_request("BTC/USD", 64005.0), _request("ETH/USD", 3000.5), _request("SOL/USD", 150.05)]
+
+    async def scenario():
+        await pipeline.ensure_fresh([r.symbol for r in requests])
+        return await pipeline.submit_entries(requests, free_slots=5)
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    assert [r.status for r in results] == [ACKED, ACKED, REJECTED]
+    assert "below minimum" in results[2].reason
+    assert sum(r.template.notional for r in results[:2]) <= Decimal("149.25")
+    assert results[0].template.notional == pytest.approx(Decimal("100"), abs=Decimal("0.1"))
+    assert broker.max_in_flight == 2
+    assert elapsed < 2 * broker.latency + 0.1
+    assert all(r.latency is not None and r.latency >= broker.latency for r in results[:2])
+
+
+def test_rejections_use_cached_constraints_without_api_calls():
+    broker = FakeBroker(quotes={"BTC/USD": (64000.0, 64010.0), "DOGE/USD": (0.10, 0.11)})
+    pipeline = OrderExecutionPipeline(broker, ExecutionLimits(max_spread=0.01))
+    pipeline.refresh(["BTCUSD", "DOGEUSD"])
+    reads = dict(broker.reads)
+
+    results = pipeline.prepare(
+        [
+            _request("DOGE/USD", 0.105),
+            _request("XRP/USD", 0.5),
+            EntryRequest("BTC/USD", "sell", 64000.0, 50.0, time.time()),
+            _request("BTC/USD", 64005.0, notional=10.0),
+            _request("BTC/USD", 64005.0, notional=10.0),
+        ],
+        free_slots=1,
+    )
+
+    assert [r.status for r in results] == [REJECTED, REJECTED, REJECTED, "pending", REJECTED]
+    assert results[0].reason.startswith("Spread too wide")
+    assert results[1].reason == "No order constraints cached for symbol"
+    assert results[4].reason == "No free position slots"
+    assert broker.reads == reads
+    assert pipeline.stats.counts[REJECTED] == 4
+
+
+def test_failed_submission_releases_reservation():
+    broker = FakeBroker(cash="100", latency=0.0)
+    broker.reject.add("ETHUSD")
+    pipeline = OrderExecutionPipeline(broker)
+    pipeline.refresh(["BTCUSD", "ETHUSD"])
+
+    results = asyncio.run(pipeline.submit_entries([_request("ETH/USD", 3000.5, notional=40.0)], free_slots=3))
+
+    assert results[0].status == FAILED
+    assert isinstance(results[0].error, RuntimeError)
+    assert pipeline.available_buying_power == Decimal("99.50")
+
+    results = asyncio.run(pipeline.submit_entries([_request("BTC/USD", 64005.0, notional=40.0)], free_slots=3))
+    assert results[0].acked
+    assert pipeline.available_buying_power == pytest.approx(Decimal("59.50"), abs=Decimal("0.1"))
+
+
+
+def test_reservations_are_held_until_the_order_book_closes_the_order():
+    broker = FakeBroker(cash="100", latency=0.0)
+    book = LocalOrderBook()
+    pipeline = OrderExecutionPipeline(broker, order_book=book)
+    pipeline.refresh(["BTCUSD", "ETHUSD"])
+
+    results = asyncio.run(pipeline.submit_entries(
+        [_request("BTC/USD", 64005.0, notional=40.0), _request("ETH/USD", 3000.5, notional=30.0)], free_slots=3,
+    ))
+    btc, eth = (r.order for r in results)
+    spent = sum(r.template.notional for r in results)
+
+    # A refresh does not forget orders the account may not reflect yet
+    pipeline.refresh(["BTCUSD"])
+    assert pipeline.available_buying_power == Decimal("99.50") - spent
+
+    book.apply_order({"id": eth.id, "symbol": "ETHUSD", "qty": eth.qty, "status": "canceled", "filled_qty": 0})
+    assert pipeline.available_buying_power == Decimal("99.50") - results[0].template.notional
+
+    book.apply_order({"id": btc.id, "symbol": "BTCUSD", "qty": btc.qty, "status": "filled",
+                      "filled_qty": btc.qty, "filled_avg_price": 64005.0})
+    assert pipeline.available_buying_power == Decimal("99.50") - results[0].template.notional
+
+    broker.cash = "60"
+    pipeline.refresh(["BTCUSD"])
+    assert pipeline.available_buying_power == Decimal("59.70")
+    assert pipeline.get_status()["committed"] == 0
+
+
+def test_buying_power_comes_from_the_shared_account_state():
+    broker = FakeBroker(cash="1000")
+    shared = SimpleNamespace(refresh_count=3, get_account=lambda: SimpleNamespace(cash="500"))
+    pipeline = OrderExecutionPipeline(broker, account_state=shared)
+
+    pipeline.refresh(["BTCUSD"])
+
+    assert pipeline.available_buying_power == Decimal("497.50")
+    assert broker.reads["get_account"] == 0
+
+
+def test_entries_before_the_first_account_read_are_rejected_explicitly():
+    broker = FakeBroker()
+    broker.get_account = lambda: (_ for _ in ()).throw(RuntimeError("account unavailable"))
+    pipeline = OrderExecutionPipeline(broker)
+    pipeline.refresh(["BTCUSD"])
+
+    results = pipeline.prepare([_request("BTC/USD", 64005.0)], free_slots=1)
+
+    assert results[0].status == REJECTED
+    assert results[0].reason == "Account state not loaded"
+
+
+def test_submissions_are_bounded_by_max_in_flight():
+    quotes = {f"C{i}/USD": (10.0, 10.001) for i in range(6)}
+    broker = FakeBroker(cash="10000", quotes=quotes, latency=0.03)
+    pipeline = OrderExecutionPipeline(broker, ExecutionLimits(max_in_flight=2))
+    pipeline.refresh(quotes)
+
+    results = asyncio.run(pipeline.submit_entries([_request(s, 10.0, notional=20.0) for s in quotes], free_slots=10))
+
+    assert all(r.acked for r in results)
+    assert broker.max_in_flight == 2
+
+
+def test_ack_latency_is_measured_from_the_signal():
+    broker = FakeBroker(latency=0.0)
+    now = [1_000.0]
+    pipeline = OrderExecutionPipeline(broker, clock=lambda: now[0])
+    pipeline.refresh(["BTCUSD", "ETHUSD"])
+
+    requests = [EntryRequest("BTC/USD", "buy", 64005.0, 50.0, signal_time=999.75),
+                EntryRequest("ETH/USD", "buy", 3000.5, 50.0, signal_time=999.5)]
+    asyncio.run(pipeline.submit_entries(requests, free_slots=2))
+
+    snapshot = pipeline.get_status()["orders"]
+    assert snapshot[ACKED] == 2
+    assert snapshot["ack_p50_ms"] == pytest.approx(500.0)
+    assert snapshot["ack_p99_ms"] == pytest.approx(500.0)
+
+
+def test_refresh_loop_keeps_constraints_warm():
+    broker = FakeBroker(latency=0.0)
+    pipeline = OrderExecutionPipeline(broker, ExecutionLimits(refresh_interval=0.01))
+
+    async def scenario():
+        pipeline.start(lambda: ["BTCUSD"])
+        await asyncio.sleep(0.05)
+        pipeline.stop()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert broker.reads["get_account"] >= 2
+    assert pipeline.is_fresh(["BTCUSD"])
+
+
+@pytest.mark.performance
+def test_order_build_takes_microseconds():
+    assert benchmark_order_build(iterations=5_000)["avg_us"] < 100.0
+
+
+def test_quote_refresh_is_shed_when_the_shared_budget_is_reserved():
+    from core import resilience
+    from core.resilient_client import ResilientAlpacaClient
+
+    broker = FakeBroker()
+    client = ResilientAlpacaClient(broker, coalesce={})
+    client._circuit_breaker = resilience.CircuitBreaker("quote-refresh-test")
+    client._rate_limiter = limiter = resilience.PriorityRateLimiter(
+        resilience.RateLimiterConfig(requests_per_second=0.1, burst_size=10)
+    )
+    pipeline = OrderExecutionPipeline(client)
+    assert pipeline.refresh(["BTCUSD"]) == 1
+
+    # Leave only the tokens reserved for orders, exits and position syncs
+    while limiter.get_status()["available_tokens"] >= 7:
+        limiter.acquire(priority=resilience.RequestPriority.ORDER)
+    pipeline.refresh(["BTCUSD"])
+
+    assert broker.reads == {"get_account": 2, "get_crypto_snapshots": 1}
+    assert limiter.get_status()["classes"]["market_data"]["shed"] == 1
+    assert pipeline.constraints("BTCUSD").ask == 64010.0
@@ -0,0 +1,180 @@
+"""Tests for event-driven position reconciliation against a fake broker."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from core.position_reconciler import PositionReconciler, ReconciliationStatus
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class NotFound(Exception):
+    status_code = 404
+
+
+def _position(symbol, qty, price=100.0):
+    return SimpleNamespace(symbol=symbol, qty=str(qty), avg_entry_price=str(price), market_value=str(qty * price),
+                           current_price=str(price), unrealized_pl="0")
+
+
+class FakeBroker:
+    def __init__(self, positions):
+        self.positions = {p.symbol: p for p in positions}
+        self.calls = {"list_positions": 0, "get_position": 0}
+
+    def list_positions(self):
+        self.calls["list_positions"] += 1
+        return list(self.positions.values())
+
+    def get_position(self, symbol):
+        self.calls["get_position"] += 1
+        if symbol not in self.positions:
+            raise NotFound("position does not exist")
+        return self.positions[symbol]
+
+
+class LocalPositions:
+    def __init__(self, positions):
+        self.active_positions = positions
+
+    def sync_position(self, symbol, quantity, entry_price):
+        self.active_positions[symbol] = {"quantity": quantity, "entry_price": entry_price}
+
+
+def _reconciler(remote, local, **kwargs):
+    clock = kwargs.pop("clock", Clock())
+    broker, manager = FakeBroker(remote), LocalPositions(local)
+    return PositionReconciler(broker, manager, full_sweep_interval=900, clock=clock, **kwargs), broker, manager, clock
+
+
+def test_quiet_passes_skip_the_api_until_a_full_sweep_is_due():
+    reconciler, broker, _, clock = _reconciler([_position("BTCUSD", 1)], {"BTCUSD": {"quantity": 1.0}})
+
+    assert reconciler.run_once().mode == "full"
+    for _ in range(5):
+        clock.now += 60
+        assert reconciler.run_once() is None
+    assert broker.calls == {"list_positions": 1, "get_position": 0}
+
+    clock.now += 900
+    assert reconciler.run_once().mode == "full"
+    status = reconciler.get_status()
+    assert status["full_sweeps"] == 2 and status["idle_passes"] == 5
+    assert status["api_calls"] == 2 and status["api_calls_saved"] == 5
+
+
+def test_single_dirty_symbol_is_verified_with_one_targeted_call():
+    reconciler, broker, manager, clock = _reconciler(
+        [_position("BTCUSD", 1), _position("ETHUSD", 2)],
+        {"BTCUSD": {"quantity": 1.0}, "ETHUSD": {"quantity": 2.0}},
+    )
+    reconciler.run_once()
+    broker.positions["ETHUSD"] = _position("ETHUSD", 3)
+
+    reconciler.on_trade_recorded({"symbol": "ETH/USD", "side": "buy", "qty": 1.0})
+    clock.now += 0.25
+    result = reconciler.run_once(scheduled=False)
+
+    assert result.mode == "incremental" and result.positions_checked == 1
+    assert result.drifts[0].status == ReconciliationStatus.QUANTITY_MISMATCH
+    assert result.drifts_resolved == 1
+    assert manager.active_positions["ETHUSD"]["quantity"] == 3.0
+    # Resolution reuses the fetched position instead of listing everything again
+    assert broker.calls == {"list_positions": 1, "get_position": 1}
+    assert reconciler.get_status()["latency_p50_ms"] == 250.0
+
+
+def test_several_dirty_symbols_share_one_list_call_and_closed_positions_drop():
+    reconciler, broker, manager, _ = _reconciler(
+        [_position("BTCUSD", 1)],
+        {"BTCUSD": {"quantity": 1.0}, "ETHUSD": {"quantity": 2.0}, "SOLUSD": {"quantity": 5.0}},
+    )
+    reconciler._last_full_sweep = reconciler._clock()
+
+    reconciler.on_order_update(SimpleNamespace(symbol="ETH/USD", filled_qty=2, is_open=False))
+    reconciler.on_order_update(SimpleNamespace(symbol="SOL/USD", filled_qty=0, is_open=False))
+    reconciler.on_order_update(SimpleNamespace(symbol="BTC/USD", filled_qty=0, is_open=True))
+    result = reconciler.run_once(scheduled=False)
+
+    assert result.positions_checked == 2
+    assert {d.status for d in result.drifts} == {ReconciliationStatus.MISSING_REMOTE}
+    assert set(manager.active_positions) == {"BTCUSD"}
+    assert broker.calls == {"list_positions": 1, "get_position": 0}
+
+
+def test_missing_remote_position_via_targeted_lookup():
+    reconciler, broker, manager, _ = _reconciler([], {"DOGEUSD": {"quantity": 10.0}})
+    reconciler._last_full_sweep = reconciler._clock()
+
+    reconciler.mark_dirty("DOGE/USD")
+    result = reconciler.run_once(scheduled=False)
+
+    assert result.drifts[0].status == ReconciliationStatus.MISSING_REMOTE
+    assert manager.active_positions == {}
+    assert broker.calls["get_position"] == 1
+
+
+def test_failed_verification_keeps_symbols_dirty():
+    reconciler, broker, _, _ = _reconciler([_position("BTCUSD", 1)], {"BTCUSD": {"quantity": 1.0}})
+    reconciler._last_full_sweep = reconciler._clock()
+    broker.get_position = lambda symbol: (_ for _ in ()).throw(RuntimeError("timeout"))
+
+    reconciler.mark_dirty("BTCUSD")
+    assert reconciler.run_once(scheduled=False).success is False
+    assert reconciler.get_status()["dirty_symbols"] == 1
+
+
+def test_history_is_bounded():
+    reconciler, _, _, _ = _reconciler([], {})
+    for _ in range(reconciler._max_history + 20):
+        reconciler.reconcile()
+
+    assert len(reconciler.get_history(limit=1_000)) == reconciler._max_history
+    assert reconciler.get_status()["total_reconciliations"] == reconciler._max_history + 20
+
+
+def test_background_loop_wakes_on_dirty_symbols():
+    reconciler, broker, _, _ = _reconciler(
+        [_position("BTCUSD", 2)], {"BTCUSD": {"quantity": 1.0}}, clock=time.monotonic,
+        reconcile_interval=3600, debounce=0.0,
+    )
+    reconciler.start()
+    try:
+        deadline = time.monotonic() + 2
+        while reconciler.full_sweeps == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        reconciler.mark_dirty("BTCUSD")
+        while reconciler.incremental_runs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reconciler.stop()
+
+    assert reconciler.incremental_runs == 1
+    assert broker.calls["get_position"] == 1
+
+
+def test_stop_interrupts_the_debounce_wait():
+    reconciler, _, _, _ = _reconciler(
+        [_position("BTCUSD", 1)], {"BTCUSD": {"quantity": 1.0}}, clock=time.monotonic,
+        reconcile_interval=3600, debounce=30.0,
+    )
+    reconciler.start()
+    deadline = time.monotonic() + 2
+    while reconciler.full_sweeps == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    reconciler.mark_dirty("BTCUSD")
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    reconciler.stop()
+
+    assert time.monotonic() - started < 1.0
+    assert not reconciler._thread.is_alive()
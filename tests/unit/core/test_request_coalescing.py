@@ -0,0 +1,166 @@
+"""Tests for single-flight coalescing of identical Alpaca reads."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.resilience import CircuitBreaker, PriorityRateLimiter, RateLimiterConfig
+from core.resilient_client import ResilientAlpacaClient, benchmark_request_coalescing
+
+
+class FakeAlpaca:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = {}
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.fail_next = False
+
+    def _respond(self, name, payload):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.entered.set()
+        self.release.wait(5)
+        time.sleep(self.latency)
+        if self.fail_next:
+            self.fail_next = False
+            raise ValueError("bad response")
+        return payload
+
+    def list_positions(self):
+        return self._respond("list_positions", [{"symbol": "BTCUSD"}])
+
+    def get_position(self, symbol):
+        return self._respond("get_position", {"symbol": symbol})
+
+    def submit_order(self, **kwargs):
+        return self._respond("submit_order", {"id": "1"})
+
+
+def _client(fake, coalesce=None) -> ResilientAlpacaClient:
+    client = ResilientAlpacaClient(fake, coalesce=coalesce)
+    client._rate_limiter = PriorityRateLimiter(RateLimiterConfig(requests_per_second=1e6, burst_size=1000))
+    client._circuit_breaker = CircuitBreaker("coalescing-test")
+    return client
+
+
+def test_concurrent_identical_reads_share_one_request():
+    fake = FakeAlpaca()
+    fake.release.clear()
+    client = _client(fake)
+    results = []
+
+    def read():
+        results.append(client.list_positions())
+
+    threads = [threading.Thread(target=read)]
+    threads[0].start()
+    assert fake.entered.wait(5)
+    threads += [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads[1:]:
+        thread.start()
+    stats = client._pipelines["list_positions"].stats
+    while stats.coalesced < 4:
+        time.sleep(0.001)
+    fake.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fake.calls == {"list_positions": 1}
+    assert len(results) == 5 and all(result == [{"symbol": "BTCUSD"}] for result in results)
+    assert len({id(result) for result in results}) == 5
+
+
+def test_callers_mutating_a_shared_list_do_not_affect_each_other():
+    fake = FakeAlpaca()
+    client = _client(fake)
+
+    first = client.list_positions()
+    first.clear()
+    second = client.list_positions()
+    second.append({"symbol": "ETHUSD"})
+
+    assert fake.calls == {"list_positions": 1}
+    assert client.list_positions() == [{"symbol": "BTCUSD"}]
+
+
+def test_finished_result_is_served_for_its_ttl_only():
+    fake = FakeAlpaca()
+    client = _client(fake, coalesce={"list_positions": 0.05})
+
+    client.list_positions()
+    client.list_positions()
+    assert fake.calls["list_positions"] == 1
+
+    time.sleep(0.08)
+    client.list_positions()
+    assert fake.calls["list_positions"] == 2
+
+
+def test_different_arguments_are_separate_flights():
+    fake = FakeAlpaca()
+    client = _client(fake)
+
+    assert client.get_position("BTCUSD")["symbol"] == "BTCUSD"
+    assert client.get_position("ETHUSD")["symbol"] == "ETHUSD"
+    assert client.get_position("BTCUSD")["symbol"] == "BTCUSD"
+
+    assert fake.calls["get_position"] == 2
+
+
+def test_errors_are_not_kept():
+    fake = FakeAlpaca()
+    client = _client(fake)
+    fake.fail_next = True
+
+    with pytest.raises(ValueError):
+        client.list_positions()
+    assert client.list_positions() == [{"symbol": "BTCUSD"}]
+    assert fake.calls["list_positions"] == 2
+
+
+def test_orders_clear_cached_reads():
+    fake = FakeAlpaca()
+    client = _client(fake)
+
+    client.list_positions()
+    client.submit_order("BTCUSD", qty=1)
+    client.list_positions()
+
+    assert fake.calls == {"list_positions": 2, "submit_order": 1}
+
+
+def test_async_reads_share_one_request():
+    fake = FakeAlpaca(latency=0.05)
+    client = _client(fake)
+
+    async def scenario():
+        return await asyncio.gather(*(client.call_async("list_positions") for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert fake.calls == {"list_positions": 1}
+    assert all(result == results[0] for result in results)
+    assert len({id(result) for result in results}) == 5
+
+
+def test_disabled_coalescing_calls_through():
+    fake = FakeAlpaca()
+    client = _client(fake, coalesce={})
+
+    client.list_positions()
+    client.list_positions()
+
+    assert fake.calls["list_positions"] == 2
+
+
+@pytest.mark.performance
+def test_simulated_workload_makes_far_fewer_api_calls():
+    report = benchmark_request_coalescing(duration=0.5)
+
+    assert report["uncoalesced"]["api_calls_per_request"] == 1.0
+    assert report["coalesced"]["api_calls_per_request"] < 0.5
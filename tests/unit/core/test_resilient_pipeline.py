@@ -0,0 +1,98 @@
+"""Tests for the per-method call pipelines in ResilientAlpacaClient."""
+
+from __future__ import annotations
+
+import pytest
+
+from core import resilience
+from core.resilience import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    PriorityRateLimiter,
+    RateLimiterConfig,
+)
+from core.resilient_client import ResilientAlpacaClient, benchmark_resilient_call
+
+
+class FakeAlpaca:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    def get_latest_trade(self, symbol):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise Exception("429 Too Many Requests")
+        return {"symbol": symbol, "price": 100.0}
+
+
+def _client(fake, breaker=None) -> ResilientAlpacaClient:
+    client = ResilientAlpacaClient(fake)
+    client._rate_limiter = PriorityRateLimiter(RateLimiterConfig(requests_per_second=1e6, burst_size=1000))
+    client._circuit_breaker = breaker or CircuitBreaker("pipeline-test")
+    return client
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(resilience.time, "sleep", lambda _: None)
+
+
+def test_pipelines_are_built_once_for_the_clients_methods():
+    client = _client(FakeAlpaca())
+
+    assert set(client._pipelines) == {"get_latest_trade"}
+    pipeline = client._pipelines["get_latest_trade"]
+    client.get_latest_trade("BTC/USD")
+    client.get_latest_trade("ETH/USD")
+
+    assert client._pipeline("get_latest_trade") is pipeline
+    assert pipeline.stats.calls == 2
+
+
+def test_stats_count_calls_retries_and_latency(no_sleep):
+    fake = FakeAlpaca(failures=2)
+    client = _client(fake)
+
+    assert client.get_latest_trade("BTC/USD")["price"] == 100.0
+
+    stats = client.get_status()["methods"]["get_latest_trade"]
+    assert fake.calls == 3
+    assert stats["calls"] == 1 and stats["retries"] == 2 and stats["errors"] == 0
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_breaker_rejections_are_counted(no_sleep):
+    breaker = CircuitBreaker("pipeline-reject", CircuitBreakerConfig(failure_threshold=1, timeout=60.0))
+    client = _client(FakeAlpaca(failures=10), breaker)
+
+    with pytest.raises(resilience.RateLimitError):
+        client.get_latest_trade("BTC/USD")
+    with pytest.raises(CircuitOpenError):
+        client.get_latest_trade("BTC/USD")
+
+    stats = client.get_status()["methods"]["get_latest_trade"]
+    assert stats["errors"] == 1 and stats["breaker_rejections"] == 1
+
+
+def test_latency_is_exported_to_prometheus():
+    prometheus = pytest.importorskip("prometheus_client")
+    labels = {"method": "get_latest_trade"}
+    before = prometheus.REGISTRY.get_sample_value("alpaca_api_call_latency_seconds_count", labels) or 0.0
+
+    client = _client(FakeAlpaca())
+    for _ in range(3):
+        client.get_latest_trade("BTC/USD")
+
+    after = prometheus.REGISTRY.get_sample_value("alpaca_api_call_latency_seconds_count", labels)
+    assert after - before == 3
+
+
+@pytest.mark.performance
+def test_pipeline_overhead_is_below_per_call_wrapping():
+    report = benchmark_resilient_call(iterations=20_000)
+
+    assert set(report) == {"direct", "per_call_wrapping", "pipeline"}
+    assert report["pipeline"]["avg_us"] < report["per_call_wrapping"]["avg_us"]
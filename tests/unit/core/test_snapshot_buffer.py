@@ -0,0 +1,81 @@
+"""Tests for the seqlock double buffer behind the bot snapshot."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from core.bot_snapshot import decode_snapshot, encode_snapshot
+from core.snapshot_buffer import SnapshotBufferReader, SnapshotBufferWriter
+
+
+def _bytes(view: memoryview, version: int) -> tuple:
+    return bytes(view), version
+
+
+def test_reader_sees_latest_version(tmp_path):
+    path = str(tmp_path / "buffer.bin")
+    writer = SnapshotBufferWriter(path, capacity=64)
+    reader = SnapshotBufferReader(path)
+
+    assert reader.read(_bytes) is None
+    writer.write(b"first")
+    writer.write(b"second")
+
+    assert reader.read(_bytes) == (b"second", 2)
+    writer.close()
+
+
+def test_rewritten_slot_is_detected_and_retried(tmp_path):
+    path = str(tmp_path / "buffer.bin")
+    writer = SnapshotBufferWriter(path, capacity=64)
+    reader = SnapshotBufferReader(path)
+    writer.write(b"v1")
+
+    def slow_parse(view: memoryview, version: int) -> tuple:
+        if version == 1:
+            # Two publishes while parsing reuse the slot being read
+            writer.write(b"v2")
+            writer.write(b"v3")
+        return bytes(view), version
+
+    assert reader.read(slow_parse) == (b"v3", 3)
+    assert reader.retries == 1
+    writer.close()
+
+
+def test_growing_the_buffer_remaps_readers(tmp_path):
+    path = str(tmp_path / "buffer.bin")
+    writer = SnapshotBufferWriter(path, capacity=16)
+    reader = SnapshotBufferReader(path)
+    writer.write(b"small")
+    assert reader.read(_bytes) == (b"small", 1)
+
+    writer.write(b"x" * 100)
+
+    assert writer.capacity >= 100
+    assert reader.read(_bytes) == (b"x" * 100, 2)
+    writer.close()
+
+
+def test_series_decode_as_zero_copy_views(tmp_path):
+    path = str(tmp_path / "buffer.bin")
+    writer = SnapshotBufferWriter(path)
+    reader = SnapshotBufferReader(path)
+    snapshot = {
+        "bot": {"attributes": {"is_running": True}},
+        "scanner": {
+            "prices": {"BTCUSD": [1.0, 2.0, 3.0], "ETHUSD": [4.0]},
+            "volumes": {"BTCUSD": [10.0, 20.0, 30.0], "ETHUSD": [40.0]},
+        },
+    }
+    writer.write(encode_snapshot(snapshot), version=5)
+
+    decoded = reader.read(decode_snapshot)
+
+    prices = decoded["scanner"]["prices"]["BTCUSD"]
+    np.testing.assert_array_equal(prices, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(decoded["scanner"]["volumes"]["ETHUSD"], [40.0])
+    assert not prices.flags.owndata and not prices.flags.writeable
+    assert decoded["version"] == 5
+    assert decoded["bot"]["attributes"]["is_running"] is True
+    writer.close()
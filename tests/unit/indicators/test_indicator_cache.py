@@ -0,0 +1,126 @@
+"""Tests for the memoized indicator cache and its incremental StochRSI extension."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import core
+from indicators.cache import IndicatorCache, stoch_rsi_cached
+from indicators.optimized_indicators import calculate_stoch_rsi_optimized
+
+STOCH_RSI_COLUMNS = ("RSI", "StochRSI", "StochRSI %K", "StochRSI %D")
+
+
+def _bars(n: int, seed: int = 21) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({"close": close}, index=pd.date_range("2024-01-01", periods=n, freq="min"))
+
+
+def _expected(df: pd.DataFrame, **params) -> dict:
+    result = calculate_stoch_rsi_optimized(df, **params)
+    return {name: result[name].to_numpy() for name in STOCH_RSI_COLUMNS}
+
+
+@pytest.fixture(params=core.BACKENDS)
+def backend(request):
+    with core.use_backend(request.param):
+        yield request.param
+
+
+def test_same_bars_are_a_hit():
+    cache = IndicatorCache()
+    bars = _bars(200)
+    calls = []
+
+    def compute(df):
+        calls.append(len(df))
+        return {"close": df["close"].to_numpy().copy()}, None
+
+    first = cache.get_or_compute(("BTC/USD", "close"), bars, compute)
+    second = cache.get_or_compute(("BTC/USD", "close"), bars.copy(), compute)
+
+    assert calls == [200]
+    assert first["close"] is second["close"]
+    assert not second["close"].flags.writeable
+    assert cache.stats.to_dict() == {"hits": 1, "extensions": 0, "misses": 1, "evictions": 0}
+
+
+@pytest.mark.parametrize("params", [{}, {"rsi_period": 14, "stoch_period": 9, "k_period": 3, "d_period": 3}])
+def test_appended_bars_extend_to_full_result(backend, params):
+    cache = IndicatorCache()
+    bars = _bars(400)
+
+    stoch_rsi_cached(bars.iloc[:250], "ETH/USD", cache=cache, **params)
+    for end in (251, 252, 260, 300, 400):
+        columns = stoch_rsi_cached(bars.iloc[:end], "ETH/USD", cache=cache, **params)
+        expected = _expected(bars.iloc[:end], **params)
+        for name in STOCH_RSI_COLUMNS:
+            np.testing.assert_allclose(columns[name], expected[name], rtol=1e-10, atol=1e-10, err_msg=name)
+
+    assert cache.stats.extensions == 5 and cache.stats.misses == 1
+
+
+def test_revised_last_bar_and_sliding_window_recompute():
+    cache = IndicatorCache()
+    bars = _bars(300)
+    stoch_rsi_cached(bars.iloc[:200], "SOL/USD", cache=cache)
+
+    revised = bars.iloc[:200].copy()
+    revised.iloc[-1, 0] += 1.0
+    columns = stoch_rsi_cached(revised, "SOL/USD", cache=cache)
+    np.testing.assert_allclose(columns["StochRSI %K"], _expected(revised)["StochRSI %K"])
+
+    window = bars.iloc[50:250]
+    columns = stoch_rsi_cached(window, "SOL/USD", cache=cache)
+    np.testing.assert_allclose(columns["RSI"], _expected(window)["RSI"])
+    assert cache.stats.misses == 3 and cache.stats.extensions == 0
+
+
+def test_short_history_is_recomputed_not_extended():
+    cache = IndicatorCache()
+    bars = _bars(60)
+    stoch_rsi_cached(bars.iloc[:10], "DOGE/USD", cache=cache)
+
+    columns = stoch_rsi_cached(bars, "DOGE/USD", cache=cache)
+
+    np.testing.assert_allclose(columns["StochRSI %D"], _expected(bars)["StochRSI %D"])
+    assert cache.stats.misses == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = IndicatorCache(maxsize=2)
+    bars = _bars(120)
+
+    for symbol in ("A", "B"):
+        stoch_rsi_cached(bars, symbol, cache=cache)
+    stoch_rsi_cached(bars, "A", cache=cache)
+    stoch_rsi_cached(bars, "C", cache=cache)
+    stoch_rsi_cached(bars, "A", cache=cache)
+    stoch_rsi_cached(bars, "B", cache=cache)
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 2
+    assert cache.stats.hits == 2 and cache.stats.misses == 4
+
+
+def test_strategy_wrappers_share_one_calculation():
+    indicator = pytest.importorskip("indicator")
+    if indicator.Indicator.__module__ != "indicator":
+        pytest.skip("indicator module replaced by a stub in this session")
+    from indicators.cache import indicator_cache
+
+    bars = _bars(150)
+    bars["symbol"] = "WRAP/USD"
+    before = indicator_cache.stats.to_dict()
+
+    with_rsi = indicator.rsi(bars, symbol="WRAP/USD")
+    both = indicator.stochastic(with_rsi, TYPE="StochRSI", symbol="WRAP/USD")
+
+    after = indicator_cache.stats.to_dict()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    pd.testing.assert_frame_equal(both, calculate_stoch_rsi_optimized(bars))
+    pd.testing.assert_frame_equal(indicator.rsi(bars), calculate_stoch_rsi_optimized(bars))
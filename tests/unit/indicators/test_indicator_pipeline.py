@@ -0,0 +1,106 @@
+"""Tests for the copy-free calculate_all_indicators_optimized pipeline."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.optimized_indicators import (
+    benchmark_indicator_pipeline,
+    calculate_all_indicators_optimized,
+    calculate_atr_optimized,
+    calculate_dynamic_bands_optimized,
+    calculate_stoch_rsi_optimized,
+    calculate_stochastic_optimized,
+)
+
+
+def _bars(n: int, seed: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.uniform(0.05, 0.6, n),
+            "low": close - rng.uniform(0.05, 0.6, n),
+            "close": close,
+            "volume": rng.uniform(1, 10, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="min"),
+    )
+
+
+def _chained(df: pd.DataFrame, include_atr=True, include_stoch=True, include_stoch_rsi=True,
+             include_dynamic_bands=True, **kwargs) -> pd.DataFrame:
+    """The per-indicator chain calculate_all_indicators_optimized used to run."""
+    result = df.copy()
+    if include_atr or include_dynamic_bands:
+        result = calculate_atr_optimized(result, **kwargs.get("atr", {}))
+    if include_stoch:
+        result = calculate_stochastic_optimized(result, **kwargs.get("stoch", {}))
+    if include_stoch_rsi:
+        result = calculate_stoch_rsi_optimized(result, **kwargs.get("stoch_rsi", {}))
+    if include_dynamic_bands:
+        result = calculate_dynamic_bands_optimized(result, **kwargs.get("dynamic_bands", {}))
+    return result
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {
+            "include_dynamic_bands": False,
+            "atr": {"period": 14},
+            "stoch": {"period": 9, "smooth_k": 3, "smooth_d": 3},
+            "stoch_rsi": {"rsi_period": 14, "stoch_period": 9, "k_period": 3, "d_period": 3},
+        },
+        {"include_atr": False, "include_stoch": False, "include_stoch_rsi": True, "include_dynamic_bands": False},
+        {"include_stoch_rsi": False, "dynamic_bands": {"atr_period": 10, "sensitivity": 0.9}},
+    ],
+)
+def test_pipeline_matches_per_indicator_chain(options):
+    bars = _bars(600)
+
+    result = calculate_all_indicators_optimized(bars, **options)
+
+    pd.testing.assert_frame_equal(result, _chained(bars, **options), check_freq=False)
+
+
+def test_short_history_keeps_insufficient_data_columns():
+    bars = _bars(12)
+
+    result = calculate_all_indicators_optimized(bars)
+
+    pd.testing.assert_frame_equal(result, _chained(bars), check_freq=False)
+    assert "RSI" not in result.columns and result["StochRSI"].isna().all()
+
+
+def test_pipeline_leaves_input_untouched():
+    bars = _bars(300)
+    original = bars.copy()
+
+    result = calculate_all_indicators_optimized(bars)
+
+    pd.testing.assert_frame_equal(bars, original)
+    result.loc[result.index[0], "close"] = -1.0
+    assert bars["close"].iloc[0] == original["close"].iloc[0]
+
+
+def test_existing_indicator_columns_are_replaced():
+    bars = _bars(300)
+    bars["ATR"] = -1.0
+
+    result = calculate_all_indicators_optimized(bars, include_stoch=False, include_stoch_rsi=False)
+
+    assert list(result.columns).count("ATR") == 1
+    assert (result["ATR"].iloc[14:] > 0).all()
+
+
+def test_pipeline_benchmark_reports_lower_peak_than_chain():
+    report = benchmark_indicator_pipeline(n_rows=50_000)
+
+    assert set(report) == {"pipeline", "chained"}
+    assert report["pipeline"]["peak_mb"] < report["chained"]["peak_mb"]
+    assert report["pipeline"]["avg_time"] > 0
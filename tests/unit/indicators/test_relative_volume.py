@@ -0,0 +1,96 @@
+"""Tests for the time-of-day relative volume baseline (batch and incremental)."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.volume_analysis import (
+    TimeOfDayVolumeBaseline,
+    VolumeAnalyzer,
+    time_of_day_volume_mean,
+)
+
+
+def _bars(days: int, seed: int = 6, freq: str = "min") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-01-01", periods=days * 1440, freq=freq)
+    volume = rng.integers(10, 1000, len(timestamps)).astype(float)
+    return pd.DataFrame({"timestamp": timestamps.astype(str), "volume": volume})
+
+
+def _legacy_baseline(df: pd.DataFrame, period: int) -> pd.Series:
+    """The groupby/rolling lambda calculate_relative_volume used before."""
+    frame = df.copy()
+    frame["hour"] = pd.to_datetime(frame["timestamp"]).dt.hour
+    frame["minute"] = pd.to_datetime(frame["timestamp"]).dt.minute
+    return frame.groupby(["hour", "minute"])["volume"].transform(
+        lambda x: x.rolling(window=min(len(x), period)).mean()
+    )
+
+
+@pytest.mark.parametrize("days,period", [(3, 50), (20, 10), (12, 5)])
+def test_batch_baseline_matches_groupby_rolling(days, period):
+    bars = _bars(days)
+    # Drop a few bars so slots end up with different lengths
+    bars = bars.drop(index=np.arange(0, len(bars), 97)).reset_index(drop=True)
+    slots = (pd.to_datetime(bars["timestamp"]).dt.hour * 60 + pd.to_datetime(bars["timestamp"]).dt.minute).to_numpy()
+
+    baseline = time_of_day_volume_mean(slots, bars["volume"].to_numpy(), period)
+
+    np.testing.assert_allclose(baseline, _legacy_baseline(bars, period).to_numpy(), rtol=1e-9)
+
+
+def test_calculate_relative_volume_keeps_columns_and_values():
+    bars = _bars(4)
+    analyzer = VolumeAnalyzer()
+
+    result = analyzer.calculate_relative_volume(bars)
+
+    expected = bars["volume"] / _legacy_baseline(bars, analyzer.relative_volume_period)
+    pd.testing.assert_series_equal(result["relative_volume"], expected, check_names=False, rtol=1e-9)
+    assert {"hour", "minute", "rel_vol_strength"} <= set(result.columns)
+
+
+def test_incremental_baseline_matches_batch_once_slots_fill():
+    period = 10
+    bars = _bars(15)
+    timestamps = pd.to_datetime(bars["timestamp"])
+    slots = (timestamps.dt.hour * 60 + timestamps.dt.minute).to_numpy()
+    batch = time_of_day_volume_mean(slots, bars["volume"].to_numpy(), period)
+
+    baseline = TimeOfDayVolumeBaseline(period)
+    streamed = np.array([baseline.update(ts, v) for ts, v in zip(timestamps, bars["volume"])])
+
+    filled = ~np.isnan(batch)
+    np.testing.assert_allclose(streamed[filled], batch[filled], rtol=1e-9)
+    first_day = streamed[:1440]
+    np.testing.assert_array_equal(first_day, bars["volume"].to_numpy()[:1440])
+
+
+def test_analyzer_tracks_a_baseline_per_symbol():
+    analyzer = VolumeAnalyzer()
+    ts = pd.Timestamp("2024-01-01 10:00")
+
+    assert analyzer.update_relative_volume("BTC/USD", ts, 100.0) == 1.0
+    assert analyzer.update_relative_volume("BTC/USD", ts + pd.Timedelta(days=1), 300.0) == pytest.approx(1.5)
+    assert analyzer.update_relative_volume("ETH/USD", ts, 50.0) == 1.0
+
+
+@pytest.mark.performance
+def test_batch_baseline_is_much_faster_than_groupby():
+    bars = _bars(30)
+    analyzer = VolumeAnalyzer()
+
+    started = time.perf_counter()
+    _legacy_baseline(bars, analyzer.relative_volume_period)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analyzer.calculate_relative_volume(bars)
+    current = time.perf_counter() - started
+
+    assert current * 5 < legacy, f"groupby {legacy:.3f}s vs slots {current:.3f}s"
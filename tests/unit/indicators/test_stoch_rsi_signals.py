@@ -0,0 +1,103 @@
+"""Tests for the vectorized StochRSI crossover signals and chart helpers."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.stoch_rsi_enhanced import (
+    StochRSIIndicator,
+    calculate_stoch_rsi_for_chart,
+    detect_stoch_rsi_signals,
+    get_signal_markers_for_chart,
+)
+
+
+def _bars(n: int, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.8, n))
+    idx = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"close": close}, index=idx)
+
+
+def _loop_signals(stoch_k: pd.Series, stoch_d: pd.Series, oversold: float = 20, overbought: float = 80):
+    """Bar-by-bar reference, as generate_signals used to be written."""
+    signals = pd.Series(0, index=stoch_k.index)
+    strength = pd.Series(0.0, index=stoch_k.index)
+    for i in range(1, len(stoch_k)):
+        if pd.isna(stoch_k.iloc[i]) or pd.isna(stoch_d.iloc[i]):
+            continue
+        k, d = stoch_k.iloc[i], stoch_d.iloc[i]
+        prev_k, prev_d = stoch_k.iloc[i - 1], stoch_d.iloc[i - 1]
+        if prev_k <= prev_d and k > d and k < oversold:
+            signals.iloc[i] = 1
+            strength.iloc[i] = min((oversold - k) / oversold, 1.0)
+        elif prev_k >= prev_d and k < d and k > overbought:
+            signals.iloc[i] = -1
+            strength.iloc[i] = min((k - overbought) / (100 - overbought), 1.0)
+    return signals, strength
+
+
+@pytest.fixture
+def indicator() -> StochRSIIndicator:
+    return StochRSIIndicator(14, 14, 3, 3)
+
+
+def test_vectorized_signals_match_bar_by_bar_reference(indicator):
+    bars = _bars(3000)
+    data = indicator.calculate_full_stoch_rsi(bars["close"])
+    k, d = data["StochRSI_K"], data["StochRSI_D"]
+
+    result = indicator.generate_signals(k, d)
+    expected_signals, expected_strength = _loop_signals(k, d)
+
+    assert isinstance(result["signals"], np.ndarray)
+    assert (result["signals"] != 0).sum() > 0
+    np.testing.assert_array_equal(result["signals"], expected_signals.to_numpy())
+    np.testing.assert_allclose(result["signal_strength"], expected_strength.to_numpy())
+    labels = np.where(expected_signals == 1, "BUY", np.where(expected_signals == -1, "SELL", "NEUTRAL"))
+    np.testing.assert_array_equal(result["signal_type"], labels)
+
+
+def test_markers_follow_shared_detector(indicator):
+    bars = _bars(1500)
+    data = indicator.calculate_full_stoch_rsi(bars["close"])
+    markers = get_signal_markers_for_chart(bars, data["StochRSI_K"], data["StochRSI_D"])
+    signals = detect_stoch_rsi_signals(data["StochRSI_K"], data["StochRSI_D"])["signals"]
+
+    unix = [int(ts.timestamp()) for ts in bars.index]
+    expected = [(unix[i], "arrowUp" if signals[i] > 0 else "arrowDown") for i in np.flatnonzero(signals)]
+    assert [(m["time"], m["shape"]) for m in markers] == expected
+
+
+def test_chart_payload_skips_missing_values_and_labels(indicator):
+    bars = _bars(300)
+    result = calculate_stoch_rsi_for_chart(bars, {})
+
+    chart = result["chart_data"]
+    assert "error" not in result
+    assert "signal_type" not in chart
+    assert len(chart["rsi"]) == int(indicator.calculate_rsi(bars["close"]).notna().sum())
+    assert chart["signals"][0] == {"time": int(bars.index[0].timestamp()), "value": 0.0}
+    assert result["current_signals"]["stochRSI"]["type"] in {"BUY", "SELL", "NEUTRAL"}
+
+
+@pytest.mark.performance
+def test_vectorized_signals_are_much_faster_than_loop(indicator):
+    bars = _bars(10_000)
+    data = indicator.calculate_full_stoch_rsi(bars["close"])
+    k, d = data["StochRSI_K"], data["StochRSI_D"]
+
+    started = time.perf_counter()
+    _loop_signals(k, d)
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(10):
+        indicator.generate_signals(k, d)
+    vector_time = (time.perf_counter() - started) / 10
+
+    assert vector_time * 100 < loop_time, f"loop {loop_time:.4f}s vs vectorized {vector_time:.6f}s"
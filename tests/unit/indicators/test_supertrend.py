@@ -0,0 +1,212 @@
+"""Parity tests for the SuperTrend kernel, incremental state and multi-timeframe cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import core
+from indicators.supertrend import (
+    MinuteBarCache,
+    calculate_multi_timeframe_supertrend,
+    calculate_supertrend,
+    get_current_signal,
+    resample_bars,
+)
+
+
+def _minute_bars(n: int, seed: int = 3, start: str = "2024-01-02 09:30") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+    high = close + rng.uniform(0.01, 0.4, n)
+    low = close - rng.uniform(0.01, 0.4, n)
+    # Occasional wide bars closing at an extreme cross the bands, so both trends occur
+    wide = rng.uniform(size=n) < 0.02
+    up = rng.uniform(size=n) < 0.5
+    high = np.where(wide & up, close, np.where(wide, close + 20, high))
+    low = np.where(wide & ~up, close, np.where(wide, close - 20, low))
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.05, n),
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.uniform(100, 1000, n),
+        },
+        index=pd.date_range(start, periods=n, freq="min"),
+    )
+
+
+def _legacy_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0) -> pd.DataFrame:
+    """calculate_supertrend as it was written before the kernel, bar by bar."""
+    high_low = df["high"] - df["low"]
+    high_close = np.abs(df["high"] - df["close"].shift())
+    low_close = np.abs(df["low"] - df["close"].shift())
+    true_range = np.max(pd.concat([high_low, high_close, low_close], axis=1), axis=1)
+    atr = true_range.rolling(period).mean()
+    hl_avg = (df["high"] + df["low"]) / 2
+    upper_band = hl_avg + multiplier * atr
+    lower_band = hl_avg - multiplier * atr
+
+    supertrend = pd.Series(index=df.index, dtype=float)
+    direction = pd.Series(index=df.index, dtype=float)
+    for i in range(period, len(df)):
+        close = df["close"].iloc[i]
+        if i == period:
+            up = close <= upper_band.iloc[i]
+            supertrend.iloc[i] = upper_band.iloc[i] if up else lower_band.iloc[i]
+            direction.iloc[i] = -1 if up else 1
+        elif direction.iloc[i - 1] == 1:
+            if close <= lower_band.iloc[i]:
+                supertrend.iloc[i], direction.iloc[i] = upper_band.iloc[i], -1
+            else:
+                supertrend.iloc[i], direction.iloc[i] = max(lower_band.iloc[i], supertrend.iloc[i - 1]), 1
+        else:
+            if close >= upper_band.iloc[i]:
+                supertrend.iloc[i], direction.iloc[i] = lower_band.iloc[i], 1
+            else:
+                supertrend.iloc[i], direction.iloc[i] = min(upper_band.iloc[i], supertrend.iloc[i - 1]), -1
+
+    return pd.DataFrame(
+        {"supertrend": supertrend, "direction": direction, "upper_band": upper_band,
+         "lower_band": lower_band, "atr": atr}
+    )
+
+
+class FakeDataManager:
+    """Serves any minute timeframe by resampling one 1Min history, like the broker would."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.calls: list[tuple[str, int]] = []
+
+    def get_historical_data(self, symbol, timeframe, limit=200):
+        self.calls.append((timeframe, limit))
+        minutes = 1 if timeframe == "1Min" else int(timeframe[:-3])
+        resampled = self.bars.resample(f"{minutes}min", label="left", closed="left").agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+        )
+        return resampled.dropna(subset=["close"]).iloc[-limit:]
+
+
+@pytest.fixture(params=core.BACKENDS)
+def backend(request):
+    with core.use_backend(request.param):
+        yield request.param
+
+
+@pytest.mark.parametrize("period,multiplier", [(10, 3.0), (7, 1.5), (20, 2.0)])
+def test_kernel_matches_bar_by_bar_implementation(backend, period, multiplier):
+    bars = _minute_bars(1500)
+
+    result = calculate_supertrend(bars, period, multiplier)
+    expected = _legacy_supertrend(bars, period, multiplier)
+
+    assert result["direction"].notna().sum() == len(bars) - period
+    for column in expected:
+        np.testing.assert_allclose(result[column], expected[column], rtol=1e-12, err_msg=column)
+    assert result["buy_signal"].any() and result["sell_signal"].any()
+
+
+def test_short_history_stays_undefined():
+    result = calculate_supertrend(_minute_bars(10), 10)
+
+    assert result["supertrend"].isna().all()
+    assert (result["signal"] == 0).all()
+
+
+def test_batch_rows_match_single_series():
+    frames = [_minute_bars(400, seed=seed) for seed in (1, 2, 3)]
+    stacked = {col: np.vstack([f[col].values for f in frames]) for col in ("high", "low", "close")}
+
+    batch = core.supertrend(stacked["high"], stacked["low"], stacked["close"], 10, 3.0)
+    for row, frame in enumerate(frames):
+        single = core.supertrend(frame["high"], frame["low"], frame["close"], 10, 3.0)
+        for name, values in single.items():
+            np.testing.assert_array_equal(batch[name][row], values, err_msg=name)
+
+
+def test_incremental_state_matches_full_series():
+    frames = [_minute_bars(600, seed=seed) for seed in (4, 5)]
+    high, low, close = (np.vstack([f[col].values for f in frames]) for col in ("high", "low", "close"))
+    full = core.supertrend(high, low, close, 10, 3.0)
+
+    state = core.SuperTrendState.from_series(high[:, :300], low[:, :300], close[:, :300], 10, 3.0)
+    steps = [state.update(high[:, i], low[:, i], close[:, i]) for i in range(300, 600)]
+    lines = np.column_stack([line for line, _ in steps])
+    directions = np.column_stack([direction for _, direction in steps])
+
+    np.testing.assert_allclose(lines, full["supertrend"][:, 300:], rtol=1e-12)
+    np.testing.assert_array_equal(directions, full["direction"][:, 300:])
+    np.testing.assert_allclose(state.atr, full["atr"][:, -1], rtol=1e-12)
+
+    cold = core.SuperTrendState(10)
+    warmup = [cold.update(h, l, c)[1] for h, l, c in zip(high[0, :11], low[0, :11], close[0, :11])]
+    assert np.isnan(warmup[9]).all() and not np.isnan(warmup[10]).any()
+
+
+def test_resample_drops_partial_leading_bucket():
+    bars = _minute_bars(33, start="2024-01-02 09:32")
+
+    five = resample_bars(bars, 5)
+
+    assert five.index[0] == pd.Timestamp("2024-01-02 09:35")
+    first = bars.loc["2024-01-02 09:35":"2024-01-02 09:39"]
+    assert five["high"].iloc[0] == first["high"].max()
+    assert five["volume"].iloc[0] == pytest.approx(first["volume"].sum())
+
+
+def test_multi_timeframe_uses_one_cached_minute_history():
+    history = _minute_bars(6000)
+    manager = FakeDataManager(history.iloc[:5990])
+    cache = MinuteBarCache(refresh_bars=50)
+    timeframes = ["1Min", "5Min", "15Min"]
+
+    for step in (5990, 6000):
+        manager.bars = history.iloc[:step]
+        manager.calls.clear()
+        result = calculate_multi_timeframe_supertrend("AAPL", manager, timeframes, bar_cache=cache)
+        cache_calls = list(manager.calls)
+        expected = {
+            tf: get_current_signal(manager.get_historical_data("AAPL", tf, limit=200))
+            for tf in timeframes
+        }
+        assert result["timeframe_signals"] == expected
+        if step == 5990:
+            assert cache_calls == [("1Min", 3000)]
+        else:
+            assert cache_calls == [("1Min", 50)]
+
+
+def test_cache_refetches_after_a_gap():
+    history = _minute_bars(4000)
+    manager = FakeDataManager(history.iloc[:3000])
+    cache = MinuteBarCache(refresh_bars=50)
+    cache.get("AAPL", manager, 1000)
+
+    manager.bars = history
+    manager.calls.clear()
+    bars = cache.get("AAPL", manager, 1000)
+
+    assert manager.calls == [("1Min", 50), ("1Min", 1000)]
+    pd.testing.assert_frame_equal(bars, history.iloc[-1000:], check_freq=False)
+
+
+def test_short_history_is_refreshed_not_refetched():
+    # The API has fewer bars than requested (sparse minutes or a response cap)
+    history = _minute_bars(600)
+    manager = FakeDataManager(history.iloc[:590])
+    cache = MinuteBarCache(refresh_bars=50)
+    cache.get("AAPL", manager, 3000)
+
+    manager.bars = history
+    manager.calls.clear()
+    bars = cache.get("AAPL", manager, 3000)
+
+    assert manager.calls == [("1Min", 50)]
+    pd.testing.assert_frame_equal(bars, history, check_freq=False)
+
+    manager.calls.clear()
+    cache.get("AAPL", manager, 6000)
+    assert manager.calls == [("1Min", 6000)]
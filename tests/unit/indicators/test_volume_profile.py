@@ -0,0 +1,104 @@
+"""Tests for the histogram volume profile and its rolling incremental form."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.volume_analysis import RollingVolumeProfile, VolumeAnalyzer
+
+
+def _bars(n: int, seed: int = 8) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 0.2, n))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.uniform(0.0, 0.6, n),
+            "low": close - rng.uniform(0.0, 0.6, n),
+            "close": close,
+            "volume": rng.integers(100, 5000, n).astype(float),
+        },
+        index=pd.date_range("2024-03-01", periods=n, freq="min"),
+    )
+
+
+def _legacy_profile(df: pd.DataFrame, lookback: int):
+    """analyze_volume_profile as it was written with iterrows, returning (price, volume, type, strength)."""
+    analysis_df = df.tail(lookback)
+    num_bins = min(50, len(analysis_df) // 2)
+    price_bins = np.linspace(analysis_df["low"].min(), analysis_df["high"].max(), num_bins)
+    volume_at_price = {}
+    for _, row in analysis_df.iterrows():
+        relevant = price_bins[(price_bins >= row["low"]) & (price_bins <= row["high"])]
+        for price in relevant:
+            volume_at_price[price] = volume_at_price.get(price, 0) + row["volume"] / len(relevant)
+    profile = sorted(volume_at_price.items(), key=lambda x: x[1], reverse=True)
+    peak = profile[0][1]
+    current = analysis_df["close"].iloc[-1]
+    return [
+        (price, volume, "support" if price < current else "resistance", volume / peak)
+        for price, volume in profile[: max(1, len(profile) // 5)]
+    ]
+
+
+@pytest.mark.parametrize("n,lookback", [(300, 100), (2000, 400), (60, 60)])
+def test_profile_matches_row_by_row_reference(n, lookback):
+    bars = _bars(n)
+
+    levels = VolumeAnalyzer().analyze_volume_profile(bars, lookback)
+    expected = _legacy_profile(bars, lookback)
+
+    assert len(levels) == len(expected) > 0
+    for level, (price, volume, level_type, strength) in zip(levels, expected):
+        assert level.price == price
+        assert level.volume == pytest.approx(volume, rel=1e-9)
+        assert level.level_type == level_type
+        assert level.strength == pytest.approx(strength, rel=1e-9)
+
+
+def test_rolling_profile_matches_rebuilt_window():
+    bars = _bars(1200, seed=2)
+    profile = RollingVolumeProfile(bin_size=0.25, window=200)
+
+    for row in bars.itertuples():
+        profile.add_bar(row.low, row.high, row.close, row.volume)
+
+    rebuilt = RollingVolumeProfile(bin_size=0.25, window=200)
+    for row in bars.tail(200).itertuples():
+        rebuilt.add_bar(row.low, row.high, row.close, row.volume)
+
+    prices, volumes = profile.profile()
+    expected_prices, expected_volumes = rebuilt.profile()
+    assert len(profile) == 200
+    np.testing.assert_allclose(prices, expected_prices)
+    np.testing.assert_allclose(volumes, expected_volumes, rtol=1e-9, atol=1e-6)
+    assert [lvl.price for lvl in profile.levels()] == [lvl.price for lvl in rebuilt.levels()]
+
+
+def test_rolling_profile_from_bars_uses_window_range():
+    bars = _bars(500, seed=4)
+
+    profile = RollingVolumeProfile.from_bars(bars, window=100, num_bins=50)
+
+    recent = bars.tail(100)
+    assert profile.bin_size == pytest.approx((recent["high"].max() - recent["low"].min()) / 49)
+    assert profile.last_close == recent["close"].iloc[-1]
+    assert all(lvl.level_type in {"support", "resistance"} for lvl in profile.levels())
+
+
+@pytest.mark.performance
+def test_profile_on_5k_bars_runs_in_milliseconds():
+    bars = _bars(5000)
+    analyzer = VolumeAnalyzer()
+    analyzer.analyze_volume_profile(bars, 5000)
+
+    started = time.perf_counter()
+    for _ in range(10):
+        analyzer.analyze_volume_profile(bars, 5000)
+    elapsed = (time.perf_counter() - started) / 10
+
+    assert elapsed < 0.02, f"volume profile took {elapsed * 1000:.1f}ms"
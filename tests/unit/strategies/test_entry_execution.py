@@ -0,0 +1,239 @@
+"""End-to-end entry execution for the crypto day trading bot against a fake broker."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from core.order_book import ReplaySource
+from core.resilience import CircuitBreaker, PriorityRateLimiter, RateLimiterConfig
+
+scalping = pytest.importorskip("strategies.crypto_scalping_strategy")
+
+
+class FakeBroker:
+    def __init__(self, cash="1000"):
+        self.cash = cash
+        self.orders = []
+        self.position_threads = []
+        self.quotes = {"BTC/USD": (64000.0, 64010.0), "ETH/USD": (3000.0, 3001.0), "PEPE/USD": (1.0, 1.1)}
+
+    def get_account(self):
+        return SimpleNamespace(cash=self.cash)
+
+    def get_crypto_snapshots(self, symbols):
+        return {
+            symbol: SimpleNamespace(latest_quote=SimpleNamespace(bid_price=bid, ask_price=ask))
+            for symbol, (bid, ask) in self.quotes.items()
+            if symbol in symbols
+        }
+
+    def submit_order(self, symbol, qty, side, type, time_in_force):
+        time.sleep(0.02)
+        order = SimpleNamespace(id=f"order-{len(self.orders)}", symbol=symbol, qty=qty, side=side,
+                                status="accepted", filled_qty="0")
+        self.orders.append(order)
+        return order
+
+    def get_position(self, symbol):
+        self.position_threads.append(threading.get_ident())
+        return SimpleNamespace(symbol=symbol, qty="0.001", current_price="64800")
+
+
+class FakeScanner:
+    def preseed_historical_data(self, api):
+        return 0
+
+    def get_indicators(self, symbol):
+        return {}
+
+    def get_enabled_symbols(self):
+        return ["BTCUSD", "ETHUSD", "PEPEUSD"]
+
+
+def _signal(symbol, price, action="buy"):
+    return scalping.CryptoSignal(
+        symbol=symbol, action=action, confidence=0.9, price=price, volatility=0.01,
+        volume_surge=False, momentum=0.0, target_profit=0.01, stop_loss=0.005, timestamp=datetime.now(),
+    )
+
+
+@pytest.fixture
+def trader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    broker = FakeBroker()
+    bot = scalping.CryptoDayTradingBot(broker, initial_capital=10000, scanner=FakeScanner())
+    _private_budget(bot, "entry-test")
+    # Only the alpaca_trade_api keyword form is accepted by the fake broker
+    monkeypatch.setattr(bot, "_submit_crypto_order", _legacy_submit(broker))
+    return bot, broker
+
+
+def _private_budget(bot, name):
+    """Keep the bot's API calls off the process-wide limiter and breaker."""
+    client = bot._resilient_api
+    client._circuit_breaker = CircuitBreaker(name)
+    client._rate_limiter = PriorityRateLimiter(RateLimiterConfig(requests_per_second=1000.0, burst_size=100))
+
+
+def _legacy_submit(broker):
+    async def place(symbol, side, quantity, order_type="market", client_order_id=None):
+        return await asyncio.to_thread(
+            broker.submit_order, symbol=symbol.replace("/", ""), qty=quantity, side=side,
+            type=order_type, time_in_force="ioc",
+        )
+    return place
+
+
+def test_signals_become_tracked_positions_in_one_batch(trader):
+    bot, broker = trader
+
+    asyncio.run(bot._execute_entries([
+        _signal("BTC/USD", 64005.0),
+        _signal("ETH/USD", 3000.5),
+        _signal("PEPE/USD", 1.05),
+        _signal("ETH/USD", 3000.5, action="sell"),
+    ]))
+
+    assert set(bot.active_positions) == {"BTC/USD", "ETH/USD"}
+    assert {order.symbol for order in broker.orders} == {"BTCUSD", "ETHUSD"}
+    eth = bot.active_positions["ETH/USD"]
+    assert eth["quantity_dec"] % Decimal("0.0001") == 0
+    status = bot.get_status(live_prices=False)["execution"]["orders"]
+    assert status["acked"] == 2 and status["rejected"] == 1
+    assert status["ack_p50_ms"] >= 20.0
+    # Quote and account refreshes share the bot's rate budget
+    assert bot.execution.client is bot._resilient_api
+
+
+def test_entries_respect_free_position_slots(trader):
+    bot, broker = trader
+    bot.max_concurrent_positions = 1
+
+    asyncio.run(bot._execute_entries([_signal("BTC/USD", 64005.0), _signal("ETH/USD", 3000.5)]))
+
+    assert list(bot.active_positions) == ["BTC/USD"]
+    assert len(broker.orders) == 1
+
+
+def test_trade_updates_adjust_and_drop_entry_positions(trader):
+    bot, broker = trader
+    asyncio.run(bot._execute_entries([_signal("BTC/USD", 64005.0), _signal("ETH/USD", 3000.5)]))
+    btc, eth = bot.active_positions["BTC/USD"], bot.active_positions["ETH/USD"]
+
+    def update(event, position, status, filled_qty, price=None):
+        return {"event": event, "order": {"id": position["order_id"], "symbol": "X", "side": "buy",
+                                          "qty": str(position["quantity_dec"]), "status": status,
+                                          "filled_qty": filled_qty, "filled_avg_price": price}}
+
+    asyncio.run(bot.order_book.run(ReplaySource([
+        update("partial_fill", btc, "partially_filled", "0.0005", "64100"),
+        update("canceled", eth, "canceled", "0"),
+    ])))
+
+    assert list(bot.active_positions) == ["BTC/USD"]
+    assert btc["quantity_dec"] == Decimal("0.0005")
+    assert btc["entry_price"] == 64100.0
+    assert btc["target_price"] == pytest.approx(64100.0 * 1.01)
+    assert btc["order_status"] == "partially_filled"
+
+
+def test_exit_check_evaluates_all_positions_from_the_table(trader, monkeypatch):
+    bot, broker = trader
+    asyncio.run(bot._execute_entries([_signal("BTC/USD", 64005.0), _signal("ETH/USD", 3000.5)]))
+    bot.active_positions["SOL/USD"] = dict(bot.active_positions["ETH/USD"], entry_price=150.0,
+                                           target_price=151.5, stop_price=149.0, entry_time=datetime(2020, 1, 1))
+    prices = {"BTC/USD": 64005.0 * 1.011, "ETH/USD": 3000.5 * 0.99, "SOL/USD": 150.1}
+    monkeypatch.setattr(bot, "_latest_prices", lambda symbols: {s: prices[s] for s in symbols})
+    exits = []
+
+    async def execute_exit(symbol, reason, price, pnl_pct):
+        exits.append((symbol, reason))
+        del bot.active_positions[symbol]
+
+    monkeypatch.setattr(bot, "_execute_exit", execute_exit)
+    asyncio.run(bot._check_exit_conditions())
+
+    assert exits == [("BTC/USD", "PROFIT_TARGET"), ("ETH/USD", "STOP_LOSS"), ("SOL/USD", "TIME_LIMIT")]
+    asyncio.run(bot._check_exit_conditions())
+    assert len(bot.exit_rules) == 0
+
+
+def test_exit_check_reads_missing_prices_off_the_loop(trader, monkeypatch):
+    bot, broker = trader
+    asyncio.run(bot._execute_entries([_signal("BTC/USD", 64005.0)]))
+    monkeypatch.setattr(bot, "_latest_prices", lambda symbols: dict.fromkeys(symbols))
+    exits = []
+
+    async def execute_exit(symbol, reason, price, pnl_pct):
+        exits.append((symbol, reason, price))
+        del bot.active_positions[symbol]
+
+    monkeypatch.setattr(bot, "_execute_exit", execute_exit)
+
+    async def check():
+        await bot._check_exit_conditions()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(check())
+
+    assert exits == [("BTC/USD", "PROFIT_TARGET", 64800.0)]
+    assert broker.position_threads and loop_thread not in broker.position_threads
+
+
+def test_legacy_clients_get_keyword_orders_through_the_resilient_client(trader):
+    bot, broker = trader
+
+    order = asyncio.run(scalping.CryptoDayTradingBot._place_crypto_order(bot, "ETH/USD", "buy", 0.5))
+
+    assert broker.orders == [order] and order.symbol == "ETHUSD" and order.qty == 0.5
+    assert bot._resilient_api.client is broker
+
+
+class ReadTimeout(Exception):
+    """Stands in for ``requests.exceptions.ReadTimeout``."""
+
+
+class TimingOutBroker(FakeBroker):
+    """Times out every ``submit_order``; ``accept`` decides whether the order still went through."""
+
+    def __init__(self, accept):
+        super().__init__()
+        self.accept = accept
+        self.submitted = []
+
+    def submit_order(self, symbol, qty, side, type, time_in_force, client_order_id=None):
+        self.submitted.append(client_order_id)
+        if self.accept:
+            self.orders.append(SimpleNamespace(id="order-0", symbol=symbol, client_order_id=client_order_id))
+        raise ReadTimeout("read timed out")
+
+    def get_order_by_client_order_id(self, client_order_id):
+        for order in self.orders:
+            if order.client_order_id == client_order_id:
+                return order
+        raise type("NotFound", (Exception,), {"status_code": 404})("order not found")
+
+
+@pytest.mark.parametrize("accept", [True, False])
+def test_timed_out_orders_are_never_submitted_twice(tmp_path, monkeypatch, accept):
+    monkeypatch.chdir(tmp_path)
+    broker = TimingOutBroker(accept)
+    bot = scalping.CryptoDayTradingBot(broker, initial_capital=10000, scanner=FakeScanner())
+    bot.ORDER_RETRY_BASE_DELAY = 0.0
+    _private_budget(bot, "order-retry-test")
+
+    order = asyncio.run(bot._place_crypto_order_with_retry("BTC/USD", "buy", 0.001))
+
+    if accept:
+        # The first attempt reached the broker; the retry finds it instead of resubmitting
+        assert order is broker.orders[0] and len(broker.submitted) == 1
+    else:
+        assert order is None and len(broker.submitted) == 3
+    assert len(set(broker.submitted)) == 1 and broker.submitted[0]
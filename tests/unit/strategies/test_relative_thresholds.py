@@ -0,0 +1,68 @@
+"""Tests for the scanner's relative-threshold history."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+scalping = pytest.importorskip("strategies.crypto_scalping_strategy")
+
+
+def _scanner(n_prices: int = 60, seed: int = 3):
+    scanner = scalping.CryptoVolatilityScanner(enabled_symbols=["BTCUSD"])
+    rng = np.random.default_rng(seed)
+    for price in 100 + np.cumsum(rng.normal(0, 0.5, n_prices)):
+        scanner.update_market_data("BTCUSD", float(price), 1.0)
+    return scanner, rng
+
+
+def test_history_gains_one_point_per_price_sample():
+    scanner, rng = _scanner()
+
+    scanner.get_indicators("BTCUSD")
+    scanner.get_indicators("BTCUSD")
+    scanner.get_indicators("BTCUSD", update_history=False)
+    assert len(scanner.indicator_history["BTCUSD"]["rsi"]) == 1
+
+    scanner.update_market_data("BTCUSD", 101.0, 1.0)
+    scanner.get_indicators("BTCUSD", update_history=False)
+    assert len(scanner.indicator_history["BTCUSD"]["rsi"]) == 1
+    scanner.get_indicators("BTCUSD")
+    assert len(scanner.indicator_history["BTCUSD"]["rsi"]) == 2
+
+
+def test_relative_position_and_percentile_follow_recent_history():
+    scanner, rng = _scanner()
+    rsi_values = []
+    for price in 100 + np.cumsum(rng.normal(0, 0.8, 250)):
+        scanner.update_market_data("BTCUSD", float(price), 1.0)
+        rsi_values.append(scanner.get_indicators("BTCUSD")["rsi"])
+
+    recent = np.array(rsi_values[-200:])
+    current = rsi_values[-1]
+    indicators = scanner.get_indicators("BTCUSD", update_history=False)
+
+    expected_relative = np.clip((current - recent.min()) / (recent.max() - recent.min()), 0, 1)
+    expected_percentile = (np.sum(recent < current) + 0.5 * np.sum(recent == current)) / len(recent)
+    assert indicators["rsi_relative"] == pytest.approx(expected_relative)
+    assert indicators["rsi_percentile"] == pytest.approx(expected_percentile)
+    assert 0.0 <= indicators["stoch_k_percentile"] <= 1.0
+
+
+def test_short_history_is_neutral():
+    scanner, _ = _scanner()
+
+    indicators = scanner.get_indicators("BTCUSD")
+
+    assert indicators["rsi_relative"] == 0.5
+    assert indicators["rsi_percentile"] == 0.5
+
+
+def test_last_indicators_keep_a_copy_for_the_snapshot():
+    scanner, _ = _scanner()
+
+    indicators = scanner.get_indicators("BTCUSD")
+    indicators["rsi"] = -1.0
+
+    assert scanner.last_indicators["BTCUSD"]["rsi"] != -1.0
+    assert scanner.last_indicators["BTCUSD"]["price"] == scanner.price_data["BTCUSD"][-1]
@@ -0,0 +1,91 @@
+"""Tests for the fast JSON provider and snapshot response helpers."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from utils.json_encoding import (
+    benchmark_json_encoding,
+    conditional_json_response,
+    dumps_bytes,
+    install_json_provider,
+    to_columnar,
+)
+
+
+@pytest.fixture
+def app():
+    app = flask.Flask(__name__)
+    install_json_provider(app)
+
+    @app.route("/snapshot")
+    def snapshot():
+        return conditional_json_response({"positions": [{"qty": np.float64(1.5)}]})
+
+    return app
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_dumps_handles_numpy_and_datetime(backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+
+    payload = {
+        "price": np.float64(101.25),
+        "qty": np.int64(3),
+        "series": np.array([1.0, 2.0]),
+        "at": datetime(2025, 1, 2, 3, 4, 5),
+        "bar": pd.Timestamp("2025-01-02T03:04:05Z"),
+    }
+
+    decoded = json.loads(dumps_bytes(payload, backend=backend))
+
+    assert decoded == {
+        "price": 101.25,
+        "qty": 3,
+        "series": [1.0, 2.0],
+        "at": "2025-01-02T03:04:05",
+        "bar": "2025-01-02T03:04:05+00:00",
+    }
+
+
+def test_unchanged_snapshot_returns_304(app):
+    client = app.test_client()
+
+    first = client.get("/snapshot")
+    assert first.status_code == 200
+    assert first.get_json() == {"positions": [{"qty": 1.5}]}
+
+    etag = first.headers["ETag"]
+    second = client.get("/snapshot", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_to_columnar_from_frame_and_records():
+    index = pd.date_range("2025-01-01", periods=3, freq="min", tz="UTC")
+    frame = pd.DataFrame({"close": [1.0, np.nan, 3.0], "volume": [10, 20, 30]}, index=index)
+
+    columns = to_columnar(frame, index_key="time")
+    decoded = json.loads(dumps_bytes(columns))
+
+    assert decoded["close"] == [1.0, None, 3.0]
+    assert decoded["volume"] == [10, 20, 30]
+    assert decoded["time"][0] == "2025-01-01T00:00:00+00:00"
+
+    records = [{"symbol": "BTC/USD", "qty": 1}, {"symbol": "ETH/USD", "qty": 2}]
+    assert to_columnar(records) == {"symbol": ["BTC/USD", "ETH/USD"], "qty": [1, 2]}
+
+
+def test_benchmark_reports_each_backend():
+    results = benchmark_json_encoding({"values": list(range(100))}, iterations=2)
+
+    assert "stdlib" in results
+    assert results["stdlib"]["bytes"] > 0
@@ -0,0 +1,71 @@
+"""Tests for slotted hot-path records and lazily formatted signal reasons."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from utils.json_encoding import dumps_bytes
+from utils.records import SignalReasons, benchmark_scan_allocations, record
+
+slots_only = pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+
+
+@record(frozen=True)
+class Quote:
+    symbol: str
+    price: float
+    reasons: SignalReasons = None
+
+
+@slots_only
+def test_records_have_no_instance_dict_and_can_be_frozen():
+    quote = Quote("BTC/USD", 64000.0)
+
+    assert not hasattr(quote, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        quote.price = 1.0
+    assert dataclasses.asdict(quote) == {"symbol": "BTC/USD", "price": 64000.0, "reasons": None}
+
+
+def test_reasons_render_the_scanner_strings_only_on_display():
+    rsi, rsi_rel, stoch_k, spike = 43.21, 0.354, 88.0, 0.0123
+    reasons = SignalReasons()
+    reasons.add("RSI_LOWER_HALF", rsi, rsi_rel)
+    reasons.add("BLOCK_STOCH_RELATIVE_HIGH", stoch_k, 1 - 0.96)
+    reasons.add("MACD_POSITIVE")
+    reasons.add("MOMENTUM_SPIKE", spike)
+
+    assert reasons.codes == ["RSI_LOWER_HALF", "BLOCK_STOCH_RELATIVE_HIGH", "MACD_POSITIVE", "MOMENTUM_SPIKE"]
+    assert reasons == [
+        f"RSI lower half ({rsi:.1f}, {rsi_rel*100:.0f}%)",
+        f"BLOCKED: StochRSI at relative high ({stoch_k:.1f}, top {(1-0.96)*100:.0f}%)",
+        "MACD positive",
+        f"🚀 MOMENTUM: {spike*100:.1f}% spike",
+    ]
+    assert ", ".join(reasons) == str(reasons)
+    assert len(reasons) == 4 and SignalReasons() == []
+
+
+def test_reasons_serialise_as_display_strings():
+    reasons = SignalReasons()
+    reasons.add("EMA_BULLISH_CROSS")
+    signal = Quote("ETH/USD", 3000.5, reasons)
+
+    payload = json.loads(dumps_bytes({"signal": signal, "at": datetime(2024, 1, 1)}))
+
+    assert payload["signal"]["reasons"] == ["EMA bullish cross"]
+
+
+@pytest.mark.performance
+def test_compact_scan_allocates_less_than_plain_records():
+    result = benchmark_scan_allocations(symbols=100)
+
+    assert result["after"]["retained_bytes"] < result["before"]["retained_bytes"]
+    assert result["after"]["peak_bytes"] < result["before"]["peak_bytes"]
+    if sys.version_info >= (3, 10):
+        assert result["bytes_per_signal_after"] < result["bytes_per_signal_before"]
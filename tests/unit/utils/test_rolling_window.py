@@ -0,0 +1,46 @@
+"""Tests for the rolling order-statistics window behind relative thresholds."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from utils.rolling_window import RollingOrderStatistics
+
+
+def _percentile(window, value):
+    window = np.asarray(window)
+    return (np.sum(window < value) + 0.5 * np.sum(window == value)) / len(window)
+
+
+def test_min_max_and_rank_track_the_last_maxlen_values():
+    rng = np.random.default_rng(40)
+    # Rounded so ties show up in the window
+    values = np.round(rng.normal(50, 15, 1000), 0)
+    window = RollingOrderStatistics(200)
+
+    for end, value in enumerate(values, start=1):
+        window.append(value)
+        recent = values[max(0, end - 200):end]
+        assert len(window) == len(recent)
+        assert window.min == recent.min() and window.max == recent.max()
+        if end % 37 == 0:
+            for probe in (value, recent.min(), recent.max(), 50.5, -1.0, 200.0):
+                assert window.percentile_rank(probe) == pytest.approx(_percentile(recent, probe))
+
+    assert list(window) == list(values[-200:])
+
+
+def test_range_position_is_unclamped_and_nan_is_ignored():
+    window = RollingOrderStatistics(5, [10.0, 20.0, 30.0])
+
+    window.append(float("nan"))
+
+    assert len(window) == 3
+    assert window.range_position(25.0) == pytest.approx(0.75)
+    assert window.range_position(40.0) == pytest.approx(1.5)
+
+
+def test_rejects_empty_window():
+    with pytest.raises(ValueError):
+        RollingOrderStatistics(0)
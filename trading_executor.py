@@ -9,7 +9,7 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 import alpaca_trade_api as tradeapi
-from dataclasses import dataclass
+from utils.records import record
 import asyncio
 from config.unified_config import TradingConfig
 from core.signal_filters import ensure_signal_filters, minimum_strength_percent
@@ -28,7 +28,7 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
     EXPIRED = "expired"
 
-@dataclass
+@record(frozen=True)
 class TradingSignal:
     """Trading signal data structure"""
     symbol: str
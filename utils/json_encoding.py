@@ -0,0 +1,238 @@
+"""Fast JSON encoding shared by the Flask dashboards and API blueprints."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+try:  # orjson is optional; the stdlib encoder is used when it is missing
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None  # type: ignore[assignment]
+
+from flask import Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+from utils.records import SignalReasons
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("orjson", "stdlib")
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+
+
+def _default(obj: Any) -> Any:
+    """Encode NumPy, pandas and stdlib scalar types that JSON does not know."""
+
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and value != value:
+            return None
+        return value
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if pd is not None:
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.tolist()
+        if isinstance(obj, pd.Timedelta):
+            return obj.total_seconds()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, SignalReasons):
+        return obj.render()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def resolve_json_backend(preferred: Optional[str] = None) -> str:
+    """Return the JSON backend to use, honouring ``API_JSON_BACKEND``."""
+
+    choice = (preferred or os.getenv("API_JSON_BACKEND", "auto")).strip().lower()
+    if choice not in (*JSON_BACKENDS, "auto"):
+        raise ValueError(f"Unknown JSON backend {choice!r}; expected one of {JSON_BACKENDS}")
+    if choice == "stdlib":
+        return "stdlib"
+    if orjson is None:
+        if choice == "orjson":
+            logger.warning("orjson requested but not installed; using stdlib json")
+        return "stdlib"
+    return "orjson"
+
+
+def dumps_bytes(obj: Any, *, backend: Optional[str] = None, sort_keys: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes using the selected backend."""
+
+    if resolve_json_backend(backend) == "orjson":
+        options = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_default, option=options)
+    return json.dumps(
+        obj, default=_default, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson with a NumPy-aware stdlib fallback.
+
+    Payloads may contain NumPy scalars/arrays, pandas timestamps and
+    ``datetime`` objects directly, so routes no longer need to ``float()``
+    every value before calling ``jsonify``.
+    """
+
+    sort_keys = False
+
+    def __init__(self, app, backend: Optional[str] = None) -> None:
+        super().__init__(app)
+        self.backend = resolve_json_backend(backend)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs or self.backend != "orjson":
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj, backend=self.backend, sort_keys=self.sort_keys).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs or self.backend != "orjson":
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj, backend=self.backend, sort_keys=self.sort_keys)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install_json_provider(app, backend: Optional[str] = None) -> FastJSONProvider:
+    """Attach :class:`FastJSONProvider` to ``app`` and return it."""
+
+    provider = FastJSONProvider(app, backend=backend or app.config.get("JSON_BACKEND"))
+    provider.sort_keys = bool(app.config.get("JSON_SORT_KEYS", False))
+    app.json = provider
+    logger.debug("Flask JSON provider: %s", provider.backend)
+    return provider
+
+
+def conditional_json_response(payload: Any, status_code: int = 200) -> Response:
+    """Return ``payload`` with a strong ETag, answering ``304`` when unchanged.
+
+    Dashboards poll snapshot endpoints every few seconds; when the snapshot
+    has not changed the client's ``If-None-Match`` matches and only headers
+    are sent back.
+    """
+
+    response = current_app.json.response(payload)
+    response.status_code = status_code
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def to_columnar(
+    data: Any,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    index_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Convert a DataFrame or list of records to ``{column: values}`` form.
+
+    Series data (bars, indicator histories) is sent as one array per column
+    instead of one object per row, which avoids repeating every key for
+    every bar and lets orjson serialise the NumPy buffers directly.
+    """
+
+    if pd is not None and isinstance(data, pd.DataFrame):
+        selected = list(columns) if columns is not None else list(data.columns)
+        payload: Dict[str, Any] = {}
+        if index_key:
+            index = data.index
+            if isinstance(index, pd.DatetimeIndex):
+                payload[index_key] = [ts.isoformat() for ts in index]
+            else:
+                payload[index_key] = index.to_numpy()
+        for name in selected:
+            values = data[name].to_numpy()
+            if values.dtype.kind == "f" and np.isnan(values).any():
+                values = np.where(np.isnan(values), None, values).tolist()
+            payload[name] = values
+        return payload
+
+    records: Iterable[Mapping[str, Any]] = data or []
+    records = list(records)
+    if columns is None:
+        columns = list(records[0].keys()) if records else []
+    return {name: [record.get(name) for record in records] for name in columns}
+
+
+def epoch_millis(index: Any) -> list:
+    """Return a DatetimeIndex as integer epoch milliseconds without a row loop."""
+
+    if hasattr(index, "as_unit"):
+        return index.as_unit("ms").asi8.tolist()
+    return (np.asarray(index.asi8) // 1_000_000).tolist()
+
+
+def benchmark_json_encoding(payload: Any, iterations: int = 50) -> Dict[str, Dict[str, float]]:
+    """Benchmark payload encode times for each available JSON backend.
+
+    ``stdlib`` mirrors the previous ``jsonify`` path; ``orjson`` is the fast
+    path used by :class:`FastJSONProvider` when the package is installed.
+    """
+
+    results: Dict[str, Dict[str, float]] = {}
+    backends = ["stdlib"] + (["orjson"] if orjson is not None else [])
+    for backend in backends:
+        times = []
+        size = 0
+        for _ in range(iterations):
+            start_time = time.perf_counter()
+            size = len(dumps_bytes(payload, backend=backend))
+            times.append(time.perf_counter() - start_time)
+        results[backend] = {
+            "avg_time": float(np.mean(times)),
+            "min_time": float(np.min(times)),
+            "max_time": float(np.max(times)),
+            "bytes": float(size),
+        }
+    return results
+
+
+__all__ = [
+    "FastJSONProvider",
+    "JSON_BACKENDS",
+    "benchmark_json_encoding",
+    "conditional_json_response",
+    "dumps_bytes",
+    "epoch_millis",
+    "install_json_provider",
+    "resolve_json_backend",
+    "to_columnar",
+]
@@ -0,0 +1,226 @@
+"""Compact record types for objects created on every scan, log line and reconciliation."""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# ``dataclass(slots=True)`` needs Python 3.10; older interpreters keep a __dict__
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def record(cls: Optional[type] = None, *, frozen: bool = False) -> Any:
+    """``@dataclass`` without a per-instance ``__dict__``, optionally frozen."""
+
+    def wrap(klass: type) -> type:
+        return dataclass(frozen=frozen, **_SLOTS)(klass)
+
+    return wrap if cls is None else wrap(cls)
+
+
+# Reason code -> display template; arguments are formatted only when rendered
+REASON_TEMPLATES: Dict[str, str] = {
+    "BLOCK_RSI_OVERBOUGHT": "BLOCKED: RSI overbought ({0:.1f})",
+    "BLOCK_RSI_RELATIVE_HIGH": "BLOCKED: RSI at relative high ({0:.1f}, top {1:.0%})",
+    "BLOCK_STOCH_VERY_HIGH": "BLOCKED: StochRSI very high ({0:.1f})",
+    "BLOCK_STOCH_RELATIVE_HIGH": "BLOCKED: StochRSI at relative high ({0:.1f}, top {1:.0%})",
+    "RSI_RELATIVE_LOW": "RSI at relative low ({0:.1f}, bottom {1:.0%})",
+    "RSI_LOW_IN_RANGE": "RSI low in range ({0:.1f}, {1:.0%})",
+    "RSI_LOWER_HALF": "RSI lower half ({0:.1f}, {1:.0%})",
+    "RSI_NEUTRAL": "RSI neutral ({0:.1f}, {1:.0%})",
+    "RSI_RELATIVE_HIGH": "RSI at relative high ({0:.1f}, top {1:.0%})",
+    "RSI_HIGH_IN_RANGE": "RSI high in range ({0:.1f}, {1:.0%})",
+    "RSI_UPPER_HALF": "RSI upper half ({0:.1f}, {1:.0%})",
+    "RSI_VERY_LOW": "RSI very low ({0:.1f})",
+    "RSI_OVERSOLD": "RSI oversold ({0:.1f})",
+    "RSI_LOW": "RSI low ({0:.1f})",
+    "RSI_VERY_HIGH": "RSI very high ({0:.1f})",
+    "RSI_OVERBOUGHT": "RSI overbought ({0:.1f})",
+    "RSI_HIGH": "RSI high ({0:.1f})",
+    "STOCH_RELATIVE_LOW": "StochRSI at relative low ({0:.1f}, bottom {1:.0%})",
+    "STOCH_LOW_IN_RANGE": "StochRSI low in range ({0:.1f}, {1:.0%})",
+    "STOCH_LOWER_HALF": "StochRSI lower half ({0:.1f}, {1:.0%})",
+    "STOCH_NEUTRAL": "StochRSI neutral ({0:.1f}, {1:.0%})",
+    "STOCH_RELATIVE_HIGH": "StochRSI at relative high ({0:.1f}, top {1:.0%})",
+    "STOCH_HIGH_IN_RANGE": "StochRSI high in range ({0:.1f}, {1:.0%})",
+    "STOCH_VERY_LOW": "StochRSI very low ({0:.1f})",
+    "STOCH_OVERSOLD": "StochRSI oversold ({0:.1f})",
+    "STOCH_VERY_HIGH": "StochRSI very high ({0:.1f})",
+    "STOCH_OVERBOUGHT": "StochRSI overbought ({0:.1f})",
+    "MACD_POSITIVE": "MACD positive",
+    "MACD_NEGATIVE": "MACD negative",
+    "EMA_BULLISH_CROSS": "EMA bullish cross",
+    "EMA_BEARISH_CROSS": "EMA bearish cross",
+    "VOLUME_CONFIRMATION": "Volume confirmation",
+    "MOMENTUM_SPIKE": "🚀 MOMENTUM: {0:.1%} spike",
+    "MOMENTUM_DROP": "📉 MOMENTUM: {0:.1%} drop",
+}
+
+
+class SignalReasons:
+    """
+    Reason codes and their raw arguments for one signal.
+
+    Scoring appends ``(code, args)`` pairs; the display strings are built
+    only when the reasons are iterated, joined or serialised, so rejected
+    symbols never pay for string formatting. Iterating yields the same
+    strings the scanner used to append directly.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Iterable[Tuple[str, Tuple[Any, ...]]] = ()):
+        self._items: List[Tuple[str, Tuple[Any, ...]]] = list(items)
+
+    def add(self, code: str, *args: Any) -> None:
+        self._items.append((code, args))
+
+    @property
+    def codes(self) -> List[str]:
+        return [code for code, _ in self._items]
+
+    def render(self) -> List[str]:
+        return [REASON_TEMPLATES.get(code, code).format(*args) for code, args in self._items]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.render())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SignalReasons):
+            return self._items == other._items
+        if isinstance(other, list):
+            return self.render() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self) -> str:
+        return ", ".join(self.render())
+
+    def __repr__(self) -> str:
+        return f"SignalReasons({self.codes!r})"
+
+
+def _measure(scan: Callable[[], T], repeat: int = 200) -> Dict[str, float]:
+    """Retained blocks/bytes and peak traced bytes for one ``scan``, plus its average time."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        kept = scan()
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del kept
+    diff = after.compare_to(before, "lineno")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        scan()
+    elapsed = time.perf_counter() - started
+    return {
+        "retained_blocks": sum(stat.count_diff for stat in diff if stat.count_diff > 0),
+        "retained_bytes": sum(stat.size_diff for stat in diff if stat.size_diff > 0),
+        "peak_bytes": peak_bytes,
+        "avg_us": elapsed / repeat * 1e6,
+    }
+
+
+def benchmark_scan_allocations(symbols: int = 50, accept_every: int = 5) -> Dict[str, Any]:
+    """
+    Allocation counts for one scanner pass, before and after compact records.
+
+    Each symbol gets the reasons a scoring pass typically builds; every
+    ``accept_every``-th symbol becomes a signal that the scan keeps. The
+    "before" pass uses a plain dataclass and f-string reasons; the "after"
+    pass uses a frozen slotted record and ``SignalReasons``.
+    """
+
+    @dataclass
+    class PlainSignal:
+        symbol: str
+        action: str
+        confidence: float
+        price: float
+        volatility: float
+        volume_surge: bool
+        momentum: float
+        target_profit: float
+        stop_loss: float
+        timestamp: datetime
+        signal_reasons: Optional[list] = None
+
+    @record(frozen=True)
+    class CompactSignal:
+        symbol: str
+        action: str
+        confidence: float
+        price: float
+        volatility: float
+        volume_surge: bool
+        momentum: float
+        target_profit: float
+        stop_loss: float
+        timestamp: datetime
+        signal_reasons: Optional[SignalReasons] = None
+
+    inputs = [(f"C{i}/USD", 30.0 + i % 40, 0.1 + (i % 9) / 10, 20.0 + i % 60, (i % 7) / 7) for i in range(symbols)]
+    now = datetime.now()
+
+    def plain_scan() -> List[PlainSignal]:
+        kept = []
+        for i, (symbol, rsi, rsi_rel, stoch_k, stoch_rel) in enumerate(inputs):
+            reasons = [
+                f"RSI lower half ({rsi:.1f}, {rsi_rel*100:.0f}%)",
+                f"StochRSI low in range ({stoch_k:.1f}, {stoch_rel*100:.0f}%)",
+                "MACD positive",
+            ]
+            sell_reasons = [f"RSI upper half ({rsi:.1f}, {rsi_rel*100:.0f}%)", "MACD negative"]
+            if i % accept_every == 0:
+                kept.append(PlainSignal(symbol, "buy", 0.8, 100.0, 0.01, False, 0.0, 0.015, 0.015, now, reasons))
+            del sell_reasons
+        return kept
+
+    def compact_scan() -> List[CompactSignal]:
+        kept = []
+        for i, (symbol, rsi, rsi_rel, stoch_k, stoch_rel) in enumerate(inputs):
+            reasons = SignalReasons()
+            reasons.add("RSI_LOWER_HALF", rsi, rsi_rel)
+            reasons.add("STOCH_LOW_IN_RANGE", stoch_k, stoch_rel)
+            reasons.add("MACD_POSITIVE")
+            sell_reasons = SignalReasons()
+            sell_reasons.add("RSI_UPPER_HALF", rsi, rsi_rel)
+            sell_reasons.add("MACD_NEGATIVE")
+            if i % accept_every == 0:
+                kept.append(CompactSignal(symbol, "buy", 0.8, 100.0, 0.01, False, 0.0, 0.015, 0.015, now, reasons))
+            del sell_reasons
+        return kept
+
+    plain_scan(), compact_scan()  # warm up string interning and caches
+    before, after = _measure(plain_scan), _measure(compact_scan)
+    return {
+        "symbols": symbols,
+        "before": before,
+        "after": after,
+        "bytes_per_signal_before": sys.getsizeof(plain_scan()[0]) + sys.getsizeof(plain_scan()[0].__dict__),
+        "bytes_per_signal_after": sys.getsizeof(compact_scan()[0]),
+    }
+
+
+__all__ = [
+    "REASON_TEMPLATES",
+    "SignalReasons",
+    "benchmark_scan_allocations",
+    "record",
+]
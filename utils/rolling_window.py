@@ -0,0 +1,74 @@
+"""Fixed-size rolling windows with order statistics (min, max, percentile rank)."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Deque, Iterable, List, Optional
+
+
+class RollingOrderStatistics:
+    """
+    The last ``maxlen`` values in arrival order plus the same values sorted.
+
+    Appending locates the evicted and inserted values by bisection, so min,
+    max and percentile rank are read from the sorted copy without scanning
+    the window. Inserting into the sorted list still shifts its tail, which
+    for windows of a few hundred values is a short ``memmove``.
+    """
+
+    __slots__ = ("maxlen", "_values", "_sorted")
+
+    def __init__(self, maxlen: int, values: Optional[Iterable[float]] = None):
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = maxlen
+        self._values: Deque[float] = deque()
+        self._sorted: List[float] = []
+        for value in values or ():
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        if value != value:  # NaN has no rank
+            return
+        if len(self._values) == self.maxlen:
+            oldest = self._values.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._values.append(value)
+        insort(self._sorted, value)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._sorted.clear()
+
+    @property
+    def min(self) -> float:
+        return self._sorted[0]
+
+    @property
+    def max(self) -> float:
+        return self._sorted[-1]
+
+    def range_position(self, value: float) -> float:
+        """Where ``value`` sits between the window min (0.0) and max (1.0), unclamped."""
+        return (value - self._sorted[0]) / (self._sorted[-1] - self._sorted[0])
+
+    def percentile_rank(self, value: float) -> float:
+        """
+        Fraction of the window below ``value``, counting ties as half.
+
+        0.0 means every stored value is higher, 1.0 every stored value is lower.
+        """
+        below = bisect_left(self._sorted, value)
+        ties = bisect_right(self._sorted, value) - below
+        return (below + 0.5 * ties) / len(self._sorted)
+
+
+__all__ = ["RollingOrderStatistics"]